@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 画面活动检测
+
+为合成导出的"只保留精彩片段"和"变速"模式计算每个视角每秒的画面变化程度：
+- 以低分辨率、低帧率的灰度画面解码（FrameReader，跳过环路滤波），
+  每攒满一秒的画面做一次向量化帧差：变化超过阈值的像素比例，取这一秒内的最大值；
+- 结果按片段文件（路径、修改时间、大小、分析参数）缓存在事件库数据库中，
+  同一片段再次导出时不再解码；
+- 各视角取最大值得到每秒的活动分数，超过阈值的秒连同前后留白合并为活动片段，
+  再转换为导出计划：只保留活动片段（1 倍速），或空闲部分快放、活动部分 1 倍速。
+"""
+
+# 标准库
+import os
+import time
+import sqlite3
+import logging
+
+# 三方库
+import numpy as np
+
+# 自研库
+import GlobalConfig
+from FrameReader import FrameReader, FrameReaderError, VIEWS
+from LibraryIndex import LibraryIndex
+
+
+# 导出模式
+MODE_ALL = "all"
+MODE_HIGHLIGHTS = "highlights"
+MODE_VARIABLE = "variable"
+EXPORT_MODES = (MODE_ALL, MODE_HIGHLIGHTS, MODE_VARIABLE)
+
+# 分析算法变化时修改，使旧的缓存失效
+ANALYZER_VERSION = 1
+
+
+class MotionMeter:
+    """逐帧送入同尺寸灰度画面，每攒满一秒做一次帧差，得到每秒的变化像素比例"""
+
+    def __init__(self, fps, pixel_threshold=GlobalConfig.ACTIVITY_PIXEL_THRESHOLD):
+        self.fps = fps
+        self.pixel_threshold = pixel_threshold
+        self.scores = []
+        # block[0] 为上一秒的最后一帧，block[1:] 为这一秒的画面；首帧到来时按尺寸分配
+        self._block = self._diff = self._mask = None
+        self._filled = 0
+        # 第一秒的首帧没有前一帧，只比较其后的 fps - 1 帧
+        self._second_size = fps - 1
+
+    def push(self, frame):
+        if self._block is None:
+            height, width = frame.shape[:2]
+            self._block = np.empty((self.fps + 1, height, width), dtype=np.int16)
+            self._diff = np.empty((self.fps, height, width), dtype=np.int16)
+            self._mask = np.empty((self.fps, height, width), dtype=bool)
+            self._block[0] = frame
+            if not self._second_size:
+                # 每秒只有一帧时第一秒没有可比较的画面
+                self.scores.append(0.0)
+                self._second_size = self.fps
+            return
+        self._filled += 1
+        self._block[self._filled] = frame
+        if self._filled >= self._second_size:
+            self._flush()
+            self._second_size = self.fps
+
+    def _flush(self):
+        count = self._filled
+        diff, mask = self._diff[:count], self._mask[:count]
+        np.subtract(self._block[1:count + 1], self._block[:count], out=diff)
+        np.abs(diff, out=diff)
+        np.greater(diff, self.pixel_threshold, out=mask)
+        pixels = mask.shape[1] * mask.shape[2]
+        self.scores.append(np.count_nonzero(mask, axis=(1, 2)).max() / pixels)
+        self._block[0] = self._block[count]
+        self._filled = 0
+
+    def finish(self):
+        """返回每秒分数（float32），最后不足一秒的部分也算一秒"""
+        if self._filled:
+            self._flush()
+        return np.asarray(self.scores, dtype=np.float32)
+
+
+def motion_scores(frames, fps, pixel_threshold=GlobalConfig.ACTIVITY_PIXEL_THRESHOLD):
+    """frames 为依次产出的灰度画面（可复用缓冲区），返回每秒的变化像素比例"""
+    meter = MotionMeter(fps, pixel_threshold)
+    for frame in frames:
+        meter.push(frame)
+    return meter.finish()
+
+
+def active_segments(scores, threshold=GlobalConfig.ACTIVITY_SCORE_THRESHOLD,
+                    padding=GlobalConfig.ACTIVITY_PADDING, min_gap=GlobalConfig.ACTIVITY_MIN_GAP,
+                    duration=None):
+    """返回活动片段 [(开始秒, 结束秒)]；前后各留 padding 秒，间隔小于 min_gap 的片段合并"""
+    scores = np.asarray(scores)
+    duration = len(scores) if duration is None else duration
+    active = np.flatnonzero(scores >= threshold)
+    if not len(active):
+        return []
+    # 连续的活动秒合并为 [开始, 结束)
+    breaks = np.flatnonzero(np.diff(active) > 1)
+    starts = np.concatenate(([active[0]], active[breaks + 1]))
+    ends = np.concatenate((active[breaks], [active[-1]])) + 1
+
+    segments = []
+    for start, end in zip(starts, ends):
+        start = max(0.0, float(start) - padding)
+        end = min(float(duration), float(end) + padding)
+        if segments and start - segments[-1][1] < min_gap:
+            segments[-1] = (segments[-1][0], max(segments[-1][1], end))
+        else:
+            segments.append((start, end))
+    return segments
+
+
+def export_plan(scores, mode, idle_speed, active_speed=1.0, duration=None, **kwargs):
+    """导出计划 [(开始秒, 结束秒, 倍速)]，按时间排序；None 表示整段按 idle_speed 导出，空列表表示跳过
+    - highlights：只保留活动片段，按 active_speed 播放，不受导出倍速影响；
+    - variable：活动片段按 active_speed，其余按 idle_speed；结束时间为 None 表示到片段末尾。
+    """
+    if mode == MODE_ALL or scores is None:
+        return None
+    segments = active_segments(scores, duration=duration, **kwargs)
+    if mode == MODE_HIGHLIGHTS:
+        return [(start, end, active_speed) for start, end in segments]
+
+    plan = []
+    position = 0.0
+    for start, end in segments:
+        if start > position:
+            plan.append((position, start, idle_speed))
+        plan.append((start, end, active_speed))
+        position = end
+    plan.append((position, None, idle_speed))
+    # 最后一段可能为空（活动持续到结尾），交给 setpts 表达式处理即可
+    return plan
+
+
+def plan_duration(plan, duration):
+    """按计划导出后的时长（秒）"""
+    if plan is None:
+        return None
+    return sum(((duration if end is None else min(end, duration)) - start) / speed
+               for start, end, speed in plan if start < duration)
+
+
+def select_expr(plan):
+    """ffmpeg select 滤镜表达式：只保留计划中的画面；计划覆盖整段时返回 None"""
+    if plan and plan[-1][1] is None:
+        return None
+    return "+".join(f"between(t,{start:.3f},{end - 0.001:.3f})" for start, end, _ in plan)
+
+
+def setpts_expr(plan):
+    """ffmpeg setpts 滤镜表达式：按计划把原始时间映射为输出时间，跳过的部分不占时间"""
+    offsets = []
+    offset = 0.0
+    for start, end, speed in plan:
+        offsets.append(offset)
+        if end is not None:
+            offset += (end - start) / speed
+    # 从最后一段开始向前嵌套：if(T<结束, 这一段, 后面各段)
+    start, _, speed = plan[-1]
+    expr = f"{offsets[-1]:.3f}+(T-{start:.3f})/{speed:g}"
+    for (start, end, speed), offset in zip(reversed(plan[:-1]), reversed(offsets[:-1])):
+        expr = f"if(lt(T,{end:.3f}),{offset:.3f}+(T-{start:.3f})/{speed:g},{expr})"
+    return f"({expr})/TB"
+
+
+class ActivityAnalyzer:
+    """计算并缓存片段的每秒活动分数"""
+
+    def __init__(self, index=None, fps=GlobalConfig.ACTIVITY_FPS, size=GlobalConfig.ACTIVITY_SIZE,
+                 pixel_threshold=GlobalConfig.ACTIVITY_PIXEL_THRESHOLD):
+        self.index = index if index is not None else LibraryIndex()
+        self.fps = fps
+        self.size = tuple(size)
+        self.pixel_threshold = pixel_threshold
+        self.params = f"v{ANALYZER_VERSION}:{fps}fps:{self.size[0]}x{self.size[1]}:{pixel_threshold}"
+        self.glogger = logging.getLogger("ActivityAnalyzer")
+
+    def analyze_group(self, group, views=VIEWS):
+        """返回 {视角: 每秒分数}；已缓存的视角不再解码，其余视角一起解码"""
+        scores = {}
+        missing = []
+        for view in views:
+            cached = self.index.get_activity(group[view], self.params)
+            if cached is None:
+                missing.append(view)
+            else:
+                scores[view] = cached
+        if not missing:
+            return scores
+
+        started = time.perf_counter()
+        meters = {view: MotionMeter(self.fps, self.pixel_threshold) for view in missing}
+        with FrameReader(group, size=self.size, fps=self.fps, views=missing, pix_fmt='gray',
+                         fast_decode=True) as reader:
+            for frame_set in reader:
+                for view, meter in meters.items():
+                    meter.push(frame_set.frames[view])
+        for view, meter in meters.items():
+            scores[view] = meter.finish()
+            self.index.put_activity(group[view], self.params, scores[view])
+        self.glogger.info(f"活动分析: {os.path.basename(group[missing[0]])}, 视角 {', '.join(missing)}, "
+                          f"{len(scores[missing[0]])} 秒, 耗时 {time.perf_counter() - started:.2f}s")
+        return scores
+
+    def group_scores(self, group, views=VIEWS):
+        """各视角取最大值得到每秒的活动分数；无法解码时返回 None"""
+        try:
+            scores = self.analyze_group(group, views)
+        except (FrameReaderError, OSError, ValueError, sqlite3.Error) as ex:
+            self.glogger.warning(f"活动分析失败: {ex}")
+            return None
+        length = min(len(s) for s in scores.values())
+        if not length:
+            return None
+        return np.max(np.stack([s[:length] for s in scores.values()]), axis=0)
+
+    def close(self):
+        self.index.close()
@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 归档转码
+
+把原始片段（或合并后的视频）重新编码为 HEVC/AV1 以节省归档空间：
+- 与合并功能相同，使用 ffmpeg-python 构建命令；
+- 后台低优先级运行：进程 nice/ionice（Windows 为低于正常优先级），可限定 CPU，
+  同时运行的任务数和每个 ffmpeg 的线程数都有上限；
+- 输出先写入同目录下的临时文件，校验（时长、编码、可选完整解码）通过后才原子替换原文件
+  或移动到归档目录，失败时原文件保持不变；
+- 每个文件的结果逐行追加到源目录下的日志文件（JSON Lines），可随时暂停、停止，
+  再次运行时跳过已完成的文件；
+- 按编码预设汇总输入/输出大小、压缩比和处理速度。
+"""
+
+# 标准库
+import os
+import json
+import time
+import signal
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# 三方库
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# 自研库
+import GlobalConfig
+from utils import low_priority_popen
+
+
+# 编码预设：ffmpeg 输出参数；HEVC 使用 hvc1 标签以便 QuickTime/浏览器识别
+PRESETS = {
+    'hevc': {'vcodec': 'libx265', 'crf': 28, 'preset': 'medium', 'tag:v': 'hvc1',
+             'x265-params': 'log-level=error'},
+    'hevc-fast': {'vcodec': 'libx265', 'crf': 28, 'preset': 'fast', 'tag:v': 'hvc1',
+                  'x265-params': 'log-level=error'},
+    'av1': {'vcodec': 'libsvtav1', 'crf': 35, 'preset': 8},
+}
+# 目标编码名称（ffprobe 的 codec_name），已是该编码的文件直接跳过
+PRESET_CODECS = {'hevc': 'hevc', 'hevc-fast': 'hevc', 'av1': 'av1'}
+
+# 转码日志文件名（位于源目录）
+JOURNAL_NAME = ".teslacam-archive.jsonl"
+# 校验时允许的时长误差（秒）
+DURATION_TOLERANCE = 0.5
+# 临时文件后缀
+PART_SUFFIX = ".archive-part.mp4"
+
+
+class ArchiveCancelled(Exception):
+    """转码被停止"""
+
+
+def probe_video(path):
+    """返回 (编码名称, 时长秒)"""
+    import ffmpeg
+
+    info = ffmpeg.probe(path, select_streams='v:0',
+                        show_entries='stream=codec_name:format=duration')
+    codec = info['streams'][0]['codec_name'] if info.get('streams') else None
+    return codec, float(info['format']['duration'])
+
+
+def build_command(src, dst, preset, threads=GlobalConfig.ARCHIVE_THREADS):
+    """ffmpeg 命令行参数；音频（合并后的视频可能带音频）直接复制"""
+    import ffmpeg
+
+    return (
+        ffmpeg
+        .input(src)
+        .output(dst, pix_fmt='yuv420p', movflags='faststart', acodec='copy',
+                threads=threads, **PRESETS[preset])
+        .global_args('-loglevel', 'error', '-nostdin')
+        .overwrite_output()
+        .compile()
+    )
+
+
+def verify_output(src_duration, dst, codec, decode=False):
+    """校验输出：编码正确、时长一致；decode 为 True 时完整解码一遍检查错误"""
+    out_codec, out_duration = probe_video(dst)
+    if out_codec != codec:
+        raise RuntimeError(f"输出编码不正确: {out_codec}")
+    if abs(out_duration - src_duration) > DURATION_TOLERANCE:
+        raise RuntimeError(f"输出时长不一致: {out_duration:.2f}s / {src_duration:.2f}s")
+    if decode:
+        import ffmpeg
+
+        _, err = (
+            ffmpeg
+            .input(dst)
+            .output('-', format='null')
+            .global_args('-v', 'error', '-nostdin')
+            .run(capture_stderr=True)
+        )
+        if err.strip():
+            raise RuntimeError(f"解码出错: {err.decode(errors='replace')[:200]}")
+
+
+class ArchiveJournal:
+    """转码日志：每行一条记录，追加写入，中断后可继续"""
+
+    def __init__(self, path):
+        self.path = path
+        # 相对路径 -> 最后一条记录
+        self.entries = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.entries[record["src"]] = record
+
+    def is_done(self, rel):
+        record = self.entries.get(rel)
+        return record is not None and record.get("status") in ("done", "skipped")
+
+    def append(self, record):
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.entries[record["src"]] = record
+
+    def report(self):
+        """按预设汇总：{预设: {files, in_bytes, out_bytes, ratio, seconds, mb_per_sec, speed}}"""
+        totals = defaultdict(lambda: defaultdict(float))
+        for record in self.entries.values():
+            if record.get("status") != "done":
+                continue
+            t = totals[record["preset"]]
+            t["files"] += 1
+            t["in_bytes"] += record["in_bytes"]
+            t["out_bytes"] += record["out_bytes"]
+            t["seconds"] += record["seconds"]
+            t["duration"] += record["duration"]
+        report = {}
+        for preset, t in totals.items():
+            seconds = max(t["seconds"], 1e-6)
+            report[preset] = {
+                "files": int(t["files"]),
+                "in_bytes": int(t["in_bytes"]),
+                "out_bytes": int(t["out_bytes"]),
+                "ratio": t["out_bytes"] / t["in_bytes"] if t["in_bytes"] else 0,
+                "seconds": t["seconds"],
+                # 输入数据处理速度，以及相对实时播放的倍数
+                "mb_per_sec": t["in_bytes"] / seconds / 1024 / 1024,
+                "speed": t["duration"] / seconds,
+            }
+        return report
+
+
+def format_report(report):
+    lines = [f"{'预设':<10}{'文件':>6}{'输入MB':>10}{'输出MB':>10}{'压缩比':>8}{'MB/s':>8}{'倍速':>8}"]
+    for preset, r in sorted(report.items()):
+        lines.append(
+            f"{preset:<10}{r['files']:>6}{r['in_bytes'] / 1024 / 1024:>10.1f}"
+            f"{r['out_bytes'] / 1024 / 1024:>10.1f}{r['ratio']:>8.2f}"
+            f"{r['mb_per_sec']:>8.1f}{r['speed']:>8.1f}x")
+    return "\n".join(lines)
+
+
+class ArchiveTranscoder:
+    """转码 source 下的全部 mp4；archive_root 为 None 时原地替换，否则写入 archive_root 并保持相对路径"""
+
+    def __init__(self, source, preset=GlobalConfig.ARCHIVE_PRESET, archive_root=None,
+                 max_jobs=GlobalConfig.ARCHIVE_MAX_JOBS, threads=GlobalConfig.ARCHIVE_THREADS,
+                 nice=GlobalConfig.ARCHIVE_NICE, cpus=GlobalConfig.ARCHIVE_CPUS,
+                 decode_check=False, progress=None):
+        if preset not in PRESETS:
+            raise ValueError(f"未知的编码预设: {preset}")
+        self.source = os.path.abspath(source)
+        self.preset = preset
+        self.archive_root = os.path.abspath(archive_root) if archive_root else None
+        self.max_jobs = max(1, max_jobs)
+        self.threads = threads
+        self.nice = nice
+        self.cpus = cpus
+        self.decode_check = decode_check
+        # progress(已完成文件数, 文件总数)
+        self.progress = progress
+        self.glogger = logging.getLogger("ArchiveTranscoder")
+
+        self.journal = ArchiveJournal(os.path.join(self.source, JOURNAL_NAME))
+        self._lock = threading.Lock()
+        self._procs = set()
+        self._running = threading.Event()
+        self._running.set()
+        self.stopped = False
+        self.stats = {"done": 0, "skipped": 0, "failed": 0}
+
+    # ******************** 暂停 / 停止 ********************
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def pause(self):
+        """不再启动新任务；POSIX 上同时挂起正在运行的 ffmpeg"""
+        # 与 _encode 登记进程共用锁，保证挂起后新登记的进程也会被挂起
+        with self._lock:
+            self._running.clear()
+            self._signal_all(getattr(signal, 'SIGSTOP', None))
+
+    def resume(self):
+        with self._lock:
+            self._signal_all(getattr(signal, 'SIGCONT', None))
+            self._running.set()
+
+    def stop(self):
+        with self._lock:
+            self.stopped = True
+            self._signal_all(getattr(signal, 'SIGCONT', None))
+            for proc in self._procs:
+                proc.terminate()
+            self._running.set()
+
+    def _signal_all(self, signum):
+        """调用方需持有 _lock"""
+        for proc in self._procs:
+            self._signal(proc, signum)
+
+    @staticmethod
+    def _signal(proc, signum):
+        if signum is None:
+            return
+        try:
+            os.kill(proc.pid, signum)
+        except OSError:
+            pass
+
+    # ******************** 转码 ********************
+
+    def plan(self):
+        """返回待转码的相对路径列表"""
+        pending = []
+        for folder, dirs, files in os.walk(self.source):
+            # 归档目录位于源目录内时不重复处理
+            dirs[:] = sorted(d for d in dirs if not d.startswith(".")
+                             and os.path.join(folder, d) != self.archive_root)
+            for name in sorted(files):
+                if not name.lower().endswith(".mp4") or name.endswith(PART_SUFFIX):
+                    continue
+                rel = os.path.relpath(os.path.join(folder, name), self.source)
+                if self.journal.is_done(rel):
+                    self.stats["skipped"] += 1
+                else:
+                    pending.append(rel)
+        return pending
+
+    def run(self):
+        pending = self.plan()
+        total = len(pending)
+        self.glogger.info(f"开始归档转码: {self.source}, 预设 {self.preset}, "
+                          f"待处理 {total}, 已完成 {self.stats['skipped']}")
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_jobs) as pool:
+            for _ in pool.map(self._transcode_safe, pending):
+                done += 1
+                if self.progress is not None:
+                    self.progress(done, total)
+        self.glogger.info(f"归档转码结束: {self.stats}\n{format_report(self.journal.report())}")
+        return dict(self.stats)
+
+    def _transcode_safe(self, rel):
+        self._running.wait()
+        if self.stopped:
+            return
+        try:
+            self._transcode_one(rel)
+        except ArchiveCancelled:
+            pass
+        except Exception as ex:
+            self.glogger.error(f"归档转码失败: {rel}, 原因: {ex}")
+            with self._lock:
+                self.stats["failed"] += 1
+            self.journal.append({"src": rel, "preset": self.preset, "status": "failed",
+                                 "error": str(ex)})
+
+    def _transcode_one(self, rel):
+        src = os.path.join(self.source, rel)
+        dst = os.path.join(self.archive_root, rel) if self.archive_root else src
+        codec = PRESET_CODECS[self.preset]
+
+        src_codec, duration = probe_video(src)
+        if src_codec == codec:
+            with self._lock:
+                self.stats["skipped"] += 1
+            self.journal.append({"src": rel, "preset": self.preset, "status": "skipped"})
+            return
+
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        # 临时文件与目标在同一目录，保证 os.replace 是原子操作
+        tmp = dst + PART_SUFFIX
+        st = os.stat(src)
+        started = time.monotonic()
+        try:
+            self._encode(src, tmp)
+            verify_output(duration, tmp, codec, self.decode_check)
+        except BaseException:
+            self._remove(tmp)
+            raise
+        seconds = time.monotonic() - started
+        out_bytes = os.path.getsize(tmp)
+        # 保留原始修改时间，事件库和按时间排序不受影响
+        os.utime(tmp, (st.st_atime, st.st_mtime))
+        os.replace(tmp, dst)
+
+        with self._lock:
+            self.stats["done"] += 1
+        self.journal.append({
+            "src": rel, "preset": self.preset, "status": "done", "dst": dst,
+            "in_bytes": st.st_size, "out_bytes": out_bytes,
+            "seconds": round(seconds, 3), "duration": duration,
+        })
+        self.glogger.info(f"已归档: {rel}, {st.st_size / 1024 / 1024:.1f}MB -> "
+                          f"{out_bytes / 1024 / 1024:.1f}MB, {seconds:.1f}s")
+
+    def _encode(self, src, tmp):
+        proc = low_priority_popen(build_command(src, tmp, self.preset, self.threads),
+                                  self.nice, self.cpus)
+        with self._lock:
+            self._procs.add(proc)
+            # 通过 stopped 检查后才启动的进程：stop()/pause() 已遍历过 _procs，这里补上
+            if self.stopped:
+                proc.terminate()
+            elif not self._running.is_set():
+                self._signal(proc, getattr(signal, 'SIGSTOP', None))
+        try:
+            _, err = proc.communicate()
+        finally:
+            with self._lock:
+                self._procs.discard(proc)
+        if self.stopped:
+            raise ArchiveCancelled()
+        if proc.returncode != 0:
+            raise RuntimeError(f"ffmpeg 退出码 {proc.returncode}: "
+                               f"{err.decode(errors='replace').strip()[-200:]}")
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class ArchiveWorker(QThread):
+    """后台归档转码"""
+
+    archiveProgress = pyqtSignal(int, int)  # 已完成, 总数
+    archiveFinished = pyqtSignal(bool, dict)  # 是否完成（未停止且无失败）, 统计
+
+    def __init__(self, source, preset, archive_root=None, parent=None):
+        super().__init__(parent)
+        self.transcoder = ArchiveTranscoder(
+            source, preset, archive_root,
+            progress=lambda done, total: self.archiveProgress.emit(done, total))
+        self.glogger = logging.getLogger("ArchiveWorker")
+
+    @property
+    def paused(self):
+        return self.transcoder.paused
+
+    def pause(self):
+        self.transcoder.pause()
+
+    def resume(self):
+        self.transcoder.resume()
+
+    def stop(self):
+        self.transcoder.stop()
+
+    def run(self):
+        try:
+            stats = self.transcoder.run()
+            self.archiveFinished.emit(
+                not self.transcoder.stopped and not stats["failed"], stats)
+        except Exception as ex:
+            self.glogger.exception(f"归档转码失败: {ex}")
+            self.archiveFinished.emit(False, {})
@@ -12,7 +12,6 @@ import sys
 import shutil
 import logging
 import platform
-import configparser
 from pathlib import Path
 
 from PyQt5.QtWidgets import *
@@ -21,10 +20,12 @@ from PyQt5.QtGui import *
 
 # from utils import *
 import GlobalConfig
-from I18n import tr
+from ConfigService import get_config
+from I18n import tr, add_language_listener, view_text, view_from_text, VIEW_KEYS
 from CamClipCombiner.CoreWorker import CoreWorker
+from ActivityAnalyzer import EXPORT_MODES, MODE_ALL
 from Signal import Signal
-from notifier import Notifier
+from notifier import shared_notifier
 
 # 解决MacOS系统中因 pyinstaller 构建安装包后无法获取全量环境变量，
 # 从而导致FFmpeg无法使用的问题，通过设置环境变量来解决
@@ -63,6 +64,7 @@ class CamClipCombiner(QDialog):
 
         self.create_ui()
         self.read_config()
+        add_language_listener(self.retranslate_ui)
         self._init_notifier_from_config()
 
         self.glogger.info(f"_MEIPASS: {hasattr(sys, '_MEIPASS')}")
@@ -129,6 +131,26 @@ class CamClipCombiner(QDialog):
         # audioFilePathHLayout.addWidget(self.audioFileBtn)
         self.vBox.addLayout(audioFilePathHLayout)
 
+        # 离线地址数据
+        offlineGeocodeHLayout = QHBoxLayout()
+        offlineGeocodeLbl = QLabel(tr("combiner.offline_geocode"), self)
+        offlineGeocodeHLayout.addWidget(offlineGeocodeLbl)
+        self.offlineGeocodePath = QLineEdit(self)
+        self.offlineGeocodePath.setPlaceholderText(tr("combiner.offline_geocode.placeholder"))
+        self.offlineGeocodePath.setToolTip(tr("combiner.offline_geocode.tooltip"))
+        # 设置只读
+        self.offlineGeocodePath.setReadOnly(True)
+        offlineGeocodeHLayout.addWidget(self.offlineGeocodePath)
+        # 添加浏览文件按钮
+        self.offlineGeocodeBrowseBtn = QPushButton(tr("combiner.browse"), self)
+        self.offlineGeocodeBrowseBtn.clicked.connect(self.openOfflineGeocodeFile)
+        offlineGeocodeHLayout.addWidget(self.offlineGeocodeBrowseBtn)
+        # 清除后改回使用在线服务
+        self.offlineGeocodeClearBtn = QPushButton(tr("combiner.offline_geocode.clear"), self)
+        self.offlineGeocodeClearBtn.clicked.connect(self.offlineGeocodePath.clear)
+        offlineGeocodeHLayout.addWidget(self.offlineGeocodeClearBtn)
+        self.vBox.addLayout(offlineGeocodeHLayout)
+
         # 输出视频
         outputFolderHLayout = QHBoxLayout()
         outputFolderLbl = QLabel(tr("combiner.output_video"), self)
@@ -203,17 +225,23 @@ class CamClipCombiner(QDialog):
         self.mainViewBox = QComboBox()
         self.mainViewBox.setPlaceholderText(tr("combiner.main_view.placeholder"))
         self.mainViewBox.setToolTip(tr("combiner.main_view.tooltip"))
-        self.mainViewBox.addItems([
-            tr("player.view.front"),
-            tr("player.view.back"),
-            tr("player.view.left"),
-            tr("player.view.right"),
-        ])
+        # 显示文本随语言变化，选项数据为视角键（front/back/left/right）
+        for view in VIEW_KEYS:
+            self.mainViewBox.addItem(view_text(view), view)
         self.mainViewBox.setMinimumWidth(100)
-        self.mainViewBox.setCurrentText(tr("player.view.front"))
-        self.mainViewBox.currentTextChanged.connect(
-            lambda text: self.setMainView(text))
+        self.mainViewBox.setCurrentIndex(self.mainViewBox.findData("front"))
+        self.mainViewBox.currentIndexChanged.connect(
+            lambda _: self.setMainView(self.mainViewBox.currentData()))
         othersHLayout.addWidget(self.mainViewBox)
+        # 导出模式：全部 / 只保留有活动的片段 / 空闲快放
+        exportModeLbl = QLabel(tr("combiner.mode"), self)
+        othersHLayout.addWidget(exportModeLbl)
+        self.exportModeBox = QComboBox()
+        self.exportModeBox.setToolTip(tr("combiner.mode.tooltip"))
+        for mode in EXPORT_MODES:
+            self.exportModeBox.addItem(tr(f"combiner.mode.{mode}"), mode)
+        self.exportModeBox.currentIndexChanged.connect(lambda _: self.save_config())
+        othersHLayout.addWidget(self.exportModeBox)
         othersHLayout.addStretch(1)
         self.vBox.addLayout(othersHLayout)
 
@@ -285,27 +313,18 @@ class CamClipCombiner(QDialog):
         self.updateStatusBarTips()
 
     def _init_notifier_from_config(self):
-        config_path = GlobalConfig.CONFIG_FILE_PATH
-
-        if not os.path.exists(config_path):
-            return
-
-        config = configparser.ConfigParser()
-        config.read(config_path, encoding='utf-8')
+        config = get_config()
 
         section = "Notification"
         if not config.has_section(section):
             return
+        notification = config.section(section)
 
         def _get(key, default=""):
-            return config.get(section, key, fallback=default)
+            return notification.get(key, fallback=default)
 
         def _get_bool(key, default=False):
-            try:
-                v = config.get(section, key, fallback="1" if default else "0")
-                return v in ("1", "true", "True")
-            except Exception:
-                return default
+            return notification.get_bool(key, fallback=default)
 
         notify_system = _get_bool("notify_system", True)
         notify_email = _get_bool("notify_email", False)
@@ -332,7 +351,8 @@ class CamClipCombiner(QDialog):
         wechat_mentions = [x.strip() for x in wechat_mentions_text.split(
             ",") if x.strip()] if wechat_mentions_text else None
 
-        self.notifier = Notifier(
+        # 各对话框共用一个应用级通知器，配置不变时不会重复创建分发线程
+        self.notifier = shared_notifier(
             enable_system=notify_system,
             enable_email=notify_email,
             enable_wechat=notify_wechat,
@@ -407,17 +427,25 @@ class CamClipCombiner(QDialog):
         # NewPATH = os.environ['PATH']
         # self.glogger.info(f"New PATH: {NewPATH}")
 
-    def setMainView(self, zh_view):
-        view_map = {
-            tr("player.view.front"): 'front',
-            tr("player.view.back"): 'back',
-            tr("player.view.left"): 'left',
-            tr("player.view.right"): 'right',
-        }
-        view = view_map.get(zh_view, 'front')
-        self.main_view = view
+    def setMainView(self, view):
+        self.main_view = view if view in VIEW_KEYS else 'front'
         self.save_config()
 
+    def selectMainView(self, view):
+        """按视角键选中主视角（如与播放器当前主视角同步）"""
+        index = self.mainViewBox.findData(view)
+        if index >= 0:
+            self.mainViewBox.setCurrentIndex(index)
+
+    def retranslate_ui(self):
+        """切换语言后更新下拉框的显示文本，选中项不变"""
+        for box, prefix in ((self.mainViewBox, "player.view"),
+                            (self.exportModeBox, "combiner.mode")):
+            box.blockSignals(True)
+            for i in range(box.count()):
+                box.setItemText(i, tr(f"{prefix}.{box.itemData(i)}"))
+            box.blockSignals(False)
+
     def is_tesla_cam_video_folder(self, folder_path):
         """判断文件夹下文件是否符合特斯拉行车记录仪视频文件规范"""
         files = os.listdir(folder_path)
@@ -564,6 +592,27 @@ class CamClipCombiner(QDialog):
         self.audioFilePath.setText(filename[0])
         self.save_config()
 
+    def openOfflineGeocodeFile(self):
+        """Open a GeoJSON/CSV offline address data file"""
+        if self.offlineGeocodePath.text() != "" and os.path.exists(self.offlineGeocodePath.text()):
+            # 路径已设置并存在，则默认打开设置的路径
+            directory = self.offlineGeocodePath.text()
+        else:
+            directory = os.path.expanduser('~')
+
+        filename = QFileDialog.getOpenFileName(
+            self,
+            tr("filedialog.select_geodata"),
+            directory,
+            tr("filedialog.filter_geodata"),
+        )
+
+        if not filename or not filename[0]:
+            return
+
+        self.offlineGeocodePath.setText(filename[0])
+        self.save_config()
+
     def openInputPath(self):
         self.openFolderOrFile(self.inputFolder.text())
 
@@ -728,7 +777,9 @@ class CamClipCombiner(QDialog):
         self.core_worker = CoreWorker(self, self.signals,
                                       self.inputFolder.text(), self.audioFilePath.text(),
                                       self.outputFolder.text(), self.tripleSpeed.value(),
-                                      self.amapApiKey.text(), self.main_view)
+                                      self.amapApiKey.text(), self.main_view,
+                                      self.offlineGeocodePath.text() or None,
+                                      self.exportModeBox.currentData() or MODE_ALL)
         self.core_worker.start()
 
         self.procProgBar.setValue(0)
@@ -742,67 +793,50 @@ class CamClipCombiner(QDialog):
             self.core_worker.stop()
 
     def save_config(self):
+        """更新配置；微调框等控件变化时频繁调用，由配置服务合并后延迟写入磁盘"""
         try:
-            # 配置文件保存路径
-            config_path = GlobalConfig.CONFIG_FILE_PATH
-
-            if os.path.exists(config_path):
-                # 如果配置文件存在就读取
-                config = configparser.ConfigParser()
-                config.read(config_path, encoding='utf-8')
-
-                config.set("Settings", "inputPath",
-                           f"{self.inputFolder.text()}")
-                config.set("Settings", "audioFilePath",
-                           f"{self.audioFilePath.text()}")
-                config.set("Settings", "outputPath",
-                           f"{self.outputFolder.text()}")
-                config.set("Settings", "ffmpegPath",
-                           f"{self.ffmpegPath.text()}")
-                config.set("Settings", "tripleSpeed",
-                           f"{self.tripleSpeed.value()}")
-                config.set("Settings", "amapApiKey",
-                           f"{self.amapApiKey.text()}")
-                config.set("Settings", "mainView",
-                           f"{self.mainViewBox.currentText()}")
-
-                config.write(open(config_path, "w", encoding="utf-8"))
-            else:
-                # 如果没有配置文件就创建
-                with open(config_path, "w", encoding="utf-8") as f:
-                    f.write("[Settings]\n")
-                    f.write(f"inputPath = {self.inputFolder.text()}\n")
-                    f.write(f"audioFilePath = {self.audioFilePath.text()}\n")
-                    f.write(f"outputPath = {self.outputFolder.text()}\n")
-                    f.write(f"ffmpegPath = {self.ffmpegPath.text()}\n")
-                    f.write(f"tripleSpeed = {self.tripleSpeed.value()}\n")
-                    f.write(f"amapApiKey = {self.amapApiKey.text()}\n")
-                    f.write(f"mainView = {self.mainViewBox.currentText()}\n")
+            get_config().update("Settings", {
+                "inputPath": self.inputFolder.text(),
+                "audioFilePath": self.audioFilePath.text(),
+                "outputPath": self.outputFolder.text(),
+                "ffmpegPath": self.ffmpegPath.text(),
+                "tripleSpeed": self.tripleSpeed.value(),
+                "amapApiKey": self.amapApiKey.text(),
+                "offlineGeocodePath": self.offlineGeocodePath.text(),
+                "mainView": self.mainViewBox.currentData() or 'front',
+                "exportMode": self.exportModeBox.currentData() or MODE_ALL,
+            })
         except Exception as e:
             self.glogger.error(f"配置保存异常: {e}")
 
     def read_config(self):
-        # 配置文件保存路径
-        config_path = GlobalConfig.CONFIG_FILE_PATH
+        config = get_config()
 
         # 如果配置文件存在就读取
-        if os.path.exists(config_path):
-            config = configparser.ConfigParser()
-            config.read(config_path, encoding='utf-8')
+        if config.has_section("Settings"):
+            settings = config.section("Settings")
 
             try:
-                self.inputFolder.setText(config.get("Settings", "inputPath"))
+                self.inputFolder.setText(
+                    settings.get("inputPath", self.inputFolder.text()))
                 self.audioFilePath.setText(
-                    config.get("Settings", "audioFilePath"))
-                self.outputFolder.setText(config.get("Settings", "outputPath"))
-                self.ffmpegPath.setText(config.get("Settings", "ffmpegPath"))
+                    settings.get("audioFilePath", self.audioFilePath.text()))
+                self.outputFolder.setText(
+                    settings.get("outputPath", self.outputFolder.text()))
+                self.ffmpegPath.setText(
+                    settings.get("ffmpegPath", self.ffmpegPath.text()))
                 self.tripleSpeed.setValue(
-                    float(config.get("Settings", "tripleSpeed")))
-                self.amapApiKey.setText(config.get("Settings", "amapApiKey"))
-                self.mainViewBox.setCurrentText(
-                    config.get("Settings", "mainView"))
-            except configparser.NoOptionError as err:
-                self.glogger.error(f'配置文件缺少选项: {err}')
+                    settings.get_float("tripleSpeed", self.tripleSpeed.value()))
+                self.amapApiKey.setText(
+                    settings.get("amapApiKey", self.amapApiKey.text()))
+                self.offlineGeocodePath.setText(
+                    settings.get("offlineGeocodePath", self.offlineGeocodePath.text()))
+                # 旧版本保存的是显示文本
+                view = settings.get("mainView", "front")
+                self.selectMainView(view if view in VIEW_KEYS else view_from_text(view))
+                index = self.exportModeBox.findData(settings.get("exportMode", MODE_ALL))
+                if index >= 0:
+                    self.exportModeBox.setCurrentIndex(index)
             except Exception as ex:
                 self.glogger.error(f'配置读取异常: {ex}')
 
@@ -844,4 +878,5 @@ class CamClipCombiner(QDialog):
                 event.ignore()
                 return
 
+        get_config().flush()
         super().closeEvent(event)
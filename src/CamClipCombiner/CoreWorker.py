@@ -5,7 +5,6 @@ import json
 # import shutil
 import logging
 import tempfile
-import requests
 from pathlib import Path
 from datetime import datetime
 from PyQt5.QtCore import *
@@ -13,6 +12,10 @@ import ffmpeg
 # from utils import *
 # import GlobalConfig
 from Signal import Signal
+from Geocoder import Geocoder, AmapProvider
+from OfflineGeocoder import OfflineProvider
+from ActivityAnalyzer import (ActivityAnalyzer, MODE_ALL, export_plan, plan_duration,
+                              select_expr, setpts_expr)
 
 
 # if get_os_type() == 'MacOS' and shutil.which('ffmpeg') is None:
@@ -29,7 +32,7 @@ from Signal import Signal
 
 class CoreWorker(QThread):
     def __init__(self, parent, signals: Signal, inputFolder, audioFile,  outputFolder, tripleSpeed=10,
-                 amapApiKey=None, mainView='front'):
+                 amapApiKey=None, mainView='front', offlineGeocodePath=None, exportMode=MODE_ALL):
         super().__init__(parent)
 
         self.parent = parent
@@ -47,6 +50,17 @@ class CoreWorker(QThread):
         self.amapApiKey = amapApiKey
         # 主视角
         self.mainView = mainView
+        # 离线地址数据（GeoJSON/CSV），优先于在线服务
+        self.offlineGeocodePath = offlineGeocodePath
+        # 逆地理编码（首次使用时创建）
+        self.geocoder = None
+        self.offline_provider = None
+        # 导出模式：all 全部按倍速导出，highlights 只保留有活动的片段（1 倍速），variable 空闲快放、活动 1 倍速
+        self.exportMode = exportMode
+        # 活动检测（首次使用时创建）与当前时间段的导出计划
+        self.activity_analyzer = None
+        self.current_plan = None
+        self.source_seconds = self.output_seconds = 0.0
 
         self.current_abspath = os.path.dirname(os.path.abspath(__file__))
 
@@ -64,6 +78,8 @@ class CoreWorker(QThread):
 
         # 1.将各个时间点的不同视角视频合并成一个视频
         self.process_tesla_clips(input_folder, output_folder)
+        if not any(f.endswith('.mp4') for f in os.listdir(output_folder)):
+            raise RuntimeError("没有可拼接的视频（片段不完整或未检测到活动画面）")
 
         # 2.将合并后的视频进行拼接
         video_file_combined = os.path.join(
@@ -96,29 +112,63 @@ class CoreWorker(QThread):
             json_dict = json.load(scf)
         return json_dict
 
+    def offline_reverse_geocode(self, longitude, latitude):
+        if not self.offlineGeocodePath:
+            return None
+
+        if self.offline_provider is None:
+            try:
+                # 同一数据文件在进程内只加载一次
+                self.offline_provider = OfflineProvider(self.offlineGeocodePath)
+            except Exception as ex:
+                self.glogger.error(f"离线地址数据加载失败: {self.offlineGeocodePath}, 原因: {ex}")
+                self.offlineGeocodePath = None
+                return None
+
+        return self.offline_provider.reverse(longitude, latitude)
+
     def reverse_geocode(self, longitude, latitude):
 
-        if self.amapApiKey is None:
+        address = self.offline_reverse_geocode(longitude, latitude)
+        if address:
+            self.glogger.info(f"地址信息(离线): {address}")
+            return address
+
+        if not self.amapApiKey:
             return None
 
-        api_key = self.amapApiKey
-        url = f"https://restapi.amap.com/v3/geocode/regeo?key={api_key}&location={longitude},{latitude}"
+        if self.geocoder is None:
+            # 复用连接池与持久化缓存，同一位置重复导出不再请求网络
+            self.geocoder = Geocoder(AmapProvider(self.amapApiKey))
 
-        try:
-            response = requests.get(url)
-            data = response.json()
+        address = self.geocoder.reverse(longitude, latitude)
+        if address:
+            self.glogger.info(f"地址信息: {address}")
+        return address
 
-            if data['status'] == '1':
-                address = data['regeocode']['formatted_address']
-                self.glogger.info(f"地址信息: {address}")
-                return address
-            else:
-                info = data['info']
-                self.glogger.info(f"逆地理编码失败: {info}")
-                return None
-        except Exception as e:
-            self.glogger.exception(f"请求失败: {e}")
+    def activity_plan(self, clips):
+        """当前导出模式下该时间段的导出计划，None 表示整段按倍速导出，空列表表示没有活动"""
+        if self.exportMode == MODE_ALL:
             return None
+        if self.activity_analyzer is None:
+            self.activity_analyzer = ActivityAnalyzer()
+        scores = self.activity_analyzer.group_scores(clips)
+        # 分析失败时整段导出，不丢画面
+        plan = export_plan(scores, self.exportMode, self.tripleSpeed)
+        if scores is not None:
+            self.source_seconds += len(scores)
+            output = plan_duration(plan, len(scores))
+            self.output_seconds += output if output is not None else len(scores) / self.tripleSpeed
+        return plan
+
+    def retime(self, input_stream):
+        """按导出计划调整时间：整段倍速，或只保留活动片段、分段变速"""
+        if not self.current_plan:
+            return input_stream.filter('setpts', f'{1/self.tripleSpeed}*PTS')
+        expr = select_expr(self.current_plan)
+        if expr:
+            input_stream = input_stream.filter('select', expr)
+        return input_stream.filter('setpts', setpts_expr(self.current_plan))
 
     def process_tesla_clips(self, folder_path, output_path):
         # 获取文件夹中所有视频文件
@@ -163,6 +213,8 @@ class CoreWorker(QThread):
 
         count = 0
         total = len(video_groups)
+        # 活动检测模式下原始时长与导出时长（秒）
+        self.source_seconds = self.output_seconds = 0.0
         # 处理每个时间戳组的视频
         for timestamp, clips in sorted(video_groups.items()):
             count = count + 1
@@ -171,6 +223,12 @@ class CoreWorker(QThread):
                 self.glogger.info(f"警告: 时间戳 {timestamp} 的视频不完整(缺少某些视角), 跳过处理")
                 continue
 
+            self.current_plan = self.activity_plan(clips)
+            if self.current_plan is not None and not self.current_plan:
+                self.glogger.info(f"时间戳 {timestamp} 未检测到活动画面, 跳过")
+                self.signals.process_progress.emit(int((count / total) * 100))
+                continue
+
             try:
                 # 输入文件
                 front_input = ffmpeg.input(clips['front'])
@@ -266,10 +324,14 @@ class CoreWorker(QThread):
                     f"处理时间戳 {timestamp} 的视频时出错: {e.stderr}")
                 continue
 
+        if self.exportMode != MODE_ALL and self.source_seconds:
+            self.glogger.info(
+                f"活动检测({self.exportMode}): 原始 {self.source_seconds:.0f} 秒, "
+                f"导出 {self.output_seconds:.0f} 秒")
+
     def frontMainView(self, front_input, back_input, left_input, right_input, width, height):
 
-        def speed_up(input_stream): return input_stream.filter(
-            'setpts', f'{1/self.tripleSpeed}*PTS')
+        speed_up = self.retime
 
         # 处理各个视角视频
         front = speed_up(front_input).filter('scale', width, height)
@@ -312,8 +374,7 @@ class CoreWorker(QThread):
 
     def backMainView(self, front_input, back_input, left_input, right_input, width, height):
 
-        def speed_up(input_stream): return input_stream.filter(
-            'setpts', f'{1/self.tripleSpeed}*PTS')
+        speed_up = self.retime
 
         # 处理各个视角视频
         front = speed_up(front_input).filter('scale', width//4, height//4)
@@ -353,8 +414,7 @@ class CoreWorker(QThread):
 
     def leftMainView(self, front_input, back_input, left_input, right_input, width, height):
 
-        def speed_up(input_stream): return input_stream.filter(
-            'setpts', f'{1/self.tripleSpeed}*PTS')
+        speed_up = self.retime
 
         # 处理各个视角视频
         front = speed_up(front_input).filter('scale', width//4, height//4)
@@ -394,8 +454,7 @@ class CoreWorker(QThread):
 
     def rightMainView(self, front_input, back_input, left_input, right_input, width, height):
 
-        def speed_up(input_stream): return input_stream.filter(
-            'setpts', f'{1/self.tripleSpeed}*PTS')
+        speed_up = self.retime
 
         # 处理各个视角视频
         front = speed_up(front_input).filter('scale', width//4, height//4)
@@ -542,6 +601,13 @@ class CoreWorker(QThread):
         except Exception as e:
             self.glogger.exception(f"处理失败: {str(e)}")
             self.signals.process_finish.emit("fail")
+        finally:
+            if self.geocoder is not None:
+                self.geocoder.close()
+                self.geocoder = None
+            if self.activity_analyzer is not None:
+                self.activity_analyzer.close()
+                self.activity_analyzer = None
 
     def stop(self):
         self.terminate()
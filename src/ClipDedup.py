@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 片段去重
+
+同一分钟的片段经常同时存在于 RecentClips、SavedClips、SentryClips 中。按内容查找重复片段：
+1. 按文件大小分组（只需 stat），大小唯一的文件不可能重复；
+2. 大小相同的文件计算指纹：开头、结尾各 64KB 以及 moov 盒子（索引表，随内容变化）的哈希；
+3. 指纹也相同时才读取完整文件计算哈希确认。
+指纹和完整哈希按 (路径, 大小, 修改时间) 缓存在用户目录下的 SQLite 数据库中，再次查找时只需 stat。
+可选把重复文件替换为硬链接或 reflink（写时复制克隆），只保留一份数据。
+"""
+
+# 标准库
+import os
+import struct
+import sqlite3
+import hashlib
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# 自研库
+import GlobalConfig
+
+
+# 指纹读取的头尾大小
+EDGE_BYTES = 64 * 1024
+# moov 盒子最多读取的字节数
+MOOV_MAX_BYTES = 4 * 1024 * 1024
+# 完整哈希的读取块大小
+CHUNK_SIZE = 4 * 1024 * 1024
+# 计算指纹/哈希的并行数
+WORKERS = 4
+
+# Linux FICLONE ioctl
+_FICLONE = 0x40049409
+
+
+def iter_clip_files(roots, suffixes=(".mp4",)):
+    """遍历目录下的片段文件，返回 [(路径, stat)]"""
+    found = []
+    pending = list(roots)
+    while pending:
+        folder = pending.pop()
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith("."):
+                            pending.append(entry.path)
+                    elif entry.name.lower().endswith(suffixes):
+                        try:
+                            found.append((entry.path, entry.stat(follow_symlinks=False)))
+                        except OSError:
+                            pass
+        except OSError:
+            continue
+    return found
+
+
+def _find_moov(f, size):
+    """按顶层盒子头查找 moov，返回 (偏移, 大小)，找不到时返回 None"""
+    offset = 0
+    while offset + 8 <= size:
+        f.seek(offset)
+        header = f.read(16)
+        if len(header) < 8:
+            return None
+        box_size, box_type = struct.unpack(">I4s", header[:8])
+        if box_size == 1 and len(header) >= 16:
+            box_size = struct.unpack(">Q", header[8:16])[0]
+        elif box_size == 0:
+            box_size = size - offset
+        if box_size < 8:
+            return None
+        if box_type == b"moov":
+            return offset, box_size
+        offset += box_size
+    return None
+
+
+def fingerprint(path, size):
+    """大小 + 头尾 + moov 的哈希"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(size.to_bytes(8, "little"))
+    with open(path, "rb") as f:
+        digest.update(f.read(EDGE_BYTES))
+        if size > EDGE_BYTES:
+            f.seek(max(EDGE_BYTES, size - EDGE_BYTES))
+            digest.update(f.read(EDGE_BYTES))
+        moov = _find_moov(f, size)
+        if moov is not None:
+            f.seek(moov[0])
+            digest.update(f.read(min(moov[1], MOOV_MAX_BYTES)))
+    return digest.hexdigest()
+
+
+def full_hash(path):
+    digest = hashlib.blake2b(digest_size=32)
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+
+class DuplicateSet:
+    """一组内容相同的文件；files 为 [(路径, stat)]，记录查找时的大小和修改时间"""
+
+    def __init__(self, digest, size, files):
+        self.digest = digest
+        self.size = size
+        self.paths = sorted(path for path, _ in files)
+        self.versions = {path: (st.st_size, st.st_mtime_ns) for path, st in files}
+
+    def changed(self, path, st):
+        """文件在查找之后是否被修改过"""
+        return self.versions.get(path) != (st.st_size, st.st_mtime_ns)
+
+    @property
+    def wasted_bytes(self):
+        return self.size * (len(self.paths) - 1)
+
+    def __repr__(self):
+        return f"DuplicateSet({self.size}, {self.paths})"
+
+
+class HashCache:
+    """指纹/完整哈希缓存，文件大小或修改时间变化后失效"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(GlobalConfig.USER_DIR, "clip-hashes.db")
+        self.conn = sqlite3.connect(self.path, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, print TEXT, digest TEXT)")
+        # 一次读入内存，10 万条约几十毫秒，比逐条查询快得多
+        self.rows = {row[0]: list(row[1:]) for row in self.conn.execute("SELECT * FROM hashes")}
+
+    def get(self, field, path, st):
+        """field 为 1（指纹）或 2（完整哈希）"""
+        row = self.rows.get(path)
+        if row is None or row[0] != st.st_size or row[1] != st.st_mtime_ns:
+            return None
+        return row[field + 1]
+
+    def put(self, field, items):
+        """items 为 [(路径, stat, 值)]"""
+        changed = []
+        for path, st, value in items:
+            row = self.rows.get(path)
+            if row is None or row[0] != st.st_size or row[1] != st.st_mtime_ns:
+                row = [st.st_size, st.st_mtime_ns, None, None]
+            row[field + 1] = value
+            self.rows[path] = row
+            changed.append((path, *row))
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)", changed)
+
+    def close(self):
+        self.conn.close()
+
+
+class ClipDedup:
+    """查找并（可选）合并重复片段"""
+
+    PRINT, DIGEST = 1, 2
+
+    def __init__(self, workers=WORKERS, cache=None):
+        self.workers = workers
+        self.cache = cache
+        self.glogger = logging.getLogger("ClipDedup")
+        # 统计：扫描文件数、计算指纹数、完整哈希数（不含缓存命中）
+        self.stats = {"files": 0, "fingerprinted": 0, "hashed": 0}
+
+    def _compute(self, field, func, items):
+        """items 为 [(路径, stat)]，优先使用缓存，返回与 items 对应的值（读取失败为 None）"""
+        values = [None] * len(items)
+        todo = []
+        for i, (path, st) in enumerate(items):
+            value = self.cache.get(field, path, st) if self.cache is not None else None
+            if value is None:
+                todo.append(i)
+            else:
+                values[i] = value
+        if todo:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                computed = list(pool.map(lambda i: self._safe(func, *items[i]), todo))
+            for i, value in zip(todo, computed):
+                values[i] = value
+            if self.cache is not None:
+                self.cache.put(field, [(*items[i], values[i]) for i in todo
+                                       if values[i] is not None])
+        return values, len(todo)
+
+    def find_duplicates(self, roots=None, files=None):
+        """返回 [DuplicateSet]；files 为 [(路径, stat)] 时不再遍历目录"""
+        files = files if files is not None else iter_clip_files(roots or [])
+        self.stats = {"files": len(files), "fingerprinted": 0, "hashed": 0}
+
+        # 1) 按大小分组；已是同一个 inode 的文件（硬链接）只算一个
+        by_size = defaultdict(dict)
+        for path, st in files:
+            by_size[st.st_size].setdefault((st.st_dev, st.st_ino), []).append((path, st))
+
+        # 2) 指纹
+        todo = [(size, key, paths[0]) for size, inodes in by_size.items()
+                if len(inodes) > 1 and size > 0 for key, paths in inodes.items()]
+        prints, self.stats["fingerprinted"] = self._compute(
+            self.PRINT, lambda path, st: fingerprint(path, st.st_size),
+            [item for _, _, item in todo])
+        by_print = defaultdict(list)
+        for (size, key, item), fp in zip(todo, prints):
+            if fp is not None:
+                by_print[(size, fp)].append((key, item))
+
+        # 3) 指纹相同的再用完整哈希确认
+        confirm = [(size, key, item) for (size, _), group in by_print.items()
+                   if len(group) > 1 for key, item in group]
+        hashes, self.stats["hashed"] = self._compute(
+            self.DIGEST, lambda path, st: full_hash(path), [item for _, _, item in confirm])
+        by_hash = defaultdict(list)
+        for (size, key, _), digest in zip(confirm, hashes):
+            if digest is not None:
+                by_hash[(size, digest)].append(key)
+
+        duplicates = []
+        for (size, digest), keys in by_hash.items():
+            if len(keys) > 1:
+                items = [item for key in keys for item in by_size[size][key]]
+                duplicates.append(DuplicateSet(digest, size, items))
+        duplicates.sort(key=lambda d: d.paths[0])
+
+        self.glogger.info(
+            f"重复片段查找完成: {self.stats}, 重复 {len(duplicates)} 组, "
+            f"可节省 {sum(d.wasted_bytes for d in duplicates) / 1024 / 1024:.1f} MB")
+        return duplicates
+
+    def _safe(self, func, *args):
+        try:
+            return func(*args)
+        except OSError as ex:
+            self.glogger.warning(f"读取失败: {args[0]}, 原因: {ex}")
+            return None
+
+    # ******************** 合并 ********************
+
+    @staticmethod
+    def _reflink(src, dst):
+        import fcntl
+
+        with open(src, "rb") as fin, open(dst, "wb") as fout:
+            fcntl.ioctl(fout.fileno(), _FICLONE, fin.fileno())
+
+    def merge(self, duplicates, mode="hardlink"):
+        """把每组中除第一个以外的文件替换为指向第一个文件的硬链接/reflink，返回替换数；
+        查找之后被修改过的文件（大小或修改时间变化）不处理"""
+        replaced = 0
+        for dup in duplicates:
+            keep = dup.paths[0]
+            try:
+                keep_st = os.stat(keep)
+            except OSError as ex:
+                self.glogger.warning(f"跳过: {keep}, 原因: {ex}")
+                continue
+            if dup.changed(keep, keep_st):
+                self.glogger.warning(f"文件在查找后被修改，跳过该组: {keep}")
+                continue
+            for path in dup.paths[1:]:
+                try:
+                    st = os.stat(path)
+                    if (st.st_dev, st.st_ino) == (keep_st.st_dev, keep_st.st_ino):
+                        continue
+                    if dup.changed(path, st):
+                        self.glogger.warning(f"文件在查找后被修改，跳过: {path}")
+                        continue
+                    tmp = f"{path}.dedup"
+                    if mode == "reflink":
+                        self._reflink(keep, tmp)
+                    else:
+                        os.link(keep, tmp)
+                    # 先建好链接再原子替换，中途失败不会丢失文件
+                    os.replace(tmp, path)
+                    replaced += 1
+                except OSError as ex:
+                    self.glogger.warning(f"替换失败: {path}, 原因: {ex}")
+                    try:
+                        os.remove(f"{path}.dedup")
+                    except OSError:
+                        pass
+        self.glogger.info(f"重复片段已合并({mode}): {replaced}")
+        return replaced
+
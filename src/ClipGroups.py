@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 片段分组
+
+按文件名中的时间戳和视角把片段分为四视角一组：
+- 所选目录下没有片段时（如选择了 TeslaCam 根目录），向下两层收集
+  RecentClips、SavedClips、SentryClips 中的片段；
+- 同一时间戳、同一视角出现多次时只保留一个文件（优先事件目录中的），
+  播放和合并时不会重复处理同一分钟；分组在界面线程中进行，不读取文件内容，
+  内容是否一致只用哈希缓存中已有的结果统计。
+"""
+
+# 标准库
+import os
+import re
+import logging
+
+# 自研库
+from ClipDedup import ClipDedup
+
+
+CLIP_PATTERN = re.compile(
+    r"(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})-(front|back|left_repeater|right_repeater)\.mp4")
+VIEW_MAP = {
+    'front': 'front',
+    'back': 'back',
+    'left_repeater': 'left',
+    'right_repeater': 'right'
+}
+# 向下查找片段的层数：TeslaCam/SavedClips/<事件目录>
+MAX_DEPTH = 2
+# 同一片段出现多次时优先保留的位置（事件目录中的片段不会被循环覆盖）
+FOLDER_PRIORITY = ("SavedClips", "SentryClips", "RecentClips")
+
+
+def _priority(path):
+    parts = os.path.normpath(path).split(os.sep)
+    for i, name in enumerate(FOLDER_PRIORITY):
+        if name in parts:
+            return i
+    return len(FOLDER_PRIORITY)
+
+
+def collect_clips(folder_path, max_depth=MAX_DEPTH):
+    """返回 {(时间戳, 视角): [(路径, stat)]}；所选目录本身有片段时不再向下查找"""
+    found = {}
+    level = [folder_path]
+    for depth in range(max_depth + 1):
+        subfolders = []
+        for folder in level:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith("."):
+                            subfolders.append(entry.path)
+                        continue
+                    match = CLIP_PATTERN.match(entry.name)
+                    if match:
+                        timestamp, view = match.groups()
+                        found.setdefault((timestamp, VIEW_MAP[view]), []).append(
+                            (entry.path, entry.stat()))
+        if depth == 0 and found:
+            break
+        level = sorted(subfolders)
+    return found
+
+
+def pick_clips(found, cache=None):
+    """每个 (时间戳, 视角) 选出一个文件：优先事件目录，其次较大的（录制完整的）文件。
+    在界面线程中调用，不读取文件内容；给出 cache（HashCache）时用其中已有的哈希统计内容是否一致"""
+    glogger = logging.getLogger("ClipGroups")
+    chosen = {}
+    conflicts = []
+    for key, items in found.items():
+        if len(items) == 1:
+            chosen[key] = items[0][0]
+        else:
+            conflicts.append(key)
+    if not conflicts:
+        return chosen
+
+    merged = differ = 0
+    for key in conflicts:
+        items = sorted(found[key], key=lambda item: (_priority(item[0]), -item[1].st_size, item[0]))
+        chosen[key] = items[0][0]
+        if cache is not None:
+            digests = {cache.get(ClipDedup.DIGEST, path, st) for path, st in items}
+        else:
+            digests = {st.st_size for _, st in items}
+        if len(digests) == 1 and None not in digests:
+            merged += len(items) - 1
+        else:
+            differ += 1
+            glogger.debug(f"同一时间的片段内容不一致，使用: {items[0][0]}")
+    glogger.info(f"重复片段: {len(conflicts)} 个时间点, 合并 {merged} 个文件, 内容不一致 {differ} 个")
+    return chosen
+
+
+def build_video_groups(folder_path, cache=None):
+    """返回 (四视角齐全的分组列表, {时间戳: {视角: 路径}})"""
+    group_dict = {}
+    for (timestamp, view), path in pick_clips(collect_clips(folder_path), cache).items():
+        group_dict.setdefault(timestamp, {})[view] = path
+
+    # 按时间戳排序并过滤不完整的组
+    group_dict = {k: v for k, v in sorted(group_dict.items()) if len(v) == 4}
+    groups = list(group_dict.values())
+    return groups, group_dict
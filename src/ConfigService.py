@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 配置服务
+
+config.ini 只在首次使用时解析一次，之后所有模块读写同一份内存中的配置：
+- 通过 section() 获取带类型转换的分区访问器；
+- 修改只更新内存并标记为脏，延迟一小段时间后合并写入磁盘，
+  写入时先写临时文件再原子替换，避免写到一半的配置文件；
+- 修改时同步通知订阅者。
+界面事件（如微调框变化）中调用 set()/update() 不会触发磁盘 IO，
+多个组件共用一份配置也不会再因为各自“读-改-写”而互相覆盖。
+"""
+
+# 标准库
+import io
+import os
+import atexit
+import logging
+import tempfile
+import threading
+import configparser
+
+# 自研库
+import GlobalConfig
+
+
+def _to_str(value):
+    if value is None:
+        return ""
+    return str(value)
+
+
+def _new_parser():
+    # 不做 % 插值：代理地址、密码等值中可能含有 %（如 URL 编码）
+    return configparser.ConfigParser(interpolation=None)
+
+
+def _check_key(key):
+    if not isinstance(key, str) or not key.strip() or any(c in key for c in "=:[]\r\n"):
+        raise ValueError(f"无效的配置项名: {key!r}")
+
+
+class ConfigSection:
+    """配置分区访问器，提供带类型转换的读取与写入"""
+
+    def __init__(self, service, name):
+        self.service = service
+        self.name = name
+
+    def has(self, key):
+        return self.service.parser.has_option(self.name, key)
+
+    def get(self, key, fallback=""):
+        return self.service.parser.get(self.name, key, fallback=fallback)
+
+    def get_bool(self, key, fallback=False):
+        try:
+            return self.service.parser.getboolean(self.name, key, fallback=fallback)
+        except ValueError:
+            return fallback
+
+    def get_int(self, key, fallback=0):
+        try:
+            return self.service.parser.getint(self.name, key, fallback=fallback)
+        except ValueError:
+            return fallback
+
+    def get_float(self, key, fallback=0.0):
+        try:
+            return self.service.parser.getfloat(self.name, key, fallback=fallback)
+        except ValueError:
+            return fallback
+
+    def items(self):
+        if not self.service.parser.has_section(self.name):
+            return {}
+        return dict(self.service.parser.items(self.name, raw=True))
+
+    def set(self, key, value):
+        self.service.set(self.name, key, value)
+
+    def update(self, values):
+        self.service.update(self.name, values)
+
+
+class ConfigService:
+    """单个配置文件的内存副本，合并延迟写入"""
+
+    # 最后一次修改后延迟多久（秒）写入磁盘
+    FLUSH_DELAY = 0.5
+
+    def __init__(self, path, flush_delay=FLUSH_DELAY):
+        self.path = path
+        self.flush_delay = flush_delay
+        self.glogger = logging.getLogger("ConfigService")
+
+        self._lock = threading.RLock()
+        self._timer = None
+        self._dirty = False
+        # (回调, 分区名或 None)
+        self._subscribers = []
+
+        # 写盘串行执行，但不持有 _lock，界面线程修改配置时不会等待 fsync
+        self._write_lock = threading.Lock()
+        self.parser = _new_parser()
+        self.reload()
+
+    # ******************** 读取 ********************
+
+    def reload(self):
+        """从磁盘重新解析（丢弃尚未写入的修改）"""
+        parser = _new_parser()
+        if os.path.exists(self.path):
+            try:
+                parser.read(self.path, encoding="utf-8")
+            except configparser.Error as ex:
+                self.glogger.error(f"配置文件解析失败: {self.path}, 原因: {ex}")
+        with self._lock:
+            self.parser = parser
+            self._dirty = False
+
+    def section(self, name):
+        return ConfigSection(self, name)
+
+    def has_section(self, name):
+        return self.parser.has_section(name)
+
+    # ******************** 修改 ********************
+
+    def set(self, section, key, value):
+        self.update(section, {key: value})
+
+    def update(self, section, values):
+        """批量修改一个分区，值未变化时不写盘也不通知；
+        任一项无效时抛出 ValueError，且不修改任何项"""
+        _check_key(section)
+        pending = {}
+        for key, value in values.items():
+            _check_key(key)
+            pending[key] = _to_str(value)
+
+        changed = {}
+        with self._lock:
+            if not self.parser.has_section(section):
+                self.parser.add_section(section)
+            for key, value in pending.items():
+                if self.parser.get(section, key, fallback=None, raw=True) != value:
+                    self.parser.set(section, key, value)
+                    changed[key] = value
+            if changed:
+                self._dirty = True
+                self._schedule_flush()
+
+        for key, value in changed.items():
+            self._notify(section, key, value)
+
+    # ******************** 订阅 ********************
+
+    def subscribe(self, callback, section=None):
+        """订阅修改通知，callback(section, key, value)；section 为 None 时订阅全部分区"""
+        self._subscribers.append((callback, section))
+
+    def unsubscribe(self, callback):
+        self._subscribers = [
+            (cb, sec) for cb, sec in self._subscribers if cb != callback]
+
+    def _notify(self, section, key, value):
+        for callback, wanted in list(self._subscribers):
+            if wanted is not None and wanted != section:
+                continue
+            try:
+                callback(section, key, value)
+            except Exception as ex:
+                self.glogger.error(f"配置订阅回调异常: {ex}")
+
+    # ******************** 写入 ********************
+
+    def _schedule_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.flush_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """立即把尚未写入的修改写入磁盘（临时文件 + 原子替换）"""
+        with self._write_lock:
+            # 只在生成内容时持有 _lock，写盘期间其他线程可以继续修改
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return True
+                buffer = io.StringIO()
+                self.parser.write(buffer)
+                self._dirty = False
+
+            folder = os.path.dirname(self.path) or "."
+            try:
+                os.makedirs(folder, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(
+                    prefix=".config-", suffix=".tmp", dir=folder)
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        f.write(buffer.getvalue())
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp, self.path)
+                except BaseException:
+                    try:
+                        os.remove(tmp)
+                    except OSError:
+                        pass
+                    raise
+            except Exception as ex:
+                self.glogger.error(f"配置文件写入失败: {self.path}, 原因: {ex}")
+                with self._lock:
+                    self._dirty = True
+                return False
+            return True
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_config(path=None):
+    """返回配置文件对应的配置服务（每个路径一个实例）"""
+    path = os.path.abspath(path or GlobalConfig.CONFIG_FILE_PATH)
+    with _services_lock:
+        service = _services.get(path)
+        if service is None:
+            service = ConfigService(path)
+            _services[path] = service
+        return service
+
+
+def flush_all():
+    """写入所有配置服务中尚未写入的修改"""
+    with _services_lock:
+        services = list(_services.values())
+    for service in services:
+        service.flush()
+
+
+# 进程退出前确保延迟写入的修改落盘
+atexit.register(flush_all)
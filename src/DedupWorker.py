@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 重复片段查找后台线程
+
+查找与合并逻辑在 ClipDedup 中，不依赖 Qt；这里只负责在后台线程中运行并通过信号报告结果。
+"""
+
+# 标准库
+import logging
+
+# 三方库
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# 自研库
+from ClipDedup import ClipDedup, HashCache
+
+
+class DedupWorker(QThread):
+    """后台查找重复片段；给出 duplicates 时跳过查找，merge_mode 不为 None 时合并"""
+
+    dedupFinished = pyqtSignal(bool, dict)  # 是否成功, 统计
+
+    def __init__(self, folder, duplicates=None, merge_mode=None, parent=None):
+        super().__init__(parent)
+        self.folder = folder
+        self.duplicates = duplicates
+        self.merge_mode = merge_mode
+        self.glogger = logging.getLogger("DedupWorker")
+
+    def run(self):
+        cache = None
+        try:
+            cache = HashCache()
+            dedup = ClipDedup(cache=cache)
+            if self.duplicates is None:
+                self.duplicates = dedup.find_duplicates([self.folder])
+            replaced = dedup.merge(self.duplicates, self.merge_mode) if self.merge_mode else 0
+            self.dedupFinished.emit(True, {
+                "files": dedup.stats["files"],
+                "groups": len(self.duplicates),
+                "wasted_mb": sum(d.wasted_bytes for d in self.duplicates) / 1024 / 1024,
+                "replaced": replaced,
+            })
+        except Exception as ex:
+            self.glogger.exception(f"查找重复片段失败: {ex}")
+            self.dedupFinished.emit(False, {})
+        finally:
+            if cache is not None:
+                cache.close()
@@ -4,7 +4,6 @@ import os
 import sys
 import tempfile
 import subprocess
-import configparser
 import logging
 
 from PyQt5.QtCore import QObject, QThread, pyqtSignal, QUrl
@@ -22,66 +21,65 @@ from PyQt5.QtWidgets import (
     QDialogButtonBox,
 )
 
-import requests
 import GlobalConfig
+from ConfigService import get_config
 from I18n import tr
+from UpdateDownloader import UpdateDownloader, release_sha256
 
 
 class _DownloadWorker(QObject):
-    progress = pyqtSignal(int)  # 0-100
+    progress = pyqtSignal(int, float, float)  # 0-100, 已下载字节, 总字节
     finished = pyqtSignal(str)  # download_path
     error = pyqtSignal(str)
-    cancelled = pyqtSignal()    # 用户请求取消并已清理完成
+    cancelled = pyqtSignal()    # 用户请求取消，下载线程已停止
 
-    def __init__(self, url: str, download_path: str, proxies=None, parent=None):
+    def __init__(self, url: str, download_path: str, proxies=None, asset=None, assets=(),
+                 segments=GlobalConfig.UPDATE_SEGMENTS, chunk_size=GlobalConfig.UPDATE_CHUNK_SIZE,
+                 parent=None):
         super().__init__(parent)
         self._url = url
         self._download_path = download_path
         self._proxies = proxies or None
+        # Release 附件信息，用于查找安装包的 SHA-256
+        self._asset = asset
+        self._assets = assets
+        self._segments = segments
+        self._chunk_size = chunk_size
         self._is_cancelled = False
 
     def cancel(self):
         self._is_cancelled = True
 
+    def _on_progress(self, downloaded, total):
+        percent = int(downloaded * 100 / total) if total > 0 else 0
+        self.progress.emit(percent, float(downloaded), float(total))
+
     def run(self):
         try:
             download_path = self._download_path
             logger = logging.getLogger(__name__)
+            sha256 = None
+            if self._asset:
+                sha256 = release_sha256(self._asset, self._assets, self._proxies)
+            if not sha256:
+                logger.warning("Release checksum not found, installer will not be verified.")
             logger.info(
-                f"Update download started: url={self._url}, path={download_path}, proxies={self._proxies!r}")
-
-            with requests.get(self._url, stream=True, timeout=60, proxies=self._proxies) as r:
-                r.raise_for_status()
-                total = int(r.headers.get("content-length", 0))
-                downloaded = 0
-
-                with open(download_path, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        if self._is_cancelled:
-                            # 取消时删除不完整文件
-                            try:
-                                f.close()
-                            except Exception:
-                                pass
-                            try:
-                                if os.path.exists(download_path):
-                                    os.remove(download_path)
-                            except Exception:
-                                pass
-                            logger.info(
-                                "Update download cancelled by user, temp file removed.")
-                            self.cancelled.emit()
-                            return
-
-                        if chunk:
-                            f.write(chunk)
-                            downloaded += len(chunk)
-                            if total > 0:
-                                percent = int(downloaded * 100 / total)
-                                self.progress.emit(percent)
+                f"Update download started: url={self._url}, path={download_path}, "
+                f"proxies={self._proxies!r}, sha256={sha256}")
+
+            downloader = UpdateDownloader(
+                self._url, download_path, sha256=sha256, proxies=self._proxies,
+                segments=self._segments, chunk_size=self._chunk_size,
+                progress=self._on_progress, should_stop=lambda: self._is_cancelled)
+            if downloader.run() is None:
+                # 临时文件保留，下次下载时从断点继续
+                logger.info("Update download cancelled by user, partial file kept for resume.")
+                self.cancelled.emit()
+                return
 
             logger.info(
-                f"Update download finished successfully: path={download_path}, size={downloaded} bytes")
+                f"Update download finished successfully: path={download_path}, "
+                f"transferred={downloader.transferred} bytes")
             self.finished.emit(download_path)
         except Exception as ex:
             logging.getLogger(__name__).exception(
@@ -92,7 +90,7 @@ class _DownloadWorker(QObject):
 class DownloadUpdateDialog(QDialog):
     """下载更新的进度窗体，独立于主窗体，避免主界面卡死。"""
 
-    def __init__(self, parent, url: str, filename: str):
+    def __init__(self, parent, url: str, filename: str, asset=None, assets=()):
         super().__init__(parent)
         self._url = url
         self._filename = filename or "installer"
@@ -105,7 +103,9 @@ class DownloadUpdateDialog(QDialog):
         self._proxies = self._load_proxy_config()
 
         self._thread = QThread(self)
-        self._worker = _DownloadWorker(url, self._download_path, self._proxies)
+        segments, chunk_size = self._load_download_options()
+        self._worker = _DownloadWorker(url, self._download_path, self._proxies, asset, assets,
+                                       segments, chunk_size)
         self._worker.moveToThread(self._thread)
 
         self._thread.started.connect(self._worker.run)
@@ -175,9 +175,10 @@ class DownloadUpdateDialog(QDialog):
         btn_layout.addWidget(self.proxy_button)
         layout.addLayout(btn_layout)
 
-    def _on_progress(self, value: int):
+    def _on_progress(self, value: int, downloaded: float, total: float):
         self.progress_bar.setValue(value)
-        self.status_label.setText(f"{value}%")
+        mb = 1024 * 1024
+        self.status_label.setText(f"{value}% ({downloaded / mb:.1f} / {total / mb:.1f} MB)")
 
     def _on_finished(self, download_path: str):
         # 下载完成，启动安装程序
@@ -262,21 +263,13 @@ class DownloadUpdateDialog(QDialog):
 
     def _load_proxy_config(self):
         """从全局配置文件中读取代理设置，返回 requests 兼容的 proxies 字典或 None。"""
-        config_path = GlobalConfig.CONFIG_FILE_PATH
-        if not os.path.exists(config_path):
-            return None
-
-        config = configparser.ConfigParser()
-        try:
-            config.read(config_path, encoding="utf-8")
-        except Exception:
-            return None
-
+        config = get_config()
         if not config.has_section("Proxy"):
             return None
 
-        enabled = config.getboolean("Proxy", "enabled", fallback=False)
-        proxy_url = config.get("Proxy", "url", fallback="").strip()
+        proxy = config.section("Proxy")
+        enabled = proxy.get_bool("enabled", fallback=False)
+        proxy_url = proxy.get("url", fallback="").strip()
 
         if not enabled or not proxy_url:
             return None
@@ -286,6 +279,17 @@ class DownloadUpdateDialog(QDialog):
             "https": proxy_url,
         }
 
+    def _load_download_options(self):
+        """从配置文件 [Update] 读取分段数和块大小（KB），未配置时使用默认值。"""
+        segments = GlobalConfig.UPDATE_SEGMENTS
+        chunk_size = GlobalConfig.UPDATE_CHUNK_SIZE
+        config = get_config()
+        if config.has_section("Update"):
+            update = config.section("Update")
+            segments = update.get_int("segments", fallback=segments)
+            chunk_size = update.get_int("chunk_kb", fallback=chunk_size // 1024) * 1024
+        return segments, chunk_size
+
 
 class ProxySettingsDialog(QDialog):
     """更新下载使用的简单代理设置对话框。"""
@@ -320,17 +324,11 @@ class ProxySettingsDialog(QDialog):
         self._load()
 
     def _load(self):
-        config_path = GlobalConfig.CONFIG_FILE_PATH
-        config = configparser.ConfigParser()
-        if os.path.exists(config_path):
-            try:
-                config.read(config_path, encoding="utf-8")
-            except Exception:
-                return
-
+        config = get_config()
         if config.has_section("Proxy"):
-            enabled = config.getboolean("Proxy", "enabled", fallback=False)
-            url = config.get("Proxy", "url", fallback="")
+            proxy = config.section("Proxy")
+            enabled = proxy.get_bool("enabled", fallback=False)
+            url = proxy.get("url", fallback="")
             self.enable_checkbox.setChecked(enabled)
             self.proxy_edit.setText(url)
 
@@ -342,26 +340,19 @@ class ProxySettingsDialog(QDialog):
             QMessageBox.warning(self, "设置错误", "已勾选启用代理，但代理地址为空。")
             return
 
-        config_path = GlobalConfig.CONFIG_FILE_PATH
-        config = configparser.ConfigParser()
-        if os.path.exists(config_path):
-            try:
-                config.read(config_path, encoding="utf-8")
-            except Exception:
-                # 如果读取失败，则从空配置开始
-                config = configparser.ConfigParser()
-
-        if not config.has_section("Proxy"):
-            config.add_section("Proxy")
-
-        config.set("Proxy", "enabled", "true" if enabled else "false")
-        config.set("Proxy", "url", url)
-
+        config = get_config()
         try:
-            with open(config_path, "w", encoding="utf-8") as f:
-                config.write(f)
-        except Exception as ex:
-            QMessageBox.warning(self, "保存失败", f"写入配置文件失败：{ex}")
+            config.update("Proxy", {
+                "enabled": "true" if enabled else "false",
+                "url": url,
+            })
+        except ValueError as ex:
+            QMessageBox.warning(self, "保存失败", f"代理设置无效: {ex}")
+            return
+
+        # 用户确认的设置立即写入，失败时提示
+        if not config.flush():
+            QMessageBox.warning(self, "保存失败", "写入配置文件失败")
             return
 
         self.accept()
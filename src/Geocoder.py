@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 逆地理编码
+
+合成导出时根据 event.json 中的经纬度获取地址。
+- 服务提供方可替换（GeocodeProvider），默认为高德地图 AmapProvider；
+- HTTP 请求复用 requests.Session 连接池，并设置连接/读取超时与有限重试；
+- 结果按四舍五入后的经纬度持久化缓存在用户目录，带有效期；
+  查询失败也会缓存较短时间，避免同一地点反复请求。
+同一停车位置重复导出时不再访问网络。
+"""
+
+# 标准库
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+
+# 三方库
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 自研库
+import GlobalConfig
+
+
+class GeocodeError(Exception):
+    """服务暂时不可用（网络错误、超时、服务端错误等），结果不可作为“无地址”长期缓存"""
+
+
+class GeocodeProvider:
+    """逆地理编码服务接口"""
+
+    # 用于区分缓存条目，更换服务或服务参数（如语言）时应使用不同的名称
+    name = "base"
+
+    def reverse(self, longitude, latitude):
+        """返回地址字符串；确定没有地址时返回 None；服务不可用时抛出 GeocodeError"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class AmapProvider(GeocodeProvider):
+    """高德地图逆地理编码"""
+
+    name = "amap"
+    BASE_URL = "https://restapi.amap.com/v3/geocode/regeo"
+    # (连接超时, 读取超时) 秒
+    TIMEOUT = (3.05, 5)
+    # 连接失败或网关错误时最多重试一次；读取超时说明服务已收到请求但响应慢，不再重试。
+    # 单次查询最长约为 连接超时 × 2 + 读取超时（约 11 秒）
+    RETRIES = 1
+
+    def __init__(self, api_key, base_url=None, session=None, timeout=TIMEOUT):
+        self.api_key = api_key
+        self.base_url = base_url or self.BASE_URL
+        self.timeout = timeout
+        self.session = session or self._new_session()
+        self.glogger = logging.getLogger("AmapProvider")
+
+    @staticmethod
+    def _new_session():
+        session = requests.Session()
+        retry = Retry(total=AmapProvider.RETRIES, connect=AmapProvider.RETRIES, read=0,
+                      status=AmapProvider.RETRIES, backoff_factor=0.2,
+                      status_forcelist=(502, 503, 504),
+                      allowed_methods=frozenset(["GET"]), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def reverse(self, longitude, latitude):
+        params = {"key": self.api_key, "location": f"{longitude},{latitude}"}
+        try:
+            response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+        except (requests.RequestException, ValueError) as ex:
+            raise GeocodeError(f"请求失败: {ex}") from ex
+
+        if data.get("status") != "1":
+            # Key 无效、超出配额等属于服务侧问题，稍后可能恢复
+            raise GeocodeError(f"逆地理编码失败: {data.get('info')}")
+
+        address = (data.get("regeocode") or {}).get("formatted_address")
+        # 海上等没有地址的位置高德返回空列表
+        if not address or not isinstance(address, str):
+            return None
+        return address
+
+    def close(self):
+        self.session.close()
+
+
+class GeocodeCache:
+    """以四舍五入后的经纬度为键的持久化缓存（JSON 文件）"""
+
+    # 小数位数：4 位约 11 米，同一停车位置的多次事件命中同一条目
+    PRECISION = 4
+    # 有效期（秒）：地址、确定无地址、服务不可用
+    TTL = 90 * 24 * 3600
+    EMPTY_TTL = 7 * 24 * 3600
+    ERROR_TTL = 10 * 60
+    MAX_ENTRIES = 20000
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(GlobalConfig.USER_DIR, "geocode-cache.json")
+        self._entries = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.glogger = logging.getLogger("GeocodeCache")
+
+    def key(self, provider_name, longitude, latitude):
+        p = self.PRECISION
+        return f"{provider_name}:{float(latitude):.{p}f},{float(longitude):.{p}f}"
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = {}
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._entries = data
+        except (OSError, ValueError) as ex:
+            self.glogger.error(f"逆地理编码缓存读取失败: {ex}")
+
+    def get(self, key, now=None):
+        """返回 (是否命中, 地址或 None)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._load()
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry.get("expires", 0) <= now:
+                del self._entries[key]
+                self._dirty = True
+                return False, None
+            return True, entry.get("address")
+
+    def put(self, key, address, ttl, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._load()
+            self._entries[key] = {"address": address, "expires": now + ttl}
+            self._dirty = True
+
+    def save(self, now=None):
+        """写入磁盘（临时文件 + 原子替换），同时清理过期条目"""
+        now = time.time() if now is None else now
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            entries = {k: v for k, v in self._entries.items()
+                       if v.get("expires", 0) > now}
+            if len(entries) > self.MAX_ENTRIES:
+                # 保留最晚过期的条目
+                keep = sorted(entries.items(), key=lambda kv: kv[1]["expires"])
+                entries = dict(keep[-self.MAX_ENTRIES:])
+            self._entries = entries
+
+            folder = os.path.dirname(self.path) or "."
+            try:
+                fd, tmp = tempfile.mkstemp(prefix=".geocode-", suffix=".tmp", dir=folder)
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entries, f, ensure_ascii=False)
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except OSError as ex:
+                self.glogger.error(f"逆地理编码缓存写入失败: {ex}")
+
+
+class Geocoder:
+    """带缓存的逆地理编码"""
+
+    def __init__(self, provider: GeocodeProvider, cache: GeocodeCache = None):
+        self.provider = provider
+        self.cache = cache or GeocodeCache()
+        self.glogger = logging.getLogger("Geocoder")
+
+        # 统计：缓存命中、请求服务次数
+        self.hits = 0
+        self.lookups = 0
+
+    def reverse(self, longitude, latitude):
+        """返回地址，没有地址或服务不可用时返回 None"""
+        key = self.cache.key(self.provider.name, longitude, latitude)
+        hit, address = self.cache.get(key)
+        if hit:
+            self.hits += 1
+            return address
+
+        self.lookups += 1
+        try:
+            address = self.provider.reverse(longitude, latitude)
+            ttl = self.cache.TTL if address else self.cache.EMPTY_TTL
+        except GeocodeError as ex:
+            self.glogger.warning(f"逆地理编码不可用: {ex}")
+            address, ttl = None, self.cache.ERROR_TTL
+
+        self.cache.put(key, address, ttl)
+        self.cache.save()
+        return address
+
+    def close(self):
+        self.cache.save()
+        self.provider.close()
@@ -45,3 +45,71 @@ os.makedirs(USER_DIR, exist_ok=True)
 
 CONFIG_FILE = "config.ini"
 CONFIG_FILE_PATH = os.path.join(USER_DIR, CONFIG_FILE)
+
+# *** 启动 ***
+
+# 启动到首帧绘制的耗时目标（毫秒），--profile-startup 时与实际耗时比较
+STARTUP_BUDGET_MS = 1500
+
+# *** 播放指标 ***
+
+# 单个指标文件的大小上限（字节），超过后滚动为 .1 文件
+METRICS_MAX_BYTES = 10 * 1024 * 1024
+# 指标文件保留天数
+METRICS_KEEP_DAYS = 7
+
+# *** U 盘导入 ***
+
+# 播放时导入的读取速度上限（MB/s），不播放时不限速
+IMPORT_PLAYBACK_MAX_MBPS = 40
+
+# *** 归档转码 ***
+
+# 默认编码预设（见 ArchiveTranscoder.PRESETS）
+ARCHIVE_PRESET = "hevc"
+# 同时运行的转码任务数
+ARCHIVE_MAX_JOBS = 2
+# 每个 ffmpeg 进程的线程数
+ARCHIVE_THREADS = 2
+# 转码进程的 nice 值（0~19，越大优先级越低）
+ARCHIVE_NICE = 15
+# 限定转码进程使用的 CPU 编号（仅 Linux），None 表示不限制，如 [2, 3]
+ARCHIVE_CPUS = None
+
+# *** 更新下载 ***
+
+# 并行下载的分段数（服务器不支持 Range 时退化为单连接）
+UPDATE_SEGMENTS = 4
+# 每次读取写入的块大小（字节）
+UPDATE_CHUNK_SIZE = 1024 * 1024
+# 进度上报的最小间隔（秒）
+UPDATE_PROGRESS_INTERVAL = 0.2
+# 网络错误时每个分段连续重试的次数（有进展时重新计数）
+UPDATE_MAX_RETRIES = 8
+# 启动时自动检查更新的最小间隔（小时）
+UPDATE_CHECK_INTERVAL_HOURS = 24
+# 启动检查在首帧绘制后延迟多久开始（毫秒）
+UPDATE_STARTUP_DELAY_MS = 5000
+
+# *** 帧读取 ***
+
+# FrameReader 默认输出帧率（TeslaCam 原始帧率约 36）
+FRAME_READER_FPS = 10
+# 每个视角最多预读的帧数
+FRAME_READER_QUEUE = 8
+# 每个 ffmpeg 解码进程的线程数
+FRAME_READER_THREADS = 2
+
+# *** 活动检测 ***
+
+# 分析时的解码帧率与分辨率（灰度）
+ACTIVITY_FPS = 4
+ACTIVITY_SIZE = (128, 96)
+# 相邻两帧亮度差超过该值的像素视为变化（0~255）
+ACTIVITY_PIXEL_THRESHOLD = 20
+# 一秒内变化像素比例（任一视角）达到该值视为有活动
+ACTIVITY_SCORE_THRESHOLD = 0.01
+# 活动片段前后保留的秒数
+ACTIVITY_PADDING = 3
+# 两段活动间隔短于该秒数时合并为一段
+ACTIVITY_MIN_GAP = 4
@@ -7,14 +7,21 @@
   zh-Hans / zh-Hant / ja.
 - Translations are primarily loaded from JSON files under assets/locales,
   with a small in-module legacy dictionary kept as a fallback.
+- Both sources are merged once per language into a compiled catalog: each
+  key maps to its final text and whether it is a format template, so tr()
+  is a single dict lookup. The catalog also keeps a reverse map from
+  display text back to its key (e.g. main view names in combo boxes).
+- set_language() switches the catalog at runtime and retranslates widgets
+  registered with bind() / add_language_listener(), no restart needed.
 """
 
-import configparser
 import json
 import locale
 import os
+import string
+import weakref
 
-import GlobalConfig
+from ConfigService import get_config
 
 
 LOCALES_DIR = os.path.join(os.path.dirname(__file__), "assets", "locales")
@@ -28,6 +35,17 @@ _LEGACY_LANG_FALLBACK = "en"
 
 _translations_cache = {}
 
+# Compiled catalogs, per canonical language
+_catalogs = {}
+
+# (widget, setter name, key, format kwargs) retranslated on language change
+_bindings = []
+# Weak references to callbacks run after the bindings on language change
+_listeners = []
+
+# Main view keys, in combo box order; display text is tr("player.view.<key>")
+VIEW_KEYS = ("front", "back", "left", "right")
+
 
 def _normalize_lang(lang):
     """Normalize various language codes / aliases to canonical ones.
@@ -71,17 +89,7 @@ def _detect_system_lang():
 
 
 def _read_config_lang():
-    cfg_path = GlobalConfig.CONFIG_FILE_PATH
-    if not os.path.exists(cfg_path):
-        return None
-    cfg = configparser.ConfigParser()
-    try:
-        cfg.read(cfg_path, encoding="utf-8")
-    except Exception:
-        return None
-    if not cfg.has_section("Settings"):
-        return None
-    raw_lang = cfg.get("Settings", "language", fallback="").strip()
+    raw_lang = get_config().section("Settings").get("language", fallback="").strip()
     lang = _normalize_lang(raw_lang)
     if lang in _SUPPORTED_LANGS:
         return lang
@@ -92,18 +100,7 @@ def _write_config_lang(lang):
     lang = _normalize_lang(lang)
     if lang not in _SUPPORTED_LANGS:
         return
-    cfg_path = GlobalConfig.CONFIG_FILE_PATH
-    cfg = configparser.ConfigParser()
-    if os.path.exists(cfg_path):
-        try:
-            cfg.read(cfg_path, encoding="utf-8")
-        except Exception:
-            cfg = configparser.ConfigParser()
-    if not cfg.has_section("Settings"):
-        cfg.add_section("Settings")
-    cfg.set("Settings", "language", lang)
-    with open(cfg_path, "w", encoding="utf-8") as f:
-        cfg.write(f)
+    get_config().set("Settings", "language", lang)
 
 
 _current_lang = _read_config_lang() or _detect_system_lang() or _DEFAULT_LANG
@@ -114,12 +111,20 @@ def get_current_language():
 
 
 def set_language(lang):
-    global _current_lang
+    """Switch language, persist it and retranslate live widgets."""
+    global _current_lang, _catalog
     normalized = _normalize_lang(lang)
     if normalized not in _SUPPORTED_LANGS:
         return
-    _current_lang = normalized
     _write_config_lang(normalized)
+    if normalized == _current_lang:
+        return
+    _current_lang = normalized
+    # Drop cached sources so edited locale files are picked up as well
+    _translations_cache.pop(normalized, None)
+    _catalogs.pop(normalized, None)
+    _catalog = _get_catalog(normalized)
+    retranslate()
 
 
 def _load_translations(lang):
@@ -231,8 +236,8 @@ _TEXTS = {
     "proxy.saved": {"zh": "代理设置已保存，下次下载时生效。", "en": "Proxy settings saved. They will take effect for the next download."},
     # Language change
     "settings.language.saved": {
-        "zh": "语言设置已保存，请重新启动应用后生效。",
-        "en": "Language setting has been saved. Please restart the application to apply it.",
+        "zh": "语言已切换，之后打开的窗口也将使用新语言。",
+        "en": "Language changed. Windows opened later will also use the new language.",
     },
     # VLC status / main window
     "vlc.not_installed.title": {"zh": "警告", "en": "Warning"},
@@ -387,6 +392,65 @@ _TEXTS = {
 }
 
 
+class _Catalog:
+    """Flattened translations for one language.
+
+    entries maps key -> (text, is_template); is_template is False for strings
+    without braces and for malformed templates, which are returned unformatted.
+    """
+
+    __slots__ = ("lang", "entries", "reverse")
+
+    def __init__(self, lang, texts):
+        self.lang = lang
+        self.entries = {}
+        self.reverse = {}
+        parser = string.Formatter()
+        for key, text in texts.items():
+            is_template = "{" in text or "}" in text
+            if is_template:
+                try:
+                    list(parser.parse(text))
+                except ValueError:
+                    is_template = False
+            self.entries[key] = (text, is_template)
+            # First key wins for duplicate display texts
+            self.reverse.setdefault(text, key)
+
+
+def _compile_catalog(lang):
+    """Merge the JSON locale file over the legacy dictionary for lang."""
+    if lang == "zh-Hans":
+        legacy_lang = "zh"
+    elif lang == "en":
+        legacy_lang = "en"
+    else:
+        legacy_lang = _LEGACY_LANG_FALLBACK
+
+    texts = {}
+    for key, entry in _TEXTS.items():
+        text = entry.get(legacy_lang) or entry.get(_LEGACY_LANG_FALLBACK)
+        if text:
+            texts[key] = text
+    for key, text in _load_translations(lang).items():
+        # Empty JSON values fall back to the legacy entry, as before
+        if text and isinstance(text, str):
+            texts[key] = text
+    return _Catalog(lang, texts)
+
+
+def _get_catalog(lang):
+    if lang not in _SUPPORTED_LANGS:
+        lang = _DEFAULT_LANG
+    catalog = _catalogs.get(lang)
+    if catalog is None:
+        catalog = _catalogs[lang] = _compile_catalog(lang)
+    return catalog
+
+
+_catalog = _get_catalog(_current_lang)
+
+
 def tr(key, **kwargs):
     """Translate a key using current language.
 
@@ -394,33 +458,94 @@ def tr(key, **kwargs):
     1. JSON locale file for the current language (primary source).
     2. Legacy in-module `_TEXTS` dictionary, using zh/en entries.
     3. Fallback to the key itself.
+    Both sources are already merged into the compiled catalog.
     """
 
-    lang = _current_lang if _current_lang in _SUPPORTED_LANGS else _DEFAULT_LANG
-
-    # 1) JSON-based translations
-    translations = _load_translations(lang)
-    text = translations.get(key)
-
-    # 2) Legacy in-code dictionary as a fallback (zh/en only)
-    if not text:
-        entry = _TEXTS.get(key)
-        if entry:
-            # Map canonical lang to legacy zh/en keys
-            if lang == "zh-Hans":
-                legacy_lang = "zh"
-            elif lang == "en":
-                legacy_lang = "en"
-            else:
-                legacy_lang = _LEGACY_LANG_FALLBACK
-            text = entry.get(legacy_lang) or entry.get(_LEGACY_LANG_FALLBACK)
-
-    if not text:
-        text = key
-
-    if kwargs:
+    entry = _catalog.entries.get(key)
+    if entry is None:
+        return key
+    text, is_template = entry
+    if kwargs and is_template:
         try:
             return text.format(**kwargs)
         except Exception:
             return text
     return text
+
+
+def key_for_text(text, prefix=""):
+    """Reverse lookup: the key whose current translation is text, or None."""
+    key = _catalog.reverse.get(text)
+    if key is None or not key.startswith(prefix):
+        return None
+    return key
+
+
+def view_text(view):
+    """Display text of a main view key ("front" / "back" / ...)."""
+    return tr(f"player.view.{view}")
+
+
+def view_from_text(text):
+    """Main view key for a display text, or None.
+
+    The current language is tried first, then the other supported
+    languages: older configs stored the view as display text in whatever
+    language was active when they were saved.
+    """
+    key = key_for_text(text, "player.view.")
+    if key:
+        return key[len("player.view."):]
+    for lang in _SUPPORTED_LANGS:
+        catalog = _get_catalog(lang)
+        for view in VIEW_KEYS:
+            entry = catalog.entries.get(f"player.view.{view}")
+            if entry is not None and entry[0] == text:
+                return view
+    return None
+
+
+def bind(obj, key, setter="setText", **kwargs):
+    """Set obj's text via setter now and again whenever the language changes.
+
+    Meant for long-lived widgets and actions; entries whose Qt object has
+    been deleted are dropped on the next retranslation. Returns obj.
+    """
+
+    getattr(obj, setter)(tr(key, **kwargs))
+    _bindings.append((obj, setter, key, kwargs))
+    return obj
+
+
+def add_language_listener(callback):
+    """Call callback() after a language change (held by weak reference)."""
+    if hasattr(callback, "__self__"):
+        _listeners.append(weakref.WeakMethod(callback))
+    else:
+        _listeners.append(weakref.ref(callback))
+
+
+def retranslate():
+    """Re-apply all bindings, then run language listeners."""
+    alive = []
+    for binding in _bindings:
+        obj, setter, key, kwargs = binding
+        try:
+            getattr(obj, setter)(tr(key, **kwargs))
+        except RuntimeError:
+            # Underlying Qt object already deleted
+            continue
+        alive.append(binding)
+    _bindings[:] = alive
+
+    listeners = []
+    for ref in _listeners:
+        callback = ref()
+        if callback is None:
+            continue
+        try:
+            callback()
+        except RuntimeError:
+            continue
+        listeners.append(ref)
+    _listeners[:] = listeners
@@ -0,0 +1,443 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 事件库索引
+
+把 TeslaCam 目录下每个事件文件夹的 event.json（时间、经纬度、城市、街道、触发原因、摄像头）
+写入用户目录下的 SQLite 数据库，供播放器按时间、位置、关键字快速筛选：
+- 时间：按事件时间戳（UTC 秒）建索引，支持日期范围查询；
+- 位置：按经纬度网格编号建索引，先取附近网格再精确计算距离；
+- 关键字：城市/街道/地址使用 FTS5（trigram 分词，支持中文子串），
+  SQLite 不支持或关键字少于 3 个字符时退化为 LIKE。
+扫描为增量方式：只重新读取 event.json 修改时间变化的文件夹，并删除已不存在的文件夹。
+同一数据库中还缓存片段的每秒活动分数（ActivityAnalyzer），按文件路径、修改时间、大小和分析参数失效。
+
+筛选语法（空格分隔，可组合）：
+    2025-04-06               当天
+    2025-04-01..2025-04-30   日期范围（任一端可省略）
+    @31.23,121.47,2          距离该点 2 千米内（千米可省略，默认 1）
+    reason:sentry            触发原因包含 sentry
+    cam:0                    摄像头编号
+    其余文字                 城市/街道/地址关键字
+"""
+
+# 标准库
+import os
+import re
+import json
+import math
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta
+
+# 自研库
+import GlobalConfig
+
+
+# 地球半径（千米）
+EARTH_RADIUS_KM = 6371.0088
+# 位置网格大小（度），约 11 千米
+CELL_DEG = 0.1
+
+# TeslaCam 下的事件目录
+CLIP_DIRS = ("SavedClips", "SentryClips", "RecentClips")
+
+SCHEMA_VERSION = 1
+
+_DATE_RANGE = re.compile(r"^(\d{4}-\d{2}-\d{2})?\.\.(\d{4}-\d{2}-\d{2})?$")
+_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_NEAR = re.compile(r"^@(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?)(?:,(\d+(?:\.\d+)?))?$")
+
+
+def _cell(value):
+    return int(math.floor(value / CELL_DEG))
+
+
+def _float(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _parse_timestamp(value, folder):
+    """event.json 的 timestamp 为本地时间（如 2025-04-06T17:42:25），缺失时取文件夹名"""
+    for text, fmt in ((value, "%Y-%m-%dT%H:%M:%S"),
+                      (os.path.basename(folder), "%Y-%m-%d_%H-%M-%S")):
+        if not text:
+            continue
+        try:
+            return datetime.strptime(str(text)[:19], fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def library_root_for(folder):
+    """根据当前打开的目录推断事件库根目录（TeslaCam 或其父目录）"""
+    folder = os.path.abspath(folder)
+    parent = os.path.dirname(folder)
+    if os.path.basename(parent) in CLIP_DIRS:
+        return os.path.dirname(parent)
+    if os.path.basename(folder) in CLIP_DIRS:
+        return parent
+    return folder
+
+
+class SearchQuery:
+    """解析后的筛选条件"""
+
+    def __init__(self, text="", start=None, end=None, near=None, reason="", camera=""):
+        self.text = text
+        # [start, end) 本地时间
+        self.start = start
+        self.end = end
+        # (纬度, 经度, 千米)
+        self.near = near
+        self.reason = reason
+        self.camera = camera
+
+    @classmethod
+    def parse(cls, text):
+        query = cls()
+        words = []
+        for token in (text or "").split():
+            lower = token.lower()
+            range_match = _DATE_RANGE.match(token)
+            near_match = _NEAR.match(token)
+            if _DATE.match(token):
+                try:
+                    query.start = datetime.strptime(token, "%Y-%m-%d")
+                    query.end = query.start + timedelta(days=1)
+                    continue
+                except ValueError:
+                    pass
+            elif range_match:
+                try:
+                    first, last = range_match.groups()
+                    if first:
+                        query.start = datetime.strptime(first, "%Y-%m-%d")
+                    if last:
+                        query.end = datetime.strptime(last, "%Y-%m-%d") + timedelta(days=1)
+                    continue
+                except ValueError:
+                    pass
+            elif near_match:
+                lat, lon, km = near_match.groups()
+                query.near = (float(lat), float(lon), float(km) if km else 1.0)
+                continue
+            elif lower.startswith("reason:"):
+                query.reason = token[7:]
+                continue
+            elif lower.startswith("cam:"):
+                query.camera = token[4:]
+                continue
+            words.append(token)
+        query.text = " ".join(words)
+        return query
+
+    def is_empty(self):
+        return not (self.text or self.start or self.end or self.near
+                    or self.reason or self.camera)
+
+
+class LibraryIndex:
+    """事件库索引（SQLite），每个线程使用各自的连接"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(GlobalConfig.USER_DIR, "library.db")
+        self.glogger = logging.getLogger("LibraryIndex")
+        self._local = threading.local()
+        self.has_fts = False
+        self._init_schema()
+
+    # ******************** 连接与表结构 ********************
+
+    @property
+    def conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _init_schema(self):
+        conn = self.conn
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            conn.executescript("""
+                DROP TABLE IF EXISTS events;
+                DROP TABLE IF EXISTS events_fts;
+            """)
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY,
+                folder TEXT NOT NULL UNIQUE,
+                root TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                ts REAL,
+                lat REAL,
+                lon REAL,
+                cell_row INTEGER,
+                cell_col INTEGER,
+                city TEXT NOT NULL DEFAULT '',
+                street TEXT NOT NULL DEFAULT '',
+                address TEXT NOT NULL DEFAULT '',
+                reason TEXT NOT NULL DEFAULT '',
+                camera TEXT NOT NULL DEFAULT ''
+            );
+            CREATE INDEX IF NOT EXISTS idx_events_ts ON events(ts);
+            CREATE INDEX IF NOT EXISTS idx_events_cell ON events(cell_row, cell_col);
+            CREATE INDEX IF NOT EXISTS idx_events_root ON events(root);
+
+            -- 片段每秒活动分数（float32 数组），与事件表无关，表结构升级时保留
+            CREATE TABLE IF NOT EXISTS clip_activity (
+                path TEXT PRIMARY KEY,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                params TEXT NOT NULL,
+                scores BLOB NOT NULL
+            );
+        """)
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+                    city, street, address,
+                    content='events', content_rowid='id', tokenize='trigram')
+            """)
+            self.has_fts = True
+        except sqlite3.OperationalError as ex:
+            # SQLite 3.34 之前没有 trigram 分词，或未编译 FTS5
+            self.glogger.warning(f"全文索引不可用，使用 LIKE 查询: {ex}")
+            self.has_fts = False
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+
+    # ******************** 扫描 ********************
+
+    @staticmethod
+    def find_event_folders(root, max_depth=3):
+        """返回 {文件夹: event.json 修改时间}"""
+        found = {}
+        pending = [(root, 0)]
+        while pending:
+            folder, depth = pending.pop()
+            try:
+                entries = list(os.scandir(folder))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name == "event.json" and entry.is_file():
+                    try:
+                        found[folder] = entry.stat().st_mtime
+                    except OSError:
+                        pass
+                elif depth < max_depth and entry.is_dir(follow_symlinks=False):
+                    pending.append((entry.path, depth + 1))
+        return found
+
+    @staticmethod
+    def read_event(folder):
+        with open(os.path.join(folder, "event.json"), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError("event.json 格式错误")
+
+        lat, lon = _float(data.get("est_lat")), _float(data.get("est_lon"))
+        if lat is None or lon is None or (lat == 0 and lon == 0):
+            lat = lon = None
+        when = _parse_timestamp(data.get("timestamp"), folder)
+        city = str(data.get("city") or "")
+        street = str(data.get("street") or "")
+        return {
+            "ts": when.timestamp() if when else None,
+            "lat": lat,
+            "lon": lon,
+            "cell_row": _cell(lat) if lat is not None else None,
+            "cell_col": _cell(lon) if lon is not None else None,
+            "city": city,
+            "street": street,
+            "address": str(data.get("address") or " ".join(p for p in (city, street) if p)),
+            "reason": str(data.get("reason") or ""),
+            "camera": str(data.get("camera") or ""),
+        }
+
+    def scan(self, root, should_stop=None):
+        """增量扫描 root 下的事件文件夹，返回 (新增或更新数, 删除数)"""
+        root = os.path.abspath(root)
+        found = self.find_event_folders(root)
+        conn = self.conn
+        # 同一个盘可能以不同的根目录扫描过（如先打开 TeslaCam 再打开其父目录），
+        # 文件夹在全表唯一，按路径前缀一并取出，扫描到的记录归到当前根目录
+        prefix = os.path.join(root, "")
+        known = {row["folder"]: (row["id"], row["mtime"], row["root"]) for row in conn.execute(
+            "SELECT id, folder, mtime, root FROM events WHERE root = ? OR substr(folder, 1, ?) = ?",
+            (root, len(prefix), prefix))}
+
+        updated = 0
+        with conn:
+            for folder, mtime in found.items():
+                if should_stop and should_stop():
+                    break
+                old = known.get(folder)
+                if old and old[1] == mtime:
+                    if old[2] != root:
+                        conn.execute("UPDATE events SET root = ? WHERE id = ?", (root, old[0]))
+                        updated += 1
+                    continue
+                try:
+                    event = self.read_event(folder)
+                except (OSError, ValueError) as ex:
+                    self.glogger.warning(f"事件文件读取失败: {folder}, 原因: {ex}")
+                    continue
+                if old:
+                    self._delete(old[0])
+                self._insert(root, folder, mtime, event)
+                updated += 1
+
+            removed = [event_id for folder, (event_id, _, event_root) in known.items()
+                       if event_root == root and folder not in found]
+            for event_id in removed:
+                self._delete(event_id)
+
+        self.glogger.info(
+            f"事件库扫描完成: {root}, 共 {len(found)} 个事件, 更新 {updated}, 删除 {len(removed)}")
+        return updated, len(removed)
+
+    def _insert(self, root, folder, mtime, event):
+        cursor = self.conn.execute("""
+            INSERT INTO events (folder, root, mtime, ts, lat, lon, cell_row, cell_col,
+                                city, street, address, reason, camera)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (folder, root, mtime, event["ts"], event["lat"], event["lon"],
+              event["cell_row"], event["cell_col"], event["city"], event["street"],
+              event["address"], event["reason"], event["camera"]))
+        if self.has_fts:
+            self.conn.execute(
+                "INSERT INTO events_fts (rowid, city, street, address) VALUES (?, ?, ?, ?)",
+                (cursor.lastrowid, event["city"], event["street"], event["address"]))
+
+    def _delete(self, event_id):
+        if self.has_fts:
+            row = self.conn.execute(
+                "SELECT city, street, address FROM events WHERE id = ?", (event_id,)).fetchone()
+            if row:
+                self.conn.execute(
+                    "INSERT INTO events_fts (events_fts, rowid, city, street, address) "
+                    "VALUES ('delete', ?, ?, ?, ?)", (event_id, *row))
+        self.conn.execute("DELETE FROM events WHERE id = ?", (event_id,))
+
+    # ******************** 活动分数 ********************
+
+    def get_activity(self, path, params):
+        """返回缓存的每秒活动分数；片段已变化、参数不同或未缓存时返回 None"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        row = self.conn.execute(
+            "SELECT mtime, size, params, scores FROM clip_activity WHERE path = ?",
+            (os.path.abspath(path),)).fetchone()
+        if (row is None or row["mtime"] != stat.st_mtime or row["size"] != stat.st_size
+                or row["params"] != params):
+            return None
+        # numpy 导入较慢，启动时加载事件库不需要
+        import numpy as np
+
+        return np.frombuffer(row["scores"], dtype=np.float32)
+
+    def put_activity(self, path, params, scores):
+        import numpy as np
+
+        stat = os.stat(path)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO clip_activity (path, mtime, size, params, scores) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (os.path.abspath(path), stat.st_mtime, stat.st_size, params,
+                 np.asarray(scores, dtype=np.float32).tobytes()))
+
+    # ******************** 查询 ********************
+
+    def count(self, root=None):
+        if root is None:
+            return self.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM events WHERE root = ?",
+                                 (os.path.abspath(root),)).fetchone()[0]
+
+    def reasons(self, root):
+        """返回 {事件文件夹: 触发原因}"""
+        return {row["folder"]: row["reason"] for row in self.conn.execute(
+            "SELECT folder, reason FROM events WHERE root = ?", (os.path.abspath(root),))}
+
+    def search(self, query, root=None, limit=None):
+        """按 SearchQuery（或筛选文本）查询，返回事件行列表，按时间倒序"""
+        if isinstance(query, str):
+            query = SearchQuery.parse(query)
+
+        where, params = [], []
+        if root is not None:
+            where.append("e.root = ?")
+            params.append(os.path.abspath(root))
+        if query.start is not None:
+            where.append("e.ts >= ?")
+            params.append(query.start.timestamp())
+        if query.end is not None:
+            where.append("e.ts < ?")
+            params.append(query.end.timestamp())
+        if query.reason:
+            where.append("e.reason LIKE ?")
+            params.append(f"%{query.reason}%")
+        if query.camera:
+            where.append("e.camera = ?")
+            params.append(query.camera)
+        if query.near is not None:
+            lat, lon, km = query.near
+            # 外包网格范围，经度方向按纬度放宽
+            dlat = km / (math.pi / 180 * EARTH_RADIUS_KM)
+            dlon = dlat / max(math.cos(math.radians(lat)), 0.01)
+            where.append("e.cell_row BETWEEN ? AND ? AND e.cell_col BETWEEN ? AND ?")
+            params += [_cell(lat - dlat), _cell(lat + dlat), _cell(lon - dlon), _cell(lon + dlon)]
+
+        words = query.text.split()
+        if words and self.has_fts and all(len(w) >= 3 for w in words):
+            where.append("e.id IN (SELECT rowid FROM events_fts WHERE events_fts MATCH ?)")
+            params.append(" AND ".join('"{}"'.format(w.replace('"', '""')) for w in words))
+        else:
+            for word in words:
+                where.append("(e.city LIKE ? OR e.street LIKE ? OR e.address LIKE ?)")
+                params += [f"%{word}%"] * 3
+
+        sql = "SELECT e.* FROM events e"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY e.ts DESC"
+        if limit and query.near is None:
+            sql += f" LIMIT {int(limit)}"
+        rows = self.conn.execute(sql, params).fetchall()
+
+        if query.near is not None:
+            rows = [r for r in rows if r["lat"] is not None
+                    and distance_km(lat, lon, r["lat"], r["lon"]) <= km]
+            if limit:
+                rows = rows[:int(limit)]
+        return rows
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """两点间球面距离（千米）"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
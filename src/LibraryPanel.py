@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 事件库面板
+
+播放器左侧的事件筛选框与事件列表：打开目录后在后台增量扫描事件库，
+输入筛选条件时直接查询 LibraryIndex，双击事件加载对应的文件夹。
+只有事件库根目录变化或手动重新扫描（列表右键菜单）时才扫描，打开列表中的事件不会重建列表。
+"""
+
+# 标准库
+import os
+import logging
+from datetime import datetime
+
+# 三方库
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
+from PyQt5.QtWidgets import (QAction, QWidget, QVBoxLayout, QLineEdit, QListWidget,
+                             QListWidgetItem, QLabel)
+
+# 自研库
+from I18n import tr, bind, add_language_listener
+from LibraryIndex import LibraryIndex, SearchQuery, library_root_for
+
+
+class LibraryScanner(QThread):
+    """后台扫描事件库"""
+
+    scanFinished = pyqtSignal(str, int, int)  # 根目录, 更新数, 删除数
+    scanFailed = pyqtSignal(str)  # 根目录
+
+    def __init__(self, index: LibraryIndex, root, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.root = root
+        self.glogger = logging.getLogger("LibraryScanner")
+
+    def run(self):
+        try:
+            updated, removed = self.index.scan(
+                self.root, should_stop=self.isInterruptionRequested)
+            self.scanFinished.emit(self.root, updated, removed)
+        except Exception as ex:
+            self.glogger.exception(f"事件库扫描失败: {self.root}, 原因: {ex}")
+            self.scanFailed.emit(self.root)
+        finally:
+            # 连接属于扫描线程，线程结束前关闭
+            self.index.close()
+
+
+class LibraryPanel(QWidget):
+    """事件筛选框 + 事件列表"""
+
+    eventSelected = pyqtSignal(str)  # 事件文件夹路径
+
+    # 输入停顿多久（毫秒）后查询
+    FILTER_DELAY_MS = 120
+    # 列表最多显示的事件数
+    MAX_ROWS = 5000
+
+    def __init__(self, parent=None, index: LibraryIndex = None):
+        super().__init__(parent)
+        self.glogger = logging.getLogger("LibraryPanel")
+        self.index = index
+        self.root = None
+        self.scanner = None
+        # 上次扫描是否失败（状态栏显示失败提示，直到下次扫描）
+        self.scan_failed = False
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.filter_edit = QLineEdit(self)
+        bind(self.filter_edit, "player.library.filter.placeholder", "setPlaceholderText")
+        bind(self.filter_edit, "player.library.filter.tooltip", "setToolTip")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.textChanged.connect(self._schedule_filter)
+        layout.addWidget(self.filter_edit)
+
+        self.event_list = QListWidget(self)
+        self.event_list.itemActivated.connect(self._on_item_activated)
+        self.event_list.setContextMenuPolicy(Qt.ActionsContextMenu)
+        rescan_action = bind(QAction(self.event_list), "player.library.rescan")
+        rescan_action.triggered.connect(self.rescan)
+        self.event_list.addAction(rescan_action)
+        layout.addWidget(self.event_list)
+
+        self.status_label = QLabel(self)
+        layout.addWidget(self.status_label)
+
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(self.FILTER_DELAY_MS)
+        self.filter_timer.timeout.connect(self.refresh)
+
+        add_language_listener(self.retranslate_ui)
+
+    def retranslate_ui(self):
+        if self.scanner is not None and self.scanner.isRunning():
+            self.status_label.setText(tr("player.library.scanning"))
+        elif self.scan_failed:
+            self.status_label.setText(tr("player.library.scan_failed"))
+        elif self.index is not None and self.root is not None:
+            self._update_status()
+
+    def set_folder(self, folder, rescan=True):
+        """根据打开的目录确定事件库根目录并在后台增量扫描；
+        事件库未变化时只在 rescan 为 True 时重新扫描，列表保持不变直到扫描发现变化"""
+        if not folder or not os.path.isdir(folder):
+            return
+        root = library_root_for(folder)
+        if root == self.root:
+            if rescan and self.index is not None:
+                self._start_scan()
+            return
+
+        if self.index is None:
+            try:
+                self.index = LibraryIndex()
+            except Exception as ex:
+                self.glogger.error(f"事件库打开失败: {ex}")
+                self.hide()
+                return
+
+        # 先显示上次扫描的结果，扫描完成后刷新
+        self.stop_scan()
+        self.root = root
+        self.refresh()
+        self._start_scan()
+
+    def rescan(self):
+        """手动重新扫描当前事件库"""
+        if self.index is not None and self.root is not None:
+            self._start_scan()
+
+    def _start_scan(self):
+        if self.scanner is not None and self.scanner.isRunning():
+            return
+        self.scan_failed = False
+        self.status_label.setText(tr("player.library.scanning"))
+        self.scanner = LibraryScanner(self.index, self.root, self)
+        self.scanner.scanFinished.connect(self._on_scan_finished)
+        self.scanner.scanFailed.connect(self._on_scan_failed)
+        self.scanner.start(QThread.LowPriority)
+
+    def stop_scan(self):
+        if self.scanner is not None and self.scanner.isRunning():
+            self.scanner.requestInterruption()
+            self.scanner.wait()
+        self.scanner = None
+
+    def _on_scan_finished(self, root, updated, removed):
+        if root != self.root:
+            return
+        if updated or removed:
+            self.refresh()
+        else:
+            self._update_status()
+
+    def _on_scan_failed(self, root):
+        if root == self.root:
+            self.scan_failed = True
+            self.status_label.setText(tr("player.library.scan_failed"))
+
+    def _schedule_filter(self):
+        self.filter_timer.start()
+
+    def refresh(self):
+        if self.index is None or self.root is None:
+            return
+        query = SearchQuery.parse(self.filter_edit.text())
+        try:
+            rows = self.index.search(query, root=self.root, limit=self.MAX_ROWS)
+        except Exception as ex:
+            self.glogger.error(f"事件库查询失败: {ex}")
+            rows = []
+
+        self.event_list.setUpdatesEnabled(False)
+        self.event_list.clear()
+        for row in rows:
+            self.event_list.addItem(self._make_item(row))
+        self.event_list.setUpdatesEnabled(True)
+
+        # 没有任何事件时（如直接打开了单个事件文件夹）不占用空间
+        self.setVisible(bool(rows) or not query.is_empty())
+        self._update_status(len(rows))
+
+    def _update_status(self, shown=None):
+        if shown is None:
+            shown = self.event_list.count()
+        self.status_label.setText(
+            tr("player.library.count", shown=shown, total=self.index.count(self.root)))
+
+    @staticmethod
+    def _make_item(row):
+        folder = row["folder"]
+        when = datetime.fromtimestamp(row["ts"]).strftime("%Y-%m-%d %H:%M") \
+            if row["ts"] is not None else os.path.basename(folder)
+        place = row["city"] or row["street"]
+        item = QListWidgetItem(f"{when}\n{place}" if place else when)
+        item.setData(Qt.UserRole, folder)
+        item.setToolTip("\n".join(
+            p for p in (folder, row["address"], row["reason"]) if p))
+        return item
+
+    def _on_item_activated(self, item):
+        folder = item.data(Qt.UserRole)
+        if folder and os.path.isdir(folder):
+            self.eventSelected.emit(folder)
+
+    def closeEvent(self, event):
+        self.stop_scan()
+        return super().closeEvent(event)
@@ -10,10 +10,15 @@ Date: 2025/05/16
 # 标准库
 import os
 import sys
+
+# --profile-startup 需要在导入其他模块之前安装导入计时钩子
+import StartupProfiler
+if StartupProfiler.requested():
+    StartupProfiler.enable()
+
+import atexit
+import time
 import logging
-import configparser
-import tempfile
-import subprocess
 import webbrowser
 import platform
 from pathlib import Path
@@ -22,19 +27,18 @@ from pathlib import Path
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
-from qt_material import apply_stylesheet
-import requests
 
 # 自研库
-from utils import *
 import GlobalConfig
+from utils import setup_logging, LogOverheadProfiler
+from ConfigService import get_config
 from CoreWorker import CoreWorker
 from Signal import Signal
 from TeslaCamPlayerWidget import TeslaCamPlayerWidget
 from ThemeManager import ThemeManager, ThemeMenu
-from NotificationSettingsDialog import NotificationSettingsDialog
-from DownloadUpdateDialog import DownloadUpdateDialog
-from I18n import tr, set_language, get_current_language
+from I18n import tr, bind, add_language_listener, set_language, get_current_language
+
+StartupProfiler.mark("imports")
 
 
 class TeslaCamPlayer(QMainWindow):
@@ -52,6 +56,16 @@ class TeslaCamPlayer(QMainWindow):
         self.glogger = logging.getLogger("TeslaCamPlayer")
 
         self.inputFolderPath = ""
+        self.importLibraryPath = ""
+        self.import_worker = None
+        # 导入期间按播放状态调整导入限速，每次导入复用同一个定时器
+        self.import_throttle_timer = QTimer(self)
+        self.import_throttle_timer.timeout.connect(self._update_import_throttle)
+        self.dedup_worker = None
+        self.archive_worker = None
+        self.update_worker = None
+        self.pending_folder_load = False
+        self.first_shown = False
 
         # 初始化主题管理器
         self.theme_manager = ThemeManager()
@@ -133,13 +147,13 @@ class TeslaCamPlayer(QMainWindow):
         # 创建托盘菜单
         menu = QMenu()
         # 打开文件夹
-        open_action = menu.addAction(tr("menu.file.open_folder"))
+        open_action = bind(menu.addAction(""), "menu.file.open_folder")
         open_action.triggered.connect(
             lambda: self.browse_folder("inputType"))
         # 分隔线
         menu.addSeparator()
         # 退出
-        exit_action = menu.addAction(tr("menu.file.exit"))
+        exit_action = bind(menu.addAction(""), "menu.file.exit")
         exit_action.triggered.connect(sys.exit)
         self.tray.setToolTip('TeslaCam Player')
         self.tray.setContextMenu(menu)
@@ -160,43 +174,51 @@ class TeslaCamPlayer(QMainWindow):
         # ****** 工具栏 ******
         menu_bar = self.menuBar()
         # File menu
-        file_menu = menu_bar.addMenu(tr("menu.file"))
+        file_menu = bind(menu_bar.addMenu(""), "menu.file", "setTitle")
         # 打开文件夹
-        open_folder_action = QAction(tr("menu.file.open_folder"), self)
+        open_folder_action = bind(QAction(self), "menu.file.open_folder")
         open_folder_action.triggered.connect(
             lambda: self.browse_folder("inputType"))
         file_menu.addAction(open_folder_action)
+        # 从 U 盘导入
+        import_action = bind(QAction(self), "menu.file.import_usb")
+        import_action.triggered.connect(self.import_from_usb)
+        file_menu.addAction(import_action)
+        # 查找重复片段
+        dedup_action = bind(QAction(self), "menu.file.find_duplicates")
+        dedup_action.triggered.connect(self.find_duplicate_clips)
+        file_menu.addAction(dedup_action)
+        # 归档转码
+        archive_action = bind(QAction(self), "menu.file.archive")
+        archive_action.triggered.connect(self.archive_transcode)
+        file_menu.addAction(archive_action)
+        # 存储管理
+        storage_action = bind(QAction(self), "menu.file.storage")
+        storage_action.triggered.connect(self.open_storage_manager)
+        file_menu.addAction(storage_action)
         # 分隔线
         file_menu.addSeparator()
         # 退出
-        close_action = QAction(tr("menu.file.exit"), self)
+        close_action = bind(QAction(self), "menu.file.exit")
         close_action.triggered.connect(sys.exit)
         file_menu.addAction(close_action)
 
-        settings_menu = menu_bar.addMenu(tr("menu.settings"))
-        notify_action = QAction(tr("menu.settings.notify"), self)
+        settings_menu = bind(menu_bar.addMenu(""), "menu.settings", "setTitle")
+        notify_action = bind(QAction(self), "menu.settings.notify")
         notify_action.triggered.connect(self.open_notification_settings)
         settings_menu.addAction(notify_action)
 
         # 语言子菜单
-        language_menu = settings_menu.addMenu(tr("menu.settings.language"))
+        language_menu = bind(settings_menu.addMenu(""), "menu.settings.language", "setTitle")
 
         # 简体中文
-        self.action_lang_zh_hans = QAction(
-            tr("menu.settings.language.zh"), self, checkable=True
-        )
+        self.action_lang_zh_hans = bind(QAction(self, checkable=True), "menu.settings.language.zh")
         # 繁體中文
-        self.action_lang_zh_hant = QAction(
-            tr("menu.settings.language.zh_hant"), self, checkable=True
-        )
+        self.action_lang_zh_hant = bind(QAction(self, checkable=True), "menu.settings.language.zh_hant")
         # 日文
-        self.action_lang_ja = QAction(
-            tr("menu.settings.language.ja"), self, checkable=True
-        )
+        self.action_lang_ja = bind(QAction(self, checkable=True), "menu.settings.language.ja")
         # 英文
-        self.action_lang_en = QAction(
-            tr("menu.settings.language.en"), self, checkable=True
-        )
+        self.action_lang_en = bind(QAction(self, checkable=True), "menu.settings.language.en")
 
         current_lang = get_current_language()
         # 兼容旧值 zh / en，I18n 会归一化
@@ -228,14 +250,22 @@ class TeslaCamPlayer(QMainWindow):
         language_menu.addAction(self.action_lang_en)
 
         # 帮助菜单
-        help_menu = menu_bar.addMenu(tr("menu.help"))
-        check_update_action = QAction(tr("menu.help.check_update"), self)
-        check_update_action.triggered.connect(self.check_for_updates)
+        help_menu = bind(menu_bar.addMenu(""), "menu.help", "setTitle")
+        check_update_action = bind(QAction(self), "menu.help.check_update")
+        # triggered 会带上 checked 参数，不能直接作为 manual 传入
+        check_update_action.triggered.connect(lambda: self.check_for_updates())
         help_menu.addAction(check_update_action)
+        self.action_check_on_startup = bind(QAction(self, checkable=True), "menu.help.check_on_startup")
+        self.action_check_on_startup.setChecked(
+            get_config().section("Update").get_bool("check_on_startup", fallback=False))
+        self.action_check_on_startup.toggled.connect(
+            lambda checked: get_config().update(
+                "Update", {"check_on_startup": "true" if checked else "false"}))
+        help_menu.addAction(self.action_check_on_startup)
 
         help_menu.addSeparator()
 
-        about_action = QAction(tr("menu.help.about"), self)
+        about_action = bind(QAction(self), "menu.help.about")
         about_action.triggered.connect(self.show_about_dialog)
         help_menu.addAction(about_action)
 
@@ -245,9 +275,8 @@ class TeslaCamPlayer(QMainWindow):
 
         # ****** 状态栏 ******
 
-        vlcTips = None
+        self.vlc_version = None
         if not self.teslaCamPlayerWidget.is_vlc_installed():
-            vlcTips = tr("vlc.status.unavailable")
             QMessageBox.warning(
                 self,
                 tr("vlc.not_installed.title"),
@@ -255,15 +284,34 @@ class TeslaCamPlayer(QMainWindow):
                 QMessageBox.Yes,
             )
         else:
-            vlcTips = tr(
-                "vlc.status.available",
-                version=self.teslaCamPlayerWidget.get_libvlc_version(),
-            )
+            self.vlc_version = self.teslaCamPlayerWidget.get_libvlc_version()
 
         self.status_bar = self.statusBar()
+        self.show_version_status()
+
+        # 播放器提示（如播放质量调整）显示在状态栏右侧，不覆盖版本信息
+        self.player_info_label = QLabel(self)
+        self.status_bar.addPermanentWidget(self.player_info_label)
+        self.teslaCamPlayerWidget.infoEmitted.connect(
+            self.player_info_label.setText)
+
+        # 切换语言时菜单等通过 bind 自动更新，其余文字在这里更新
+        add_language_listener(self.retranslate_ui)
+
+    def show_version_status(self):
+        if self.vlc_version is None:
+            vlcTips = tr("vlc.status.unavailable")
+        else:
+            vlcTips = tr("vlc.status.available", version=self.vlc_version)
         self.status_bar.showMessage(
             f'{GlobalConfig.APP_NAME} {GlobalConfig.APP_VERSION}，{vlcTips}', 0)
 
+    def retranslate_ui(self):
+        """切换语言后更新不便用 bind 绑定的文字"""
+        self.setWindowTitle(f'{tr("app.title")} {GlobalConfig.APP_VERSION}')
+        self.show_version_status()
+        self.player_info_label.clear()
+
     def browse_folder(self, foldertype):
         if foldertype == "inputType":
             if self.inputFolderPath != "" and os.path.exists(self.inputFolderPath):
@@ -331,57 +379,57 @@ class TeslaCamPlayer(QMainWindow):
         self.save_config()
 
     def save_config(self):
-        # 配置文件保存路径
-        config_path = GlobalConfig.CONFIG_FILE_PATH
-        if os.path.exists(config_path):
-            # 如果配置文件存在就读取
-            config = configparser.ConfigParser()
-            config.read(config_path, encoding='utf-8')
-            if not config.has_section("Settings"):
-                config.add_section("Settings")
-            config.set("Settings", "inputPath",
-                       f"{self.inputFolderPath}")
-            config.set("Settings", "theme",
-                       f"{self.theme_manager.get_current_theme()}")
-            try:
-                ba = self.saveGeometry()
-                config.set("Settings", "geometry", bytes(ba).hex())
-            except Exception as ex:
-                self.glogger.error(f"geometry 保存失败: {ex}")
-            config.write(open(config_path, "w", encoding="utf-8"))
-        else:
-            # 如果没有配置文件就创建
-            with open(config_path, "w", encoding="utf-8") as f:
-                f.write("[Settings]\n")
-                f.write(f"inputPath = {self.inputFolderPath}\n")
-                f.write(f"theme = {self.theme_manager.get_current_theme()}\n")
-                try:
-                    ba = self.saveGeometry()
-                    f.write(f"geometry = {bytes(ba).hex()}\n")
-                except Exception as ex:
-                    self.glogger.error(f"geometry 保存失败: {ex}")
+        """更新配置，由配置服务合并后延迟写入磁盘"""
+        values = {
+            "inputPath": self.inputFolderPath,
+            "importLibraryPath": self.importLibraryPath,
+            "theme": self.theme_manager.get_current_theme(),
+            "proxyEnabled": self.teslaCamPlayerWidget.proxy_manager.enabled,
+            "metricsEnabled": self.teslaCamPlayerWidget.metrics.enabled,
+            "metricsInterval": self.teslaCamPlayerWidget.metrics_interval_ms,
+        }
+        try:
+            ba = self.saveGeometry()
+            values["geometry"] = bytes(ba).hex()
+        except Exception as ex:
+            self.glogger.error(f"geometry 保存失败: {ex}")
+        get_config().update("Settings", values)
         return True
 
     def read_config(self):
-        # 配置文件保存路径
-        config_path = GlobalConfig.CONFIG_FILE_PATH
         # 如果配置文件存在就读取
-        if os.path.exists(config_path):
-            config = configparser.ConfigParser()
-            config.read(config_path, encoding='utf-8')
+        if get_config().has_section("Settings"):
+            settings = get_config().section("Settings")
+
+            # 代理视频开关需在加载目录前设置，加载时才会排队生成代理
             try:
-                self.inputFolderPath = config.get("Settings", "inputPath")
+                self.teslaCamPlayerWidget.set_proxy_enabled(
+                    settings.get_bool("proxyEnabled", fallback=False))
+            except Exception as ex:
+                self.glogger.error(f'代理视频配置读取异常: {ex}')
+
+            # 播放指标采集开关及采样间隔（毫秒）
+            try:
+                self.teslaCamPlayerWidget.set_metrics_enabled(
+                    settings.get_bool("metricsEnabled", fallback=False),
+                    settings.get_int("metricsInterval", fallback=0))
+            except Exception as ex:
+                self.glogger.error(f'播放指标配置读取异常: {ex}')
+
+            self.importLibraryPath = settings.get("importLibraryPath", fallback="")
+
+            try:
+                self.inputFolderPath = settings.get("inputPath")
                 if self.inputFolderPath != "" and os.path.exists(self.inputFolderPath):
-                    self.teslaCamPlayerWidget.load_all(self.inputFolderPath)
-            except configparser.NoOptionError as err:
-                self.glogger.error(f'配置文件缺少选项: {err}')
+                    # 扫描目录、创建媒体放到窗口首次显示之后，先让首帧尽快绘制出来
+                    self.pending_folder_load = True
             except Exception as ex:
                 self.glogger.error(f'配置读取异常: {ex}')
 
             # 读取主题设置
             try:
-                theme = config.get("Settings", "theme", fallback="light_blue")
-                if theme in self.theme_manager.get_available_themes():
+                theme = settings.get("theme", fallback="light_blue")
+                if self.theme_manager.is_theme_available(theme):
                     self.theme_manager.set_current_theme(theme)
                     self.glogger.info(f"从配置文件加载主题: {theme}")
                 else:
@@ -391,22 +439,216 @@ class TeslaCamPlayer(QMainWindow):
 
             # 读取窗口 geometry 设置
             try:
-                geo = config.get("Settings", "geometry", fallback="")
+                geo = settings.get("geometry", fallback="")
                 if geo:
                     ba = QByteArray(bytes.fromhex(geo))
                     self.restoreGeometry(ba)
             except Exception as ex:
                 self.glogger.error(f'窗口位置读取异常: {ex}')
 
+    def after_first_show(self):
+        """窗口首次绘制完成后执行延后的初始化"""
+        StartupProfiler.mark("first-frame")
+        if self.pending_folder_load:
+            self.pending_folder_load = False
+            self.teslaCamPlayerWidget.load_all(self.inputFolderPath)
+            StartupProfiler.mark("folder-loaded")
+        StartupProfiler.report(GlobalConfig.STARTUP_BUDGET_MS)
+        if self.action_check_on_startup.isChecked():
+            # 启动检查放到首帧之后再延迟一段时间，不占用启动时间
+            QTimer.singleShot(GlobalConfig.UPDATE_STARTUP_DELAY_MS, self.check_for_updates_on_startup)
+
+    def import_from_usb(self):
+        """把 U 盘上的 TeslaCam 片段导入本地事件库"""
+        if self.import_worker is not None and self.import_worker.isRunning():
+            reply = QMessageBox.question(
+                self, tr("import.title"), tr("import.cancel_confirm"),
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply == QMessageBox.Yes:
+                self.import_worker.requestInterruption()
+            return
+
+        source = QFileDialog.getExistingDirectory(
+            self, tr("import.select_source"), os.path.expanduser('~'))
+        if not source:
+            return
+        target = QFileDialog.getExistingDirectory(
+            self, tr("import.select_target"),
+            self.importLibraryPath if os.path.isdir(self.importLibraryPath)
+            else os.path.expanduser('~'))
+        if not target:
+            return
+        if os.path.commonpath([os.path.abspath(source), os.path.abspath(target)]) \
+                == os.path.abspath(source):
+            QMessageBox.warning(self, tr("import.title"), tr("import.invalid_target"))
+            return
+
+        self.importLibraryPath = target
+        self.save_config()
+
+        from UsbImportWorker import UsbImportWorker
+        self.glogger.info(f"从 U 盘导入: {source} -> {target}")
+        self.import_worker = UsbImportWorker(source, target, parent=self)
+        self.import_worker.importProgress.connect(self._on_import_progress)
+        self.import_worker.importFinished.connect(self._on_import_finished)
+        self.import_worker.start(QThread.LowPriority)
+
+        # 播放时限制导入速度，避免与播放争抢磁盘带宽
+        self.import_throttle_timer.start(1000)
+        self._update_import_throttle()
+
+    def _update_import_throttle(self):
+        if self.import_worker is None:
+            return
+        playing = self.teslaCamPlayerWidget.visibility_scheduler.is_playing()
+        limit = GlobalConfig.IMPORT_PLAYBACK_MAX_MBPS * 1024 * 1024 if playing else None
+        self.import_worker.set_rate_limit(limit)
+
+    def _on_import_progress(self, done, total, read_mb):
+        self.player_info_label.setText(
+            tr("import.progress", done=done, total=total, mb=f"{read_mb:.0f}"))
+
+    def _on_import_finished(self, ok, stats):
+        self.import_throttle_timer.stop()
+        self.import_worker = None
+        if not stats:
+            self.player_info_label.setText(tr("import.failed"))
+            return
+        message = tr("import.finished", copied=stats["copied"],
+                     duplicates=stats["duplicates"], skipped=stats["skipped"],
+                     failed=stats["failed"])
+        self.player_info_label.setText(message)
+        if ok:
+            # 导入完成后打开事件库，左侧事件列表会扫描新导入的事件
+            self.inputFolderPath = self.importLibraryPath
+            self.save_config()
+            self.teslaCamPlayerWidget.load_all(self.importLibraryPath)
+
+    def find_duplicate_clips(self):
+        """查找当前目录下内容重复的片段，确认后替换为硬链接"""
+        if self.dedup_worker is not None and self.dedup_worker.isRunning():
+            return
+        if not self.inputFolderPath or not os.path.isdir(self.inputFolderPath):
+            QMessageBox.warning(self, tr("dedup.title"), tr("dedup.no_folder"))
+            return
+
+        from DedupWorker import DedupWorker
+        self.dedup_worker = DedupWorker(self.inputFolderPath, parent=self)
+        self.dedup_worker.dedupFinished.connect(self._on_dedup_finished)
+        self.dedup_worker.start(QThread.LowPriority)
+        self.player_info_label.setText(tr("dedup.running"))
+
+    def _on_dedup_finished(self, ok, stats):
+        worker, self.dedup_worker = self.dedup_worker, None
+        if not ok:
+            self.player_info_label.setText(tr("dedup.failed"))
+            return
+        if worker.merge_mode:
+            self.player_info_label.setText(tr("dedup.merged", replaced=stats["replaced"]))
+            return
+        if not stats["groups"]:
+            self.player_info_label.setText(tr("dedup.none", files=stats["files"]))
+            return
+
+        reply = QMessageBox.question(
+            self, tr("dedup.title"),
+            tr("dedup.found", files=stats["files"], groups=stats["groups"],
+               mb=f"{stats['wasted_mb']:.0f}"),
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+        from DedupWorker import DedupWorker
+        # 直接使用上次的查找结果，不再重新扫描
+        self.dedup_worker = DedupWorker(
+            worker.folder, duplicates=worker.duplicates, merge_mode="hardlink", parent=self)
+        self.dedup_worker.dedupFinished.connect(self._on_dedup_finished)
+        self.dedup_worker.start(QThread.LowPriority)
+
+    def archive_transcode(self):
+        """把片段重新编码为 HEVC/AV1 以节省空间；运行中再次点击可暂停、继续或停止"""
+        if self.archive_worker is not None and self.archive_worker.isRunning():
+            box = QMessageBox(QMessageBox.Question, tr("archive.title"), tr("archive.running"),
+                              parent=self)
+            paused = self.archive_worker.paused
+            toggle_btn = box.addButton(
+                tr("archive.resume") if paused else tr("archive.pause"), QMessageBox.AcceptRole)
+            stop_btn = box.addButton(tr("archive.stop"), QMessageBox.DestructiveRole)
+            box.addButton(QMessageBox.Cancel)
+            box.exec_()
+            if box.clickedButton() is toggle_btn:
+                if paused:
+                    self.archive_worker.resume()
+                else:
+                    self.archive_worker.pause()
+            elif box.clickedButton() is stop_btn:
+                self.archive_worker.stop()
+            return
+
+        source = QFileDialog.getExistingDirectory(
+            self, tr("archive.select_source"),
+            self.inputFolderPath if os.path.isdir(self.inputFolderPath) else os.path.expanduser('~'))
+        if not source:
+            return
+        from ArchiveTranscoder import ArchiveWorker, PRESETS
+        presets = list(PRESETS)
+        preset, ok = QInputDialog.getItem(
+            self, tr("archive.title"), tr("archive.select_preset"), presets,
+            presets.index(GlobalConfig.ARCHIVE_PRESET), False)
+        if not ok:
+            return
+        # 选择与源目录相同的文件夹时原地替换
+        target = QFileDialog.getExistingDirectory(self, tr("archive.select_target"), source)
+        if not target:
+            return
+        archive_root = None
+        if os.path.abspath(target) == os.path.abspath(source):
+            reply = QMessageBox.question(
+                self, tr("archive.title"), tr("archive.replace_confirm"),
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+        else:
+            archive_root = target
+
+        self.glogger.info(f"归档转码: {source} -> {archive_root or '原地替换'}, 预设 {preset}")
+        self.archive_worker = ArchiveWorker(source, preset, archive_root, parent=self)
+        self.archive_worker.archiveProgress.connect(
+            lambda done, total: self.player_info_label.setText(
+                tr("archive.progress", done=done, total=total)))
+        self.archive_worker.archiveFinished.connect(self._on_archive_finished)
+        self.archive_worker.start(QThread.LowestPriority)
+
+    def _on_archive_finished(self, ok, stats):
+        self.archive_worker = None
+        if not stats:
+            self.player_info_label.setText(tr("archive.failed"))
+            return
+        self.player_info_label.setText(
+            tr("archive.finished", done=stats["done"], skipped=stats["skipped"],
+               failed=stats["failed"]))
+
+    def open_storage_manager(self):
+        if not self.inputFolderPath or not os.path.isdir(self.inputFolderPath):
+            QMessageBox.warning(self, tr("storage.title"), tr("dedup.no_folder"))
+            return
+        from StorageDialog import StorageDialog
+
+        dlg = StorageDialog(self.inputFolderPath, self)
+        dlg.exec_()
+        # 删除的事件从左侧事件列表中移除
+        self.teslaCamPlayerWidget.library_panel.refresh()
+
     def open_notification_settings(self):
+        from NotificationSettingsDialog import NotificationSettingsDialog
+
         dlg = NotificationSettingsDialog(self)
         dlg.exec_()
 
     # ******************** 帮助菜单：关于 & 检查更新 ********************
 
     def change_language(self, lang: str):
-        """切换应用语言并提示用户重启后生效。"""
-        # 更新当前语言并写入配置文件
+        """切换应用语言，界面文字立即更新。"""
+        # 更新当前语言并写入配置文件，重新翻译已打开的界面
         set_language(lang)
 
         # 先全部清空勾选状态
@@ -428,7 +670,6 @@ class TeslaCamPlayer(QMainWindow):
         else:
             self.action_lang_en.setChecked(True)
 
-        # 提示需要重启
         QMessageBox.information(
             self,
             tr("menu.settings.language"),
@@ -485,18 +726,33 @@ class TeslaCamPlayer(QMainWindow):
 
         return None
 
-    def check_for_updates(self):
-        """检查 GitHub 是否有新版本发布，并根据用户确认下载并启动安装程序。"""
-        repo = "JerryYu2014/TeslaCamPlayer"
-        api_url = f"https://api.github.com/repos/{repo}/releases/latest"
+    def check_for_updates(self, manual=True):
+        """在后台检查 GitHub 是否有新版本发布，结果在 _on_update_checked 中处理。"""
+        if self.update_worker is not None and self.update_worker.isRunning():
+            return
+        from UpdateChecker import UpdateCheckWorker
 
-        try:
-            resp = requests.get(api_url, timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception as ex:
-            QMessageBox.warning(self, tr("update.check_failed.title"),
-                                f"{ex}")
+        self.update_worker = UpdateCheckWorker(manual, parent=self)
+        self.update_worker.updateChecked.connect(self._on_update_checked)
+        self.update_worker.start()
+
+    def check_for_updates_on_startup(self):
+        """启动时的自动检查，距离上次检查不足间隔时跳过。"""
+        from UpdateChecker import startup_check_due
+
+        update = get_config().section("Update")
+        if not startup_check_due(update.get_float("last_check", fallback=0.0)):
+            return
+        update.set("last_check", f"{time.time():.0f}")
+        self.check_for_updates(manual=False)
+
+    def _on_update_checked(self, manual, data, error):
+        """根据检查结果提示用户，确认后下载并启动安装程序；自动检查只在有新版本时提示。"""
+        self.update_worker = None
+        repo = "JerryYu2014/TeslaCamPlayer"
+        if error:
+            if manual:
+                QMessageBox.warning(self, tr("update.check_failed.title"), error)
             return
 
         latest_tag = data.get("tag_name") or ""
@@ -509,12 +765,13 @@ class TeslaCamPlayer(QMainWindow):
         latest_version = self._parse_version(tag_version_str)
 
         if latest_version <= current_version:
-            QMessageBox.information(
-                self,
-                tr("update.no_new.title"),
-                tr("update.no_new.text",
-                   current=GlobalConfig.APP_VERSION, latest=latest_name),
-            )
+            if manual:
+                QMessageBox.information(
+                    self,
+                    tr("update.no_new.title"),
+                    tr("update.no_new.text",
+                       current=GlobalConfig.APP_VERSION, latest=latest_name),
+                )
             return
 
         # 发现新版本
@@ -552,8 +809,11 @@ class TeslaCamPlayer(QMainWindow):
             webbrowser.open(f"https://github.com/{repo}/releases")
             return
 
-        # 使用独立的下载进度窗体进行下载，避免主界面卡死
-        dlg = DownloadUpdateDialog(self, url, name)
+        # 使用独立的下载进度窗体进行下载，避免主界面卡死；
+        # 下载完成后用 Release 提供的 SHA-256 校验安装包
+        from DownloadUpdateDialog import DownloadUpdateDialog
+
+        dlg = DownloadUpdateDialog(self, url, name, asset, data.get("assets", []))
         dlg.exec_()
 
     def resizeEvent(self, event):
@@ -563,11 +823,34 @@ class TeslaCamPlayer(QMainWindow):
 
         return super().resizeEvent(event)
 
+    def showEvent(self, event):
+        if not self.first_shown:
+            self.first_shown = True
+            # show() 之后事件循环第一次空闲时窗口已完成首次绘制
+            QTimer.singleShot(0, self.after_first_show)
+        return super().showEvent(event)
+
     def closeEvent(self, event):
+        if self.import_worker is not None and self.import_worker.isRunning():
+            # 已复制的文件都记录在清单中，下次导入从中断处继续
+            self.import_worker.requestInterruption()
+            self.import_worker.wait()
+        if self.dedup_worker is not None and self.dedup_worker.isRunning():
+            self.dedup_worker.wait()
+        if self.archive_worker is not None and self.archive_worker.isRunning():
+            # 未完成的文件不会替换原文件，下次从日志中断处继续
+            self.archive_worker.stop()
+            self.archive_worker.wait()
+        if self.update_worker is not None and self.update_worker.isRunning():
+            self.update_worker.wait()
         try:
             self.save_config()
+            get_config().flush()
         except Exception as ex:
             self.glogger.error(f'配置保存异常: {ex}')
+        # Qt 不会向子控件发送 closeEvent，播放器的后台线程和 VLC 需要在这里停止
+        # （在保存配置之后：停止时会关闭指标采集）
+        self.teslaCamPlayerWidget.shutdown()
         return super().closeEvent(event)
 
     def keyPressEvent(self, event):
@@ -576,20 +859,22 @@ class TeslaCamPlayer(QMainWindow):
 
 def main():
     """Entry point for TeslaCamPlayer"""
-    os.makedirs(GlobalConfig.LOG_DIR, exist_ok=True)
-    log_file = os.path.join(
-        GlobalConfig.LOG_DIR, f"{time.strftime('%Y-%m-%d', time.localtime())}.log")
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s %(levelname)s %(name)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler(log_file, encoding='utf-8')
-        ]
-    )
+    # 日志经队列在后台线程写入，文件按大小/时间滚动
+    setup_logging(GlobalConfig.LOG_DIR)
+
+    if "--profile-logging" in sys.argv:
+        # 统计各调用位置在界面线程中的日志耗时，退出时写入日志
+        log_profiler = LogOverheadProfiler()
+        log_profiler.install()
+
+        def report_log_overhead():
+            log = logging.getLogger("LogOverheadProfiler")
+            for line in log_profiler.report():
+                log.info(line)
+        atexit.register(report_log_overhead)
 
     app = QApplication(sys.argv)
+    StartupProfiler.mark("qapplication")
 
     # 安装 Qt 自带的中文翻译，使标准按钮文本(如 Yes/No/OK/Cancel)显示为中文
     try:
@@ -611,11 +896,13 @@ def main():
 
     # 创建主窗口
     teslaCamPlayer = TeslaCamPlayer()
+    StartupProfiler.mark("main-window")
     # 设置主题管理器的应用程序实例
     teslaCamPlayer.theme_manager.set_app(app)
     # 应用当前主题
     current_theme = teslaCamPlayer.theme_manager.get_current_theme()
     teslaCamPlayer.theme_manager.apply_theme(current_theme)
+    StartupProfiler.mark("theme")
     teslaCamPlayer.show()
 
     sys.exit(app.exec_())
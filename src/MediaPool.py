@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player libVLC 媒体对象池
+
+libVLC 的 Media 是引用计数对象，python-vlc 不会在 Python 对象回收时自动释放。
+媒体池负责复用相同文件/选项的 Media，并限制缓存数量，淘汰时释放引用，
+避免长时间循环播放时 Media 对象持续累积导致内存增长。
+"""
+
+# 标准库
+import logging
+from collections import OrderedDict
+
+
+class MediaPool:
+    """按 (视角, 路径, 选项) 缓存 Media 的 LRU 池
+
+    acquire() 返回的 Media 带有一份属于调用方的引用，调用方不再使用时需调用 release()；
+    池本身为缓存中的每个 Media 另外持有一份引用，淘汰或 clear() 时释放。
+    """
+
+    # 默认容量：当前组 + 下一组的四个视角，再留一些余量给代理/降级切换
+    DEFAULT_CAPACITY = 16
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._cache = OrderedDict()
+        self.glogger = logging.getLogger("MediaPool")
+
+        # 统计：新建、命中、释放次数
+        self.created = 0
+        self.hits = 0
+        self.released = 0
+
+    def __len__(self):
+        return len(self._cache)
+
+    def acquire(self, instance, key, path, options=(), cacheable=True):
+        """获取 Media；cacheable 为 False 时（如带起始时间的一次性媒体）不进入缓存"""
+        options = tuple(options)
+        if not cacheable:
+            self.created += 1
+            return instance.media_new(path, *options)
+
+        cache_key = (key, path, options)
+        media = self._cache.get(cache_key)
+        if media is not None:
+            self._cache.move_to_end(cache_key)
+            self.hits += 1
+        else:
+            media = instance.media_new(path, *options)
+            self.created += 1
+            self._cache[cache_key] = media
+            self._evict()
+
+        # 交给调用方的引用
+        media.retain()
+        return media
+
+    def release(self, media):
+        """释放调用方持有的引用"""
+        if media is not None:
+            media.release()
+            self.released += 1
+
+    def _evict(self):
+        while len(self._cache) > self.capacity:
+            _, media = self._cache.popitem(last=False)
+            self.release(media)
+
+    def clear(self):
+        while self._cache:
+            _, media = self._cache.popitem(last=False)
+            self.release(media)
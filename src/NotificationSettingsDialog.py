@@ -1,8 +1,6 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-import configparser
-import os
 from typing import Any, Dict
 
 from PyQt5.QtCore import Qt
@@ -17,7 +15,7 @@ from PyQt5.QtWidgets import (
     QVBoxLayout,
 )
 
-import GlobalConfig
+from ConfigService import get_config
 from I18n import tr
 
 
@@ -142,88 +140,54 @@ class NotificationSettingsDialog(QDialog):
         super().accept()
 
     def _load_from_config(self) -> None:
-        config_path = GlobalConfig.CONFIG_FILE_PATH
-        if not os.path.exists(config_path):
-            return
-
-        config = configparser.ConfigParser()
-        config.read(config_path, encoding='utf-8')
+        config = get_config()
 
         section = "Notification"
         if not config.has_section(section):
             return
 
-        get = config.get
-        getboolean = config.getboolean
-
-        try:
-            self.chkSystem.setChecked(getboolean(
-                section, "notify_system", fallback=True))
-        except Exception:
-            self.chkSystem.setChecked(True)
-
-        try:
-            self.emailGroup.setChecked(getboolean(
-                section, "notify_email", fallback=False))
-        except Exception:
-            self.emailGroup.setChecked(False)
+        notification = config.section(section)
+        get = notification.get
 
-        try:
-            self.wechatGroup.setChecked(getboolean(
-                section, "notify_wechat", fallback=False))
-        except Exception:
-            self.wechatGroup.setChecked(False)
+        self.chkSystem.setChecked(
+            notification.get_bool("notify_system", fallback=True))
+        self.emailGroup.setChecked(
+            notification.get_bool("notify_email", fallback=False))
+        self.wechatGroup.setChecked(
+            notification.get_bool("notify_wechat", fallback=False))
 
-        self.edHost.setText(get(section, "smtp_host", fallback=""))
-        port = get(section, "smtp_port", fallback="")
+        self.edHost.setText(get("smtp_host", fallback=""))
+        port = get("smtp_port", fallback="")
         self.spinPort.setText(port)
-        self.edUser.setText(get(section, "smtp_user", fallback=""))
-        self.edPass.setText(get(section, "smtp_pass", fallback=""))
-        self.edFrom.setText(get(section, "smtp_from", fallback=""))
-        self.edTo.setText(get(section, "smtp_to", fallback=""))
+        self.edUser.setText(get("smtp_user", fallback=""))
+        self.edPass.setText(get("smtp_pass", fallback=""))
+        self.edFrom.setText(get("smtp_from", fallback=""))
+        self.edTo.setText(get("smtp_to", fallback=""))
 
-        self.chkSSL.setChecked(config.getboolean(
-            section, "use_ssl", fallback=False))
-        self.chkTLS.setChecked(config.getboolean(
-            section, "use_tls", fallback=True))
+        self.chkSSL.setChecked(notification.get_bool("use_ssl", fallback=False))
+        self.chkTLS.setChecked(notification.get_bool("use_tls", fallback=True))
 
-        self.edWebhook.setText(get(section, "wechat_webhook", fallback=""))
-        self.edMentions.setText(get(section, "wechat_mentions", fallback=""))
+        self.edWebhook.setText(get("wechat_webhook", fallback=""))
+        self.edMentions.setText(get("wechat_mentions", fallback=""))
 
     def _save_to_config(self) -> None:
-        config_path = GlobalConfig.CONFIG_FILE_PATH
-
-        config = configparser.ConfigParser()
-        if os.path.exists(config_path):
-            config.read(config_path, encoding='utf-8')
-
-        section = "Notification"
-        if not config.has_section(section):
-            config.add_section(section)
-
         notify_vals = self.notify_values()
         email_vals = self.email_values()
         wechat_vals = self.wechat_values()
 
-        config.set(section, "notify_system",
-                   "1" if notify_vals["notify_system"] else "0")
-        config.set(section, "notify_email",
-                   "1" if notify_vals["notify_email"] else "0")
-        config.set(section, "notify_wechat",
-                   "1" if wechat_vals["enable_wechat"] else "0")
-
-        config.set(section, "smtp_host", email_vals["smtp_host"] or "")
-        config.set(section, "smtp_port", "" if email_vals["smtp_port"] is None else str(
-            email_vals["smtp_port"]))
-        config.set(section, "smtp_user", email_vals["smtp_user"] or "")
-        config.set(section, "smtp_pass", email_vals["smtp_pass"] or "")
-        config.set(section, "smtp_from", email_vals["smtp_from"] or "")
-        config.set(section, "smtp_to", email_vals["smtp_to"] or "")
-        config.set(section, "use_ssl", "1" if email_vals["use_ssl"] else "0")
-        config.set(section, "use_tls", "1" if email_vals["use_tls"] else "0")
-
-        config.set(section, "wechat_webhook", wechat_vals["webhook"] or "")
-        config.set(section, "wechat_mentions", wechat_vals["mentions"] or "")
-
-        with open(config_path, "w", encoding="utf-8") as f:
-            config.write(f)
+        get_config().update("Notification", {
+            "notify_system": "1" if notify_vals["notify_system"] else "0",
+            "notify_email": "1" if notify_vals["notify_email"] else "0",
+            "notify_wechat": "1" if wechat_vals["enable_wechat"] else "0",
+            "smtp_host": email_vals["smtp_host"] or "",
+            "smtp_port": "" if email_vals["smtp_port"] is None else str(
+                email_vals["smtp_port"]),
+            "smtp_user": email_vals["smtp_user"] or "",
+            "smtp_pass": email_vals["smtp_pass"] or "",
+            "smtp_from": email_vals["smtp_from"] or "",
+            "smtp_to": email_vals["smtp_to"] or "",
+            "use_ssl": "1" if email_vals["use_ssl"] else "0",
+            "use_tls": "1" if email_vals["use_tls"] else "0",
+            "wechat_webhook": wechat_vals["webhook"] or "",
+            "wechat_mentions": wechat_vals["mentions"] or "",
+        })
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 离线逆地理编码
+
+从用户提供的地名/行政区数据（GeoJSON 或 CSV）构建内存中的空间索引，
+无网络环境下也能为合成导出的视频提供地址：
+- 地名点（GeoJSON Point / CSV 行）按经纬度网格分桶，查询最近的地名；
+- 行政区面（GeoJSON Polygon / MultiPolygon）按外包矩形预筛选后做点在多边形内判断，
+  返回包含该点的最小行政区。
+坐标、网格均存放在 NumPy 数组中，单次查询为微秒级。
+
+CSV 需包含表头，列名支持 name/address、lat/latitude、lon/lng/longitude。
+"""
+
+# 标准库
+import os
+import csv
+import json
+import math
+import logging
+import threading
+
+# 三方库
+import numpy as np
+
+# 自研库
+from Geocoder import GeocodeProvider
+
+
+# 地球半径（千米）
+EARTH_RADIUS_KM = 6371.0088
+
+_NAME_KEYS = ("name", "address", "label", "title", "名称", "地址")
+_LAT_KEYS = ("lat", "latitude", "纬度")
+_LON_KEYS = ("lon", "lng", "long", "longitude", "经度")
+
+
+def _pick(mapping, keys):
+    lowered = {str(k).strip().lower(): v for k, v in mapping.items()}
+    for key in keys:
+        value = lowered.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+class PlaceIndex:
+    """地名点的网格索引，查询最近的地名"""
+
+    # 网格大小（度），约 11 千米
+    CELL_DEG = 0.1
+
+    def __init__(self, names, lats, lons, cell_deg=CELL_DEG):
+        self.cell_deg = cell_deg
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+
+        rows = np.floor((lats + 90.0) / cell_deg).astype(np.int64)
+        cols = np.floor((lons + 180.0) / cell_deg).astype(np.int64)
+        self.ncols = int(math.ceil(360.0 / cell_deg)) + 1
+        cells = rows * self.ncols + cols
+
+        # 按网格编号排序，同一行相邻的网格在数组中连续，一次切片即可取出
+        order = np.argsort(cells, kind="stable")
+        self.cells = cells[order]
+        self.lats = lats[order]
+        self.lons = lons[order]
+        self.names = [names[i] for i in order]
+
+    def __len__(self):
+        return len(self.names)
+
+    def _row_slice(self, row, col_from, col_to):
+        first = row * self.ncols + col_from
+        last = row * self.ncols + col_to
+        start = int(np.searchsorted(self.cells, first, side="left"))
+        end = int(np.searchsorted(self.cells, last, side="right"))
+        return start, end
+
+    def nearest(self, longitude, latitude, max_km=5.0):
+        """返回 (地名, 距离千米)，max_km 范围内没有地名时返回 (None, None)"""
+        if not len(self):
+            return None, None
+
+        fy = (latitude + 90.0) / self.cell_deg
+        fx = (longitude + 180.0) / self.cell_deg
+        row, col = int(math.floor(fy)), int(math.floor(fx))
+        # 查询点到所在网格边缘的距离（网格数）
+        edge_lat = min(fy - row, row + 1 - fy)
+        edge_lon = min(fx - col, col + 1 - fx)
+        # 经度方向的网格宽度随纬度变窄，按纬度换算需要搜索的网格圈数
+        cell_km = self.cell_deg * math.pi / 180 * EARTH_RADIUS_KM
+        rings_lat = int(math.ceil(max_km / cell_km))
+        cos_lat = max(math.cos(math.radians(latitude)), 0.01)
+        rings_lon = int(math.ceil(max_km / (cell_km * cos_lat)))
+
+        best, best_km = None, None
+        ring = 0
+        while ring <= max(rings_lat, rings_lon):
+            ring_lat, ring_lon = min(ring, rings_lat), min(ring, rings_lon)
+            idx = self._candidates(row, col, ring_lat, ring_lon)
+            if idx.size:
+                # 等距矩形近似，几千米范围内误差可忽略
+                dlat = np.radians(self.lats[idx] - latitude)
+                dlon = np.radians(self.lons[idx] - longitude) * cos_lat
+                dist = np.hypot(dlat, dlon) * EARTH_RADIUS_KM
+                i = int(np.argmin(dist))
+                if dist[i] <= max_km:
+                    best, best_km = self.names[int(idx[i])], float(dist[i])
+                    # 已搜索区域之外的点至少与区域边缘一样远，不可能更近
+                    searched_km = min((edge_lat + ring_lat) * cell_km,
+                                      (edge_lon + ring_lon) * cell_km * cos_lat)
+                    if best_km <= searched_km:
+                        break
+            ring += 1
+        return best, best_km
+
+    def _candidates(self, row, col, rings_lat, rings_lon):
+        slices = []
+        for r in range(row - rings_lat, row + rings_lat + 1):
+            start, end = self._row_slice(r, col - rings_lon, col + rings_lon)
+            if end > start:
+                slices.append(np.arange(start, end))
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        return slices[0] if len(slices) == 1 else np.concatenate(slices)
+
+
+class RegionIndex:
+    """行政区面的索引，查询包含某点的最小行政区"""
+
+    def __init__(self, regions):
+        # regions: [(名称, [外环 ndarray(N, 2) (lon, lat), ...])]
+        self.names = []
+        self.rings = []
+        bounds = []
+        areas = []
+        for name, rings in regions:
+            if not rings:
+                continue
+            stacked = np.vstack(rings)
+            self.names.append(name)
+            # 预先计算每条边的起止点，查询时不再重复 np.roll
+            self.rings.append([self._edges(r) for r in rings])
+            bounds.append((stacked[:, 0].min(), stacked[:, 1].min(),
+                           stacked[:, 0].max(), stacked[:, 1].max()))
+            areas.append(sum(abs(self._area(r)) for r in rings))
+
+        bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+        self.minx, self.miny, self.maxx, self.maxy = bounds.T
+        self.areas = np.asarray(areas, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.names)
+
+    @staticmethod
+    def _area(ring):
+        x, y = ring[:, 0], ring[:, 1]
+        return 0.5 * float(np.dot(x, np.roll(y, 1)) - np.dot(y, np.roll(x, 1)))
+
+    @staticmethod
+    def _edges(ring):
+        xi = np.ascontiguousarray(ring[:, 0])
+        yi = np.ascontiguousarray(ring[:, 1])
+        xj, yj = np.roll(xi, 1), np.roll(yi, 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = (xj - xi) / (yj - yi)
+        return xi, yi, yj, slope
+
+    @staticmethod
+    def _contains(edges, x, y):
+        """射线法判断点是否在多边形内"""
+        xi, yi, yj, slope = edges
+        crosses = (yi > y) != (yj > y)
+        with np.errstate(invalid="ignore"):
+            x_at = slope * (y - yi) + xi
+        return bool(np.count_nonzero(crosses & (x < x_at)) % 2)
+
+    def lookup(self, longitude, latitude):
+        if not len(self):
+            return None
+        hit = np.flatnonzero((self.minx <= longitude) & (longitude <= self.maxx) &
+                             (self.miny <= latitude) & (latitude <= self.maxy))
+        # 面积小的（更具体的行政区）优先
+        if hit.size > 1:
+            hit = hit[np.argsort(self.areas[hit])]
+        for i in hit:
+            if any(self._contains(ring, longitude, latitude) for ring in self.rings[i]):
+                return self.names[i]
+        return None
+
+
+def load_dataset(path):
+    """读取 GeoJSON/CSV，返回 (地名列表, 纬度列表, 经度列表, 行政区列表)"""
+    names, lats, lons, regions = [], [], [], []
+
+    if path.lower().endswith(".csv"):
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                name = _pick(row, _NAME_KEYS)
+                lat, lon = _pick(row, _LAT_KEYS), _pick(row, _LON_KEYS)
+                if name is None or lat is None or lon is None:
+                    continue
+                try:
+                    lats.append(float(lat))
+                    lons.append(float(lon))
+                except ValueError:
+                    continue
+                names.append(str(name))
+        return names, lats, lons, regions
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    features = data.get("features", []) if isinstance(data, dict) else []
+    for feature in features:
+        geometry = feature.get("geometry") or {}
+        name = _pick(feature.get("properties") or {}, _NAME_KEYS)
+        if name is None:
+            continue
+        kind, coords = geometry.get("type"), geometry.get("coordinates")
+        if kind == "Point" and coords:
+            lons.append(float(coords[0]))
+            lats.append(float(coords[1]))
+            names.append(str(name))
+        elif kind in ("Polygon", "MultiPolygon") and coords:
+            polygons = [coords] if kind == "Polygon" else coords
+            # 只使用外环；行政区中的“洞”通常另有对应的行政区，按面积优先即可区分
+            rings = [np.asarray(p[0], dtype=np.float64)[:, :2] for p in polygons if p]
+            regions.append((str(name), rings))
+    return names, lats, lons, regions
+
+
+class OfflineGeocoder:
+    """离线逆地理编码：行政区 + 最近地名"""
+
+    # 超过该距离（千米）的地名不作为附近地名
+    MAX_PLACE_KM = 5.0
+
+    def __init__(self, path, max_place_km=MAX_PLACE_KM):
+        self.path = path
+        self.max_place_km = max_place_km
+        self.glogger = logging.getLogger("OfflineGeocoder")
+
+        names, lats, lons, regions = load_dataset(path)
+        self.places = PlaceIndex(names, lats, lons)
+        self.regions = RegionIndex(regions)
+        self.glogger.info(
+            f"离线地址数据已加载: {path}, 地名 {len(self.places)}, 行政区 {len(self.regions)}")
+
+    def reverse(self, longitude, latitude):
+        region = self.regions.lookup(longitude, latitude)
+        place, _ = self.places.nearest(longitude, latitude, self.max_place_km)
+        if region and place and place != region:
+            return f"{region} {place}"
+        return region or place
+
+
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+
+def load_offline_geocoder(path):
+    """按路径和修改时间复用已加载的离线数据"""
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    with _loaded_lock:
+        geocoder = _loaded.get(key)
+        if geocoder is None:
+            geocoder = OfflineGeocoder(path)
+            _loaded.clear()
+            _loaded[key] = geocoder
+        return geocoder
+
+
+class OfflineProvider(GeocodeProvider):
+    """离线数据作为逆地理编码服务"""
+
+    def __init__(self, path):
+        self.geocoder = load_offline_geocoder(path)
+        self.name = f"offline:{os.path.basename(path)}"
+
+    def reverse(self, longitude, latitude):
+        return self.geocoder.reverse(float(longitude), float(latitude))
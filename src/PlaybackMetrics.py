@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 播放性能指标
+
+按固定间隔采样每个播放器的解码帧率、丢帧、与主时钟的偏差、seek 延迟、
+切换片段组的黑屏间隔以及进程 CPU/内存，显示在调试面板中并写入 JSON Lines 指标文件，
+便于排查卡顿问题时随问题反馈一起提交。
+"""
+
+# 标准库
+import os
+import sys
+import glob
+import json
+import time
+import logging
+import threading
+
+# 三方库
+from PyQt5.QtWidgets import QPlainTextEdit
+from PyQt5.QtGui import QFont
+import vlc
+
+# 自研库
+import GlobalConfig
+
+
+# 默认采样间隔（毫秒）
+DEFAULT_INTERVAL_MS = 1000
+# seek 后播放时间与目标相差在该范围内即视为 seek 完成
+SEEK_DONE_TOLERANCE_MS = 500
+
+
+def metrics_log_path(day=None):
+    """指标文件路径，每天一个文件，与日志放在同一目录"""
+    day = day or time.strftime("%Y-%m-%d", time.localtime())
+    return os.path.join(GlobalConfig.LOG_DIR, f"playback-metrics-{day}.jsonl")
+
+
+def prune_metrics_logs(keep_days=GlobalConfig.METRICS_KEEP_DAYS, now=None):
+    """删除超过保留天数的指标文件"""
+    deadline = (now or time.time()) - keep_days * 24 * 3600
+    for path in glob.glob(os.path.join(GlobalConfig.LOG_DIR, "playback-metrics-*.jsonl*")):
+        try:
+            if os.path.getmtime(path) < deadline:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+class ProcessUsage:
+    """进程 CPU 占用与常驻内存；优先使用 psutil，未安装时退化为标准库实现"""
+
+    def __init__(self):
+        try:
+            import psutil
+            self._proc = psutil.Process()
+            self._proc.cpu_percent(None)
+        except Exception:
+            self._proc = None
+        self._last_cpu = time.process_time()
+        self._last_wall = time.monotonic()
+
+    def sample(self):
+        if self._proc is not None:
+            return self._proc.cpu_percent(None), self._proc.memory_info().rss
+
+        now_cpu = time.process_time()
+        now_wall = time.monotonic()
+        elapsed = now_wall - self._last_wall
+        cpu = (now_cpu - self._last_cpu) / elapsed * 100 if elapsed > 0 else 0.0
+        self._last_cpu, self._last_wall = now_cpu, now_wall
+        return cpu, self._rss()
+
+    @staticmethod
+    def _rss():
+        if sys.platform.startswith("linux"):
+            try:
+                with open("/proc/self/statm") as f:
+                    return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+            except Exception:
+                return 0
+        try:
+            import resource
+            # macOS 上 ru_maxrss 单位为字节，这里只能得到峰值
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        except Exception:
+            return 0
+
+
+class PlaybackMetrics:
+    """播放性能指标采集器"""
+
+    def __init__(self, players, sampler, log_path=None, max_bytes=GlobalConfig.METRICS_MAX_BYTES):
+        self.players = players
+        self.glogger = logging.getLogger("PlaybackMetrics")
+        # 与播放质量控制共用的 MediaStatsSampler，只读取其最近一次采样的增量
+        self.sampler = sampler
+        self.usage = ProcessUsage()
+        self.log_path = log_path
+        self.max_bytes = max_bytes
+        self._written_path = None
+        self.enabled = False
+
+        # 以下状态在 libVLC 事件线程与界面线程之间共享
+        self._lock = threading.Lock()
+        # view -> (seek 目标毫秒, 发起时间)
+        self._pending_seeks = {}
+        # view -> 最近一次 seek 延迟（毫秒）
+        self.seek_latency_ms = {}
+        # 片段组切换：开始时间、已开始播放的视角、最近一次黑屏间隔（毫秒）
+        self._switch_started = None
+        self._switch_waiting = set()
+        self.group_switch_gap_ms = None
+
+        self._callbacks = []
+        self.last_record = None
+
+    # ******************** 启用 / 关闭 ********************
+
+    def set_enabled(self, enabled):
+        if enabled == self.enabled:
+            return
+        self.enabled = enabled
+        if enabled:
+            self._attach_events()
+        else:
+            self._detach_events()
+
+    def _attach_events(self):
+        for view, player in self.players.items():
+            em = player.event_manager()
+            for event_type, cb in (
+                    (vlc.EventType.MediaPlayerTimeChanged, self._on_time_changed),
+                    (vlc.EventType.MediaPlayerPlaying, self._on_playing)):
+                em.event_attach(event_type, cb, view)
+                self._callbacks.append((em, event_type))
+
+    def _detach_events(self):
+        for em, event_type in self._callbacks:
+            em.event_detach(event_type)
+        self._callbacks = []
+
+    # ******************** 事件（在 libVLC 线程中回调） ********************
+
+    def _on_time_changed(self, event, view):
+        with self._lock:
+            pending = self._pending_seeks.get(view)
+            if pending is None:
+                return
+            target_ms, issued = pending
+            if abs(event.u.new_time - target_ms) <= SEEK_DONE_TOLERANCE_MS:
+                self.seek_latency_ms[view] = (time.monotonic() - issued) * 1000
+                self._pending_seeks.pop(view, None)
+
+    def _on_playing(self, event, view):
+        with self._lock:
+            if self._switch_started is None:
+                return
+            self._switch_waiting.discard(view)
+            if not self._switch_waiting:
+                self.group_switch_gap_ms = (time.monotonic() - self._switch_started) * 1000
+                self._switch_started = None
+
+    # ******************** 播放器操作通知 ********************
+
+    def mark_seek(self, views, target_ms):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for view in views:
+                self._pending_seeks[view] = (target_ms, now)
+
+    def mark_group_switch(self, views):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._switch_started = time.monotonic()
+            self._switch_waiting = set(views)
+
+    # ******************** 采样 ********************
+
+    def sample(self, master_time_ms, active_views, context=None):
+        """采样一次指标，写入指标文件并返回记录"""
+        deltas = self.sampler.last_deltas
+        cpu, rss = self.usage.sample()
+        with self._lock:
+            seek_latency_ms = dict(self.seek_latency_ms)
+            group_switch_gap_ms = self.group_switch_gap_ms
+
+        players = {}
+        for view, player in self.players.items():
+            delta = deltas.get(view)
+            t = player.get_time()
+            players[view] = {
+                "active": view in active_views,
+                "state": str(player.get_state()).split(".")[-1],
+                "decode_fps": round(delta.decode_fps, 1) if delta else None,
+                "lost_frames": delta.lost if delta else None,
+                "drift_ms": int(t - master_time_ms) if t >= 0 and view in active_views else None,
+                "seek_latency_ms": round(seek_latency_ms[view], 1)
+                if view in seek_latency_ms else None,
+            }
+
+        record = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime()),
+            "master_time_ms": int(master_time_ms),
+            "group_switch_gap_ms": round(group_switch_gap_ms, 1)
+            if group_switch_gap_ms is not None else None,
+            "cpu_percent": round(cpu, 1),
+            "rss_mb": round(rss / 1024 / 1024, 1),
+            "players": players,
+        }
+        if context:
+            record.update(context)
+
+        self.last_record = record
+        self._write(record)
+        return record
+
+    def _write(self, record):
+        path = self.log_path or metrics_log_path()
+        try:
+            if path != self._written_path:
+                # 启动或跨天时清理过期的指标文件
+                self._written_path = path
+                if not self.log_path:
+                    prune_metrics_logs()
+            if self.max_bytes and os.path.exists(path) and os.path.getsize(path) >= self.max_bytes:
+                os.replace(path, path + ".1")
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except Exception as ex:
+            self.glogger.error(f"写入播放指标失败: {ex}")
+
+
+class PlaybackMetricsPanel(QPlainTextEdit):
+    """播放指标调试面板"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumHeight(150)
+        font = QFont("Menlo" if sys.platform == "darwin" else "Consolas")
+        font.setStyleHint(QFont.Monospace)
+        self.setFont(font)
+
+    def show_record(self, record):
+        def fmt(value, suffix=""):
+            return "-" if value is None else f"{value}{suffix}"
+
+        lines = [
+            f"CPU {record['cpu_percent']}%  RSS {record['rss_mb']} MB  "
+            f"group gap {fmt(record['group_switch_gap_ms'], ' ms')}  "
+            f"speed {fmt(record.get('speed'), 'x')}  "
+            f"quality {fmt(record.get('quality_level'))}",
+        ]
+        for view, m in record["players"].items():
+            lines.append(
+                f"{view:<6} {m['state']:<9} {'on ' if m['active'] else 'off'} "
+                f"fps {fmt(m['decode_fps']):>5}  lost {fmt(m['lost_frames']):>4}  "
+                f"drift {fmt(m['drift_ms'], ' ms'):>8}  "
+                f"seek {fmt(m['seek_latency_ms'], ' ms')}")
+        self.setPlainText("\n".join(lines))
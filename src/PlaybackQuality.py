@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 自适应播放质量
+
+周期性采样各播放器的 libVLC 媒体统计（解码/显示/丢失帧数），
+丢帧率超过阈值时逐级降低侧视角画质、帧率或限制倍速，余量恢复后再逐级恢复。
+"""
+
+# 标准库
+import time
+import logging
+
+# 三方库
+import vlc
+
+
+class StatsDelta:
+    """一个采样区间内单个播放器的统计增量"""
+
+    __slots__ = ("decoded", "displayed", "lost", "elapsed")
+
+    def __init__(self, decoded=0, displayed=0, lost=0, elapsed=0.0):
+        self.decoded = decoded
+        self.displayed = displayed
+        self.lost = lost
+        self.elapsed = elapsed
+
+    @property
+    def decode_fps(self):
+        return self.decoded / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def loss_ratio(self):
+        total = self.displayed + self.lost
+        return self.lost / total if total > 0 else 0.0
+
+
+class MediaStatsSampler:
+    """采样 libVLC 媒体统计，返回与上次采样之间的增量"""
+
+    def __init__(self, views, media_getter):
+        self.views = list(views)
+        # 返回某视角当前播放的 Media 对象（由播放器持有方提供，避免 get_media 额外引用）
+        self.media_getter = media_getter
+        self._stats = vlc.MediaStats()
+        # view -> (media, decoded, displayed, lost, 采样时间)
+        self._last = {}
+        # 最近一次采样的增量，供播放指标复用，避免重复读取统计
+        self.last_deltas = {}
+
+    def read(self, view):
+        """读取某个播放器当前媒体的累计统计，无媒体时返回 None"""
+        media = self.media_getter(view)
+        if media is None or not media.get_stats(self._stats):
+            return None
+        return (media, self._stats.decoded_video,
+                self._stats.displayed_pictures, self._stats.lost_pictures)
+
+    def sample(self, views=None):
+        now = time.monotonic()
+        deltas = {}
+        for view in (views if views is not None else self.views):
+            current = self.read(view)
+            if current is None:
+                self._last.pop(view, None)
+                continue
+            media, decoded, displayed, lost = current
+            last = self._last.get(view)
+            self._last[view] = (media, decoded, displayed, lost, now)
+            # 换了媒体或计数回退时重新建立基线
+            if last is None or last[0] is not media or decoded < last[1]:
+                continue
+            deltas[view] = StatsDelta(decoded - last[1], displayed - last[2],
+                                      lost - last[3], now - last[4])
+        self.last_deltas = deltas
+        return deltas
+
+
+class QualityController:
+    """根据丢帧率在各质量等级之间切换"""
+
+    # 质量等级
+    LEVEL_FULL = 0              # 全部视角原画质
+    LEVEL_SIDE_QUALITY = 1      # 侧视角跳过环路滤波、优先使用代理视频
+    LEVEL_SIDE_FRAMERATE = 2    # 侧视角额外跳过非参考帧，降低有效帧率
+    LEVEL_SPEED_CAP = 3         # 限制播放倍速
+    MAX_LEVEL = LEVEL_SPEED_CAP
+
+    LEVEL_NAMES = {
+        LEVEL_FULL: "full",
+        LEVEL_SIDE_QUALITY: "side-quality",
+        LEVEL_SIDE_FRAMERATE: "side-framerate",
+        LEVEL_SPEED_CAP: "speed-cap",
+    }
+
+    # 丢帧率超过该值时降级
+    DEGRADE_LOSS_RATIO = 0.10
+    # 连续多少次丢帧采样后降低一级（每次降级都会重新加载侧视角媒体，不能每秒降一级）
+    DEGRADE_SAMPLES = 3
+    # 丢帧率持续低于该值时恢复
+    RESTORE_LOSS_RATIO = 0.02
+    # 连续多少次健康采样后恢复一级
+    RESTORE_SAMPLES = 5
+    # 区间内帧数过少时不做判断（如刚切换片段）
+    MIN_FRAMES = 10
+
+    def __init__(self, logger=None):
+        self.glogger = logger or logging.getLogger("QualityController")
+        self.level = self.LEVEL_FULL
+        self._healthy = 0
+        self._unhealthy = 0
+        # 最近的决策记录：(时间, 旧等级, 新等级, 丢帧率)
+        self.decisions = []
+
+    def reset(self):
+        self._healthy = 0
+        self._unhealthy = 0
+
+    def update(self, deltas):
+        """输入本次采样增量，等级变化时返回新等级，否则返回 None"""
+        displayed = sum(d.displayed for d in deltas.values())
+        lost = sum(d.lost for d in deltas.values())
+        if displayed + lost < self.MIN_FRAMES:
+            return None
+        ratio = lost / (displayed + lost)
+
+        if ratio > self.DEGRADE_LOSS_RATIO and self.level < self.MAX_LEVEL:
+            self._healthy = 0
+            self._unhealthy += 1
+            if self._unhealthy >= self.DEGRADE_SAMPLES:
+                return self._set_level(self.level + 1, ratio)
+            return None
+        self._unhealthy = 0
+
+        if ratio < self.RESTORE_LOSS_RATIO and self.level > self.LEVEL_FULL:
+            self._healthy += 1
+            if self._healthy >= self.RESTORE_SAMPLES:
+                return self._set_level(self.level - 1, ratio)
+        else:
+            self._healthy = 0
+        return None
+
+    def _set_level(self, level, ratio):
+        old = self.level
+        self.level = level
+        self._healthy = 0
+        self._unhealthy = 0
+        self.decisions.append((time.time(), old, level, ratio))
+        del self.decisions[:-50]
+        self.glogger.info(
+            f"播放质量调整: {self.LEVEL_NAMES[old]} -> {self.LEVEL_NAMES[level]}, "
+            f"丢帧率 {ratio:.1%}")
+        return level
+
+    def side_media_options(self):
+        """侧视角在当前等级下的媒体选项"""
+        options = []
+        if self.level >= self.LEVEL_SIDE_QUALITY:
+            options.append(":avcodec-skiploopfilter=4")
+        if self.level >= self.LEVEL_SIDE_FRAMERATE:
+            options.append(":avcodec-skip-frame=1")
+        return options
+
+    def speed_cap(self, speed):
+        """当前等级下允许的最大倍速"""
+        if self.level >= self.LEVEL_SPEED_CAP:
+            return min(speed, max(1.0, speed / 2))
+        return speed
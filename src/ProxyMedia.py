@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 代理视频
+
+在后台为每个片段生成低分辨率、短 GOP 的代理文件并放入受管理的缓存目录（ffmpeg 以低优先级运行）。
+高倍速播放或拖动进度条时播放器切换到代理文件，回到 1x 或暂停时切回原始文件。
+"""
+
+# 标准库
+import os
+import shutil
+import logging
+import threading
+from collections import deque
+
+# 三方库
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# 自研库
+import GlobalConfig
+from utils import generate_hash, low_priority_popen
+
+
+# 代理视频高度（宽度按比例缩放）
+PROXY_HEIGHT = 360
+# 关键帧间隔（秒）；ALL_INTRA 为 True 时每帧都是关键帧
+PROXY_GOP_SECONDS = 1
+PROXY_ALL_INTRA = False
+# 缓存目录容量上限（字节），超出后按最近访问时间淘汰
+PROXY_CACHE_MAX_BYTES = 5 * 1024 ** 3
+
+PROXY_CACHE_DIR = os.path.join(GlobalConfig.USER_DIR, "proxies")
+# 生成中的临时文件后缀
+PART_SUFFIX = ".part.mp4"
+
+
+class ProxyCache:
+    """代理文件缓存：以源文件路径、大小和修改时间为键，超出容量时按最近访问淘汰"""
+
+    def __init__(self, cache_dir=PROXY_CACHE_DIR, max_bytes=PROXY_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def proxy_path(self, src):
+        st = os.stat(src)
+        key = generate_hash(f"{os.path.abspath(src)}|{st.st_size}|{st.st_mtime_ns}")
+        return os.path.join(self.cache_dir, f"{key}.mp4")
+
+    def lookup(self, src):
+        """返回已生成的代理文件路径，不存在时返回 None"""
+        try:
+            path = self.proxy_path(src)
+        except OSError:
+            return None
+        if not os.path.exists(path):
+            return None
+        try:
+            # 记录访问时间，供淘汰时参考
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def evict(self):
+        """超出容量时删除最久未访问的代理文件"""
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                # 正在生成的临时文件不计入、也不淘汰
+                if entry.is_file() and entry.name.endswith(".mp4") \
+                        and not entry.name.endswith(PART_SUFFIX):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+class ProxyGenerator(QThread):
+    """后台代理生成线程，按队列顺序逐个转码"""
+
+    proxyReady = pyqtSignal(str, str)  # 源文件路径, 代理文件路径
+
+    def __init__(self, cache: ProxyCache, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.glogger = logging.getLogger("ProxyGenerator")
+
+        self._queue = deque()
+        self._queued = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        # 正在运行的 ffmpeg 进程，停止时直接结束
+        self._proc = None
+
+    def request(self, paths, urgent=False):
+        """加入生成队列；urgent 为 True 时插到队首（如当前播放片段）"""
+        with self._lock:
+            for path in (reversed(paths) if urgent else paths):
+                if not path:
+                    continue
+                if path in self._queued:
+                    if urgent:
+                        self._queue.remove(path)
+                        self._queue.appendleft(path)
+                    continue
+                self._queued.add(path)
+                if urgent:
+                    self._queue.appendleft(path)
+                else:
+                    self._queue.append(path)
+        self._wakeup.set()
+        if not self.isRunning():
+            self.start(QThread.LowestPriority)
+
+    def clear(self):
+        with self._lock:
+            self._queue.clear()
+            self._queued.clear()
+
+    def stop(self):
+        """停止生成：结束正在运行的 ffmpeg，不等待当前片段转码完成"""
+        self._stopped = True
+        self.clear()
+        with self._lock:
+            if self._proc is not None and self._proc.poll() is None:
+                self._proc.kill()
+        self._wakeup.set()
+        self.wait()
+
+    def _next(self):
+        with self._lock:
+            if not self._queue:
+                return None
+            path = self._queue.popleft()
+            self._queued.discard(path)
+            return path
+
+    def run(self):
+        while not self._stopped:
+            src = self._next()
+            if src is None:
+                self._wakeup.clear()
+                self._wakeup.wait(1.0)
+                continue
+
+            if self.cache.lookup(src):
+                continue
+            try:
+                proxy = self.transcode(src)
+            except Exception as ex:
+                if not self._stopped:
+                    self.glogger.error(f"代理视频生成失败: {src}, 原因: {ex}")
+                continue
+            self.cache.evict()
+            self.proxyReady.emit(src, proxy)
+
+    def transcode(self, src):
+        import ffmpeg
+
+        dst = self.cache.proxy_path(src)
+        tmp = dst + PART_SUFFIX
+
+        if PROXY_ALL_INTRA:
+            gop_args = {'g': 1}
+        else:
+            # 按时间强制关键帧，不依赖源视频帧率
+            gop_args = {
+                'force_key_frames': f'expr:gte(t,n_forced*{PROXY_GOP_SECONDS})',
+                'sc_threshold': 0,
+            }
+
+        args = (
+            ffmpeg
+            .input(src)
+            .filter('scale', -2, PROXY_HEIGHT)
+            .output(
+                tmp,
+                vcodec='libx264',
+                preset='veryfast',
+                tune='fastdecode',
+                crf=28,
+                pix_fmt='yuv420p',
+                movflags='faststart',
+                an=None,
+                **gop_args,
+            )
+            # 限制线程数，避免与前台播放争抢 CPU
+            .global_args('-loglevel', 'error', '-nostdin', '-threads', '2')
+            .overwrite_output()
+            .compile()
+        )
+        # 与归档转码相同，以低 CPU/IO 优先级运行，不与前台播放争抢
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError("代理生成已停止")
+            self._proc = low_priority_popen(args, GlobalConfig.ARCHIVE_NICE, GlobalConfig.ARCHIVE_CPUS)
+        try:
+            _, err = self._proc.communicate()
+        finally:
+            with self._lock:
+                proc, self._proc = self._proc, None
+        if proc.returncode != 0:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise RuntimeError(f"ffmpeg 退出码 {proc.returncode}: "
+                               f"{err.decode(errors='replace').strip()[-200:]}")
+        shutil.move(tmp, dst)
+        self.glogger.info(f"代理视频已生成: {src} -> {dst}")
+        return dst
+
+
+class ProxyManager:
+    """代理视频的启用状态、缓存查询与后台生成"""
+
+    # 达到该倍速时切换到代理视频
+    SPEED_THRESHOLD = 4.0
+
+    def __init__(self, parent=None, cache: ProxyCache = None):
+        self.enabled = False
+        self.cache = cache or ProxyCache()
+        self.generator = ProxyGenerator(self.cache, parent)
+        self.proxyReady = self.generator.proxyReady
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if not enabled:
+            self.generator.clear()
+
+    def request_groups(self, groups, current_index=0):
+        """为所有片段排队生成代理，当前片段优先"""
+        if not self.enabled or not groups:
+            return
+        ordered = groups[current_index:] + groups[:current_index]
+        paths = [path for group in ordered for path in group.values()]
+        self.generator.request(paths)
+        self.generator.request(list(ordered[0].values()), urgent=True)
+
+    def lookup(self, src):
+        if not self.enabled or not src:
+            return None
+        return self.cache.lookup(src)
+
+    def wants_proxy(self, speed, playing, scrubbing):
+        """高倍速播放或拖动进度条时使用代理，1x 或暂停时使用原始文件"""
+        if not self.enabled:
+            return False
+        return scrubbing or (playing and speed >= self.SPEED_THRESHOLD)
+
+    def stop(self):
+        self.generator.stop()
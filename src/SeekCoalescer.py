@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player seek 合并器
+
+拖动进度条时每次数值变化都会请求 seek，逐个下发会让 libVLC 不断放弃未完成的 seek。
+合并器只保留最新的目标位置，每个播放器同一时间最多一个未完成的 seek；
+拖动过程中使用快速（关键帧）seek，松开时再做一次精确 seek。
+"""
+
+# 标准库
+import time
+import inspect
+
+
+class SeekCoalescer:
+    """合并 seek 请求，由调用方周期性调用 pump() 下发"""
+
+    # 未完成的 seek 超过该时间（秒）视为已结束，允许下发下一次
+    INFLIGHT_TIMEOUT = 0.3
+    # 播放位置与目标相差在该范围内即视为 seek 已生效（0~1 的进度）
+    APPLIED_TOLERANCE = 0.01
+
+    def __init__(self, players_getter):
+        # 返回当前参与解码的播放器 {view: player}
+        self.players_getter = players_getter
+
+        self._target = None
+        self._precise = False
+        # view -> (已下发的目标, 下发时间)
+        self._inflight = {}
+        # view -> 最近一次下发的 (目标, 是否精确)
+        self._issued = {}
+
+        # 统计：请求数、实际下发数、已生效数、超时数
+        self.requested = 0
+        self.issued = 0
+        self.applied = 0
+        self.timed_out = 0
+
+    def request(self, position, precise=False):
+        """记录最新的目标位置；precise 为 True 表示拖动结束后的精确 seek"""
+        self._target = min(max(position, 0.0), 1.0)
+        self._precise = precise
+        self.requested += 1
+
+    @property
+    def target(self):
+        """尚未下发到所有播放器的目标位置，没有时为 None"""
+        return self._target
+
+    @property
+    def idle(self):
+        return self._target is None and not self._inflight
+
+    def reset_stats(self):
+        self.requested = self.issued = self.applied = self.timed_out = 0
+
+    def pump(self, now=None):
+        """检查未完成的 seek 并按需下发最新目标，返回本次下发了 seek 的视角"""
+        now = time.monotonic() if now is None else now
+        players = self.players_getter()
+
+        for view in list(self._inflight):
+            player = players.get(view)
+            target, issued_at = self._inflight[view]
+            if player is None:
+                del self._inflight[view]
+            elif abs(player.get_position() - target) <= self.APPLIED_TOLERANCE:
+                self.applied += 1
+                del self._inflight[view]
+            elif now - issued_at > self.INFLIGHT_TIMEOUT:
+                self.timed_out += 1
+                del self._inflight[view]
+
+        if self._target is None:
+            return []
+
+        target, precise = self._target, self._precise
+        sent = []
+        for view, player in players.items():
+            if self._issued.get(view) == (target, precise):
+                continue
+            # 拖动中每个播放器最多一个未完成的 seek；精确 seek 不等待，直接覆盖
+            if view in self._inflight and not precise:
+                continue
+            set_position(player, target, fast=not precise)
+            self._inflight[view] = (target, now)
+            self._issued[view] = (target, precise)
+            self.issued += 1
+            sent.append(view)
+
+        if all(self._issued.get(view) == (target, precise) for view in players):
+            # 所有播放器都已下发最新目标；精确 seek 完成后清空，等待下一次拖动
+            if precise:
+                self._issued.clear()
+            self._target = None
+        return sent
+
+
+_fast_seek_supported = {}
+
+
+def set_position(player, position, fast=False):
+    """设置播放位置；libVLC 4 的绑定支持快速（关键帧）seek 参数，3.x 退化为普通 seek"""
+    cls = type(player)
+    supported = _fast_seek_supported.get(cls)
+    if supported is None:
+        try:
+            params = inspect.signature(player.set_position).parameters
+            supported = len(params) >= 2
+        except (TypeError, ValueError):
+            supported = False
+        _fast_seek_supported[cls] = supported
+
+    if supported:
+        player.set_position(position, fast)
+    else:
+        player.set_position(position)
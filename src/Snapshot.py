@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 四视角同步快照
+
+按当前全局时间从四个原始片段中各取一帧并按播放器当前布局合成为一张图片：
+- 每个视角单独运行一次 ffmpeg，-ss 放在输入之前（先跳到之前最近的关键帧，再解码到目标帧），
+  四个视角并行，输出原始 RGB 数据直接构造 QImage，不经过图片编解码；
+- 主视角铺满画面，其余视角缩小为 1/4 放在各自的角落，与播放界面一致；
+- 可选在底部叠加时间和地址。
+"""
+
+# 标准库
+import os
+import logging
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+# 三方库
+from PyQt5.QtCore import Qt, QRect, QThread, pyqtSignal
+from PyQt5.QtGui import QImage, QPainter, QColor, QFont
+
+# 自研库
+from utils import probe_size
+
+
+# 非主视角所在的角落（与播放界面的 4x4 网格布局一致）
+CORNERS = {
+    'front': (0, 0),  # 左上角
+    'back': (0, 3),   # 右上角
+    'left': (3, 0),   # 左下角
+    'right': (3, 3),  # 右下角
+}
+
+
+def grab_frame(path, seconds, size=None):
+    """返回 path 中 seconds 秒处的一帧（QImage）；size 为 None 时先探测分辨率"""
+    import ffmpeg
+
+    width, height = size or probe_size(path)
+    data, _ = (
+        ffmpeg
+        # 输入端跳转：从之前最近的关键帧开始解码，丢弃目标时间之前的帧
+        .input(path, ss=f'{max(0.0, seconds):.3f}')
+        .output('pipe:', vframes=1, format='rawvideo', pix_fmt='rgb24', an=None)
+        .global_args('-loglevel', 'error', '-nostdin')
+        .run(capture_stdout=True, quiet=True)
+    )
+    if len(data) < width * height * 3:
+        raise RuntimeError(f"未能读取到画面: {path} @ {seconds:.3f}s")
+    # copy() 使 QImage 拥有自己的内存，不依赖 bytes 对象的生命周期
+    return QImage(data, width, height, width * 3, QImage.Format_RGB888).copy()
+
+
+def grab_frames(sources, seconds):
+    """并行截取多个视角，返回 {视角: QImage}，失败的视角不在结果中"""
+    glogger = logging.getLogger("Snapshot")
+    frames = {}
+    with ThreadPoolExecutor(max_workers=max(len(sources), 1)) as pool:
+        futures = {view: pool.submit(grab_frame, path, seconds)
+                   for view, path in sources.items() if path}
+        for view, future in futures.items():
+            try:
+                frames[view] = future.result()
+            except Exception as ex:
+                glogger.error(f"截取画面失败: {view}, 原因: {ex}")
+    return frames
+
+
+def compose(frames, main_view, caption=None):
+    """按播放界面布局合成：主视角铺满，其余视角缩小到 1/4 放在角落"""
+    main = frames.get(main_view)
+    if main is None:
+        main = next(iter(frames.values()))
+    width, height = main.width(), main.height()
+    cell_w, cell_h = width // 4, height // 4
+
+    image = QImage(width, height, QImage.Format_RGB888)
+    image.fill(Qt.black)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform)
+    painter.drawImage(QRect(0, 0, width, height), main)
+
+    for view, frame in frames.items():
+        if frame is main or view not in CORNERS:
+            continue
+        row, col = CORNERS[view]
+        target = QRect(col * cell_w, row * cell_h, cell_w, cell_h)
+        painter.drawImage(target, frame)
+        painter.setPen(QColor(31, 31, 31))
+        painter.drawRect(target.adjusted(0, 0, -1, -1))
+
+    if caption:
+        font = QFont()
+        font.setPixelSize(max(14, height // 36))
+        painter.setFont(font)
+        bar_h = int(font.pixelSize() * 1.8)
+        # 放在底部中间，避开左右下角的小窗
+        bar = QRect(cell_w, height - bar_h, width - 2 * cell_w, bar_h)
+        painter.fillRect(bar, QColor(0, 0, 0, 160))
+        painter.setPen(Qt.white)
+        painter.drawText(bar, Qt.AlignCenter, caption)
+
+    painter.end()
+    return image
+
+
+def clip_time(group_name, ms):
+    """片段组名（如 2025-04-06_17-32-11）加组内偏移，得到画面时间"""
+    try:
+        return datetime.strptime(group_name, "%Y-%m-%d_%H-%M-%S") + timedelta(milliseconds=ms)
+    except ValueError:
+        return None
+
+
+def take_snapshot(group, seconds, main_view, output_path, caption=None):
+    """截取并保存快照，返回保存路径"""
+    frames = grab_frames(group, seconds)
+    if not frames:
+        raise RuntimeError("所有视角均截取失败")
+    image = compose(frames, main_view, caption)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    if not image.save(output_path):
+        raise RuntimeError(f"快照保存失败: {output_path}")
+    return output_path
+
+
+class SnapshotWorker(QThread):
+    """后台截取快照，避免阻塞界面"""
+
+    snapshotFinished = pyqtSignal(bool, str)  # 是否成功, 保存路径或错误信息
+
+    def __init__(self, group, seconds, main_view, output_path, caption=None, parent=None):
+        super().__init__(parent)
+        self.group = dict(group)
+        self.seconds = seconds
+        self.main_view = main_view
+        self.output_path = output_path
+        self.caption = caption
+        self.glogger = logging.getLogger("SnapshotWorker")
+
+    def run(self):
+        try:
+            path = take_snapshot(self.group, self.seconds, self.main_view,
+                                 self.output_path, self.caption)
+            self.snapshotFinished.emit(True, path)
+        except Exception as ex:
+            self.glogger.exception(f"快照失败: {ex}")
+            self.snapshotFinished.emit(False, str(ex))
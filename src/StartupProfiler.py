@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 启动耗时分析
+
+以 --profile-startup 启动时，记录各模块的导入耗时和启动各阶段的耗时，
+在首帧绘制完成后打印汇总，并与 GlobalConfig.STARTUP_BUDGET_MS 比较。
+导入计时通过 sys.meta_path 钩子实现，必须在导入其他模块之前调用 enable()。
+"""
+
+# 标准库
+import sys
+import time
+import logging
+import importlib.abc
+
+
+FLAG = "--profile-startup"
+
+_enabled = False
+_started = time.perf_counter()
+# (阶段名, 距离启动的毫秒数)
+_phases = []
+# 模块名 -> [累计耗时, 自身耗时]（毫秒）
+_imports = {}
+_stack = []
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """包装真实的 loader，统计 exec_module 耗时"""
+
+    def __init__(self, loader):
+        self._loader = loader
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        name = module.__name__
+        start = time.perf_counter()
+        _stack.append(0.0)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            children = _stack.pop()
+            elapsed = (time.perf_counter() - start) * 1000
+            _imports[name] = [elapsed, elapsed - children]
+            if _stack:
+                _stack[-1] += elapsed
+
+    def __getattr__(self, item):
+        return getattr(self._loader, item)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """在其他 finder 找到模块后替换为计时 loader"""
+
+    def find_spec(self, fullname, path, target=None):
+        spec = None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        if spec is None or spec.loader is None or not hasattr(spec.loader, "exec_module"):
+            return None
+        spec.loader = _TimedLoader(spec.loader)
+        return spec
+
+
+def requested(argv=None):
+    return FLAG in (sys.argv if argv is None else argv)
+
+
+def enable():
+    """安装导入计时钩子并开始记录阶段"""
+    global _enabled
+    if _enabled:
+        return
+    _enabled = True
+    sys.meta_path.insert(0, _TimingFinder())
+    mark("profiler")
+
+
+def is_enabled():
+    return _enabled
+
+
+def mark(phase):
+    """记录一个启动阶段完成的时间点"""
+    if _enabled:
+        _phases.append((phase, (time.perf_counter() - _started) * 1000))
+
+
+def elapsed_ms():
+    return (time.perf_counter() - _started) * 1000
+
+
+def report(budget_ms=None, top=25, stream=None):
+    """打印导入与阶段耗时，返回首帧耗时（毫秒）"""
+    if not _enabled:
+        return None
+    stream = stream or sys.stderr
+    for finder in [f for f in sys.meta_path if isinstance(f, _TimingFinder)]:
+        sys.meta_path.remove(finder)
+
+    lines = ["", "=== Startup profile ===", "", "Phases (ms since start):"]
+    last = 0.0
+    for phase, at in _phases:
+        lines.append(f"  {phase:<28} {at:9.1f}  (+{at - last:.1f})")
+        last = at
+
+    lines += ["", f"Slowest imports (top {top}, cumulative / self ms):"]
+    ranked = sorted(_imports.items(), key=lambda kv: kv[1][0], reverse=True)
+    for name, (cumulative, own) in ranked[:top]:
+        lines.append(f"  {name:<40} {cumulative:9.1f} {own:9.1f}")
+
+    first_frame = next((at for phase, at in _phases if phase == "first-frame"), None)
+    if first_frame is not None:
+        lines.append("")
+        lines.append(f"Time to first frame: {first_frame:.1f} ms")
+        if budget_ms:
+            verdict = "OK" if first_frame <= budget_ms else "OVER BUDGET"
+            lines.append(f"Budget: {budget_ms} ms -> {verdict}")
+            if first_frame > budget_ms:
+                logging.getLogger("StartupProfiler").warning(
+                    f"启动耗时 {first_frame:.1f} ms 超出预算 {budget_ms} ms")
+
+    print("\n".join(lines), file=stream)
+    return first_frame
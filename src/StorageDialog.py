@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from PyQt5.QtGui import QFontDatabase
+from PyQt5.QtWidgets import (
+    QDialog,
+    QFormLayout,
+    QGroupBox,
+    QHBoxLayout,
+    QMessageBox,
+    QPlainTextEdit,
+    QPushButton,
+    QSpinBox,
+    QVBoxLayout,
+)
+
+from ConfigService import get_config
+from I18n import tr
+from LibraryIndex import LibraryIndex, library_root_for
+from StorageManager import RetentionPolicy, StorageManager, StorageWorker, format_size
+
+
+class StorageDialog(QDialog):
+    """存储占用报告与保留策略"""
+
+    # 报告中按日期列出的最近天数
+    REPORT_DAYS = 14
+
+    def __init__(self, folder, parent=None) -> None:
+        super().__init__(parent)
+
+        self.setWindowTitle(tr("storage.title"))
+        self.resize(560, 560)
+
+        self.manager = StorageManager(library_root_for(folder), LibraryIndex())
+        self.worker = None
+        self.pending_plan = None
+
+        root = QVBoxLayout(self)
+
+        self.reportView = QPlainTextEdit(self)
+        self.reportView.setReadOnly(True)
+        self.reportView.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        root.addWidget(self.reportView, 1)
+
+        form = QFormLayout()
+        self.spinSentry = self._days_spin()
+        self.spinSaved = self._days_spin()
+        self.spinRecent = self._days_spin()
+        form.addRow(tr("storage.sentry_days"), self.spinSentry)
+        form.addRow(tr("storage.saved_days"), self.spinSaved)
+        form.addRow(tr("storage.recent_days"), self.spinRecent)
+        group = QGroupBox(tr("storage.group.retention"), self)
+        group.setLayout(form)
+        root.addWidget(group)
+
+        btns = QHBoxLayout()
+        self.btnRefresh = QPushButton(tr("storage.refresh"), self)
+        self.btnPreview = QPushButton(tr("storage.preview"), self)
+        self.btnApply = QPushButton(tr("storage.apply"), self)
+        self.btnClose = QPushButton(tr("button.close"), self)
+        btns.addWidget(self.btnRefresh)
+        btns.addStretch(1)
+        btns.addWidget(self.btnPreview)
+        btns.addWidget(self.btnApply)
+        btns.addWidget(self.btnClose)
+        root.addLayout(btns)
+
+        self.btnRefresh.clicked.connect(self.refresh)
+        self.btnPreview.clicked.connect(self.preview)
+        self.btnApply.clicked.connect(self.apply)
+        self.btnClose.clicked.connect(self.reject)
+
+        self._load_from_config()
+        self.refresh()
+
+    def _days_spin(self) -> QSpinBox:
+        spin = QSpinBox(self)
+        spin.setRange(0, 3650)
+        # 0 表示不限
+        spin.setSpecialValueText(tr("storage.keep_forever"))
+        spin.setSuffix(tr("storage.days_suffix"))
+        return spin
+
+    def policy(self) -> RetentionPolicy:
+        return RetentionPolicy(
+            sentry_days=self.spinSentry.value() or None,
+            saved_days=self.spinSaved.value() or None,
+            recent_days=self.spinRecent.value() or None,
+        )
+
+    def _set_busy(self, busy: bool) -> None:
+        for btn in (self.btnRefresh, self.btnPreview, self.btnApply):
+            btn.setEnabled(not busy)
+
+    # ******************** 扫描 ********************
+
+    def refresh(self) -> None:
+        self._set_busy(True)
+        self.reportView.setPlainText(tr("storage.scanning"))
+        self.worker = StorageWorker(self.manager, parent=self)
+        self.worker.storageReady.connect(self._on_report)
+        self.worker.start()
+
+    def _on_report(self, report, forecast) -> None:
+        self._set_busy(False)
+        if not report:
+            self.reportView.setPlainText(tr("storage.failed"))
+            return
+        self.reportView.setPlainText(self._format_report(report, forecast))
+
+    def _format_report(self, report, forecast) -> str:
+        lines = [tr("storage.total", size=format_size(report["total"]), files=report["files"]), ""]
+        for title, values in ((tr("storage.by_type"), report["by_type"]),
+                              (tr("storage.by_reason"), report["by_reason"]),
+                              (tr("storage.by_camera"), report["by_camera"])):
+            if not values:
+                continue
+            lines.append(title)
+            for name, size in sorted(values.items(), key=lambda kv: -kv[1]):
+                lines.append(f"  {name:<24}{format_size(size):>12}")
+            lines.append("")
+        lines.append(tr("storage.by_day"))
+        for day, size in list(report["by_day"].items())[-self.REPORT_DAYS:]:
+            lines.append(f"  {day:<24}{format_size(size):>12}")
+        lines.append("")
+        days_left = forecast["days_left"]
+        lines.append(tr("storage.forecast",
+                        daily=format_size(forecast["daily_bytes"]),
+                        free=format_size(forecast["free_bytes"]),
+                        days="-" if days_left is None else f"{days_left:.0f}"))
+        return "\n".join(lines)
+
+    # ******************** 保留策略 ********************
+
+    def preview(self) -> None:
+        """试运行：只列出将要删除的内容"""
+        self._save_to_config()
+        plan = self.manager.plan(self.policy())
+        freed = sum(unit.size for unit in plan)
+        lines = [tr("storage.plan", count=len(plan), size=format_size(freed)), ""]
+        for unit in plan[:200]:
+            lines.append(f"  {unit.day.isoformat()}  {format_size(unit.size):>10}  {unit.path}")
+        if len(plan) > 200:
+            lines.append(f"  ... (+{len(plan) - 200})")
+        forecast = self.manager.forecast(freed=freed)
+        days_left = forecast["days_left"]
+        lines += ["", tr("storage.forecast",
+                         daily=format_size(forecast["daily_bytes"]),
+                         free=format_size(forecast["free_bytes"]),
+                         days="-" if days_left is None else f"{days_left:.0f}")]
+        self.reportView.setPlainText("\n".join(lines))
+        return plan
+
+    def apply(self) -> None:
+        plan = self.preview()
+        if not plan:
+            return
+        reply = QMessageBox.question(
+            self, tr("storage.title"),
+            tr("storage.apply_confirm", count=len(plan),
+               size=format_size(sum(unit.size for unit in plan))),
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+        self._set_busy(True)
+        self.worker = StorageWorker(self.manager, plan=plan, parent=self)
+        self.worker.deleteProgress.connect(
+            lambda done, total: self.setWindowTitle(
+                f"{tr('storage.title')} - {done}/{total}"))
+        self.worker.deleteFinished.connect(self._on_deleted)
+        self.worker.start()
+
+    def _on_deleted(self, deleted, freed) -> None:
+        self.setWindowTitle(tr("storage.title"))
+        QMessageBox.information(self, tr("storage.title"),
+                                tr("storage.deleted", count=deleted, size=format_size(freed)))
+        self.refresh()
+
+    def reject(self) -> None:
+        if self.worker is not None and self.worker.isRunning():
+            # 已开始的批次执行完后停止
+            self.worker.requestInterruption()
+            self.worker.wait()
+        self._save_to_config()
+        super().reject()
+
+    # ******************** 配置 ********************
+
+    def _load_from_config(self) -> None:
+        config = get_config()
+        if not config.has_section("Storage"):
+            return
+        storage = config.section("Storage")
+        self.spinSentry.setValue(storage.get_int("sentry_days", fallback=0))
+        self.spinSaved.setValue(storage.get_int("saved_days", fallback=0))
+        self.spinRecent.setValue(storage.get_int("recent_days", fallback=0))
+
+    def _save_to_config(self) -> None:
+        get_config().update("Storage", {
+            "sentry_days": str(self.spinSentry.value()),
+            "saved_days": str(self.spinSaved.value()),
+            "recent_days": str(self.spinRecent.value()),
+        })
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 存储管理
+
+统计事件库占用并按保留策略清理：
+- 一次 os.scandir 遍历得到全部文件大小（使用目录项自带的 stat 结果），
+  按日期、事件类型（RecentClips/SavedClips/SentryClips/导出文件）、触发原因（来自事件库索引）
+  和摄像头汇总；
+- 保留策略：哨兵事件保留 N 天、手动保存事件保留 N 天、RecentClips 保留 N 天，
+  导出的合并视频、快照等不属于 TeslaCam 片段的文件始终保留；
+- 先生成删除计划（试运行报告），确认后分批删除，Saved/Sentry 以整个事件文件夹为单位；
+- 按最近几天的平均增长量和剩余空间预测磁盘还能使用多少天。
+"""
+
+# 标准库
+import os
+import time
+import shutil
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+# 三方库
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# 自研库
+from ClipGroups import CLIP_PATTERN, VIEW_MAP
+from LibraryIndex import CLIP_DIRS
+
+
+# 不属于 TeslaCam 片段目录的文件类型
+EXPORT_TYPE = "Exports"
+# 每批删除的事件/文件数，每批之间检查是否停止并报告进度
+DELETE_BATCH = 100
+# 预测增长量时参考的天数
+FORECAST_WINDOW_DAYS = 14
+
+_EVENT_DIR_FORMAT = "%Y-%m-%d_%H-%M-%S"
+
+
+class StorageItem:
+    """一个文件的统计信息"""
+
+    __slots__ = ("path", "size", "type", "unit", "day", "camera")
+
+    def __init__(self, path, size, type_, unit, day, camera):
+        self.path = path
+        self.size = size
+        # RecentClips/SavedClips/SentryClips/Exports
+        self.type = type_
+        # 删除单位：Saved/Sentry 为事件文件夹，其余为文件本身
+        self.unit = unit
+        self.day = day
+        self.camera = camera
+
+
+class RetentionPolicy:
+    """保留天数，None 表示不限"""
+
+    def __init__(self, sentry_days=None, saved_days=None, recent_days=None):
+        self.days = {
+            "SentryClips": sentry_days,
+            "SavedClips": saved_days,
+            "RecentClips": recent_days,
+        }
+
+    def is_empty(self):
+        return all(days is None for days in self.days.values())
+
+
+class DeleteUnit:
+    """删除计划中的一项"""
+
+    def __init__(self, path, type_, day):
+        self.path = path
+        self.type = type_
+        self.day = day
+        self.size = 0
+        self.files = 0
+
+
+def _day_from_name(name):
+    try:
+        return datetime.strptime(name[:19], _EVENT_DIR_FORMAT).date()
+    except ValueError:
+        return None
+
+
+def scan_library(root):
+    """遍历 root，返回 [StorageItem]"""
+    items = []
+    # (目录, 类型, 事件文件夹, 事件文件夹日期)
+    pending = [(os.path.abspath(root), None, None, None)]
+    while pending:
+        folder, type_, event, event_day = pending.pop()
+        try:
+            it = os.scandir(folder)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if type_ is None:
+                            pending.append((entry.path, entry.name if entry.name in CLIP_DIRS
+                                            else None, None, None))
+                        elif event is None and type_ != "RecentClips":
+                            pending.append((entry.path, type_, entry.path,
+                                            _day_from_name(entry.name)))
+                        else:
+                            pending.append((entry.path, type_, event, event_day))
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+
+                match = CLIP_PATTERN.match(entry.name)
+                if match:
+                    day = _day_from_name(match.group(1))
+                    camera = VIEW_MAP[match.group(2)]
+                else:
+                    day = None
+                    camera = "other"
+                if day is None:
+                    day = event_day or date.fromtimestamp(st.st_mtime)
+                items.append(StorageItem(
+                    entry.path, st.st_size, type_ or EXPORT_TYPE,
+                    event or entry.path, day, camera))
+    return items
+
+
+class StorageManager:
+    """事件库占用统计、保留策略与空间预测"""
+
+    def __init__(self, root, index=None):
+        self.root = os.path.abspath(root)
+        # 可选的 LibraryIndex，用于按触发原因统计及删除后更新索引
+        self.index = index
+        self.items = []
+        self.glogger = logging.getLogger("StorageManager")
+
+    def scan(self):
+        started = time.perf_counter()
+        self.items = scan_library(self.root)
+        self.glogger.info(f"存储扫描完成: {self.root}, {len(self.items)} 个文件, "
+                          f"耗时 {time.perf_counter() - started:.2f}s")
+        return self.items
+
+    def report(self):
+        """{total, files, by_day, by_type, by_reason, by_camera}，大小单位为字节"""
+        reasons = self.index.reasons(self.root) if self.index is not None else {}
+        by_day = defaultdict(int)
+        by_type = defaultdict(int)
+        by_reason = defaultdict(int)
+        by_camera = defaultdict(int)
+        total = 0
+        for item in self.items:
+            total += item.size
+            by_day[item.day.isoformat()] += item.size
+            by_type[item.type] += item.size
+            by_camera[item.camera] += item.size
+            if item.unit in reasons:
+                by_reason[reasons[item.unit] or "unknown"] += item.size
+        return {
+            "total": total,
+            "files": len(self.items),
+            "by_day": dict(sorted(by_day.items())),
+            "by_type": dict(by_type),
+            "by_reason": dict(by_reason),
+            "by_camera": dict(by_camera),
+        }
+
+    def plan(self, policy, today=None):
+        """按保留策略生成删除计划（试运行），返回 [DeleteUnit]，按日期从旧到新"""
+        today = today or date.today()
+        units = {}
+        protected = set()
+        for item in self.items:
+            days = policy.days.get(item.type)
+            if days is None:
+                continue
+            # 事件中只要有一个文件仍在保留期内，整个事件都保留
+            if item.day >= today - timedelta(days=days):
+                protected.add(item.unit)
+                continue
+            unit = units.get(item.unit)
+            if unit is None:
+                unit = units[item.unit] = DeleteUnit(item.unit, item.type, item.day)
+            unit.size += item.size
+            unit.files += 1
+            unit.day = max(unit.day, item.day)
+        plan = [unit for path, unit in units.items() if path not in protected]
+        plan.sort(key=lambda unit: (unit.day, unit.path))
+        return plan
+
+    def apply(self, plan, batch_size=DELETE_BATCH, should_stop=None, progress=None):
+        """分批删除，返回 (已删除数, 释放字节数)"""
+        deleted_paths = set()
+        freed = 0
+        for start in range(0, len(plan), batch_size):
+            if should_stop is not None and should_stop():
+                break
+            for unit in plan[start:start + batch_size]:
+                try:
+                    if os.path.isdir(unit.path):
+                        shutil.rmtree(unit.path)
+                    else:
+                        os.remove(unit.path)
+                        self._remove_empty_parents(os.path.dirname(unit.path))
+                except OSError as ex:
+                    self.glogger.warning(f"删除失败: {unit.path}, 原因: {ex}")
+                    continue
+                deleted_paths.add(unit.path)
+                freed += unit.size
+            if progress is not None:
+                progress(min(start + batch_size, len(plan)), len(plan))
+
+        deleted = len(deleted_paths)
+        self.items = [item for item in self.items if item.unit not in deleted_paths]
+        if self.index is not None:
+            # 删除的事件文件夹从索引中移除
+            self.index.scan(self.root)
+        self.glogger.info(f"按保留策略删除: {deleted} 项, 释放 {freed / 1024 ** 3:.2f} GB")
+        return deleted, freed
+
+    def _remove_empty_parents(self, folder):
+        """RecentClips 下按日期分的子目录删空后一并删除"""
+        while folder != self.root and os.path.basename(folder) not in CLIP_DIRS:
+            try:
+                os.rmdir(folder)
+            except OSError:
+                return
+            folder = os.path.dirname(folder)
+
+    def forecast(self, report=None, freed=0, window_days=FORECAST_WINDOW_DAYS):
+        """{daily_bytes, free_bytes, days_left}；days_left 为 None 表示没有增长"""
+        report = report or self.report()
+        by_day = report["by_day"]
+        daily = 0
+        if by_day:
+            last = date.fromisoformat(max(by_day))
+            first = last - timedelta(days=window_days - 1)
+            recent = [size for day, size in by_day.items() if date.fromisoformat(day) >= first]
+            daily = sum(recent) / window_days
+        free = shutil.disk_usage(self.root).free + freed
+        return {
+            "daily_bytes": daily,
+            "free_bytes": free,
+            "days_left": free / daily if daily else None,
+        }
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+class StorageWorker(QThread):
+    """后台扫描、统计，或执行删除计划"""
+
+    storageReady = pyqtSignal(dict, dict)  # 统计, 预测
+    deleteProgress = pyqtSignal(int, int)  # 已处理, 总数
+    deleteFinished = pyqtSignal(int, float)  # 已删除数, 释放字节数
+
+    def __init__(self, manager, plan=None, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.plan = plan
+        self.glogger = logging.getLogger("StorageWorker")
+
+    def run(self):
+        try:
+            if self.plan is None:
+                self.manager.scan()
+                report = self.manager.report()
+                self.storageReady.emit(report, self.manager.forecast(report))
+            else:
+                deleted, freed = self.manager.apply(
+                    self.plan, should_stop=self.isInterruptionRequested,
+                    progress=self.deleteProgress.emit)
+                self.deleteFinished.emit(deleted, float(freed))
+        except Exception as ex:
+            self.glogger.exception(f"存储管理失败: {ex}")
+            if self.plan is None:
+                self.storageReady.emit({}, {})
+            else:
+                self.deleteFinished.emit(0, 0.0)
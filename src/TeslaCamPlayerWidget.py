@@ -2,7 +2,6 @@
 
 # 标准库
 import os
-import re
 import logging
 import platform
 
@@ -13,7 +12,14 @@ from PyQt5.QtGui import *
 import qtawesome as qta
 import vlc
 
-from I18n import tr
+from I18n import tr, bind, add_language_listener, view_text, view_from_text, VIEW_KEYS
+from VisibilityScheduler import VisibilityScheduler
+from ProxyMedia import ProxyManager
+from PlaybackQuality import MediaStatsSampler, QualityController
+from PlaybackMetrics import PlaybackMetrics, PlaybackMetricsPanel, DEFAULT_INTERVAL_MS
+from SeekCoalescer import SeekCoalescer
+from MediaPool import MediaPool
+from LibraryPanel import LibraryPanel
 
 # 自研库
 # try:
@@ -72,7 +78,7 @@ class VideoContextMenu(QMenu):
         self.addAction(self.play_pause_action)
 
         # 停止
-        stop_action = QAction(tr("player.menu.stop"), self)
+        stop_action = bind(QAction(self), "player.menu.stop")
         stop_action.triggered.connect(self.parent_widget.stop_all)
         # 设置统一的图标尺寸
         stop_action.setIcon(qta.icon('mdi.stop', color='#1890ff'))
@@ -81,7 +87,7 @@ class VideoContextMenu(QMenu):
         self.addSeparator()
 
         # 播放倍数子菜单
-        speed_menu = self.addMenu(tr("player.menu.speed"))
+        speed_menu = bind(self.addMenu(""), "player.menu.speed", "setTitle")
         speed_menu.setIcon(qta.icon('mdi.speedometer', color='#1890ff'))
         speeds = [
             ("0.5x", 0.5),
@@ -106,18 +112,13 @@ class VideoContextMenu(QMenu):
         self.addSeparator()
 
         # 主视角切换子菜单
-        view_menu = self.addMenu(tr("player.menu.view"))
+        view_menu = bind(self.addMenu(""), "player.menu.view", "setTitle")
         view_menu.setIcon(qta.icon('mdi.view-dashboard', color='#1890ff'))
-        views = [
-            (tr("player.view.front"), "front"),
-            (tr("player.view.back"), "back"),
-            (tr("player.view.left"), "left"),
-            (tr("player.view.right"), "right"),
-        ]
-        for view_text, view_key in views:
-            action = QAction(view_text, self)
+        for view_key in VIEW_KEYS:
+            action = bind(QAction(self), f"player.view.{view_key}")
+            # 按视角键传递，切换语言后显示文本变化也不受影响
             action.triggered.connect(
-                lambda checked, v=view_text: self.parent_widget.set_main_view(v))
+                lambda checked, v=view_key: self.parent_widget.set_main_view(view_text(v)))
             # 保存动作引用
             self.view_actions[view_key] = action
             # 为当前主视角添加选中标记
@@ -127,8 +128,58 @@ class VideoContextMenu(QMenu):
 
         self.addSeparator()
 
+        # 播放指标调试面板
+        self.metrics_action = bind(QAction(self), "player.menu.metrics")
+        self.metrics_action.setCheckable(True)
+        self.metrics_action.toggled.connect(
+            lambda checked: self.parent_widget.set_metrics_enabled(checked))
+        self.addAction(self.metrics_action)
+
+        # 代理视频
+        self.proxy_action = bind(QAction(self), "player.menu.proxy")
+        self.proxy_action.setCheckable(True)
+        self.proxy_action.toggled.connect(self.parent_widget.set_proxy_enabled)
+        self.addAction(self.proxy_action)
+
+        self.addSeparator()
+
+        # 四视角同步快照
+        snapshot_action = bind(QAction(self), "player.menu.snapshot")
+        snapshot_action.setIcon(qta.icon('mdi.camera', color='#1890ff'))
+        snapshot_action.triggered.connect(self.parent_widget.take_snapshot)
+        self.addAction(snapshot_action)
+        self.snapshot_caption_action = bind(QAction(self), "player.menu.snapshot.caption")
+        self.snapshot_caption_action.setCheckable(True)
+        self.snapshot_caption_action.setChecked(True)
+        self.addAction(self.snapshot_caption_action)
+
+        # 区间导出：入点/出点及导出所选区间
+        range_menu = bind(self.addMenu(""), "player.menu.range", "setTitle")
+        range_menu.setIcon(qta.icon('mdi.content-cut', color='#1890ff'))
+        mark_in_action = bind(QAction(self), "player.menu.range.mark_in")
+        mark_in_action.triggered.connect(self.parent_widget.mark_in)
+        range_menu.addAction(mark_in_action)
+        mark_out_action = bind(QAction(self), "player.menu.range.mark_out")
+        mark_out_action.triggered.connect(self.parent_widget.mark_out)
+        range_menu.addAction(mark_out_action)
+        clear_range_action = bind(QAction(self), "player.menu.range.clear")
+        clear_range_action.triggered.connect(self.parent_widget.clear_range)
+        range_menu.addAction(clear_range_action)
+        range_menu.addSeparator()
+        export_all_action = bind(QAction(self), "player.menu.range.export_all")
+        export_all_action.triggered.connect(
+            lambda: self.parent_widget.export_selection())
+        range_menu.addAction(export_all_action)
+        export_main_action = bind(QAction(self), "player.menu.range.export_main")
+        export_main_action.triggered.connect(
+            lambda: self.parent_widget.export_selection(self.parent_widget.current_main_view))
+        range_menu.addAction(export_main_action)
+        self.range_accurate_action = bind(QAction(self), "player.menu.range.accurate")
+        self.range_accurate_action.setCheckable(True)
+        range_menu.addAction(self.range_accurate_action)
+
         # 合成导出
-        combine_export_action = QAction(tr("player.menu.combine_export"), self)
+        combine_export_action = bind(QAction(self), "player.menu.combine_export")
         combine_export_action.setIcon(
             qta.icon('mdi.movie-edit', color='#1890ff'))
         combine_export_action.triggered.connect(self.show_combine_export)
@@ -149,8 +200,7 @@ class VideoContextMenu(QMenu):
     def update_play_pause_text(self):
         """更新播放/暂停按钮文字和图标"""
         # 检查是否有播放器正在播放
-        any_playing = any(player.get_state() == vlc.State.Playing
-                          for player in self.parent_widget.players.values())
+        any_playing = self.parent_widget.visibility_scheduler.is_playing()
 
         if any_playing:
             self.play_pause_action.setText(tr("player.menu.pause"))
@@ -163,7 +213,7 @@ class VideoContextMenu(QMenu):
 
     def update_speed_selection(self, current_speed):
         """更新倍数选择的勾选状态"""
-        self.parent_widget.glogger.info(f"更新右键菜单倍数选择: {current_speed}")
+        self.parent_widget.glogger.debug(f"更新右键菜单倍数选择: {current_speed}")
 
         # 清除所有倍数动作的勾选图标
         for action in self.speed_actions.values():
@@ -173,7 +223,7 @@ class VideoContextMenu(QMenu):
         if current_speed in self.speed_actions:
             self.speed_actions[current_speed].setIcon(
                 qta.icon('mdi.check', color='#52c41a'))
-            self.parent_widget.glogger.info(f"已为倍数 {current_speed} 添加勾选图标")
+            self.parent_widget.glogger.debug(f"已为倍数 {current_speed} 添加勾选图标")
         else:
             self.parent_widget.glogger.warning(f"未找到倍数 {current_speed} 对应的动作")
 
@@ -194,7 +244,7 @@ class TeslaCamPlayerWidget(QWidget):
     warningEmitted = pyqtSignal(str)
     infoEmitted = pyqtSignal(str)
 
-    def __init__(self, folder_path, logger_instance=None, enable_dialogs=True, enable_file_dialog=True, log_dir=None):
+    def __init__(self, folder_path, logger_instance=None, enable_dialogs=True, enable_file_dialog=True, log_dir=None, vlc_args=()):
         super().__init__()
 
         # 运行时配置
@@ -229,9 +279,10 @@ class TeslaCamPlayerWidget(QWidget):
 
             self.glogger = logging.getLogger("TeslaCamPlayerWidget")
 
-        self.instances = {k: vlc.Instance()
-                          for k in ['front', 'back', 'left', 'right']}
-        self.players = {k: self.instances[k].media_player_new() for k in [
+        # 四个播放器共用一个 libVLC 实例（每个实例都要加载插件缓存，启动开销较大）
+        # vlc_args 为额外的 libVLC 参数（如无界面环境下的 --vout=dummy）
+        self.vlc_instance = vlc.Instance(*vlc_args)
+        self.players = {k: self.vlc_instance.media_player_new() for k in [
             'front', 'back', 'left', 'right']}
 
         self.current_main_view = 'front'
@@ -247,16 +298,54 @@ class TeslaCamPlayerWidget(QWidget):
 
         self.video_groups = None
         self.video_group_dict = None
+        # 当前片段组（原始文件）及各视角实际播放的文件
+        self.current_group = None
+        self.current_sources = {}
+        self.current_media = {}
+        # libVLC 媒体对象池：复用相同文件的 Media，并在淘汰/替换时释放引用
+        self.media_pool = MediaPool()
+
+        # 自适应播放质量：依据 libVLC 丢帧统计调整侧视角画质/帧率及倍速
+        self.stats_sampler = MediaStatsSampler(
+            self.players, lambda v: self.current_media.get(v))
+        self.quality_controller = QualityController(self.glogger)
+
+        # 播放性能指标（调试面板 + JSON Lines 指标文件），默认关闭
+        self.metrics = PlaybackMetrics(self.players, self.stats_sampler)
+        self.metrics_interval_ms = DEFAULT_INTERVAL_MS
+
+        # 代理视频：高倍速或拖动进度条时使用
+        self.proxy_manager = ProxyManager(self)
+        self.proxy_manager.proxyReady.connect(self._on_proxy_ready)
+        self.using_proxy = False
+        self.scrubbing = False
+
+        # 区间导出的入点/出点
+        self.range_in = None
+        self.range_out = None
+        self.range_export_worker = None
+        self.snapshot_worker = None
+        # shutdown() 只执行一次（主窗口关闭时调用，之后控件销毁时还会收到 closeEvent）
+        self._shut_down = False
 
         # 创建右键菜单
         self.context_menu = VideoContextMenu(self)
 
         self.create_ui()
 
+        # 可见性调度：不可见的视角暂停解码，重新可见时同步到主时钟
+        self.visibility_scheduler = VisibilityScheduler(
+            self.players, self.widgets, lambda: self.current_main_view,
+            lambda v: self.current_media.get(v), self.glogger, self,
+            reopen=self._reopen_view)
+
         # 初始化右键菜单状态
         self.context_menu.update_speed_selection(self.current_speed)
         self.context_menu.update_view_selection(self.current_view)
 
+        # 切换语言时更新随状态变化的文字
+        add_language_listener(self.retranslate_ui)
+
         if self.inputFolderPath != "" and os.path.exists(self.inputFolderPath):
             self.glogger.info(f"初始化加载目录: {self.inputFolderPath}")
             self.load_all(self.inputFolderPath)
@@ -292,13 +381,14 @@ class TeslaCamPlayerWidget(QWidget):
             QComboBox QAbstractItemView { border: 1px solid #d9d9d9; selection-background-color: #e6f7ff; }
 
             QLabel { color: #262626; }
+            QLabel#videoView { background-color: #000000; border: 1px solid #1f1f1f; border-radius: 4px; }
         """)
 
         self.widgets = {k: QLabel(self)
                         for k in ['front', 'back', 'left', 'right']}
         for widget in self.widgets.values():
-            widget.setStyleSheet(
-                "background-color: #000000; border: 1px solid #1f1f1f; border-radius: 4px;")
+            # 样式写在上面的样式表中，不再给每个画面单独解析一份
+            widget.setObjectName("videoView")
             widget.setScaledContents(True)
             # 启用右键菜单
             widget.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -307,24 +397,36 @@ class TeslaCamPlayerWidget(QWidget):
         # 左侧布局
         left_layout = QVBoxLayout()
         # 打开文件夹按钮
-        open_folder_button = QPushButton(tr("player.open_folder"), self)
+        open_folder_button = bind(QPushButton(self), "player.open_folder")
         open_folder_button.clicked.connect(
             lambda: self.browse_folder("inputType"))
         left_layout.addWidget(open_folder_button)
 
+        # 事件库筛选（打开目录后在后台扫描，没有事件时隐藏）
+        self.library_panel = LibraryPanel(self)
+        self.library_panel.setMaximumWidth(200)
+        self.library_panel.eventSelected.connect(self.open_event_folder)
+        self.library_panel.hide()
+        left_layout.addWidget(self.library_panel, 1)
+
         # 左侧列表
         self.time_point_list = QListWidget()
         self.time_point_list.setMaximumWidth(200)
         self.time_point_list.itemClicked.connect(self.load_time_point_group)
-        left_layout.addWidget(self.time_point_list)
+        left_layout.addWidget(self.time_point_list, 1)
 
         # 右侧播放器
         self.video_layout = QGridLayout()
         self.control_layout = self.build_controls()
 
+        # 播放指标调试面板（默认隐藏）
+        self.metrics_panel = PlaybackMetricsPanel(self)
+        self.metrics_panel.hide()
+
         player_layout = QVBoxLayout()
         player_layout.addLayout(self.video_layout)
         player_layout.addLayout(self.control_layout)
+        player_layout.addWidget(self.metrics_panel)
 
         main_layout = QHBoxLayout()
         main_layout.addLayout(left_layout)
@@ -339,6 +441,16 @@ class TeslaCamPlayerWidget(QWidget):
         self.timer.timeout.connect(self.update_ui)
         self.timer.start(1000)
 
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self._sample_metrics)
+
+        # 拖动进度条时合并 seek 请求，约每帧检查一次
+        self.seek_coalescer = SeekCoalescer(
+            lambda: self.visibility_scheduler.active_players())
+        self.seek_timer = QTimer(self)
+        self.seek_timer.setInterval(16)
+        self.seek_timer.timeout.connect(self._pump_seeks)
+
     def get_all_video_groups(self, folder_path):
         """
         特斯拉行车记录仪保存到U盘中的视频文件规范:
@@ -354,33 +466,13 @@ class TeslaCamPlayerWidget(QWidget):
         """
         self.glogger.info(f"扫描目录获取视频分组: {folder_path}")
         try:
-            files = os.listdir(folder_path)
+            from ClipGroups import build_video_groups
+
+            # 选择 TeslaCam 根目录时会合并各子目录中的片段，内容相同的片段只保留一个
+            groups, group_dict = build_video_groups(folder_path)
         except Exception as ex:
             self.glogger.error(f"目录读取失败: {folder_path}, 原因: {ex}")
             return [], {}
-        pattern = re.compile(
-            r"(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})-(front|back|left_repeater|right_repeater)\.mp4")
-        group_dict = {}
-        for f in files:
-            match = pattern.match(f)
-            if match:
-                timestamp, view = match.groups()
-                view_map = {
-                    'front': 'front',
-                    'back': 'back',
-                    'left_repeater': 'left',
-                    'right_repeater': 'right'
-                }
-                view_key = view_map[view]
-                group_dict.setdefault(timestamp, {})[
-                    view_key] = os.path.join(folder_path, f)
-
-        # 按时间戳排序并过滤空组
-        group_dict = {k: v for k, v in sorted(
-            group_dict.items()) if len(v) == 4}
-
-        groups = [group for ts, group in sorted(
-            group_dict.items()) if len(group) == 4]
 
         self.glogger.info(f"共匹配到时间段: {len(groups)} 组")
 
@@ -416,72 +508,127 @@ class TeslaCamPlayerWidget(QWidget):
                 self.widgets[view].mousePressEvent = lambda e, v=view: self.swap_view(
                     v)
 
+        # 布局变化可能改变各视角的可见性
+        if hasattr(self, 'visibility_scheduler'):
+            QTimer.singleShot(0, self.visibility_scheduler.refresh)
+
     def swap_view(self, new_main):
         if new_main == self.current_main_view:
             return
 
-        view_text_map = {
-            'front': tr("player.view.front"),
-            'back': tr("player.view.back"),
-            'left': tr("player.view.left"),
-            'right': tr("player.view.right"),
-        }
-        self.main_view_box.setCurrentText(view_text_map[new_main])
+        self.main_view_box.setCurrentText(view_text(new_main))
 
         self.glogger.info(f"切换主视角: {self.current_main_view} -> {new_main}")
         self.current_main_view = new_main
         self.setup_video_widgets()
+        # 降级只作用于侧视角，主视角变化后重新分配
+        if self.quality_controller.level > QualityController.LEVEL_FULL:
+            self._switch_sources()
 
     def load_video_group(self, group):
+        self.current_group = group
+        self.metrics.mark_group_switch(
+            list(self.visibility_scheduler.active_players()))
+        self.glogger.info(f"加载片段组: index={self.current_index}")
         for view, path in group.items():
-            self.glogger.info(f"加载视频: view={view}, path={path}")
-            media = self.instances[view].media_new(path)
-            self.players[view].set_media(media)
-
-            if platform.system() == "Linux":
-                # for Linux using the X Server
-                self.players[view].set_xwindow(
-                    int(self.widgets[view].winId()))
-            elif platform.system() == "Windows":
-                # for Windows
-                self.players[view].set_hwnd(
-                    int(self.widgets[view].winId()))
-            elif platform.system() == "Darwin":
-                # for MacOS
-                self.players[view].set_nsobject(
-                    int(self.widgets[view].winId()))
-
-            # 解决 Windows 版本单击视角小窗无法切换主视角的问题，同时貌似也解决了
-            # 因 [0000019b3c799b80] direct3d11 vout display error: SetThumbNailClip failed: 0x800706f4 报错而导致界面卡死的问题
-            # https://github.com/oaubert/python-vlc/issues/290#issuecomment-2690386548
-            self.players[view].video_set_key_input(False)
-            self.players[view].video_set_mouse_input(False)
+            self.glogger.debug(f"加载视频: view={view}, path={path}")
+            self._set_view_media(view, self._source_for(path, view),
+                                 options=self._options_for(view))
+
+        self.visibility_scheduler.on_media_changed()
+
+    def _is_side_view(self, view):
+        return view != self.current_main_view
+
+    def _source_for(self, path, view):
+        """根据代理及播放质量状态，返回片段实际播放的文件"""
+        degraded = (self.quality_controller.level > QualityController.LEVEL_FULL
+                    and self._is_side_view(view))
+        if self.using_proxy or degraded:
+            return self.proxy_manager.lookup(path) or path
+        return path
+
+    def _options_for(self, view):
+        """当前播放质量等级下该视角的媒体选项"""
+        if self._is_side_view(view):
+            return self.quality_controller.side_media_options()
+        return []
+
+    def effective_speed(self):
+        """实际下发给播放器的倍速（可能被播放质量控制限制）"""
+        return self.quality_controller.speed_cap(self.current_speed)
+
+    def _set_view_media(self, view, path, start_ms=None, paused=False, options=()):
+        """为指定视角设置媒体，可指定起始时间、是否以暂停状态打开及额外选项"""
+        # 带起始时间/暂停选项的媒体只用一次，不进入媒体池
+        one_shot = start_ms is not None or paused
+        media = self.media_pool.acquire(
+            self.vlc_instance, view, path, options, cacheable=not one_shot)
+        if start_ms is not None:
+            media.add_option(f":start-time={start_ms / 1000.0:.3f}")
+        if paused:
+            media.add_option(":start-paused")
+        self.players[view].set_media(media)
+        # 播放器已持有新媒体的引用，释放本地对旧媒体的引用，避免长时间播放时 Media 累积
+        self.media_pool.release(self.current_media.get(view))
+        self.current_media[view] = media
+        self.current_sources[view] = (path, tuple(options))
+        self.visibility_scheduler.on_view_media_changed(view)
+
+        if platform.system() == "Linux":
+            # for Linux using the X Server
+            self.players[view].set_xwindow(
+                int(self.widgets[view].winId()))
+        elif platform.system() == "Windows":
+            # for Windows
+            self.players[view].set_hwnd(
+                int(self.widgets[view].winId()))
+        elif platform.system() == "Darwin":
+            # for MacOS
+            self.players[view].set_nsobject(
+                int(self.widgets[view].winId()))
+
+        # 解决 Windows 版本单击视角小窗无法切换主视角的问题，同时貌似也解决了
+        # 因 [0000019b3c799b80] direct3d11 vout display error: SetThumbNailClip failed: 0x800706f4 报错而导致界面卡死的问题
+        # https://github.com/oaubert/python-vlc/issues/290#issuecomment-2690386548
+        self.players[view].video_set_key_input(False)
+        self.players[view].video_set_mouse_input(False)
+
+    def _reopen_view(self, view, start_ms, paused):
+        """以起始时间重新打开视角的当前片段（挂起期间换了媒体的视角恢复可见时）"""
+        path, options = self.current_sources[view]
+        self._set_view_media(view, path, start_ms=start_ms, paused=paused, options=options)
 
     def play_all(self):
         self.glogger.info("开始播放所有视角")
-        for player in self.players.values():
+        for player in self.visibility_scheduler.active_players().values():
             player.play()
+        self.visibility_scheduler.on_play()
+        self.update_proxy_mode()
         self.play_pause_all_btn.setText(tr("player.pause"))
         # self.play_pause_all_btn.setIcon(self.pause_icon)
         self.play_pause_all_btn.setIcon(qta.icon('mdi.pause', color='#ffffff'))
 
     def pause_all(self):
         self.glogger.info("暂停所有视角")
-        for player in self.players.values():
+        for player in self.visibility_scheduler.active_players().values():
             player.pause()
+        self.visibility_scheduler.on_pause()
+        self.update_proxy_mode()
         self.play_pause_all_btn.setText(tr("player.play"))
         # self.play_pause_all_btn.setIcon(self.play_icon)
         self.play_pause_all_btn.setIcon(qta.icon('mdi.play', color='#ffffff'))
 
     def play_pause_all(self):
         # 若有任一播放器正在播放，则执行“暂停”
-        any_playing = any(player.get_state() ==
-                          vlc.State.Playing for player in self.players.values())
+        any_playing = self.visibility_scheduler.is_playing()
 
         if any_playing:
             self.glogger.info("检测到播放中，执行暂停")
-            for player in self.players.values():
+            for player in self.visibility_scheduler.active_players().values():
                 player.pause()
+            self.visibility_scheduler.on_pause()
+            self.update_proxy_mode()
             self.play_pause_all_btn.setText(tr("player.play"))
             self.play_pause_all_btn.setIcon(
                 qta.icon('mdi.play', color='#ffffff'))
@@ -500,8 +647,10 @@ class TeslaCamPlayerWidget(QWidget):
             self.stopped_by_user = False
 
         self.glogger.info("执行播放")
-        for player in self.players.values():
+        for player in self.visibility_scheduler.active_players().values():
             player.play()
+        self.visibility_scheduler.on_play()
+        self.update_proxy_mode()
         self.play_pause_all_btn.setText(tr("player.pause"))
         self.play_pause_all_btn.setIcon(
             qta.icon('mdi.pause', color='#ffffff'))
@@ -510,6 +659,8 @@ class TeslaCamPlayerWidget(QWidget):
         self.glogger.info("停止所有视角，并标记下次从第一段开始")
         for player in self.players.values():
             player.stop()
+        self.visibility_scheduler.on_stop()
+        self.using_proxy = False
         self.play_pause_all_btn.setText(tr("player.play"))
         # self.play_pause_all_btn.setIcon(self.play_icon)
         self.play_pause_all_btn.setIcon(
@@ -529,18 +680,23 @@ class TeslaCamPlayerWidget(QWidget):
         self.glogger.info("仅停止播放（不改变索引与列表状态）")
         for player in self.players.values():
             player.stop()
+        self.visibility_scheduler.on_stop()
+        self.using_proxy = False
         self.play_pause_all_btn.setText(tr("player.play"))
         self.play_pause_all_btn.setIcon(
             qta.icon('mdi.play', color='#0288D1'))
 
     def set_rate_all(self, rate):
         self.glogger.info(f"设置播放倍速: {rate}x")
-        for player in self.players.values():
-            player.set_rate(rate)
-
         # 更新当前倍数状态
         self.current_speed = rate
-        self.glogger.info(f"当前倍数状态已更新为: {self.current_speed}")
+        self.glogger.debug(f"当前倍数状态已更新为: {self.current_speed}")
+
+        effective_rate = self.effective_speed()
+        for player in self.players.values():
+            player.set_rate(effective_rate)
+        self.visibility_scheduler.on_rate(effective_rate)
+        self.update_proxy_mode()
 
         # 同步更新底部下拉框
         speed_text = f"{rate}x"
@@ -553,7 +709,7 @@ class TeslaCamPlayerWidget(QWidget):
                 # 验证更新是否成功
                 current_text = self.speed_box.currentText()
                 if current_text == speed_text:
-                    self.glogger.info(f"底部下拉框已更新为: {speed_text}")
+                    self.glogger.debug(f"底部下拉框已更新为: {speed_text}")
                 else:
                     self.glogger.warning(
                         f"底部下拉框更新失败: 期望 {speed_text}, 实际 {current_text}")
@@ -566,7 +722,7 @@ class TeslaCamPlayerWidget(QWidget):
                         QApplication.processEvents()
                         current_text = self.speed_box.currentText()
                         if current_text == speed_text:
-                            self.glogger.info(
+                            self.glogger.debug(
                                 f"底部下拉框通过索引更新成功: {speed_text} (索引: {index})")
                         else:
                             self.glogger.error(
@@ -583,7 +739,7 @@ class TeslaCamPlayerWidget(QWidget):
         if hasattr(self, 'context_menu') and self.context_menu is not None:
             try:
                 self.context_menu.update_speed_selection(rate)
-                self.glogger.info(f"右键菜单勾选状态已更新为: {rate}")
+                self.glogger.debug(f"右键菜单勾选状态已更新为: {rate}")
             except Exception as e:
                 self.glogger.error(f"更新右键菜单失败: {e}")
         else:
@@ -595,19 +751,157 @@ class TeslaCamPlayerWidget(QWidget):
             player.audio_set_volume(volume)
 
     def seek_all(self, position):
-        self.glogger.info(f"跳转进度: {position:.3f}")
-        for player in self.players.values():
+        self.glogger.debug(f"跳转进度: {position:.3f}")
+        # 挂起的视角恢复可见时会同步到主时钟，这里只跳转参与解码的视角
+        active = self.visibility_scheduler.active_players()
+        for player in active.values():
             player.set_position(position)
+        self.visibility_scheduler.on_seek(position)
+        self.metrics.mark_seek(
+            list(active), position * self.visibility_scheduler.length_ms())
+
+    def set_metrics_enabled(self, enabled, interval_ms=None):
+        """开启/关闭播放指标采集，开启时显示调试面板并写入指标文件"""
+        if interval_ms:
+            self.metrics_interval_ms = int(interval_ms)
+        self.glogger.info(
+            f"播放指标: {'开启' if enabled else '关闭'}, 间隔 {self.metrics_interval_ms}ms")
+        self.metrics.set_enabled(enabled)
+        self.metrics_panel.setVisible(enabled)
+        self.context_menu.metrics_action.blockSignals(True)
+        self.context_menu.metrics_action.setChecked(enabled)
+        self.context_menu.metrics_action.blockSignals(False)
+        if enabled:
+            self.metrics_timer.start(self.metrics_interval_ms)
+        else:
+            self.metrics_timer.stop()
+
+    def _sample_metrics(self):
+        scheduler = self.visibility_scheduler
+        record = self.metrics.sample(
+            scheduler.master_time(),
+            set(scheduler.active_players()),
+            context={
+                "group_index": self.current_index,
+                "main_view": self.current_main_view,
+                "speed": self.current_speed,
+                "effective_speed": self.effective_speed(),
+                "quality_level": self.quality_controller.level,
+                "proxy": self.using_proxy,
+            })
+        self.metrics_panel.show_record(record)
+
+    def set_proxy_enabled(self, enabled):
+        """启用/关闭代理视频，启用时在后台为当前目录的片段生成代理"""
+        self.glogger.info(f"代理视频: {'启用' if enabled else '关闭'}")
+        self.proxy_manager.set_enabled(enabled)
+        self.context_menu.proxy_action.blockSignals(True)
+        self.context_menu.proxy_action.setChecked(enabled)
+        self.context_menu.proxy_action.blockSignals(False)
+        if enabled and self.video_group_dict:
+            self.proxy_manager.request_groups(
+                self.video_groups, self.current_index)
+        self.update_proxy_mode()
+
+    def update_proxy_mode(self):
+        """按倍速、拖动及播放状态在代理文件与原始文件之间切换"""
+        want = self.proxy_manager.wants_proxy(
+            self.current_speed, self.visibility_scheduler.playing, self.scrubbing)
+        if want == self.using_proxy:
+            return
+        self.using_proxy = want
+        self.glogger.info(f"切换到{'代理' if want else '原始'}视频")
+        self._switch_sources()
+
+    def _switch_sources(self):
+        """保持当前时间与播放状态，将各视角切换到应使用的文件"""
+        if not self.current_group:
+            return
+        scheduler = self.visibility_scheduler
+        start_ms = int(scheduler.master_time())
+        playing = scheduler.playing
+        active = scheduler.active_players()
+        for view, path in self.current_group.items():
+            source = self._source_for(path, view)
+            options = self._options_for(view)
+            if (source, tuple(options)) == self.current_sources.get(view):
+                continue
+            self._set_view_media(view, source, start_ms=start_ms,
+                                 paused=not playing, options=options)
+            # 挂起的视角在恢复可见时再同步，这里只启动参与解码的视角
+            if view in active:
+                self.players[view].play()
+                self.players[view].set_rate(self.effective_speed())
+
+    def _sample_quality(self):
+        """采样解码统计并交给播放质量控制器，等级变化时立即应用"""
+        scheduler = self.visibility_scheduler
+        deltas = self.stats_sampler.sample(list(scheduler.active_players()))
+        if not scheduler.playing:
+            self.quality_controller.reset()
+            return
+        level = self.quality_controller.update(deltas)
+        if level is not None:
+            self._apply_quality_level(level)
+
+    def _apply_quality_level(self, level):
+        self.infoEmitted.emit(tr(f"player.quality.level.{level}"))
+        self._switch_sources()
+        for player in self.players.values():
+            player.set_rate(self.effective_speed())
+
+    def _on_proxy_ready(self, src, proxy):
+        if self.using_proxy and self.current_group and src in self.current_group.values():
+            self._switch_sources()
+
+    def on_slider_pressed(self):
+        self.scrubbing = True
+        self.seek_coalescer.reset_stats()
+        self.update_proxy_mode()
+
+    def on_slider_moved(self, value):
+        # 拖动中只记录最新目标，由定时器合并下发快速 seek
+        self.seek_coalescer.request(value / 1000.0)
+        if not self.seek_timer.isActive():
+            self.seek_timer.start()
+
+    def on_slider_released(self):
+        self.scrubbing = False
+        self.update_proxy_mode()
+        position = self.progress_slider.value() / 1000.0
+        self.glogger.info(f"跳转进度: {position:.3f}")
+        # 松开时做一次精确 seek
+        self.seek_coalescer.request(position, precise=True)
+        self._pump_seeks()
+        if not self.seek_timer.isActive():
+            self.seek_timer.start()
+
+    def _pump_seeks(self):
+        coalescer = self.seek_coalescer
+        target = coalescer.target
+        sent = coalescer.pump()
+        if sent:
+            self.visibility_scheduler.on_seek(target)
+            self.metrics.mark_seek(
+                sent, target * self.visibility_scheduler.length_ms())
+        if coalescer.idle:
+            self.seek_timer.stop()
+            self.glogger.debug(
+                f"seek 合并: 请求 {coalescer.requested}, 下发 {coalescer.issued}, "
+                f"生效 {coalescer.applied}, 超时 {coalescer.timed_out}")
+
+    def retranslate_ui(self):
+        """切换语言后更新主视角下拉框和播放按钮的文字"""
+        self.main_view_box.blockSignals(True)
+        for i, view in enumerate(VIEW_KEYS):
+            self.main_view_box.setItemText(i, view_text(view))
+        self.main_view_box.blockSignals(False)
+        playing = self.visibility_scheduler.is_playing()
+        self.play_pause_all_btn.setText(tr("player.pause" if playing else "player.play"))
 
     def set_main_view(self, view_text):
         """根据当前语言下拉框显示文本设置主视角。"""
-        text_to_view = {
-            tr("player.view.front"): 'front',
-            tr("player.view.back"): 'back',
-            tr("player.view.left"): 'left',
-            tr("player.view.right"): 'right',
-        }
-        view = text_to_view.get(view_text)
+        view = view_from_text(view_text)
         if not view:
             self.glogger.warning(f"未知主视角文本: {view_text}")
             return
@@ -616,6 +910,8 @@ class TeslaCamPlayerWidget(QWidget):
         self.current_main_view = view
         self.current_view = view
         self.setup_video_widgets()
+        if self.quality_controller.level > QualityController.LEVEL_FULL:
+            self._switch_sources()
 
         # 同步更新底部下拉框
         if hasattr(self, 'main_view_box'):
@@ -628,8 +924,22 @@ class TeslaCamPlayerWidget(QWidget):
             self.context_menu.update_view_selection(view)
 
     def update_ui(self):
-        # 自动下一组播放
-        if all(player.get_state() == vlc.State.Ended for player in self.players.values()):
+        if not self.video_groups:
+            return
+
+        scheduler = self.visibility_scheduler
+        scheduler.refresh()
+        self._sample_quality()
+
+        # 自动下一组播放：有视角在解码时以其播放结束为准，全部挂起时以共享时钟为准
+        active_players = scheduler.active_players()
+        if active_players:
+            group_ended = all(player.get_state() == vlc.State.Ended
+                              for player in active_players.values())
+        else:
+            group_ended = scheduler.clock_finished()
+
+        if group_ended:
             self.current_index += 1
             if self.current_index >= len(self.video_groups):
                 self.current_index = 0
@@ -639,11 +949,12 @@ class TeslaCamPlayerWidget(QWidget):
             self.play_all()
             self.time_point_list.setCurrentRow(self.current_index)
 
-        # 更新进度条
-        pos = self.players['front'].get_position()
-        self.progress_slider.blockSignals(True)
-        self.progress_slider.setValue(int(pos * 1000))
-        self.progress_slider.blockSignals(False)
+        # 更新进度条（拖动中不覆盖用户拖动的位置）
+        if not self.scrubbing:
+            pos = scheduler.master_position()
+            self.progress_slider.blockSignals(True)
+            self.progress_slider.setValue(int(pos * 1000))
+            self.progress_slider.blockSignals(False)
 
     def build_controls(self):
         layout = QHBoxLayout()
@@ -661,17 +972,18 @@ class TeslaCamPlayerWidget(QWidget):
         self.play_pause_all_btn.setIcon(qta.icon('mdi.play', color='#ffffff'))
 
         # stop_btn = QPushButton("⏹ 停止")
-        stop_btn = QPushButton(tr("player.menu.stop"))
+        stop_btn = bind(QPushButton(), "player.menu.stop")
         stop_btn.clicked.connect(self.stop_all)
-        stop_btn.setToolTip(tr("player.menu.stop"))
+        bind(stop_btn, "player.menu.stop", "setToolTip")
         stop_btn.setIconSize(QSize(18, 18))
         # stop_btn.setIcon(self.stop_icon)
         stop_btn.setIcon(qta.icon('mdi.stop', color='#ffffff'))
 
         self.progress_slider = QSlider(Qt.Horizontal)
         self.progress_slider.setRange(0, 1000)
-        self.progress_slider.sliderMoved.connect(
-            lambda val: self.seek_all(val / 1000.0))
+        self.progress_slider.sliderMoved.connect(self.on_slider_moved)
+        self.progress_slider.sliderPressed.connect(self.on_slider_pressed)
+        self.progress_slider.sliderReleased.connect(self.on_slider_released)
 
         self.volume_slider = QSlider(Qt.Horizontal)
         self.volume_slider.setMaximumWidth(120)
@@ -689,17 +1001,11 @@ class TeslaCamPlayerWidget(QWidget):
             lambda text: self.set_rate_all(float(text[:-1])))
 
         self.main_view_box = QComboBox()
-        self.main_view_box.setPlaceholderText(
-            tr("combiner.main_view.placeholder"))
-        self.main_view_box.setToolTip(tr("combiner.main_view.tooltip"))
-        self.main_view_box.addItems([
-            tr("player.view.front"),
-            tr("player.view.back"),
-            tr("player.view.left"),
-            tr("player.view.right"),
-        ])
+        bind(self.main_view_box, "combiner.main_view.placeholder", "setPlaceholderText")
+        bind(self.main_view_box, "combiner.main_view.tooltip", "setToolTip")
+        self.main_view_box.addItems([view_text(view) for view in VIEW_KEYS])
         self.main_view_box.setMinimumWidth(100)
-        self.main_view_box.setCurrentText(tr("player.view.front"))
+        self.main_view_box.setCurrentText(view_text("front"))
         self.main_view_box.currentTextChanged.connect(
             lambda text: self.set_main_view(text))
 
@@ -756,10 +1062,21 @@ class TeslaCamPlayerWidget(QWidget):
         if folder and os.path.exists(folder):
             self.load_all(folder)
 
-    def load_all(self, folder):
+    def open_event_folder(self, folder):
+        """从事件库列表打开事件文件夹"""
+        self.glogger.info(f"打开事件: {folder}")
+        self.inputFolderPath = folder
+        self.folderChanged.emit(folder)
+        # 事件来自当前事件库，保留列表，不重新扫描
+        self.load_all(folder, rescan_library=False)
+
+    def load_all(self, folder, rescan_library=True):
         self.inputFolderPath = folder
 
         self.glogger.info(f"加载目录: {folder}")
+        self.library_panel.set_folder(folder, rescan_library)
+        # 入点/出点以片段组序号记录，换目录后失效
+        self.range_in = self.range_out = None
         self.stop_all()
         self.current_index = 0
 
@@ -790,16 +1107,14 @@ class TeslaCamPlayerWidget(QWidget):
             self.time_point_list.addItem(display_name)
         self.time_point_list.setCurrentRow(self.current_index)
 
+        self.proxy_manager.request_groups(self.video_groups, self.current_index)
+
         self.load_video_group(self.video_groups[self.current_index])
         # self.play_all()
 
     def is_vlc_installed(self):
-        try:
-            instance = vlc.Instance()
-            instance.media_player_new()
-            return True
-        except Exception as e:
-            return False
+        # 复用播放器已创建的 libVLC 实例，不再单独创建一个用于检测
+        return self.vlc_instance is not None
 
     def get_libvlc_version(self):
         return vlc.libvlc_get_version()
@@ -839,6 +1154,137 @@ class TeslaCamPlayerWidget(QWidget):
         # 显示菜单
         self.context_menu.exec_(global_pos)
 
+    def current_point(self):
+        """当前播放位置（片段组序号 + 组内毫秒）"""
+        from RangeExport import RangePoint
+
+        scheduler = self.visibility_scheduler
+        return RangePoint(self.current_index,
+                          scheduler.master_position() * scheduler.length_ms())
+
+    def _format_point(self, point):
+        names = list(self.video_group_dict or {})
+        name = names[point.index] if point.index < len(names) else str(point.index)
+        seconds = point.ms // 1000
+        return f"{name} +{seconds // 60:02d}:{seconds % 60:02d}"
+
+    def mark_in(self):
+        if not self.video_group_dict:
+            return
+        self.range_in = self.current_point()
+        self.glogger.info(f"设置入点: {self.range_in}")
+        self.infoEmitted.emit(tr("player.range.in_set", point=self._format_point(self.range_in)))
+
+    def mark_out(self):
+        if not self.video_group_dict:
+            return
+        self.range_out = self.current_point()
+        self.glogger.info(f"设置出点: {self.range_out}")
+        self.infoEmitted.emit(tr("player.range.out_set", point=self._format_point(self.range_out)))
+
+    def clear_range(self):
+        self.range_in = self.range_out = None
+        self.infoEmitted.emit(tr("player.range.cleared"))
+
+    def _warn(self, message):
+        if self.enable_dialogs:
+            QMessageBox.warning(self, "提示", message)
+        else:
+            self.warningEmitted.emit(message)
+
+    def export_selection(self, view=None):
+        """导出入点到出点之间的区间（view 为 None 时导出全部视角）"""
+        if self.range_in is None or self.range_out is None:
+            self._warn(tr("player.range.need_marks"))
+            return
+        if self.range_export_worker is not None and self.range_export_worker.isRunning():
+            self._warn(tr("player.range.busy"))
+            return
+
+        from RangeExport import RangePoint, RangeExportWorker, VIEWS
+
+        start, end = sorted((self.range_in, self.range_out), key=RangePoint.key)
+        if start.key() == end.key():
+            self._warn(tr("player.range.need_marks"))
+            return
+
+        output_folder = os.path.join(self.inputFolderPath, "temps")
+        if self.enable_file_dialog:
+            folder = QFileDialog.getExistingDirectory(
+                self, tr("filedialog.select_folder"), output_folder
+                if os.path.isdir(output_folder) else self.inputFolderPath)
+            if not folder:
+                return
+            output_folder = folder
+
+        names = list(self.video_group_dict)
+        name = f"{names[start.index]}+{start.ms // 1000}s"
+        self.glogger.info(f"区间导出: {start} -> {end}, 视角: {view or '全部'}, 输出: {output_folder}")
+        self.range_export_worker = RangeExportWorker(
+            list(self.video_groups), start, end, output_folder,
+            views=(view,) if view else VIEWS,
+            accurate=self.context_menu.range_accurate_action.isChecked(),
+            name=name, parent=self)
+        self.range_export_worker.exportFinished.connect(self._on_range_exported)
+        self.range_export_worker.start()
+        self.infoEmitted.emit(tr("player.range.exporting"))
+
+    def _on_range_exported(self, ok, message):
+        if ok:
+            self.infoEmitted.emit(tr("player.range.exported", folder=message))
+        else:
+            self.infoEmitted.emit(tr("player.range.failed"))
+            self._warn(tr("player.range.failed") + f"\n{message}")
+
+    def _snapshot_caption(self, point):
+        from Snapshot import clip_time
+        from LibraryIndex import LibraryIndex
+
+        names = list(self.video_group_dict or {})
+        when = clip_time(names[point.index], point.ms) if point.index < len(names) else None
+        parts = [when.strftime("%Y-%m-%d %H:%M:%S")] if when else []
+        try:
+            if os.path.exists(os.path.join(self.inputFolderPath, "event.json")):
+                address = LibraryIndex.read_event(self.inputFolderPath)["address"]
+                if address:
+                    parts.append(address)
+        except Exception as ex:
+            self.glogger.warning(f"事件信息读取失败: {ex}")
+        return "  ".join(parts)
+
+    def take_snapshot(self):
+        """按当前时间截取四个视角的原始画面并合成为一张图片"""
+        if not self.video_group_dict or not self.current_group:
+            self._warn(tr("player.snapshot.no_video"))
+            return
+        if self.snapshot_worker is not None and self.snapshot_worker.isRunning():
+            return
+
+        point = self.current_point()
+        caption = None
+        if self.context_menu.snapshot_caption_action.isChecked():
+            caption = self._snapshot_caption(point)
+        names = list(self.video_group_dict)
+        output_path = os.path.join(
+            self.inputFolderPath, "temps",
+            f"snapshot-{names[point.index]}+{point.ms:06d}ms.png")
+
+        from Snapshot import SnapshotWorker
+
+        self.glogger.info(f"截取快照: {point}, 输出: {output_path}")
+        self.snapshot_worker = SnapshotWorker(
+            self.current_group, point.ms / 1000, self.current_main_view,
+            output_path, caption, self)
+        self.snapshot_worker.snapshotFinished.connect(self._on_snapshot_finished)
+        self.snapshot_worker.start()
+
+    def _on_snapshot_finished(self, ok, message):
+        if ok:
+            self.infoEmitted.emit(tr("player.snapshot.saved", path=message))
+        else:
+            self.infoEmitted.emit(tr("player.snapshot.failed"))
+            self._warn(tr("player.snapshot.failed") + f"\n{message}")
+
     def show_combine_export(self):
         """打开 TeslaCam 片段合成导出窗口"""
         # 确保当前已选择有效的视频文件夹
@@ -875,15 +1321,7 @@ class TeslaCamPlayerWidget(QWidget):
                 )
 
             # 同步主视角（以当前播放主视角为准）
-            view_map = {
-                "front": "前",
-                "back": "后",
-                "left": "左",
-                "right": "右",
-            }
-            zh_view = view_map.get(getattr(self, "current_view", "front"), "前")
-            if hasattr(self.clip_combiner_win, "mainViewBox"):
-                self.clip_combiner_win.mainViewBox.setCurrentText(zh_view)
+            self.clip_combiner_win.selectMainView(self.current_main_view)
 
             self.clip_combiner_win.show()
             self.clip_combiner_win.raise_()
@@ -896,21 +1334,43 @@ class TeslaCamPlayerWidget(QWidget):
             else:
                 self.warningEmitted.emit("打开合成导出窗口失败")
 
+    def showEvent(self, event):
+        # 窗口句柄在首次显示后才稳定，此时再监听顶层窗口的最小化/隐藏
+        self.visibility_scheduler.attach_window(self.window())
+        return super().showEvent(event)
+
     def resizeEvent(self, event):
         # # 获取屏幕分辨率
         # screen = QDesktopWidget().screenGeometry()
 
         return super().resizeEvent(event)
 
-    def closeEvent(self, event):
+    def shutdown(self):
+        """退出前停止后台线程并释放 VLC；Qt 不会向子控件发送 closeEvent，由主窗口关闭时调用"""
+        if self._shut_down:
+            return
+        self._shut_down = True
+        self.timer.stop()
+        self.seek_timer.stop()
+        self.library_panel.stop_scan()
+        for worker in (self.range_export_worker, self.snapshot_worker):
+            if worker is not None:
+                worker.wait()
+        self.metrics_timer.stop()
+        self.metrics.set_enabled(False)
+        self.proxy_manager.stop()
         for player in self.players.values():
             player.stop()
+        for media in self.current_media.values():
+            self.media_pool.release(media)
+        self.current_media = {}
+        self.media_pool.clear()
         for player in self.players.values():
             player.release()
-        for instance in self.instances.values():
-            instance.release()
-        self.timer.stop()
+        self.vlc_instance.release()
 
+    def closeEvent(self, event):
+        self.shutdown()
         return super().closeEvent(event)
 
     # def show_export_dialog(self):
@@ -998,4 +1458,12 @@ class TeslaCamPlayerWidget(QWidget):
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Escape:
             self.play_pause_all()
+        elif event.key() == Qt.Key_F12:
+            self.set_metrics_enabled(not self.metrics.enabled)
+        elif event.key() == Qt.Key_S:
+            self.take_snapshot()
+        elif event.key() == Qt.Key_I:
+            self.mark_in()
+        elif event.key() == Qt.Key_O:
+            self.mark_out()
         return super().keyPressEvent(event)
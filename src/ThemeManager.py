@@ -3,22 +3,52 @@
 """
 TeslaCam Player 主题管理器
 基于 qt_material 的主题切换功能
+
+qt_material 每次应用主题都要渲染样式模板并重新生成图标文件，因此编译结果缓存在用户目录：
+- 每个主题一份完整的 QSS（图标引用已替换为绝对路径）和生成的图标，
+  以应用版本和 qt_material 版本区分，版本变化后重新编译；
+- 命中缓存时直接读取 QSS 设置到应用上，不导入 qt_material、不渲染模板；
+- 已应用过的主题在内存中保留 QSS，再次切换只需设置样式表。
 """
 
 import os
-import configparser
+import json
+import shutil
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
-from qt_material import apply_stylesheet
+
+import GlobalConfig
+from ConfigService import get_config
+
+
+# 主题编译缓存目录
+THEME_CACHE_DIR = os.path.join(GlobalConfig.USER_DIR, "theme-cache")
+# 与 qt_material 相同：占位文字使用主题主色，透明度 92/255
+PLACEHOLDER_ALPHA = 92
+
+
+def _qt_material_version():
+    """不导入 qt_material 读取其版本号"""
+    try:
+        from importlib.metadata import version
+        return version("qt-material")
+    except Exception:
+        return "unknown"
 
 
 class ThemeManager:
     """主题管理器"""
     
-    def __init__(self):
+    def __init__(self, cache_dir=THEME_CACHE_DIR):
         self.current_theme = "light_blue"
         self.app = None
+        self.cache_dir = cache_dir
+        self._cache_key = None
+        # 主题 ID -> 编译结果 {qss, primary, fonts}
+        self._compiled = {}
+        # Roboto 字体只需注册一次；编译主题时 qt_material 已注册
+        self._fonts_registered = False
         
         # 定义可用主题（基于 qt_material 常见支持的主题）
         self.themes = {
@@ -72,6 +102,15 @@ class ThemeManager:
         """获取所有可用主题"""
         return self.filter_available_themes()
     
+    def is_theme_available(self, theme_id):
+        """主题是否可用；已编译缓存的主题不需要导入 qt_material 检查"""
+        if theme_id not in self.themes:
+            return False
+        if theme_id in self._compiled or os.path.exists(
+                os.path.join(self.theme_cache_dir(theme_id), "style.qss")):
+            return True
+        return theme_id in self.get_available_themes()
+
     def get_current_theme(self):
         """获取当前主题"""
         return self.current_theme
@@ -89,13 +128,99 @@ class ThemeManager:
             return False
         
         try:
-            theme_file = self.themes[theme_id]["file"]
-            apply_stylesheet(self.app, theme=theme_file)
+            compiled = (self._compiled.get(theme_id)
+                        or self.load_compiled(theme_id)
+                        or self.compile_theme(theme_id))
+            self._compiled[theme_id] = compiled
+            self._apply_compiled(compiled)
             self.current_theme = theme_id
             return True
         except Exception as e:
             print(f"应用主题失败: {e}")
             return False
+
+    # ******************** 编译缓存 ********************
+
+    def cache_key(self):
+        if self._cache_key is None:
+            self._cache_key = f"{GlobalConfig.APP_VERSION}-{_qt_material_version()}"
+        return self._cache_key
+
+    def theme_cache_dir(self, theme_id):
+        return os.path.join(self.cache_dir, self.cache_key(), theme_id)
+
+    def load_compiled(self, theme_id):
+        """读取缓存的编译结果，不存在或已失效时返回 None"""
+        folder = self.theme_cache_dir(theme_id)
+        try:
+            with open(os.path.join(folder, "theme.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(os.path.join(folder, "style.qss"), "r", encoding="utf-8") as f:
+                qss = f.read()
+        except (OSError, ValueError):
+            return None
+        # qt_material 安装位置变化（如重新安装）时字体路径失效
+        if not all(os.path.exists(path) for path in meta.get("fonts", [])):
+            return None
+        return {"qss": qss, "primary": meta.get("primary"), "fonts": meta.get("fonts", [])}
+
+    def compile_theme(self, theme_id):
+        """用 qt_material 渲染主题并写入缓存"""
+        # qt_material 导入较慢，需要编译主题时再加载
+        import qt_material
+
+        folder = self.theme_cache_dir(theme_id)
+        icons = os.path.join(folder, "icons")
+        os.makedirs(icons, exist_ok=True)
+        theme_file = self.themes[theme_id]["file"]
+        qss = qt_material.build_stylesheet(theme=theme_file, parent=icons)
+        self._fonts_registered = True
+        if qss is None:
+            raise ValueError(f"qt_material 无法加载主题: {theme_file}")
+        # 与 export_theme 相同，把 icon:/ 换成图标目录，不再依赖 QDir 搜索路径
+        qss = qss.replace("icon:/", icons.replace("\\", "/") + "/")
+
+        fonts_dir = os.path.join(os.path.dirname(qt_material.__file__), "fonts", "roboto")
+        fonts = sorted(os.path.join(fonts_dir, name) for name in os.listdir(fonts_dir)
+                       if name.endswith(".ttf"))
+        compiled = {
+            "qss": qss,
+            "primary": qt_material.get_theme(theme_file)["primaryColor"],
+            "fonts": fonts,
+        }
+        for name, content in (
+                ("style.qss", qss),
+                ("theme.json", json.dumps({"primary": compiled["primary"], "fonts": fonts}))):
+            tmp = os.path.join(folder, name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp, os.path.join(folder, name))
+        self._remove_stale_caches()
+        return compiled
+
+    def _remove_stale_caches(self):
+        """删除其他版本留下的缓存"""
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if name != self.cache_key():
+                shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+
+    def _apply_compiled(self, compiled):
+        if not self._fonts_registered:
+            # 从缓存读取时没有经过 qt_material，需要自己注册字体
+            for path in compiled["fonts"]:
+                QFontDatabase.addApplicationFont(path)
+            self._fonts_registered = True
+        if compiled["primary"]:
+            palette = QGuiApplication.palette()
+            color = QColor(compiled["primary"])
+            color.setAlpha(PLACEHOLDER_ALPHA)
+            palette.setColor(QPalette.PlaceholderText, color)
+            QGuiApplication.setPalette(palette)
+        self.app.setStyleSheet(compiled["qss"])
     
     def set_current_theme(self, theme_id):
         """设置当前主题（不应用，仅更新状态）"""
@@ -104,34 +229,22 @@ class ThemeManager:
             return True
         return False
     
-    def load_theme_from_config(self, config_path):
+    def load_theme_from_config(self, config_path=None):
         """从配置文件加载主题"""
-        if os.path.exists(config_path):
-            try:
-                config = configparser.ConfigParser()
-                config.read(config_path, encoding='utf-8')
-                theme = config.get("Settings", "theme", fallback="light_blue")
-                if theme in self.themes:
-                    self.current_theme = theme
-                    return theme
-            except Exception as e:
-                print(f"读取主题配置失败: {e}")
+        try:
+            theme = get_config(config_path).section("Settings").get(
+                "theme", fallback="light_blue")
+            if theme in self.themes:
+                self.current_theme = theme
+                return theme
+        except Exception as e:
+            print(f"读取主题配置失败: {e}")
         return "light_blue"
     
-    def save_theme_to_config(self, config_path):
-        """保存主题到配置文件"""
+    def save_theme_to_config(self, config_path=None):
+        """保存主题到配置文件（由配置服务延迟写入）"""
         try:
-            if os.path.exists(config_path):
-                config = configparser.ConfigParser()
-                config.read(config_path, encoding='utf-8')
-                config.set("Settings", "theme", self.current_theme)
-                with open(config_path, "w", encoding="utf-8") as f:
-                    config.write(f)
-            else:
-                # 创建新配置文件
-                with open(config_path, "w", encoding="utf-8") as f:
-                    f.write("[Settings]\n")
-                    f.write(f"theme = {self.current_theme}\n")
+            get_config(config_path).set("Settings", "theme", self.current_theme)
             return True
         except Exception as e:
             print(f"保存主题配置失败: {e}")
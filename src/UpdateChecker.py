@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 更新检查
+
+在后台线程中查询 GitHub Releases API，界面线程不再等待网络：
+- 最近一次的 Release 信息连同 ETag/Last-Modified 缓存在用户目录，
+  再次检查时发送条件请求（If-None-Match/If-Modified-Since），未变化时服务器只返回 304，
+  直接使用缓存内容（304 不计入 GitHub API 的访问次数限制）；
+- 可选的启动检查：窗口首次绘制完成后延迟一段时间才开始，且距离上次检查不足间隔时跳过。
+"""
+
+# 标准库
+import os
+import json
+import time
+import logging
+
+# 三方库
+import requests
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# 自研库
+import GlobalConfig
+
+
+RELEASES_API = "https://api.github.com/repos/JerryYu2014/TeslaCamPlayer/releases/latest"
+CACHE_PATH = os.path.join(GlobalConfig.USER_DIR, "release-cache.json")
+# (连接超时, 读取超时) 秒
+TIMEOUT = (5, 10)
+
+
+class ReleaseCache:
+    """最近一次 Release 信息及其 ETag/Last-Modified"""
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self.url = None
+        self.etag = None
+        self.last_modified = None
+        self.fetched_at = 0.0
+        self.data = None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            self.url = cached.get("url")
+            self.etag = cached.get("etag")
+            self.last_modified = cached.get("last_modified")
+            self.fetched_at = cached.get("fetched_at", 0.0)
+            self.data = cached.get("data")
+        except (OSError, ValueError):
+            pass
+
+    def matches(self, url):
+        return self.data is not None and self.url == url
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "url": self.url,
+                "etag": self.etag,
+                "last_modified": self.last_modified,
+                "fetched_at": self.fetched_at,
+                "data": self.data,
+            }, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+def fetch_latest_release(api_url=RELEASES_API, cache=None, max_age=0, proxies=None,
+                         timeout=TIMEOUT):
+    """返回 (Release 信息, 来源)；来源为 cache（未请求）、not_modified（304）或 network"""
+    glogger = logging.getLogger("UpdateChecker")
+    cache = cache if cache is not None else ReleaseCache()
+    cached = cache.matches(api_url)
+    if cached and max_age and time.time() - cache.fetched_at < max_age:
+        return cache.data, "cache"
+
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "User-Agent": f"TeslaCamPlayer/{GlobalConfig.APP_VERSION}",
+    }
+    if cached:
+        if cache.etag:
+            headers["If-None-Match"] = cache.etag
+        if cache.last_modified:
+            headers["If-Modified-Since"] = cache.last_modified
+
+    started = time.perf_counter()
+    resp = requests.get(api_url, headers=headers, timeout=timeout, proxies=proxies)
+    if resp.status_code == 304 and cached:
+        source = "not_modified"
+    else:
+        resp.raise_for_status()
+        cache.url = api_url
+        cache.data = resp.json()
+        cache.etag = resp.headers.get("ETag")
+        cache.last_modified = resp.headers.get("Last-Modified")
+        source = "network"
+    cache.fetched_at = time.time()
+    try:
+        cache.save()
+    except OSError as ex:
+        glogger.warning(f"Release 缓存写入失败: {ex}")
+    glogger.info(f"检查更新: {source}, 耗时 {(time.perf_counter() - started) * 1000:.0f}ms")
+    return cache.data, source
+
+
+def startup_check_due(last_check, interval_hours=GlobalConfig.UPDATE_CHECK_INTERVAL_HOURS, now=None):
+    """距离上次检查（时间戳）已超过间隔"""
+    now = time.time() if now is None else now
+    return now - (last_check or 0) >= interval_hours * 3600
+
+
+class UpdateCheckWorker(QThread):
+    """后台检查更新；失败时 Release 信息为空字典，附带错误信息"""
+
+    updateChecked = pyqtSignal(bool, dict, str)  # 是否手动检查, Release 信息, 错误信息
+
+    def __init__(self, manual=True, api_url=RELEASES_API, parent=None):
+        super().__init__(parent)
+        self.manual = manual
+        self.api_url = api_url
+        self.glogger = logging.getLogger("UpdateCheckWorker")
+
+    def run(self):
+        try:
+            data, _ = fetch_latest_release(self.api_url)
+            self.updateChecked.emit(self.manual, data or {}, "")
+        except Exception as ex:
+            self.glogger.warning(f"检查更新失败: {ex}")
+            self.updateChecked.emit(self.manual, {}, str(ex))
@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 更新下载
+
+分段、可续传的安装包下载：
+- 服务器支持 Range 时把文件分成几段并行下载，写入预分配的临时文件（<文件名>.part）；
+- 每段的下载位置保存在状态文件（<文件名>.part.json）中，网络断开后从断点重试，
+  取消或程序退出后再次下载时从上次的位置继续；文件在服务器上变化（ETag/Last-Modified 不同）时重新下载；
+- 按块（默认 1MB）读取写入，进度按固定间隔上报，而不是每块一次；
+- 下载完成后与 Release 提供的 SHA-256 校验值比较，一致才重命名为最终文件名。
+"""
+
+# 标准库
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+
+# 三方库
+import requests
+
+# 自研库
+import GlobalConfig
+
+
+# 临时文件后缀，状态文件为临时文件名再加 .json
+PART_SUFFIX = ".part"
+# 小于 MIN_SEGMENT_CHUNKS 个块的部分不再拆分
+MIN_SEGMENT_CHUNKS = 4
+# 重试等待时间：BACKOFF_BASE * 2^n 秒，不超过 BACKOFF_MAX
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 10.0
+# (连接超时, 读取超时) 秒
+TIMEOUT = (10, 30)
+# Release 中可能存放校验值的附件名
+CHECKSUM_ASSETS = ("SHA256SUMS", "SHA256SUMS.txt", "sha256sums.txt", "checksums.txt")
+
+
+class DownloadError(Exception):
+    """无法继续的下载错误"""
+
+
+class ChecksumError(DownloadError):
+    """下载完成但 SHA-256 不一致"""
+
+
+def sha256_file(path, chunk_size=GlobalConfig.UPDATE_CHUNK_SIZE):
+    digest = hashlib.sha256()
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+
+def _parse_checksum(text, name):
+    """解析 "<hash>  <文件名>" 格式（sha256sum 输出）或只有一个哈希值的文本"""
+    lines = [line.split() for line in text.splitlines() if line.strip()]
+    for parts in lines:
+        if len(parts) >= 2 and parts[-1].lstrip("*") == name:
+            return parts[0].lower()
+    if len(lines) == 1 and len(lines[0][0]) == 64:
+        return lines[0][0].lower()
+    return None
+
+
+def release_sha256(asset, assets, proxies=None):
+    """查找安装包的 SHA-256：优先用 GitHub 提供的 digest 字段，其次是 <文件名>.sha256 或 SHA256SUMS 附件"""
+    digest = asset.get("digest") or ""
+    if digest.startswith("sha256:"):
+        return digest[len("sha256:"):].lower()
+
+    name = asset.get("name", "")
+    by_name = {a.get("name"): a for a in assets}
+    for candidate in (f"{name}.sha256",) + CHECKSUM_ASSETS:
+        sidecar = by_name.get(candidate)
+        if not sidecar or not sidecar.get("browser_download_url"):
+            continue
+        try:
+            resp = requests.get(sidecar["browser_download_url"], timeout=TIMEOUT, proxies=proxies)
+            resp.raise_for_status()
+        except requests.RequestException as ex:
+            logging.getLogger("UpdateDownloader").warning(f"获取校验值失败: {candidate}, 原因: {ex}")
+            continue
+        sha256 = _parse_checksum(resp.text, name)
+        if sha256:
+            return sha256
+    return None
+
+
+class UpdateDownloader:
+    """把 url 下载到 path；run() 返回 path，被停止时返回 None，临时文件保留以便续传"""
+
+    def __init__(self, url, path, sha256=None, proxies=None,
+                 segments=GlobalConfig.UPDATE_SEGMENTS,
+                 chunk_size=GlobalConfig.UPDATE_CHUNK_SIZE,
+                 max_retries=GlobalConfig.UPDATE_MAX_RETRIES,
+                 progress_interval=GlobalConfig.UPDATE_PROGRESS_INTERVAL,
+                 progress=None, should_stop=None):
+        self.url = url
+        self.path = path
+        self.part_path = path + PART_SUFFIX
+        self.state_path = self.part_path + ".json"
+        self.sha256 = sha256.lower() if sha256 else None
+        self.proxies = proxies or None
+        self.segments = max(1, segments)
+        self.chunk_size = max(64 * 1024, chunk_size)
+        self.max_retries = max_retries
+        self.progress_interval = progress_interval
+        # progress(已下载字节, 总字节)，总字节未知时为 0
+        self.progress = progress
+        self.should_stop = should_stop
+        self.glogger = logging.getLogger("UpdateDownloader")
+
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        # 每段 [起始, 结束(含), 下一个要下载的字节]
+        self._ranges = []
+        self._validator = None
+        self._errors = []
+        # 本次实际从网络读取的字节数，用于日志和续传检查
+        self.transferred = 0
+
+    # ******************** 状态文件 ********************
+
+    def _load_state(self, size, validator):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if (state.get("url") != self.url or state.get("size") != size
+                or state.get("validator") != validator
+                or not os.path.exists(self.part_path)
+                or os.path.getsize(self.part_path) != size):
+            return False
+        self._ranges = [list(r) for r in state["ranges"]]
+        return True
+
+    def _save_state(self, size):
+        with self._lock:
+            state = {"url": self.url, "size": size, "validator": self._validator,
+                     "ranges": [list(r) for r in self._ranges]}
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_path)
+
+    def _discard(self):
+        for path in (self.part_path, self.state_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    # ******************** 下载 ********************
+
+    def _probe(self):
+        """请求第一个字节，返回 (总大小或 0, 是否支持 Range, 校验标识)"""
+        with requests.get(self.url, headers={"Range": "bytes=0-0"}, stream=True,
+                          timeout=TIMEOUT, proxies=self.proxies) as r:
+            r.raise_for_status()
+            validator = r.headers.get("ETag") or r.headers.get("Last-Modified")
+            if r.status_code == 206:
+                total = r.headers.get("Content-Range", "").rpartition("/")[2]
+                if total.isdigit():
+                    return int(total), True, validator
+            return int(r.headers.get("Content-Length", 0) or 0), False, validator
+
+    def _split(self, size):
+        count = min(self.segments, max(1, size // (self.chunk_size * MIN_SEGMENT_CHUNKS)))
+        step = -(-size // count)
+        self._ranges = [[start, min(start + step, size) - 1, start]
+                        for start in range(0, size, step)]
+
+    def _fetch_segment(self, index, session):
+        """下载一段，断开时从断点重试；有进展就重新计数"""
+        failures = 0
+        while not self._stop.is_set():
+            with self._lock:
+                start, end, pos = self._ranges[index]
+            if pos > end:
+                return
+            headers = {"Range": f"bytes={pos}-{end}"}
+            if self._validator:
+                # 文件已变化时服务器返回 200 完整内容
+                headers["If-Range"] = self._validator
+            try:
+                with session.get(self.url, headers=headers, stream=True,
+                                 timeout=TIMEOUT, proxies=self.proxies) as r:
+                    r.raise_for_status()
+                    if r.status_code != 206:
+                        raise DownloadError("服务器上的文件已变化或不支持断点续传")
+                    with open(self.part_path, "r+b", buffering=0) as f:
+                        f.seek(pos)
+                        for chunk in r.iter_content(chunk_size=self.chunk_size):
+                            if self._stop.is_set():
+                                return
+                            chunk = chunk[:end + 1 - pos]
+                            f.write(chunk)
+                            pos += len(chunk)
+                            with self._lock:
+                                self._ranges[index][2] = pos
+                                self.transferred += len(chunk)
+                            failures = 0
+                            if pos > end:
+                                return
+                raise requests.ConnectionError(f"连接提前结束: {pos}/{end + 1}")
+            except (requests.RequestException, OSError) as ex:
+                failures += 1
+                if failures > self.max_retries:
+                    raise DownloadError(f"下载失败（已重试 {self.max_retries} 次）: {ex}") from ex
+                delay = min(BACKOFF_BASE * 2 ** (failures - 1), BACKOFF_MAX)
+                self.glogger.info(f"分段 {index} 下载中断，{delay:.1f}s 后从 {pos} 继续: {ex}")
+                self._stop.wait(delay)
+
+    def _segment_thread(self, index):
+        try:
+            with requests.Session() as session:
+                self._fetch_segment(index, session)
+        except Exception as ex:
+            self._errors.append(ex)
+            self._stop.set()
+
+    def _downloaded(self):
+        with self._lock:
+            return sum(pos - start for start, _, pos in self._ranges)
+
+    def _report(self, downloaded, total):
+        if self.progress is not None:
+            self.progress(downloaded, total)
+
+    def _run_segments(self, size):
+        threads = [threading.Thread(target=self._segment_thread, args=(i,), daemon=True)
+                   for i, (_, end, pos) in enumerate(self._ranges) if pos <= end]
+        for t in threads:
+            t.start()
+        alive = threads
+        while alive:
+            # 下载线程只更新计数，由这里按固定间隔上报进度并保存断点
+            alive[0].join(self.progress_interval)
+            if self.should_stop is not None and self.should_stop():
+                self._stop.set()
+            alive = [t for t in threads if t.is_alive()]
+            if alive:
+                self._report(self._downloaded(), size)
+                self._save_state(size)
+        # 所有线程结束后再上报一次，最后一次进度一定是最终的下载量
+        self._report(self._downloaded(), size)
+        self._save_state(size)
+
+    def _run_single(self):
+        """服务器不支持 Range：单连接从头下载，失败时从头重试"""
+        failures = 0
+        while True:
+            downloaded = 0
+            last = 0.0
+            try:
+                with requests.get(self.url, stream=True, timeout=TIMEOUT,
+                                  proxies=self.proxies) as r:
+                    r.raise_for_status()
+                    total = int(r.headers.get("Content-Length", 0) or 0)
+                    with open(self.part_path, "wb") as f:
+                        for chunk in r.iter_content(chunk_size=self.chunk_size):
+                            if self.should_stop is not None and self.should_stop():
+                                return False
+                            f.write(chunk)
+                            downloaded += len(chunk)
+                            self.transferred += len(chunk)
+                            now = time.monotonic()
+                            if now - last >= self.progress_interval:
+                                last = now
+                                self._report(downloaded, total)
+                if total and downloaded != total:
+                    raise requests.ConnectionError(f"连接提前结束: {downloaded}/{total}")
+                self._report(downloaded, total)
+                return True
+            except requests.RequestException as ex:
+                failures += 1
+                if failures > self.max_retries:
+                    raise DownloadError(f"下载失败（已重试 {self.max_retries} 次）: {ex}") from ex
+                delay = min(BACKOFF_BASE * 2 ** (failures - 1), BACKOFF_MAX)
+                self.glogger.info(f"下载中断，{delay:.1f}s 后重新下载: {ex}")
+                time.sleep(delay)
+
+    def run(self):
+        started = time.perf_counter()
+        # 上次已下载完成且校验通过
+        if self.sha256 and os.path.exists(self.path) and sha256_file(self.path) == self.sha256:
+            self.glogger.info(f"安装包已存在且校验通过: {self.path}")
+            return self.path
+
+        size, ranged, validator = self._probe()
+        self._validator = validator
+        if ranged and size:
+            if self._load_state(size, validator):
+                self.glogger.info(f"继续上次的下载: {self._downloaded()}/{size} 字节")
+            else:
+                self._discard()
+                with open(self.part_path, "wb") as f:
+                    f.truncate(size)
+                self._split(size)
+            self._run_segments(size)
+            if self._errors:
+                raise self._errors[0]
+            if self._stop.is_set():
+                self.glogger.info(f"下载已停止，保留临时文件以便续传: {self.part_path}")
+                return None
+        else:
+            self._discard()
+            if not self._run_single():
+                self._discard()
+                return None
+
+        if self.sha256:
+            actual = sha256_file(self.part_path)
+            if actual != self.sha256:
+                self._discard()
+                raise ChecksumError(f"安装包校验失败: 期望 {self.sha256}, 实际 {actual}")
+        os.replace(self.part_path, self.path)
+        try:
+            os.remove(self.state_path)
+        except FileNotFoundError:
+            pass
+        self.glogger.info(
+            f"下载完成: {self.path}, 分段 {len(self._ranges) or 1}, 本次传输 {self.transferred} 字节, "
+            f"耗时 {time.perf_counter() - started:.1f}s, 校验 {'通过' if self.sha256 else '未提供'}")
+        return self.path
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player U 盘导入后台线程
+
+导入逻辑在 UsbImporter 中，不依赖 Qt；这里只负责在后台线程中运行并通过信号报告进度。
+"""
+
+# 标准库
+import logging
+
+# 三方库
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# 自研库
+from UsbImporter import UsbImporter, Throttle
+
+
+class UsbImportWorker(QThread):
+    """后台导入"""
+
+    importProgress = pyqtSignal(int, int, float)  # 已完成, 总数, 已读取 MB
+    importFinished = pyqtSignal(bool, dict)  # 是否完成（未取消且无失败）, 统计
+
+    def __init__(self, source, target, max_bytes_per_sec=None, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.target = target
+        self.throttle = Throttle(max_bytes_per_sec)
+        self.glogger = logging.getLogger("UsbImportWorker")
+
+    def set_rate_limit(self, bytes_per_sec):
+        self.throttle.set_rate(bytes_per_sec)
+
+    def run(self):
+        try:
+            importer = UsbImporter(
+                self.source, self.target, throttle=self.throttle,
+                should_stop=self.isInterruptionRequested,
+                progress=lambda done, total, read: self.importProgress.emit(
+                    done, total, read / 1024 / 1024))
+            stats = importer.run()
+            ok = not self.isInterruptionRequested() and not stats["failed"]
+            self.importFinished.emit(ok, stats)
+        except Exception as ex:
+            self.glogger.exception(f"导入失败: {ex}")
+            self.importFinished.emit(False, {})
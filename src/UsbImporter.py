@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player U 盘导入
+
+把挂载的 U 盘（或任意 TeslaCam 目录）中的片段导入本地事件库：
+- 大块缓冲顺序读写，复制的同时计算 BLAKE2 哈希，不需要再读一遍；
+- 多个文件并行复制，单个文件内部仍为顺序 IO；
+- RecentClips/SavedClips/SentryClips 中内容相同的片段只保存一份，
+  其余位置使用硬链接（不支持时复制本地已有的文件），目录结构保持完整；
+- 导入记录逐行追加到目标目录下的清单文件（JSON Lines），中断后再次导入会跳过已完成的文件；
+- 可限制读取速度，避免与播放争抢磁盘带宽。
+"""
+
+# 标准库
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+
+
+# 读写缓冲大小，越大 Python 层的循环开销越小
+CHUNK_SIZE = 8 * 1024 * 1024
+# 并行复制的文件数
+WORKERS = 2
+# 导入清单文件名（位于目标目录）
+MANIFEST_NAME = ".teslacam-import.jsonl"
+# 按内容去重的文件类型
+DEDUP_SUFFIXES = (".mp4",)
+
+
+class ImportCancelled(Exception):
+    """导入被取消"""
+
+
+class Throttle:
+    """按字节数限速（令牌桶），bytes_per_sec 为 None 或 0 时不限速"""
+
+    def __init__(self, bytes_per_sec=None, burst_seconds=0.5):
+        self.burst_seconds = burst_seconds
+        self._lock = threading.Lock()
+        self.set_rate(bytes_per_sec)
+
+    def set_rate(self, bytes_per_sec):
+        """运行中调整限速（如开始/停止播放时）"""
+        with self._lock:
+            self.rate = bytes_per_sec or 0
+            self.capacity = self.rate * self.burst_seconds
+            self.tokens = self.capacity
+            self.updated = time.monotonic()
+
+    def consume(self, amount):
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+def hash_copy(src, dst, chunk_size=CHUNK_SIZE, throttle=None, should_stop=None):
+    """复制文件并返回 BLAKE2b 哈希（十六进制）"""
+    digest = hashlib.blake2b(digest_size=32)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(src, "rb", buffering=0) as fin, open(dst, "wb", buffering=0) as fout:
+        if hasattr(os, "posix_fadvise"):
+            # 提示内核顺序读取，增大预读
+            os.posix_fadvise(fin.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        while True:
+            size = fin.readinto(buffer)
+            if not size:
+                break
+            chunk = view[:size]
+            # hashlib 与文件读写处理大块数据时都会释放 GIL，多个文件可以真正并行
+            digest.update(chunk)
+            fout.write(chunk)
+            if throttle is not None:
+                throttle.consume(size)
+            if should_stop is not None and should_stop():
+                raise ImportCancelled()
+    return digest.hexdigest()
+
+
+class ImportManifest:
+    """导入清单：每行一条记录，追加写入，中断后可继续"""
+
+    def __init__(self, path):
+        self.path = path
+        # 源文件相对路径 -> 记录
+        self.entries = {}
+        # 内容哈希 -> 目标相对路径
+        self.hashes = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 中断时可能留下不完整的最后一行
+                    continue
+                self.entries[record["src"]] = record
+                if record.get("status") == "copied" and record.get("hash"):
+                    self.hashes.setdefault(record["hash"], record["dst"])
+
+    def is_done(self, rel, size, mtime):
+        record = self.entries.get(rel)
+        return (record is not None and record.get("size") == size
+                and abs(record.get("mtime", 0) - mtime) < 1e-3)
+
+    def append(self, record):
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.entries[record["src"]] = record
+
+
+class UsbImporter:
+    """导入 source 下的全部文件到 target，保持相对路径"""
+
+    def __init__(self, source, target, workers=WORKERS, chunk_size=CHUNK_SIZE,
+                 max_bytes_per_sec=None, should_stop=None, progress=None, throttle=None):
+        self.source = os.path.abspath(source)
+        self.target = os.path.abspath(target)
+        self.workers = max(1, workers)
+        self.chunk_size = chunk_size
+        self.throttle = throttle or Throttle(max_bytes_per_sec)
+        self.should_stop = should_stop
+        # progress(已完成文件数, 文件总数, 已读取字节数)
+        self.progress = progress
+        self.glogger = logging.getLogger("UsbImporter")
+
+        os.makedirs(self.target, exist_ok=True)
+        self.manifest = ImportManifest(os.path.join(self.target, MANIFEST_NAME))
+        self._lock = threading.Lock()
+        self.stats = {"copied": 0, "duplicates": 0, "skipped": 0, "failed": 0, "bytes": 0}
+        self._done = 0
+
+    def plan(self):
+        """返回待导入的 [(相对路径, 大小, 修改时间)]，已导入且未变化的文件计入 skipped"""
+        pending = []
+        for folder, dirs, files in os.walk(self.source):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            for name in sorted(files):
+                if name.startswith("."):
+                    continue
+                path = os.path.join(folder, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                rel = os.path.relpath(path, self.source)
+                if self.manifest.is_done(rel, st.st_size, st.st_mtime):
+                    self.stats["skipped"] += 1
+                    continue
+                pending.append((rel, st.st_size, st.st_mtime))
+        return pending
+
+    def run(self):
+        pending = self.plan()
+        total = len(pending)
+        self.glogger.info(
+            f"开始导入: {self.source} -> {self.target}, 待导入 {total}, 已跳过 {self.stats['skipped']}")
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(self._import_one, *item) for item in pending]
+            for future in futures:
+                try:
+                    future.result()
+                except (ImportCancelled, CancelledError):
+                    continue
+                except OSError as ex:
+                    # 复制成功但写导入清单失败等，只记为该文件失败
+                    self.glogger.error(f"导入失败: {ex}")
+                    with self._lock:
+                        self.stats["failed"] += 1
+                with self._lock:
+                    self._done += 1
+                    done, read = self._done, self.stats["bytes"]
+                if self.progress is not None:
+                    self.progress(done, total, read)
+                if self.should_stop is not None and self.should_stop():
+                    for f in futures:
+                        f.cancel()
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.glogger.info(
+            f"导入结束: {self.stats}, 耗时 {elapsed:.1f}s, "
+            f"{self.stats['bytes'] / elapsed / 1024 / 1024:.1f} MB/s")
+        return dict(self.stats)
+
+    def _import_one(self, rel, size, mtime):
+        if self.should_stop is not None and self.should_stop():
+            raise ImportCancelled()
+
+        src = os.path.join(self.source, rel)
+        dst = os.path.join(self.target, rel)
+        tmp = dst + ".part"
+        digest = None
+        try:
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            digest = hash_copy(src, tmp, self.chunk_size, self.throttle, self.should_stop)
+            record = self._store(rel, size, mtime, digest, dst, tmp)
+        except ImportCancelled:
+            self._remove(tmp)
+            raise
+        except OSError as ex:
+            # 单个文件失败（读盘错误、目标盘已满等）不影响其余文件的导入
+            self._remove(tmp)
+            self.glogger.error(f"导入失败: {src}, 原因: {ex}")
+            with self._lock:
+                if digest is not None and self.manifest.hashes.get(digest) == rel:
+                    del self.manifest.hashes[digest]
+                self.stats["failed"] += 1
+            return
+
+        with self._lock:
+            self.stats["duplicates" if record["status"] == "duplicate" else "copied"] += 1
+        self.manifest.append(record)
+
+    def _store(self, rel, size, mtime, digest, dst, tmp):
+        """把复制好的临时文件放到目标位置（内容重复时改为链接），返回清单记录"""
+        with self._lock:
+            self.stats["bytes"] += size
+            existing = None
+            if rel.lower().endswith(DEDUP_SUFFIXES):
+                existing = self.manifest.hashes.get(digest)
+                if existing is not None and existing != rel and \
+                        not os.path.exists(os.path.join(self.target, existing)):
+                    existing = None
+                if existing is None:
+                    self.manifest.hashes[digest] = rel
+
+        if existing is not None and existing != rel:
+            self._remove(tmp)
+            self._link(os.path.join(self.target, existing), dst)
+            return {"src": rel, "size": size, "mtime": mtime, "hash": digest,
+                    "dst": existing, "status": "duplicate"}
+        os.replace(tmp, dst)
+        os.utime(dst, (mtime, mtime))
+        return {"src": rel, "size": size, "mtime": mtime, "hash": digest,
+                "dst": rel, "status": "copied"}
+
+    @staticmethod
+    def _link(existing, dst):
+        """与已导入的相同内容共用一份数据"""
+        if os.path.lexists(dst):
+            os.remove(dst)
+        try:
+            os.link(existing, dst)
+        except OSError:
+            shutil.copy2(existing, dst)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+"""
+TeslaCam Player 可见性调度器
+
+只解码可见的视角：窗口最小化/隐藏、视角画面不在屏幕上、或被单视角模式关闭时，
+暂停对应播放器的解码；同时维护一个共享的主时钟，视角重新可见时再同步到主时钟时间。
+挂起期间换了媒体的视角输入尚未打开，seek 会被 libVLC 丢弃，恢复时以主时钟时间作为起始时间重新打开。
+只通过播放器对象的方法访问 libVLC，不导入 vlc，时钟与同步逻辑可以脱离 VLC 测试。
+"""
+
+# 标准库
+import time
+import logging
+
+# 三方库
+from PyQt5.QtCore import QObject, QEvent, QTimer
+
+
+# libvlc_media_parse_local：只解析本地文件，不访问网络
+PARSE_LOCAL = 0
+# 异步解析超时：-1 使用 libVLC 默认值
+PARSE_TIMEOUT = -1
+
+
+class VisibilityScheduler(QObject):
+    """按可见性调度四个视角播放器的解码"""
+
+    # 重新可见时，与主时钟偏差超过该值（毫秒）才执行 seek
+    RESYNC_TOLERANCE_MS = 200
+
+    def __init__(self, players, widgets, main_view_getter, media_getter, logger=None, parent=None,
+                 reopen=None):
+        super().__init__(parent)
+
+        self.players = players
+        self.widgets = widgets
+        # 返回当前主视角，主时钟优先取主视角播放器的时间
+        self.main_view_getter = main_view_getter
+        # 返回某视角当前的 Media；get_media() 每次调用都会增加一次引用，这里不使用
+        self.media_getter = media_getter
+        # reopen(视角, 起始毫秒, 是否暂停)：以起始时间重新设置该视角的当前媒体
+        self.reopen = reopen
+        self.glogger = logger or logging.getLogger("VisibilityScheduler")
+
+        # 因不可见而暂停解码的视角
+        self.suspended = set()
+        # 被显式关闭的视角（如单视角模式），无论是否在屏幕上都不解码
+        self.disabled = set()
+        # 挂起期间换了媒体、输入尚未打开的视角
+        self.unopened = set()
+
+        # 共享时钟状态：是否播放、倍速、锚点（毫秒）及锚点对应的墙钟时间
+        self.playing = False
+        self.rate = 1.0
+        self._anchor_ms = 0
+        self._anchor_wall = time.monotonic()
+        # 当前片段时长（毫秒），用于全部视角挂起时判断片段是否播放结束
+        self._length_ms = 0
+        # 已请求异步解析时长的媒体，每个媒体只请求一次
+        self._parsing = None
+
+        self._window = None
+
+    # ******************** 可见性 ********************
+
+    def attach_window(self, window):
+        """监听顶层窗口的最小化/隐藏/显示事件"""
+        if window is None or window is self._window:
+            return
+        if self._window is not None:
+            self._window.removeEventFilter(self)
+        self._window = window
+        window.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.WindowStateChange, QEvent.Show, QEvent.Hide):
+            # 事件处理完成后窗口状态才会更新，延迟到下一轮事件循环再刷新
+            QTimer.singleShot(0, self.refresh)
+        return False
+
+    def set_view_enabled(self, view, enabled):
+        """显式启用/关闭某个视角的解码（供单视角模式等使用）"""
+        if enabled:
+            self.disabled.discard(view)
+        else:
+            self.disabled.add(view)
+        self.refresh()
+
+    def is_view_visible(self, view):
+        if view in self.disabled:
+            return False
+        widget = self.widgets[view]
+        window = widget.window()
+        if window.isMinimized() or not window.isVisible():
+            return False
+        if not widget.isVisible():
+            return False
+        return not widget.visibleRegion().isEmpty()
+
+    def refresh(self):
+        """根据当前可见性挂起或恢复各视角"""
+        # 先刷新锚点，保证最后一个视角挂起后虚拟时钟从正确位置继续
+        self.master_time()
+
+        for view in self.players:
+            visible = self.is_view_visible(view)
+            if visible and view in self.suspended:
+                self._resume(view)
+            elif not visible and view not in self.suspended:
+                self._suspend(view)
+
+    def _suspend(self, view):
+        self.suspended.add(view)
+        player = self.players[view]
+        if player.is_playing():
+            player.set_pause(1)
+        self.glogger.info(f"视角不可见，暂停解码: {view}")
+
+    def _resume(self, view):
+        target = self.master_time()
+        self.suspended.discard(view)
+        player = self.players[view]
+        if view in self.unopened and self.reopen is not None:
+            self.unopened.discard(view)
+            # 输入未打开时 set_time 会被丢弃，改为从主时钟时间打开（暂停时停在该帧）
+            self.reopen(view, int(target), not self.playing)
+            player.play()
+        else:
+            if self.playing:
+                player.play()
+            if abs(player.get_time() - target) > self.RESYNC_TOLERANCE_MS:
+                player.set_time(int(target))
+        self.glogger.info(f"视角恢复可见，同步到主时钟: {view} -> {int(target)}ms")
+
+    def active_players(self):
+        """返回当前参与解码的播放器"""
+        return {view: player for view, player in self.players.items()
+                if view not in self.suspended}
+
+    # ******************** 共享时钟 ********************
+
+    def _master_view(self):
+        active = self.active_players()
+        if not active:
+            return None
+        main_view = self.main_view_getter()
+        if main_view in active:
+            return main_view
+        return next(iter(active))
+
+    def _reanchor(self, time_ms):
+        self._anchor_ms = max(0, int(time_ms))
+        self._anchor_wall = time.monotonic()
+
+    def master_time(self):
+        """主时钟时间（毫秒）：有可见视角时取其播放时间，否则按墙钟推算"""
+        view = self._master_view()
+        if view is not None:
+            player = self.players[view]
+            t = player.get_time()
+            if t >= 0:
+                self._reanchor(t)
+                length = player.get_length()
+                if length > 0:
+                    self._length_ms = length
+                return t
+
+        if not self.playing:
+            return self._anchor_ms
+        elapsed = (time.monotonic() - self._anchor_wall) * 1000.0 * self.rate
+        return self._anchor_ms + elapsed
+
+    def master_position(self):
+        """主时钟进度（0~1）"""
+        view = self._master_view()
+        if view is not None:
+            return self.players[view].get_position()
+        length = self.length_ms()
+        if length <= 0:
+            return 0.0
+        return min(1.0, self.master_time() / length)
+
+    def length_ms(self):
+        if self._length_ms <= 0:
+            # 全部视角挂起时播放器不会上报时长，直接解析媒体获取
+            media = self.media_getter(self.main_view_getter())
+            if media is not None:
+                duration = media.get_duration()
+                if duration <= 0 and media is not self._parsing:
+                    # 异步解析，不阻塞界面线程；完成前按时长未知处理，不重复请求
+                    self._parsing = media
+                    media.parse_with_options(PARSE_LOCAL, PARSE_TIMEOUT)
+                self._length_ms = max(0, duration)
+        return self._length_ms
+
+    def is_playing(self):
+        active = self.active_players()
+        if active:
+            return any(player.is_playing() for player in active.values())
+        return self.playing
+
+    def clock_finished(self):
+        """全部视角挂起时，虚拟时钟是否已走完当前片段"""
+        if self.active_players() or not self.playing:
+            return False
+        length = self.length_ms()
+        return length > 0 and self.master_time() >= length
+
+    # ******************** 播放控制通知 ********************
+
+    def on_play(self):
+        self._reanchor(self.master_time())
+        self.playing = True
+
+    def on_pause(self):
+        self._reanchor(self.master_time())
+        self.playing = False
+
+    def on_stop(self):
+        self.playing = False
+        self._reanchor(0)
+
+    def on_rate(self, rate):
+        self._reanchor(self.master_time())
+        self.rate = rate
+
+    def on_seek(self, position):
+        length = self.length_ms()
+        if length > 0:
+            self._reanchor(position * length)
+
+    def on_view_media_changed(self, view):
+        """某视角设置了新媒体：挂起中的视角不会播放，输入保持未打开"""
+        if view in self.suspended:
+            self.unopened.add(view)
+        else:
+            self.unopened.discard(view)
+
+    def on_media_changed(self):
+        self._length_ms = 0
+        self._parsing = None
+        self._reanchor(0)
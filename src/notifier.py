@@ -3,13 +3,17 @@ from __future__ import annotations
 
 import os
 import sys
+import time
+import queue
+import atexit
 import logging
+import threading
 import subprocess
 import smtplib
 import ssl
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional, List
+from typing import Callable, Optional, List, Tuple
 
 import requests
 
@@ -17,6 +21,126 @@ from utils import send_win_notification
 
 logger = logging.getLogger(__name__)
 
+# Pending notifications; when full the oldest one is dropped.
+QUEUE_SIZE = 100
+# Notifications arriving within this window are merged into one digest.
+DIGEST_WINDOW_S = 2.0
+# Retries per channel with exponential backoff: 1s, 2s, 4s, ...
+MAX_RETRIES = 4
+BACKOFF_BASE_S = 1.0
+BACKOFF_MAX_S = 60.0
+# Probe an idle SMTP session with NOOP before reuse, close it after a longer idle time.
+SMTP_KEEPALIVE_S = 30.0
+SMTP_IDLE_CLOSE_S = 120.0
+# How long to wait for pending notifications at interpreter exit.
+EXIT_FLUSH_S = 5.0
+
+
+def make_digest(items: List[Tuple[str, str]]) -> Tuple[str, str]:
+    """Merge queued (title, message) pairs into a single notification."""
+    if len(items) == 1:
+        return items[0]
+    titles = [title for title, _ in items]
+    if len(set(titles)) == 1:
+        title = f"{titles[0]} (x{len(items)})"
+        body = "\n".join(f"- {message}" for _, message in items)
+    else:
+        title = f"{titles[-1]} (+{len(items) - 1})"
+        body = "\n".join(f"- [{t}] {message}" for t, message in items)
+    return title, body
+
+
+class SmtpSession:
+    """A reusable SMTP connection: connects and logs in once, reconnects when dropped."""
+
+    def __init__(self, host: str, port: int, user: str, password: str,
+                 use_ssl: bool = False, use_tls: bool = True, timeout: float = 10) -> None:
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_ssl = use_ssl
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.server: Optional[smtplib.SMTP] = None
+        self.last_used = 0.0
+        self.connects = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout,
+                                      context=ssl.create_default_context())
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.use_tls:
+                server.starttls(context=ssl.create_default_context())
+        server.login(self.user, self.password)
+        self.connects += 1
+        return server
+
+    def _alive(self) -> bool:
+        if self.server is None:
+            return False
+        if time.monotonic() - self.last_used < SMTP_KEEPALIVE_S:
+            return True
+        try:
+            return self.server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def send(self, from_addr: str, to_addrs: List[str], message: str) -> None:
+        # A session that was dropped by the server is retried once on a fresh connection;
+        # other failures propagate to the caller's backoff.
+        for attempt in (0, 1):
+            if not self._alive():
+                self.close()
+                self.server = self._connect()
+            try:
+                self.server.sendmail(from_addr, to_addrs, message)
+                self.last_used = time.monotonic()
+                return
+            except smtplib.SMTPServerDisconnected:
+                self.close()
+                if attempt:
+                    raise
+            except Exception:
+                # The session state is unknown after a failed transaction.
+                self.close()
+                raise
+
+    def close_if_idle(self) -> None:
+        if self.server is not None and time.monotonic() - self.last_used > SMTP_IDLE_CLOSE_S:
+            self.close()
+
+    def close(self) -> None:
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self.server = None
+
+
+_shared: Optional["Notifier"] = None
+_shared_settings: Optional[tuple] = None
+_shared_lock = threading.Lock()
+
+
+def shared_notifier(**settings) -> "Notifier":
+    """Return the app-wide notifier, replacing it only when the settings change."""
+    global _shared, _shared_settings
+    key = tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in settings.items()))
+    with _shared_lock:
+        if _shared is not None and key == _shared_settings:
+            return _shared
+        old, _shared, _shared_settings = _shared, Notifier(**settings), key
+        notifier = _shared
+    if old is not None:
+        # Let the old notifier deliver what it has queued without blocking the caller.
+        threading.Thread(target=old.close, name="NotifierClose", daemon=True).start()
+    return notifier
+
 
 class Notifier:
     def __init__(
@@ -34,6 +158,10 @@ class Notifier:
         use_tls: Optional[bool] = None,
         wechat_webhook: Optional[str] = None,
         wechat_mentions: Optional[List[str]] = None,
+        digest_window: float = DIGEST_WINDOW_S,
+        max_retries: int = MAX_RETRIES,
+        backoff_base: float = BACKOFF_BASE_S,
+        queue_size: int = QUEUE_SIZE,
     ) -> None:
         self.enable_system = enable_system
         self.enable_email = enable_email
@@ -59,30 +187,138 @@ class Notifier:
         self.use_ssl = use_ssl if use_ssl is not None else (env_ssl == "1")
         self.use_tls = use_tls if use_tls is not None else (env_tls == "1")
 
+        self.digest_window = digest_window
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self._smtp: Optional[SmtpSession] = None
+        self._http = requests.Session()
+
+        # One long-lived dispatch worker, started on the first notification.
+        self._queue: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue(maxsize=queue_size)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._exit_registered = False
+        self.dropped = 0
+
     def notify(self, title: str, message: str) -> None:
-        def _do_notify() -> None:
-            if self.enable_system:
-                try:
-                    self._system_notify(title, message)
-                except Exception:
-                    logger.exception("Failed to notify system")
-            if self.enable_email:
+        """Queue a notification; returns immediately."""
+        self._ensure_worker()
+        while True:
+            try:
+                self._queue.put_nowait((title, message))
+                return
+            except queue.Full:
                 try:
-                    self._email_notify(title, message)
-                except Exception:
-                    logger.exception("Failed to notify email")
-            if self.enable_wechat:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                    self.dropped += 1
+                    logger.warning("Notification queue full, dropped the oldest notification")
+                except queue.Empty:
+                    pass
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued notification has been dispatched."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def close(self, timeout: float = EXIT_FLUSH_S) -> None:
+        """Dispatch what is pending (up to timeout), then stop the worker."""
+        with self._worker_lock:
+            worker = self._worker
+            if worker is None:
+                return
+            self.flush(timeout)
+            self._stopping.set()
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass
+            worker.join(timeout)
+            self._worker = None
+            if self._exit_registered:
+                # Drop the atexit reference so a closed notifier can be collected.
+                atexit.unregister(self.close)
+                self._exit_registered = False
+        if self._smtp is not None:
+            self._smtp.close()
+
+    def _ensure_worker(self) -> None:
+        with self._worker_lock:
+            if self._worker is not None:
+                return
+            self._stopping.clear()
+            self._worker = threading.Thread(
+                target=self._dispatch_loop, name="NotifierDispatch", daemon=True)
+            self._worker.start()
+            if not self._exit_registered:
+                atexit.register(self.close)
+                self._exit_registered = True
+
+    def _dispatch_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                item = self._queue.get(timeout=SMTP_KEEPALIVE_S)
+            except queue.Empty:
+                if self._smtp is not None:
+                    self._smtp.close_if_idle()
+                continue
+            if item is None:
+                self._queue.task_done()
+                break
+
+            # Collect everything that arrives within the digest window.
+            items = [item]
+            deadline = time.monotonic() + self.digest_window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
                 try:
-                    self._wechat_notify(title, message)
-                except Exception:
-                    logger.exception("Failed to notify wechat")
+                    extra = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if extra is None:
+                    self._stopping.set()
+                    self._queue.task_done()
+                    break
+                items.append(extra)
 
-        try:
-            import threading
+            try:
+                self._dispatch(*make_digest(items))
+            finally:
+                for _ in items:
+                    self._queue.task_done()
 
-            threading.Thread(target=_do_notify, daemon=True).start()
-        except Exception:
-            _do_notify()
+    def _dispatch(self, title: str, message: str) -> None:
+        if self.enable_system:
+            self._with_retry("system", self._system_notify, title, message)
+        if self.enable_email:
+            self._with_retry("email", self._email_notify, title, message)
+        if self.enable_wechat:
+            self._with_retry("wechat", self._wechat_notify, title, message)
+
+    def _with_retry(self, channel: str, func: Callable[[str, str], None],
+                    title: str, message: str) -> bool:
+        delay = self.backoff_base
+        for attempt in range(self.max_retries + 1):
+            try:
+                func(title, message)
+                return True
+            except Exception as ex:
+                if attempt == self.max_retries:
+                    logger.exception("Failed to notify %s after %d attempts", channel, attempt + 1)
+                    return False
+                logger.warning("Failed to notify %s (%s), retrying in %.1fs", channel, ex, delay)
+                # Wake up early when closing so exit is not held up by backoff.
+                if self._stopping.wait(delay):
+                    return False
+                delay = min(delay * 2, BACKOFF_MAX_S)
+        return False
 
     def _system_notify(self, title: str, message: str) -> None:
         msg = message if len(message) <= 220 else (message[:217] + "...")
@@ -108,17 +344,10 @@ class Notifier:
         mime["Subject"] = title
         mime.attach(MIMEText(message, "plain", "utf-8"))
 
-        if self.use_ssl:
-            context = ssl.create_default_context()
-            with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, context=context) as server:
-                server.login(self.smtp_user, self.smtp_pass)
-                server.sendmail(self.smtp_from, self.smtp_to, mime.as_string())
-        else:
-            with smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=10) as server:
-                if self.use_tls:
-                    server.starttls(context=ssl.create_default_context())
-                server.login(self.smtp_user, self.smtp_pass)
-                server.sendmail(self.smtp_from, self.smtp_to, mime.as_string())
+        if self._smtp is None:
+            self._smtp = SmtpSession(self.smtp_host, self.smtp_port, self.smtp_user,
+                                     self.smtp_pass, self.use_ssl, self.use_tls)
+        self._smtp.send(self.smtp_from, self.smtp_to, mime.as_string())
 
     def _wechat_notify(self, title: str, message: str) -> None:
         if not self.wechat_webhook:
@@ -133,7 +362,13 @@ class Notifier:
             },
         }
 
+        # Reuses the pooled keep-alive connection; errors are raised for the retry loop.
+        response = self._http.post(self.wechat_webhook, json=payload, timeout=8)
+        response.raise_for_status()
+        # The webhook reports errors (e.g. rate limits) in the body with HTTP 200.
         try:
-            requests.post(self.wechat_webhook, json=payload, timeout=8)
-        except Exception:
-            logger.exception("Failed to notify wechat")
+            errcode = response.json().get("errcode", 0)
+        except ValueError:
+            return
+        if errcode:
+            raise RuntimeError(f"wechat webhook error {errcode}: {response.text[:200]}")
@@ -6,14 +6,15 @@ import datetime
 import hashlib
 import json
 import logging
+import logging.handlers
+import queue
+import atexit
 import re
+import shutil
 import subprocess
 import time
+import threading
 from urllib.parse import unquote, urlparse
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.image import MIMEImage
 
 
 current_abspath = os.path.dirname(os.path.abspath(__file__))
@@ -49,38 +50,201 @@ def print_success(msg):
     print(f'{ConsoleColor.GREEN} {msg} {ConsoleColor.RESET}')
 
 
+# 日志文件单个大小上限（字节）及保留的历史文件数
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 14
+LOG_FILE_NAME = "TeslaCamPlayer.log"
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s - %(message)s"
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class SizedTimedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    r"""
+    按大小或时间滚动的日志文件处理器
+
+    文件超过 maxBytes 或跨过滚动时间点（默认每天零点）时滚动为 .1、.2 ... 的历史文件，
+    最多保留 backupCount 个。
+    """
+
+    def __init__(self, filename, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                 interval=24 * 3600, encoding="utf-8"):
+        super().__init__(filename, maxBytes=maxBytes,
+                         backupCount=backupCount, encoding=encoding)
+        self.interval = interval
+        self.rolloverAt = self._next_rollover(time.time())
+
+    def _next_rollover(self, now):
+        if self.interval == 24 * 3600:
+            # 按天滚动时对齐到本地零点
+            tomorrow = datetime.date.fromtimestamp(now) + datetime.timedelta(days=1)
+            return time.mktime(tomorrow.timetuple())
+        return now + self.interval
+
+    def shouldRollover(self, record):
+        if record.created >= self.rolloverAt:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.rolloverAt = self._next_rollover(time.time())
+
+
+class RateLimitFilter(logging.Filter):
+    r"""
+    限制同一调用位置的重复日志
+
+    每个调用位置（文件 + 行号）在 period 秒内最多输出 burst 条，超出的记录被丢弃，
+    下一条放行的记录会附带被丢弃的条数。仅作用于 max_level 及以下级别（默认只限制调试日志），
+    信息、警告和错误不受限制。多个线程同时记录日志时由锁保护计数。
+    """
+
+    def __init__(self, burst=5, period=1.0, max_level=logging.DEBUG):
+        super().__init__()
+        self.burst = burst
+        self.period = period
+        self.max_level = max_level
+        # (文件, 行号) -> [窗口开始时间, 窗口内条数, 被丢弃条数]
+        self._sites = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > self.max_level:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = record.created
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.period:
+                suppressed = site[2] if site else 0
+                self._sites[key] = [now, 1, 0]
+            elif site[1] < self.burst:
+                site[1] += 1
+                return True
+            else:
+                site[2] += 1
+                return False
+        if suppressed:
+            record.msg = f"{record.msg} (已忽略 {suppressed} 条相同位置的日志)"
+        return True
+
+
+class LogOverheadProfiler:
+    r"""
+    统计各调用位置在调用线程中花费在日志上的时间（创建记录、过滤、入队）
+
+    仅用于排查，需显式 install()；report() 按总耗时排序返回各调用位置的次数、总耗时和平均耗时。
+    """
+
+    def __init__(self):
+        # (文件, 行号) -> [次数, 总耗时秒]
+        self.stats = {}
+        self._original = None
+
+    def install(self):
+        if self._original is not None:
+            return
+        original = self._original = logging.Logger._log
+        stats = self.stats
+
+        def _timed_log(logger_self, level, msg, args, exc_info=None, extra=None,
+                       stack_info=False, stacklevel=1):
+            start = time.perf_counter()
+            try:
+                # stacklevel + 1 跳过本函数，保证记录中的调用位置（文件、行号）不变
+                return original(logger_self, level, msg, args, exc_info, extra,
+                                stack_info, stacklevel + 1)
+            finally:
+                elapsed = time.perf_counter() - start
+                # 跳过 logging 模块自身的栈帧，找到真正的调用位置
+                frame = sys._getframe(1)
+                while frame is not None and frame.f_code.co_filename == logging.__file__:
+                    frame = frame.f_back
+                key = (frame.f_code.co_filename, frame.f_lineno) if frame else ("?", 0)
+                entry = stats.setdefault(key, [0, 0.0])
+                entry[0] += 1
+                entry[1] += elapsed
+
+        logging.Logger._log = _timed_log
+
+    def uninstall(self):
+        if self._original is not None:
+            logging.Logger._log = self._original
+            self._original = None
+
+    def report(self, top=20):
+        rows = sorted(self.stats.items(), key=lambda kv: kv[1][1], reverse=True)
+        lines = []
+        for (path, lineno), (count, total) in rows[:top]:
+            lines.append(f"{os.path.basename(path)}:{lineno} 次数 {count} "
+                         f"总耗时 {total * 1000:.2f}ms 平均 {total / count * 1e6:.1f}us")
+        return lines
+
+
+_log_listeners = []
+
+
+def setup_logging(log_dir: str, level=logging.INFO, show_console: bool = True,
+                  rate_limit: RateLimitFilter = None, target=None):
+    r"""
+    安装异步日志管道：调用线程只把记录放入队列，控制台/文件输出在后台线程完成
+
+    :param log_dir: 日志文件存放目录
+    :param level: 日志级别
+    :param show_console: 是否同时输出到控制台
+    :param rate_limit: 重复日志限流过滤器，默认使用 RateLimitFilter()
+    :param target: 安装到的日志器，默认为根日志器
+    :return: QueueListener，进程退出时自动停止
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    formatter = logging.Formatter(fmt=LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+
+    handlers = []
+    if show_console:
+        sh = logging.StreamHandler()
+        sh.setFormatter(formatter)
+        handlers.append(sh)
+    fh = SizedTimedRotatingFileHandler(os.path.join(log_dir, LOG_FILE_NAME))
+    fh.setFormatter(formatter)
+    handlers.append(fh)
+
+    log_queue = queue.SimpleQueue()
+    qh = logging.handlers.QueueHandler(log_queue)
+    qh.addFilter(rate_limit or RateLimitFilter())
+
+    target = target or logging.getLogger()
+    target.setLevel(level)
+    for handler in list(target.handlers):
+        target.removeHandler(handler)
+    target.addHandler(qh)
+
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _log_listeners.append(listener)
+    return listener
+
+
+def stop_logging():
+    r"""
+    停止后台日志线程并写完队列中剩余的记录
+    """
+    while _log_listeners:
+        _log_listeners.pop().stop()
+
+
+atexit.register(stop_logging)
+
+
 def logger(log_dir: str, show_console: bool = True, log_name: str = 'logger'):
     # 创建一个日志器
     re_logger = logging.getLogger(f"{log_name}")
-    # 设置日志输出的最低等级, 低于当前等级则会被忽略
-    re_logger.setLevel(logging.INFO)
 
     if not re_logger.handlers:
-        # 避免重复添加处理器
-
-        if show_console:
-            # 创建控制台处理器
-            sh = logging.StreamHandler()
-            # 创建格式器
-            sh_formator = logging.Formatter(
-                fmt="%(asctime)s %(levelname)s %(message)s", datefmt="%Y/%m/%d %X")
-            sh.setFormatter(sh_formator)
-            # 将处理器添加至日志器中
-            re_logger.addHandler(sh)
-
-        # 创建日志文件存放文件夹
-        # log_dir = os.path.join(current_abspath, "logs")
-        os.makedirs(log_dir, exist_ok=True)
-        # 创建文件处理器, log_file 为日志存放的文件夹
-        log_file = os.path.join(
-            log_dir, f'{time.strftime("%Y-%m-%d", time.localtime())}.log')
-        fh = logging.FileHandler(log_file, encoding="UTF-8")
-        # 创建格式器
-        fh_formator = logging.Formatter(fmt="%(asctime)s %(filename)s %(lineno)d %(levelname)s %(message)s",
-                                        datefmt="%Y/%m/%d %X")
-        fh.setFormatter(fh_formator)
-        # 将处理器添加至日志器中
-        re_logger.addHandler(fh)
+        # 避免重复添加处理器；输出经队列在后台线程写入，文件按大小/时间滚动
+        setup_logging(log_dir, logging.INFO, show_console, target=re_logger)
+        re_logger.propagate = False
 
     return re_logger
 
@@ -230,6 +394,40 @@ def print_progress_bar(iteration, total, bar_length=100):
     sys.stdout.flush()
 
 
+def probe_size(path):
+    r'''
+    探测视频第一路视频流的分辨率，返回 (宽, 高)
+    '''
+    import ffmpeg
+
+    info = ffmpeg.probe(path, select_streams='v:0', show_entries='stream=width,height')
+    stream = info['streams'][0]
+    return int(stream['width']), int(stream['height'])
+
+
+def low_priority_popen(args, nice=15, cpus=None):
+    r'''
+    以低 CPU/IO 优先级启动子进程（stdout 丢弃，stderr 可读）
+    '''
+    kwargs = {'stdin': subprocess.DEVNULL, 'stdout': subprocess.DEVNULL, 'stderr': subprocess.PIPE}
+    if sys.platform == 'win32':
+        kwargs['creationflags'] = subprocess.BELOW_NORMAL_PRIORITY_CLASS
+        return subprocess.Popen(args, **kwargs)
+
+    if shutil.which('ionice'):
+        # 空闲 IO 调度类：磁盘空闲时才读写，不影响播放（ionice 直接 exec，进程号不变）
+        args = ['ionice', '-c', '3'] + list(args)
+    proc = subprocess.Popen(args, **kwargs)
+    # 启动后再调整，避免在多线程程序中使用 preexec_fn
+    try:
+        os.setpriority(os.PRIO_PROCESS, proc.pid, nice)
+        if cpus and hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(proc.pid, cpus)
+    except OSError as ex:
+        logging.getLogger("utils").warning(f"调整子进程优先级失败: {ex}")
+    return proc
+
+
 def bytes_to_readable(bytes_value):
     # 将字节数转换为可读性更好的格式（KB/MB/GB）
     suffixes = ['B', 'KB', 'MB', 'GB', 'TB']
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+活动检测与精彩片段导出基准测试
+
+用 ffmpeg 生成两组四个视角的测试片段：第一组只有前视角在中间几秒出现移动的方块，
+第二组画面完全静止。检查：
+1. 每秒活动分数只在方块移动的几秒内超过阈值；
+2. 活动片段前后留白，导出计划与模式一致，精彩片段不受导出倍速影响按 1 倍速播放，
+   静止的分组在"只保留精彩片段"模式下被跳过；
+3. 分数缓存在事件库数据库中，再次分析不解码；片段修改后重新分析；
+并按合成导出相同的四视角拼接与编码参数，比较各导出模式的输出时长和编码耗时
+（不含文字叠加）。
+
+用法:
+    python tests/bench_activity_export.py [片段秒数]
+"""
+
+import sys
+import os
+import re
+import time
+import shutil
+import tempfile
+import subprocess
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ActivityAnalyzer import (ActivityAnalyzer, MODE_ALL, MODE_HIGHLIGHTS,  # noqa: E402
+                              MODE_VARIABLE, export_plan, plan_duration)
+from LibraryIndex import LibraryIndex  # noqa: E402
+
+FILE_VIEWS = {'front': 'front', 'back': 'back', 'left': 'left_repeater', 'right': 'right_repeater'}
+SOURCE_FPS = 36
+SIZE = "640x480"
+IDLE_SPEED = 10
+
+
+def make_clip(path, seconds, motion=None):
+    """静止的彩条画面；motion=(开始秒, 结束秒) 时叠加一个在这段时间内横向移动的白色方块"""
+    source = f"smptebars=size={SIZE}:rate={SOURCE_FPS}:duration={seconds}"
+    if motion:
+        start, end = motion
+        graph = (f"{source}[bg];color=white:size=80x80:rate={SOURCE_FPS}:duration={seconds}[box];"
+                 f"[bg][box]overlay=x='if(between(t,{start},{end}),(t-{start})*150,-100)':y=200")
+    else:
+        graph = source
+    subprocess.run(
+        ["ffmpeg", "-loglevel", "quiet", "-y", "-f", "lavfi", "-i", graph,
+         "-c:v", "libx264", "-preset", "ultrafast", "-g", str(SOURCE_FPS),
+         "-pix_fmt", "yuv420p", path],
+        check=True)
+
+
+def make_group(folder, name, seconds, motion=None):
+    group = {}
+    for view, file_view in FILE_VIEWS.items():
+        group[view] = os.path.join(folder, f"{name}-{file_view}.mp4")
+        make_clip(group[view], seconds, motion if view == 'front' else None)
+    return group
+
+
+def output_info(path):
+    """输出文件的帧数和时长（秒）"""
+    err = subprocess.run(["ffmpeg", "-nostdin", "-i", path, "-f", "null", "-"],
+                         capture_output=True, text=True).stderr
+    frames = int(re.findall(r"frame=\s*(\d+)", err)[-1])
+    h, m, s = re.findall(r"time=(\d+):(\d+):([\d.]+)", err)[-1]
+    return frames, int(h) * 3600 + int(m) * 60 + float(s)
+
+
+def export_group(folder, group, mode, speed, analyzer):
+    """与合成导出相同的前视角主画面拼接和编码参数，返回 (计划, 输出路径, 编码耗时)"""
+    import ffmpeg
+    from Signal import Signal
+    from CamClipCombiner.CoreWorker import CoreWorker
+
+    worker = CoreWorker(None, Signal(), folder, None, folder, speed, exportMode=mode)
+    worker.activity_analyzer = analyzer
+    worker.current_plan = worker.activity_plan(group)
+    inputs = [ffmpeg.input(group[view]) for view in ('front', 'back', 'left', 'right')]
+    combined = worker.frontMainView(*inputs, 640, 480)
+    path = os.path.join(folder, f"{mode}-{speed}x.mp4")
+    started = time.perf_counter()
+    (
+        ffmpeg.output(combined, path, vcodec='libx264', crf=18, preset='fast',
+                      pix_fmt='yuv420p', r='30')
+        .global_args('-loglevel', 'error')
+        .run(overwrite_output=True)
+    )
+    return worker.current_plan, path, time.perf_counter() - started
+
+
+def check(name, ok):
+    print(f"   {'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def main():
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    motion = (seconds * 2 // 5, seconds * 2 // 5 + 3)
+
+    print("🔍 活动检测与精彩片段导出基准测试")
+    print("=" * 50)
+
+    if not shutil.which("ffmpeg"):
+        print("❌ 未找到 ffmpeg")
+        return 1
+
+    folder = tempfile.mkdtemp(prefix="activity-export-")
+    results = []
+    try:
+        busy = make_group(folder, "2025-01-01_00-00-00", seconds, motion)
+        idle = make_group(folder, "2025-01-01_00-01-00", seconds)
+        analyzer = ActivityAnalyzer(LibraryIndex(os.path.join(folder, "library.db")))
+
+        # 1) 每秒分数
+        started = time.perf_counter()
+        scores = analyzer.group_scores(busy)
+        analyze_s = time.perf_counter() - started
+        active = [i for i, score in enumerate(scores) if score >= 0.01]
+        print(f"   分数: {' '.join(f'{score:.3f}' for score in scores)}")
+        results.append(check(f"分析 {seconds} 秒 × 4 视角耗时 {analyze_s:.2f}s，活动秒 {active}",
+                             len(scores) == seconds and active
+                             and motion[0] <= active[0] and active[-1] <= motion[1]))
+
+        # 2) 导出计划
+        highlights = export_plan(scores, MODE_HIGHLIGHTS, IDLE_SPEED, duration=seconds)
+        variable = export_plan(scores, MODE_VARIABLE, IDLE_SPEED, duration=seconds)
+        idle_plan = export_plan(analyzer.group_scores(idle), MODE_HIGHLIGHTS, IDLE_SPEED,
+                                duration=seconds)
+        results.append(check(f"精彩片段 {highlights}，变速 {variable}，静止分组 {idle_plan}",
+                             len(highlights) == 1 and highlights[0][0] < active[0]
+                             and highlights[0][2] == 1.0
+                             and highlights[0][1] > active[-1] + 1
+                             and [s[2] for s in variable] == [IDLE_SPEED, 1.0, IDLE_SPEED]
+                             and idle_plan == []))
+
+        # 3) 缓存
+        started = time.perf_counter()
+        cached = analyzer.group_scores(busy)
+        cached_ms = (time.perf_counter() - started) * 1000
+        os.utime(busy['back'], (time.time() + 5, time.time() + 5))
+        stale = [view for view in FILE_VIEWS
+                 if analyzer.index.get_activity(busy[view], analyzer.params) is None]
+        results.append(check(f"缓存读取 {cached_ms:.1f}ms（分析 {analyze_s * 1000:.0f}ms），"
+                             f"修改后失效的视角 {stale}",
+                             (cached == scores).all() and stale == ['back']))
+        analyzer.group_scores(busy)
+
+        # 导出
+        scenarios = (
+            ("完整 1x", MODE_ALL, 1),
+            ("完整 10x", MODE_ALL, IDLE_SPEED),
+            ("精彩片段 1x", MODE_HIGHLIGHTS, 1),
+            ("精彩片段 10x", MODE_HIGHLIGHTS, IDLE_SPEED),
+            ("变速 10x/1x", MODE_VARIABLE, IDLE_SPEED),
+        )
+        print(f"\n   {'模式':<14}{'预计秒':>8}{'输出秒':>8}{'帧数':>8}{'编码 s':>8}")
+        durations_ok = True
+        for name, mode, speed in scenarios:
+            plan, path, elapsed = export_group(folder, busy, mode, speed, analyzer)
+            expected = plan_duration(plan, seconds) if plan else seconds / speed
+            frames, duration = output_info(path)
+            durations_ok &= abs(duration - expected) < 0.5
+            print(f"   {name:<14}{expected:>8.1f}{duration:>8.1f}{frames:>8}{elapsed:>8.1f}")
+        print()
+        results.append(check("各模式输出时长与导出计划一致", durations_ok))
+        analyzer.close()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print("\n" + ("✅ 全部通过" if all(results) else "❌ 存在失败项"))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
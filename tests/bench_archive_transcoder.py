@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+归档转码基准测试
+
+用 ffmpeg 生成一组与 TeslaCam 相近的 H.264 测试片段，依次用每个可用的编码预设
+转码到归档目录，输出各预设的大小和速度报告，并检查：
+1. 输出通过校验且比原文件小；
+2. 再次运行时日志中的文件全部跳过；
+3. 原地替换模式下原文件被替换为目标编码，修改时间保持不变。
+
+用法:
+    python tests/bench_archive_transcoder.py [片段数] [片段秒数]
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import subprocess
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ArchiveTranscoder import (  # noqa: E402
+    ArchiveTranscoder, PRESETS, PRESET_CODECS, format_report, probe_video)
+
+VIEWS = ('front', 'back', 'left_repeater', 'right_repeater')
+
+
+def make_clips(folder, count, seconds):
+    os.makedirs(folder, exist_ok=True)
+    for i in range(count):
+        view = VIEWS[i % 4]
+        path = os.path.join(folder, f"2025-01-01_00-{i // 4:02d}-00-{view}.mp4")
+        subprocess.run(
+            ["ffmpeg", "-loglevel", "quiet", "-y", "-f", "lavfi",
+             "-i", f"testsrc2=size=1280x960:rate=36:duration={seconds}",
+             "-c:v", "libx264", "-preset", "veryfast", "-b:v", "5M",
+             "-pix_fmt", "yuv420p", path],
+            check=True)
+
+
+def available_presets():
+    encoders = subprocess.run(["ffmpeg", "-hide_banner", "-encoders"],
+                              capture_output=True, text=True).stdout
+    return [name for name, args in PRESETS.items() if f" {args['vcodec']} " in encoders]
+
+
+def check(name, ok):
+    print(f"   {'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    seconds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    print("🔍 归档转码基准测试")
+    print("=" * 50)
+
+    if not shutil.which("ffmpeg") or not shutil.which("ffprobe"):
+        print("❌ 未找到 ffmpeg/ffprobe")
+        return 1
+    presets = available_presets()
+    if not presets:
+        print("❌ ffmpeg 不支持 libx265/libsvtav1")
+        return 1
+
+    folder = tempfile.mkdtemp(prefix="archive-")
+    source = os.path.join(folder, "source")
+    make_clips(source, count, seconds)
+    in_bytes = sum(os.path.getsize(os.path.join(source, n)) for n in os.listdir(source))
+
+    results = []
+    report = {}
+    for preset in presets:
+        archive = os.path.join(folder, preset)
+        transcoder = ArchiveTranscoder(source, preset, archive)
+        stats = transcoder.run()
+        out_bytes = sum(os.path.getsize(os.path.join(archive, n)) for n in os.listdir(archive))
+        results.append(check(f"{preset}: 转码 {stats['done']} 个, 输出小于原文件",
+                             stats["done"] == count and out_bytes < in_bytes))
+
+        again = ArchiveTranscoder(source, preset, archive).run()
+        results.append(check(f"{preset}: 再次运行全部跳过",
+                             again["done"] == 0 and again["skipped"] == count))
+        report.update(transcoder.journal.report())
+        # 日志位于源目录，换预设前删除
+        os.remove(transcoder.journal.path)
+    print(format_report(report))
+
+    # 原地替换
+    inplace = os.path.join(folder, "inplace")
+    shutil.copytree(source, inplace)
+    sample = os.path.join(inplace, sorted(os.listdir(inplace))[0])
+    mtime = os.stat(sample).st_mtime
+    stats = ArchiveTranscoder(inplace, presets[0]).run()
+    codec, _ = probe_video(sample)
+    results.append(check("原地替换为目标编码且保留修改时间",
+                         stats["done"] == count and codec == PRESET_CODECS[presets[0]]
+                         and abs(os.stat(sample).st_mtime - mtime) < 1e-3))
+
+    shutil.rmtree(folder, ignore_errors=True)
+    print("\n" + ("✅ 全部通过" if all(results) else "❌ 存在失败项"))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
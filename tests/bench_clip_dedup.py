@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+重复片段查找基准测试
+
+生成大量稀疏测试文件（大小各不相同，模拟真实片段），其中：
+- 一部分在 SavedClips 与 RecentClips 中内容完全相同（应被找出）；
+- 一部分大小相同、头尾不同（应在指纹阶段排除）；
+- 一部分大小和头尾都相同、只有中间不同（应在完整哈希阶段排除）。
+检查结果是否正确、哈希缓存预热后耗时是否在目标以内，检查分组时重复片段只保留一个，
+以及合并时跳过查找之后被修改的文件。
+首次查找的耗时与需要确认的数据量成正比，测试文件较小（1~8MB）。
+
+用法:
+    python tests/bench_clip_dedup.py [文件数]
+"""
+
+import sys
+import os
+import time
+import random
+import shutil
+import tempfile
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ClipDedup import ClipDedup, HashCache, iter_clip_files  # noqa: E402
+from ClipGroups import build_video_groups  # noqa: E402
+
+VIEWS = ('front', 'back', 'left_repeater', 'right_repeater')
+MAX_SECONDS = 10.0
+
+
+def write_clip(path, size, head, middle=b""):
+    with open(path, "wb") as f:
+        f.write(head)
+        if middle:
+            f.seek(size // 2)
+            f.write(middle)
+        f.truncate(size)
+
+
+def make_library(root, count, rng):
+    saved = os.path.join(root, "SavedClips", "2025-01-01_00-00-00")
+    recent = os.path.join(root, "RecentClips")
+    os.makedirs(saved)
+    os.makedirs(recent)
+
+    expected = set()
+    sizes = rng.sample(range(1_000_000, 8_000_000), count)
+    for i in range(count):
+        # 每个时间点四个视角
+        j = i // 4
+        minute = f"2025-{j // 86400 % 12 + 1:02d}-01_{j // 3600 % 24:02d}-{j // 60 % 60:02d}-{j % 60:02d}"
+        name = f"{minute}-{VIEWS[i % 4]}.mp4"
+        head = f"clip-{i}".encode()
+        write_clip(os.path.join(recent, name), sizes[i], head)
+        kind = i % 100
+        if kind == 0:
+            # 完全相同
+            write_clip(os.path.join(saved, name), sizes[i], head)
+            expected.add(name)
+        elif kind == 1:
+            # 大小相同、开头不同
+            write_clip(os.path.join(saved, name), sizes[i], head + b"x")
+        elif kind == 2:
+            # 头尾相同、中间不同
+            write_clip(os.path.join(saved, name), sizes[i], head, middle=b"changed")
+    return expected
+
+
+def check(name, ok):
+    print(f"   {'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    print("🔍 重复片段查找基准测试")
+    print("=" * 50)
+
+    rng = random.Random(41)
+    root = tempfile.mkdtemp(prefix="clip-dedup-")
+    try:
+        started = time.perf_counter()
+        expected = make_library(root, count, rng)
+        print(f"   生成 {count} 个文件: {time.perf_counter() - started:.1f}s")
+
+        results = []
+        cache = HashCache(os.path.join(root, "hashes.db"))
+        dedup = ClipDedup(cache=cache)
+        for label in ("首次查找", "再次查找"):
+            started = time.perf_counter()
+            duplicates = dedup.find_duplicates([root])
+            elapsed = time.perf_counter() - started
+            print(f"   {label}: {elapsed:.2f}s, 统计: {dedup.stats}")
+
+        found = {os.path.basename(d.paths[0]) for d in duplicates if len(d.paths) == 2}
+        results.append(check(f"找到 {len(expected)} 组重复且无误判", found == expected and
+                             len(duplicates) == len(expected)))
+        results.append(check(f"再次查找耗时 < {MAX_SECONDS:.0f}s", elapsed < MAX_SECONDS))
+
+        # 分组：选择 TeslaCam 根目录时，同一时间同一视角的相同片段只保留一个
+        groups, group_dict = build_video_groups(root, cache=cache)
+        clips = [path for group in groups for path in group.values()]
+        results.append(check("分组中没有重复的时间点和视角",
+                             len(clips) == len(set(clips)) and
+                             all(len(g) == 4 for g in groups)))
+        saved = set(os.listdir(os.path.join(root, "SavedClips", "2025-01-01_00-00-00")))
+        results.append(check("同一片段优先使用 SavedClips",
+                             all("SavedClips" in path for path in clips
+                                 if os.path.basename(path) in saved)))
+
+        # 查找之后被修改的文件不合并；其余合并为硬链接后再查找应没有重复
+        changed = duplicates[0].paths[1]
+        write_clip(changed, os.path.getsize(changed), b"clip-changed")
+        replaced = dedup.merge(duplicates)
+        again = dedup.find_duplicates(files=iter_clip_files([root]))
+        results.append(check(f"合并 {replaced} 个文件后不再有重复，跳过查找后被修改的文件",
+                             replaced == len(expected) - 1 and not again
+                             and os.stat(changed).st_nlink == 1))
+        cache.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print("\n" + ("✅ 全部通过" if all(results) else "❌ 存在失败项"))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+多视角帧读取基准测试
+
+用 ffmpeg 生成两组四个视角的测试片段（TeslaCam 的文件名和目录结构），检查：
+1. 按目录读取时分组按时间顺序，各视角同一序号的画面是同一时刻，帧数与时长、帧率一致；
+2. 帧缓冲区循环使用，数量不超过预读队列长度 + 2；
+3. 解码时缩放、只选部分视角、灰度输出；
+4. 提前结束迭代时 ffmpeg 进程被结束，直接迭代（未打开）的读取器在迭代结束后关闭；
+并在 TeslaCam 分辨率的片段上比较不同参数下每秒产出的帧数。
+
+用法:
+    python tests/bench_frame_reader.py [片段秒数]
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+import subprocess
+from datetime import datetime, timedelta
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from FrameReader import FrameReader, read_event  # noqa: E402
+
+FILE_VIEWS = {'front': 'front', 'back': 'back', 'left': 'left_repeater', 'right': 'right_repeater'}
+SOURCE_FPS = 36
+# 对齐检查用的片段：每帧画面亮度不同（随帧号变化）
+LEVEL_STEP = 7
+
+
+def make_clip(path, source, seconds):
+    subprocess.run(
+        ["ffmpeg", "-loglevel", "quiet", "-y", "-f", "lavfi", "-i", source, "-t", str(seconds),
+         "-c:v", "libx264", "-preset", "ultrafast", "-g", str(SOURCE_FPS),
+         "-pix_fmt", "yuv420p", path],
+        check=True)
+
+
+def make_group(folder, name, source, seconds):
+    group = {}
+    for view, file_view in FILE_VIEWS.items():
+        group[view] = os.path.join(folder, f"{name}-{file_view}.mp4")
+        make_clip(group[view], source, seconds)
+    return group
+
+
+def level_source(size, seconds):
+    return (f"nullsrc=size={size}:rate={SOURCE_FPS}:duration={seconds},"
+            f"geq=lum='mod(N*{LEVEL_STEP},200)+20':cb=128:cr=128")
+
+
+def check(name, ok):
+    print(f"   {'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def main():
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    print("🔍 多视角帧读取基准测试")
+    print("=" * 50)
+
+    if not shutil.which("ffmpeg"):
+        print("❌ 未找到 ffmpeg")
+        return 1
+
+    folder = tempfile.mkdtemp(prefix="frame-reader-")
+    results = []
+    try:
+        # 1) 对齐与分组顺序
+        event = os.path.join(folder, "SavedClips", "2025-01-01_00-02-00")
+        os.makedirs(event)
+        names = ("2025-01-01_00-00-00", "2025-01-01_00-01-00")
+        for name in names:
+            make_group(event, name, level_source("320x240", 3), 3)
+        group = {view: os.path.join(event, f"{names[0]}-{file_view}.mp4")
+                 for view, file_view in FILE_VIEWS.items()}
+        # 参照：前视角不抽帧时每帧的亮度
+        with FrameReader(group, size=(160, 120), fps=SOURCE_FPS, views=('front',),
+                         pix_fmt='gray') as reader:
+            reference = [round(float(s.frames['front'].mean())) for s in reader]
+        fps = 12
+        step = SOURCE_FPS // fps
+        counts = {}
+        aligned = True
+        times_ok = True
+        for frame_set in read_event(event, size=(160, 120), fps=fps, pix_fmt='gray'):
+            counts[frame_set.group] = counts.get(frame_set.group, 0) + 1
+            expected = reference[frame_set.index * step]
+            levels = [float(frame.mean()) for frame in frame_set.frames.values()]
+            aligned &= all(abs(level - expected) < 2 for level in levels)
+            start = datetime.strptime(frame_set.group, "%Y-%m-%d_%H-%M-%S")
+            times_ok &= frame_set.time == start + timedelta(seconds=frame_set.index / fps)
+        results.append(check(f"两组按时间顺序读取，各 {list(counts.values())} 帧，四个视角画面同一时刻",
+                             list(counts) == list(names) and aligned and times_ok
+                             and len(reference) == 3 * SOURCE_FPS
+                             and all(count == 3 * fps for count in counts.values())))
+
+        # 2) 缓冲区复用
+        addresses = set()
+        with FrameReader(group, size=(160, 120), fps=SOURCE_FPS, queue_size=4) as reader:
+            for frame_set in reader:
+                addresses.update(frame.__array_interface__['data'][0]
+                                 for frame in frame_set.frames.values())
+        results.append(check(f"{3 * SOURCE_FPS} 帧只使用 {len(addresses)} 个缓冲区（4 个视角 × (4 + 2)）",
+                             len(addresses) <= 4 * (4 + 2)))
+
+        # 3) 缩放、视角选择、灰度
+        with FrameReader(group, size=(80, 60), views=('front', 'back'), pix_fmt='gray') as reader:
+            first = next(iter(reader))
+            shapes = {view: frame.shape for view, frame in first.frames.items()}
+        results.append(check(f"解码时缩放并只读取所选视角: {shapes}",
+                             shapes == {'front': (60, 80), 'back': (60, 80)}))
+
+        # 4) 提前结束
+        reader = FrameReader(group, size=(160, 120))
+        with reader:
+            next(iter(reader))
+            procs = [stream.proc for stream in reader._streams.values()]
+        results.append(check("提前结束时 ffmpeg 进程已退出",
+                             all(proc.poll() is not None for proc in procs)))
+
+        # 不用 with，由迭代打开：迭代结束后关闭
+        reader = FrameReader(group, size=(160, 120))
+        frames = iter(reader)
+        next(frames)
+        procs = [stream.proc for stream in reader._streams.values()]
+        frames.close()
+        results.append(check("未打开的读取器迭代结束后关闭 ffmpeg 进程",
+                             not reader._streams and all(proc.poll() is not None for proc in procs)))
+
+        # 吞吐量：TeslaCam（HW3）分辨率
+        bench = os.path.join(folder, "bench")
+        os.makedirs(bench)
+        source = f"testsrc=size=1280x960:rate={SOURCE_FPS}:duration={seconds}"
+        group = make_group(bench, "2025-01-01_00-00-00", source, seconds)
+        scenarios = (
+            ("原始分辨率 RGB 36fps", dict(size=(1280, 960), fps=SOURCE_FPS)),
+            ("1/2 分辨率 RGB 36fps", dict(size=(640, 480), fps=SOURCE_FPS)),
+            ("1/4 分辨率 RGB 10fps", dict(size=(320, 240), fps=10)),
+            ("1/4 分辨率 灰度 5fps", dict(size=(320, 240), fps=5, pix_fmt='gray')),
+            ("仅前视 1/2 RGB 36fps", dict(size=(640, 480), fps=SOURCE_FPS, views=('front',))),
+        )
+        print(f"\n   {'场景':<20}{'帧组/s':>10}{'画面/s':>10}{'实时倍数':>10}")
+        speeds = []
+        for name, kwargs in scenarios:
+            started = time.perf_counter()
+            frames = 0
+            with FrameReader(group, **kwargs) as reader:
+                for frame_set in reader:
+                    frames += 1
+                    # 模拟分析代码读取画面
+                    frame_set.frames[reader.views[0]][::64, ::64].sum()
+                views = len(reader.views)
+            elapsed = time.perf_counter() - started
+            rate = frames / elapsed
+            speeds.append(seconds / elapsed)
+            print(f"   {name:<20}{rate:>10.1f}{rate * views:>10.1f}{seconds / elapsed:>9.1f}x")
+        print()
+        results.append(check("降低分辨率和帧率后读取更快", speeds[2] > speeds[0]))
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print("\n" + ("✅ 全部通过" if all(results) else "❌ 存在失败项"))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+翻译查找基准测试
+
+比较 tr() 在编译后的翻译表上与原实现（每次查 JSON 字典、回退旧字典、try/except 格式化）
+的吞吐量，并检查：
+1. 所有语言、所有键的翻译结果与原实现一致；
+2. 显示文本到主视角的反查在各语言下正确；
+3. 运行时切换语言后，bind 绑定的控件和语言监听器立即更新。
+
+用法:
+    python tests/bench_i18n.py [调用次数]
+"""
+
+import sys
+import os
+import time
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import I18n  # noqa: E402
+
+LANGS = ("zh-Hans", "zh-Hant", "ja", "en")
+PLAIN_KEYS = ("menu.file", "player.view.front", "player.menu.play", "download.cancel")
+TEMPLATE_KEYS = (("player.library.count", {"shown": 3, "total": 10}),
+                 ("vlc.status.available", {"version": "3.0.20"}))
+
+
+def legacy_tr(lang, key, **kwargs):
+    """原 tr() 的查找过程，用于对比结果与速度"""
+    translations = I18n._load_translations(lang)
+    text = translations.get(key)
+    if not text:
+        entry = I18n._TEXTS.get(key)
+        if entry:
+            if lang == "zh-Hans":
+                legacy_lang = "zh"
+            elif lang == "en":
+                legacy_lang = "en"
+            else:
+                legacy_lang = I18n._LEGACY_LANG_FALLBACK
+            text = entry.get(legacy_lang) or entry.get(I18n._LEGACY_LANG_FALLBACK)
+    if not text:
+        text = key
+    if kwargs:
+        try:
+            return text.format(**kwargs)
+        except Exception:
+            return text
+    return text
+
+
+def measure(fn, calls):
+    started = time.perf_counter()
+    for _ in range(calls // 4):
+        fn()
+        fn()
+        fn()
+        fn()
+    return calls / (time.perf_counter() - started)
+
+
+class Label:
+    def __init__(self):
+        self.text = ""
+
+    def setText(self, text):
+        self.text = text
+
+
+def check(name, ok):
+    print(f"   {'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 400000
+
+    print("🔍 翻译查找基准测试")
+    print("=" * 50)
+
+    # 基准测试不改动用户配置文件中的语言
+    I18n._write_config_lang = lambda lang: None
+    results = []
+
+    # 1) 结果一致
+    keys = set(I18n._TEXTS)
+    for lang in LANGS:
+        keys.update(I18n._load_translations(lang))
+    mismatched = []
+    for lang in LANGS:
+        I18n.set_language(lang)
+        for key in sorted(keys):
+            kwargs = {"shown": 1, "total": 2, "version": "v", "path": "p", "msg": "m"}
+            if I18n.tr(key) != legacy_tr(lang, key) or \
+                    I18n.tr(key, **kwargs) != legacy_tr(lang, key, **kwargs):
+                mismatched.append((lang, key))
+    results.append(check(f"{len(LANGS)} 种语言 × {len(keys)} 个键与原实现一致", not mismatched))
+    for lang, key in mismatched[:5]:
+        print(f"      {lang}: {key}")
+
+    # 吞吐量
+    I18n.set_language("ja")
+    tr = I18n.tr
+    print(f"\n   {'场景':<12}{'原实现 万次/s':>14}{'编译表 万次/s':>14}{'倍数':>8}")
+    speedups = []
+    scenarios = (
+        ("普通文本", lambda: tr(PLAIN_KEYS[1]), lambda: legacy_tr("ja", PLAIN_KEYS[1])),
+        ("旧字典回退", lambda: tr("combiner.speed"), lambda: legacy_tr("ja", "combiner.speed")),
+        ("格式化", lambda: tr(TEMPLATE_KEYS[0][0], **TEMPLATE_KEYS[0][1]),
+         lambda: legacy_tr("ja", TEMPLATE_KEYS[0][0], **TEMPLATE_KEYS[0][1])),
+        ("不存在的键", lambda: tr("no.such.key"), lambda: legacy_tr("ja", "no.such.key")),
+    )
+    for name, new, old in scenarios:
+        old_rate = measure(old, calls)
+        new_rate = measure(new, calls)
+        speedups.append(new_rate / old_rate)
+        print(f"   {name:<12}{old_rate / 1e4:>14.0f}{new_rate / 1e4:>14.0f}{new_rate / old_rate:>7.1f}x")
+    print()
+    results.append(check("普通文本查找快于原实现", speedups[0] > 1.0))
+
+    # 2) 反查主视角
+    reverse_ok = True
+    for lang in LANGS:
+        I18n.set_language(lang)
+        for view in I18n.VIEW_KEYS:
+            reverse_ok &= I18n.view_from_text(I18n.view_text(view)) == view
+        reverse_ok &= I18n.view_from_text("no such view") is None
+    # 旧配置保存的是保存时所用语言的显示文本
+    I18n.set_language("en")
+    reverse_ok &= I18n.view_from_text("后") == "back" and I18n.view_from_text("後") == "back"
+    results.append(check("各语言下显示文本反查主视角，其他语言的文本也能反查", reverse_ok))
+
+    # 3) 运行时切换语言
+    I18n.set_language("en")
+    label = I18n.bind(Label(), "menu.help")
+    count = I18n.bind(Label(), "player.library.count", shown=1, total=5)
+    calls_seen = []
+
+    class Window:
+        def retranslate_ui(self):
+            calls_seen.append(I18n.get_current_language())
+
+    window = Window()
+    I18n.add_language_listener(window.retranslate_ui)
+    before = (label.text, count.text)
+    started = time.perf_counter()
+    I18n.set_language("zh-Hans")
+    switch_ms = (time.perf_counter() - started) * 1000
+    del window
+    I18n.set_language("ja")
+    results.append(check(f"切换语言后立即更新（{switch_ms:.1f}ms），已释放的监听器不再调用",
+                         before == ("Help", "1 / 5 events") and label.text == I18n.tr("menu.help")
+                         and count.text == I18n.tr("player.library.count", shown=1, total=5)
+                         and calls_seen == ["zh-Hans"]))
+
+    print("\n" + ("✅ 全部通过" if all(results) else "❌ 存在失败项"))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+事件库索引基准测试
+
+生成若干个带 event.json 的哨兵事件文件夹，检查：
+1. 首次扫描与增量扫描（无变化时不重新读取）耗时；
+2. 关键字、日期范围、附近位置查询结果与逐条过滤一致；
+3. 删除事件文件夹后重新扫描能移除对应记录；
+4. 同一个盘换用上一级目录扫描时，已有的事件归到新的根目录；
+并输出各类查询的平均耗时。
+
+用法:
+    python tests/bench_library_index.py [事件数量]
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from LibraryIndex import LibraryIndex, SearchQuery, distance_km  # noqa: E402
+
+CITIES = ["上海市", "杭州市", "苏州市", "南京市", "宁波市", "Shanghai", "Hangzhou"]
+STREETS = ["南京东路", "人民路", "中山北路", "延安西路", "Century Avenue", "West Lake Road"]
+REASONS = ["sentry_aware_object_detection", "user_interaction_dashcam_icon_tapped",
+           "sentry_aware_accel"]
+
+
+def make_events(root, count, rnd):
+    start = datetime(2025, 1, 1)
+    events = []
+    for i in range(count):
+        when = start + timedelta(minutes=rnd.randint(0, 365 * 24 * 60))
+        name = f"{when:%Y-%m-%d_%H-%M-%S}-{i}"
+        folder = os.path.join(root, "TeslaCam", "SentryClips", name)
+        os.makedirs(folder)
+        event = {
+            "timestamp": f"{when:%Y-%m-%dT%H:%M:%S}",
+            "city": rnd.choice(CITIES),
+            "street": rnd.choice(STREETS),
+            "est_lat": f"{rnd.uniform(30.0, 32.0):.4f}",
+            "est_lon": f"{rnd.uniform(120.0, 122.0):.4f}",
+            "reason": rnd.choice(REASONS),
+            "camera": str(rnd.randint(0, 7)),
+        }
+        with open(os.path.join(folder, "event.json"), "w", encoding="utf-8") as f:
+            json.dump(event, f, ensure_ascii=False)
+        events.append((folder, when, event))
+    return events
+
+
+def brute(events, query):
+    result = set()
+    for folder, when, event in events:
+        if query.start and when < query.start:
+            continue
+        if query.end and when >= query.end:
+            continue
+        if query.reason and query.reason not in event["reason"]:
+            continue
+        if query.camera and query.camera != event["camera"]:
+            continue
+        if query.near:
+            lat, lon, km = query.near
+            if distance_km(lat, lon, float(event["est_lat"]), float(event["est_lon"])) > km:
+                continue
+        text = " ".join((event["city"], event["street"], event["city"] + " " + event["street"]))
+        if any(word.lower() not in text.lower() for word in query.text.split()):
+            continue
+        result.add(folder)
+    return result
+
+
+def check(name, ok):
+    print(f"   {'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def timed(label, func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = time.perf_counter() - started
+    print(f"   {label}: 平均 {elapsed / repeat * 1000:.2f}ms/次, 结果 {len(result)} 条")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    print("🔍 事件库索引基准测试")
+    print("=" * 50)
+
+    rnd = random.Random(7)
+    folder = tempfile.mkdtemp(prefix="library-index-")
+    events = make_events(folder, count, rnd)
+    root = os.path.join(folder, "TeslaCam")
+    index = LibraryIndex(os.path.join(folder, "library.db"))
+    print(f"   事件 {count}, 全文索引 {'FTS5' if index.has_fts else 'LIKE'}")
+
+    results = []
+
+    started = time.perf_counter()
+    updated, _ = index.scan(root)
+    print(f"   首次扫描: {time.perf_counter() - started:.2f}s")
+    results.append(check("首次扫描写入全部事件", updated == count == index.count(root)))
+
+    started = time.perf_counter()
+    updated, _ = index.scan(root)
+    print(f"   增量扫描: {time.perf_counter() - started:.2f}s")
+    results.append(check("无变化时增量扫描不重新读取", updated == 0))
+
+    queries = [
+        ("关键字", "南京东路"),
+        ("短关键字", "上海"),
+        ("日期", "2025-04-06"),
+        ("日期范围", "2025-03-01..2025-03-31 reason:sentry"),
+        ("附近 5km", "@31.2,121.4,5"),
+        ("组合", "杭州市 2025-06-01..2025-09-30 @31.0,120.5,30"),
+    ]
+    for label, text in queries:
+        query = SearchQuery.parse(text)
+        rows = timed(label, lambda: index.search(query, root=root), 50)
+        got = {row["folder"] for row in rows}
+        results.append(check(f"{label} 与逐条过滤一致", got == brute(events, query)))
+
+    removed = events[:10]
+    for path, _, _ in removed:
+        shutil.rmtree(path)
+    _, deleted = index.scan(root)
+    remaining = {row["folder"] for row in index.search("", root=root)}
+    results.append(check("删除的事件被移除",
+                         deleted == 10 and not any(p in remaining for p, _, _ in removed)))
+
+    # 同一个盘换一个根目录扫描：已有的事件归到新的根目录，不因文件夹重复而失败
+    try:
+        updated, _ = index.scan(folder)
+        moved = index.count(folder)
+    except Exception as ex:
+        print(f"   扫描失败: {ex}")
+        updated = moved = -1
+    results.append(check("换用上一级目录扫描时事件归到新的根目录",
+                         moved == count - 10 and updated == moved and index.count(root) == 0))
+
+    index.close()
+    shutil.rmtree(folder, ignore_errors=True)
+    print("\n" + ("✅ 全部通过" if all(results) else "❌ 存在失败项"))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
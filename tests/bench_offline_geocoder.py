@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+离线逆地理编码基准测试
+
+生成随机地名点（CSV）与网格状行政区（GeoJSON），各自构建索引后执行 10 万次查询，
+与逐个计算距离的暴力查找对比前若干次结果是否一致，并输出平均查询耗时。
+
+用法:
+    python tests/bench_offline_geocoder.py [查询次数] [地名数量]
+"""
+
+import sys
+import os
+import csv
+import json
+import time
+import random
+import tempfile
+
+import numpy as np
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from OfflineGeocoder import OfflineGeocoder, EARTH_RADIUS_KM  # noqa: E402
+
+# 长三角附近的范围
+LON_RANGE = (118.0, 123.0)
+LAT_RANGE = (29.0, 33.0)
+
+
+def write_places(path, count, rnd):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "lat", "lon"])
+        for i in range(count):
+            writer.writerow([f"地点{i}", rnd.uniform(*LAT_RANGE), rnd.uniform(*LON_RANGE)])
+
+
+def write_regions(path, step=0.5):
+    features = []
+    lon = LON_RANGE[0]
+    while lon < LON_RANGE[1]:
+        lat = LAT_RANGE[0]
+        while lat < LAT_RANGE[1]:
+            ring = [[lon, lat], [lon + step, lat], [lon + step, lat + step],
+                    [lon, lat + step], [lon, lat]]
+            features.append({
+                "type": "Feature",
+                "properties": {"name": f"区{lon:.1f}_{lat:.1f}"},
+                "geometry": {"type": "Polygon", "coordinates": [ring]},
+            })
+            lat += step
+        lon += step
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "features": features}, f)
+    return len(features)
+
+
+def brute_nearest(index, lon, lat, max_km):
+    cos_lat = np.cos(np.radians(lat))
+    dlat = np.radians(index.lats - lat)
+    dlon = np.radians(index.lons - lon) * cos_lat
+    dist = np.hypot(dlat, dlon) * EARTH_RADIUS_KM
+    i = int(np.argmin(dist))
+    return index.names[i] if dist[i] <= max_km else None
+
+
+def bench(label, func, queries):
+    started = time.perf_counter()
+    for lon, lat in queries:
+        func(lon, lat)
+    elapsed = time.perf_counter() - started
+    print(f"   {label}: {elapsed:.2f}s, 平均 {elapsed / len(queries) * 1e6:.1f}us/次")
+
+
+def main():
+    lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    place_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+
+    print("🔍 离线逆地理编码基准测试")
+    print("=" * 50)
+
+    rnd = random.Random(42)
+    folder = tempfile.mkdtemp(prefix="offline-geocoder-")
+    places_csv = os.path.join(folder, "places.csv")
+    regions_json = os.path.join(folder, "regions.geojson")
+    write_places(places_csv, place_count, rnd)
+    region_count = write_regions(regions_json)
+
+    started = time.perf_counter()
+    places = OfflineGeocoder(places_csv)
+    regions = OfflineGeocoder(regions_json)
+    print(f"   地名 {place_count}, 行政区 {region_count}, "
+          f"加载 {time.perf_counter() - started:.2f}s")
+
+    queries = [(rnd.uniform(*LON_RANGE), rnd.uniform(*LAT_RANGE)) for _ in range(lookups)]
+
+    mismatches = 0
+    for lon, lat in queries[:500]:
+        expected = brute_nearest(places.places, lon, lat, places.max_place_km)
+        got, _ = places.places.nearest(lon, lat, places.max_place_km)
+        mismatches += expected != got
+    print(f"   与暴力查找对比 500 次: {'✅ 一致' if not mismatches else f'❌ 不一致 {mismatches} 次'}")
+
+    bench("最近地名", places.reverse, queries)
+    bench("所在行政区", regions.reverse, queries)
+
+    return 0 if not mismatches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
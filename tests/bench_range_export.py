@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+区间快速导出基准测试
+
+用 ffmpeg 生成三组、每组四个视角的 20 秒测试片段（1 秒一个关键帧、无 B 帧），
+导出跨越三组共 30 秒的区间，检查：
+1. 直接复制模式：输出时长在 [30, 30 + GOP] 秒之间（入点对齐到之前的关键帧），耗时小于 1 秒；
+2. 精确模式：输出时长约为 30 秒，整个文件只有一套 SPS/PPS（严格的播放器只读取 MP4 中的参数集），
+   入点和跨组处的画面与原始片段一致。
+
+用法:
+    python tests/bench_range_export.py
+"""
+
+import sys
+import os
+import re
+import time
+import shutil
+import tempfile
+import subprocess
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from RangeExport import RangeExporter, RangePoint, VIEWS  # noqa: E402
+
+CLIP_SECONDS = 20
+GOP_SECONDS = 1
+FPS = 36
+
+
+def make_groups(folder, count=3):
+    groups = []
+    for i in range(count):
+        group = {}
+        for view in VIEWS:
+            path = os.path.join(folder, f"2025-01-01_00-0{i}-00-{view}.mp4")
+            subprocess.run(
+                ["ffmpeg", "-loglevel", "quiet", "-y", "-f", "lavfi",
+                 "-i", f"testsrc=size=1280x960:rate={FPS}:duration={CLIP_SECONDS}",
+                 "-c:v", "libx264", "-preset", "ultrafast", "-bf", "0",
+                 "-g", str(FPS * GOP_SECONDS), "-pix_fmt", "yuv420p", path],
+                check=True)
+            group[view] = path
+        groups.append(group)
+    return groups
+
+
+def duration(path):
+    out = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+         "-of", "default=nw=1:nk=1", path],
+        check=True, capture_output=True, text=True).stdout
+    return float(out.strip())
+
+
+def parameter_sets(path):
+    """输出中出现过的不同 SPS/PPS（按字段值区分）"""
+    err = subprocess.run(
+        ["ffmpeg", "-nostdin", "-i", path, "-c", "copy", "-bsf:v", "trace_headers",
+         "-f", "null", "-"], capture_output=True, text=True).stderr
+    sets, current = set(), None
+    for line in err.splitlines():
+        text = line.split("] ", 1)[-1]
+        field = re.match(r"\d+\s+(\w+)\s+\S+ = (\S+)$", text)
+        if field and current is not None:
+            current.append(field.groups())
+            continue
+        if current is not None:
+            sets.add(tuple(current))
+            current = None
+        if text in ("Sequence Parameter Set", "Picture Parameter Set"):
+            current = [text]
+    return sets
+
+
+def psnr(path, ref, at, ref_at, seconds=1.0):
+    """输出 at 秒起与原始片段 ref_at 秒起 seconds 秒画面的平均 PSNR"""
+    err = subprocess.run(
+        ["ffmpeg", "-nostdin", "-i", path, "-i", ref, "-filter_complex",
+         f"[0:v]trim={at}:{at + seconds},setpts=PTS-STARTPTS[a];"
+         f"[1:v]trim={ref_at}:{ref_at + seconds},setpts=PTS-STARTPTS[b];[a][b]psnr",
+         "-f", "null", "-"], capture_output=True, text=True).stderr
+    value = re.findall(r"average:(\S+)", err)[-1]
+    return float("inf") if value == "inf" else float(value)
+
+
+def check(name, ok):
+    print(f"   {'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def main():
+    print("🔍 区间快速导出基准测试")
+    print("=" * 50)
+
+    if not shutil.which("ffmpeg") or not shutil.which("ffprobe"):
+        print("❌ 未找到 ffmpeg/ffprobe")
+        return 1
+
+    folder = tempfile.mkdtemp(prefix="range-export-")
+    groups = make_groups(folder)
+    # 第一组 15.5 秒 -> 第三组 5.5 秒，共 30 秒
+    start, end = RangePoint(0, 15500), RangePoint(2, 5500)
+
+    results = []
+    for accurate in (False, True):
+        label = "精确模式" if accurate else "直接复制"
+        exporter = RangeExporter(os.path.join(folder, "out"), accurate=accurate)
+        started = time.perf_counter()
+        outputs = exporter.export(groups, start, end, name=label)
+        elapsed = time.perf_counter() - started
+        lengths = [duration(p) for p in outputs.values()]
+        print(f"   {label}: {elapsed:.2f}s, 视角 {len(outputs)}, "
+              f"时长 {min(lengths):.2f}~{max(lengths):.2f}s")
+        if accurate:
+            ok = all(abs(x - 30) < 0.1 for x in lengths)
+        else:
+            ok = all(30 - 0.1 < x < 30 + GOP_SECONDS + 0.1 for x in lengths) and elapsed < 1
+        results.append(check(f"{label}时长与耗时", len(outputs) == 4 and ok))
+
+        if accurate:
+            output, clips = outputs['front'], [group['front'] for group in groups]
+            sets = parameter_sets(output)
+            # 入点（第一组 15.5 秒）与跨到第二组后的画面
+            quality = min(psnr(output, clips[0], 0, 15.5), psnr(output, clips[1], 5.0, 0.5))
+            results.append(check(f"精确模式参数集一致（{len(sets)} 套 SPS/PPS），"
+                                 f"画面与原始片段一致（PSNR {quality:.1f}dB）",
+                                 len(sets) == 2 and quality > 35))
+
+    shutil.rmtree(folder, ignore_errors=True)
+    print("\n" + ("✅ 全部通过" if all(results) else "❌ 存在失败项"))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
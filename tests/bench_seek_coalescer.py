@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+seek 合并器基准测试
+
+模拟拖动进度条：以 120Hz 产生 seek 请求、按 60Hz 调用 pump()，
+每个模拟播放器的 seek 需要固定时间才能生效，对比逐个下发与合并下发的 seek 次数。
+"""
+
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from SeekCoalescer import SeekCoalescer  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+
+class FakePlayer:
+    """模拟 libVLC 播放器：seek 在 latency 秒后生效，新的 seek 会放弃未完成的 seek"""
+
+    def __init__(self, clock, latency):
+        self.clock = clock
+        self.latency = latency
+        self.position = 0.0
+        self._pending = None
+        self.seeks = 0
+        self.abandoned = 0
+        self.completed = 0
+
+    def set_position(self, position):
+        if self._pending is not None:
+            self.abandoned += 1
+        self.seeks += 1
+        self._pending = (position, self.clock.now + self.latency)
+
+    def get_position(self):
+        if self._pending is not None and self.clock.now >= self._pending[1]:
+            self.position = self._pending[0]
+            self._pending = None
+            self.completed += 1
+        return self.position
+
+
+def run(latency=0.08, drag_seconds=2.0, move_hz=120, pump_hz=60, coalesce=True):
+    clock = FakeClock()
+    players = {v: FakePlayer(clock, latency) for v in ('front', 'back', 'left', 'right')}
+    coalescer = SeekCoalescer(lambda: players)
+
+    steps = int(drag_seconds * move_hz)
+    pump_every = max(1, move_hz // pump_hz)
+    for i in range(steps):
+        clock.now = i / move_hz
+        position = i / steps
+        if coalesce:
+            coalescer.request(position)
+            if i % pump_every == 0:
+                coalescer.pump(clock.now)
+        else:
+            for p in players.values():
+                p.set_position(position)
+            for p in players.values():
+                p.get_position()
+
+    # 松开：一次精确 seek，之后等待全部生效
+    clock.now = drag_seconds
+    if coalesce:
+        coalescer.request(1.0, precise=True)
+        while not coalescer.idle:
+            coalescer.pump(clock.now)
+            clock.now += 1 / pump_hz
+    else:
+        for p in players.values():
+            p.set_position(1.0)
+        clock.now += latency
+    for p in players.values():
+        p.get_position()
+
+    return steps, players, coalescer
+
+
+def main():
+    print("🔍 seek 合并器基准测试")
+    print("=" * 50)
+    for coalesce in (False, True):
+        steps, players, coalescer = run(coalesce=coalesce)
+        issued = sum(p.seeks for p in players.values())
+        applied = sum(p.completed for p in players.values())
+        abandoned = sum(p.abandoned for p in players.values())
+        final_ok = all(abs(p.position - 1.0) < 1e-9 for p in players.values())
+        print(f"\n{'合并下发' if coalesce else '逐个下发'}:")
+        print(f"   拖动事件: {steps}")
+        print(f"   下发 seek: {issued}")
+        print(f"   生效 seek: {applied}")
+        print(f"   被放弃 seek: {abandoned}")
+        print(f"   最终位置正确: {'✅' if final_ok else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
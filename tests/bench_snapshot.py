@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+四视角同步快照基准测试
+
+用 ffmpeg 生成一组四个视角的 60 秒测试片段（与 TeslaCam 相近的分辨率和关键帧间隔），
+在片段后半段的多个时间点截取快照，检查平均耗时是否低于 1 秒。
+
+用法:
+    python tests/bench_snapshot.py [快照次数]
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+import subprocess
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PyQt5.QtGui import QGuiApplication  # noqa: E402
+from Snapshot import take_snapshot  # noqa: E402
+
+VIEWS = ('front', 'back', 'left', 'right')
+MAX_LATENCY_S = 1.0
+
+
+def make_group(folder, seconds=60):
+    group = {}
+    for view in VIEWS:
+        path = os.path.join(folder, f"2025-01-01_00-00-00-{view}.mp4")
+        subprocess.run(
+            ["ffmpeg", "-loglevel", "quiet", "-y", "-f", "lavfi",
+             "-i", f"testsrc=size=1280x960:rate=36:duration={seconds}",
+             "-c:v", "libx264", "-preset", "ultrafast", "-g", "36",
+             "-pix_fmt", "yuv420p", path],
+            check=True)
+        group[view] = path
+    return group
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print("🔍 四视角同步快照基准测试")
+    print("=" * 50)
+
+    if not shutil.which("ffmpeg"):
+        print("❌ 未找到 ffmpeg")
+        return 1
+
+    folder = tempfile.mkdtemp(prefix="snapshot-")
+    group = make_group(folder)
+
+    elapsed = []
+    for i in range(count):
+        seconds = 30.5 + i * 5.3
+        output = os.path.join(folder, f"snapshot-{i}.png")
+        started = time.perf_counter()
+        take_snapshot(group, seconds, 'front', output, caption=f"2025-01-01 00:00:{int(seconds):02d}")
+        elapsed.append(time.perf_counter() - started)
+        print(f"   {seconds:.1f}s: {elapsed[-1] * 1000:.0f}ms")
+
+    average = sum(elapsed) / len(elapsed)
+    ok = average < MAX_LATENCY_S
+    print(f"\n{'✅' if ok else '❌'} 平均 {average * 1000:.0f}ms (目标 < {MAX_LATENCY_S * 1000:.0f}ms)")
+
+    shutil.rmtree(folder, ignore_errors=True)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    # 快照的说明文字用 QPainter 绘制，需要 QGuiApplication；保存在模块变量中，避免被回收
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv)
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+存储管理基准测试
+
+生成约 2TB（稀疏文件，不占实际空间）的模拟事件库：SentryClips、SavedClips 事件文件夹，
+按日期分目录的 RecentClips，以及导出的合并视频。检查：
+1. 完整扫描与统计的耗时；
+2. 按日期、类型、摄像头汇总的结果正确；
+3. 保留策略的试运行只包含超期内容，导出文件不在计划中；
+4. 分批删除后重新扫描，剩余内容与计划一致。
+
+用法:
+    python tests/bench_storage_manager.py [天数]
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from StorageManager import RetentionPolicy, StorageManager, format_size  # noqa: E402
+
+VIEWS = ('front', 'back', 'left_repeater', 'right_repeater')
+CLIP_BYTES = 40 * 1024 * 1024
+# 每天的哨兵事件数、保存事件数、RecentClips 分钟数
+SENTRY_PER_DAY = 10
+SAVED_PER_DAY = 2
+RECENT_MINUTES = 60
+MAX_SECONDS = 5.0
+
+
+def sparse(path, size):
+    with open(path, "wb") as f:
+        f.truncate(size)
+
+
+def make_event(folder, day, index):
+    name = f"{day.isoformat()}_{index // 60:02d}-{index % 60:02d}-00"
+    event = os.path.join(folder, name)
+    os.makedirs(event)
+    # 每个事件 10 分钟
+    for minute in range(10):
+        for view in VIEWS:
+            sparse(os.path.join(event, f"{day.isoformat()}_{index // 60:02d}-{minute:02d}-00-{view}.mp4"),
+                   CLIP_BYTES)
+    with open(os.path.join(event, "event.json"), "w") as f:
+        f.write("{}")
+
+
+def make_library(root, days, today):
+    for offset in range(days):
+        day = today - timedelta(days=offset)
+        for i in range(SENTRY_PER_DAY):
+            make_event(os.path.join(root, "TeslaCam", "SentryClips"), day, i)
+        for i in range(SAVED_PER_DAY):
+            make_event(os.path.join(root, "TeslaCam", "SavedClips"), day, 30 + i)
+        recent = os.path.join(root, "TeslaCam", "RecentClips", day.isoformat())
+        os.makedirs(recent)
+        for minute in range(RECENT_MINUTES):
+            for view in VIEWS:
+                sparse(os.path.join(recent, f"{day.isoformat()}_12-{minute:02d}-00-{view}.mp4"),
+                       CLIP_BYTES)
+    exports = os.path.join(root, "exports")
+    os.makedirs(exports)
+    for offset in range(days):
+        path = os.path.join(exports, f"mosaic-{offset}.mp4")
+        sparse(path, CLIP_BYTES * 4)
+        # 导出文件按修改时间归入日期
+        mtime = time.mktime((today - timedelta(days=offset)).timetuple()) + 12 * 3600
+        os.utime(path, (mtime, mtime))
+
+
+def check(name, ok):
+    print(f"   {'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def main():
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+
+    print("🔍 存储管理基准测试")
+    print("=" * 50)
+
+    today = date(2025, 6, 30)
+    root = tempfile.mkdtemp(prefix="storage-")
+    results = []
+    try:
+        started = time.perf_counter()
+        make_library(root, days, today)
+        print(f"   生成模拟事件库: {time.perf_counter() - started:.1f}s")
+
+        manager = StorageManager(root)
+        started = time.perf_counter()
+        manager.scan()
+        report = manager.report()
+        elapsed = time.perf_counter() - started
+        print(f"   扫描与统计: {elapsed:.2f}s, {report['files']} 个文件, {format_size(report['total'])}")
+        results.append(check(f"耗时 < {MAX_SECONDS:.0f}s", elapsed < MAX_SECONDS))
+
+        clips_per_day = (SENTRY_PER_DAY + SAVED_PER_DAY) * 40 + RECENT_MINUTES * 4
+        results.append(check("按日期统计",
+                             len(report["by_day"]) == days and
+                             report["by_day"][today.isoformat()] >= clips_per_day * CLIP_BYTES))
+        results.append(check("按类型、摄像头统计",
+                             set(report["by_type"]) == {"SentryClips", "SavedClips", "RecentClips",
+                                                        "Exports"} and
+                             report["by_camera"]["front"] == report["by_camera"]["back"]))
+
+        policy = RetentionPolicy(sentry_days=30, recent_days=7)
+        plan = manager.plan(policy, today=today)
+        sentry = [u for u in plan if u.type == "SentryClips"]
+        recent = [u for u in plan if u.type == "RecentClips"]
+        cutoff = today - timedelta(days=30)
+        results.append(check(f"试运行: {len(plan)} 项, {format_size(sum(u.size for u in plan))}",
+                             len(sentry) == SENTRY_PER_DAY * max(0, days - 31) and
+                             len(recent) == RECENT_MINUTES * 4 * max(0, days - 8) and
+                             all(u.day < cutoff for u in sentry) and
+                             all(u.type in ("SentryClips", "RecentClips") for u in plan)))
+
+        forecast = manager.forecast(report)
+        print(f"   预测: 每天 {format_size(forecast['daily_bytes'])}")
+        results.append(check("每日增长量预测",
+                             abs(forecast["daily_bytes"] - report["total"] / days) <
+                             report["by_type"]["Exports"] / days + 1))
+
+        started = time.perf_counter()
+        deleted, freed = manager.apply(plan)
+        print(f"   分批删除: {time.perf_counter() - started:.2f}s")
+        manager.scan()
+        after = manager.report()
+        results.append(check("删除后剩余大小一致",
+                             deleted == len(plan) and after["total"] == report["total"] - freed and
+                             not manager.plan(policy, today=today)))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print("\n" + ("✅ 全部通过" if all(results) else "❌ 存在失败项"))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+主题编译缓存基准测试
+
+比较 qt_material.apply_stylesheet 与 ThemeManager 编译缓存的主题应用耗时，并检查：
+1. 编译后的 QSS 不再引用 icon:/ 搜索路径，引用的图标文件都存在；
+2. 新的 ThemeManager（相当于再次启动）从磁盘读取缓存，不导入 qt_material；
+3. 切换到已应用过的主题只设置样式表；
+4. 版本变化后旧缓存被删除。
+
+用法:
+    python tests/bench_theme_cache.py [切换次数]
+"""
+
+import sys
+import os
+import re
+import time
+import shutil
+import tempfile
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import (QApplication, QComboBox, QLabel, QLineEdit, QListWidget,  # noqa: E402
+                             QPushButton, QSlider, QVBoxLayout, QWidget)
+
+from ThemeManager import ThemeManager  # noqa: E402
+
+THEMES = ("light_blue", "dark_blue")
+
+
+def check(name, ok):
+    print(f"   {'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def make_window():
+    """与播放器主界面控件种类相近的窗口，切换主题时需要重新计算样式"""
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    for i in range(10):
+        for widget in (QPushButton(f"按钮 {i}"), QLabel(f"标签 {i}"), QLineEdit(),
+                       QComboBox(), QSlider()):
+            layout.addWidget(widget)
+    items = QListWidget()
+    items.addItems([f"事件 {i}" for i in range(50)])
+    layout.addWidget(items)
+    window.show()
+    return window
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    app = QApplication.instance() or QApplication(sys.argv)
+    window = make_window()
+
+    print("🔍 主题编译缓存基准测试")
+    print("=" * 50)
+
+    folder = tempfile.mkdtemp(prefix="theme-cache-")
+    results = []
+    try:
+        # 原实现：每次应用都渲染模板、生成图标
+        _, import_ms = timed(lambda: __import__("qt_material"))
+        from qt_material import apply_stylesheet
+        legacy = []
+        for i in range(rounds):
+            _, ms = timed(lambda: apply_stylesheet(app, theme=f"{THEMES[i % 2]}.xml",
+                                                   parent=os.path.join(folder, "legacy")))
+            legacy.append(ms)
+        app.setStyleSheet("")
+        sys.modules.pop("qt_material", None)
+
+        # 1) 首次编译
+        manager = ThemeManager(cache_dir=folder)
+        manager.set_app(app)
+        ok, compile_ms = timed(lambda: manager.apply_theme(THEMES[0]))
+        qss = app.styleSheet()
+        icons = set(re.findall(r"url\(([^)]+)\)", qss))
+        results.append(check(f"首次编译 {compile_ms:.0f}ms，QSS {len(qss) // 1024}KB，"
+                             f"{len(icons)} 个图标引用均为存在的文件",
+                             ok and "icon:/" not in qss and icons
+                             and all(os.path.isfile(path) for path in icons)))
+
+        # 2) 再次启动：读取缓存
+        manager.apply_theme(THEMES[1])
+        sys.modules.pop("qt_material", None)
+        restarted = ThemeManager(cache_dir=folder)
+        restarted.set_app(app)
+        available = restarted.is_theme_available(THEMES[0])
+        ok, startup_ms = timed(lambda: restarted.apply_theme(THEMES[0]))
+        results.append(check(f"再次启动从缓存应用 {startup_ms:.1f}ms，未导入 qt_material",
+                             ok and available and "qt_material" not in sys.modules
+                             and app.styleSheet() == qss))
+
+        # 3) 切换已应用过的主题
+        restarted.apply_theme(THEMES[1])
+        switches = []
+        for i in range(rounds):
+            _, ms = timed(lambda: restarted.apply_theme(THEMES[i % 2]))
+            switches.append(ms)
+        legacy_avg = sum(legacy) / len(legacy)
+        switch_avg = sum(switches) / len(switches)
+        print(f"\n   {'场景':<20}{'耗时 ms':>10}")
+        print(f"   {'导入 qt_material':<20}{import_ms:>10.2f}")
+        print(f"   {'apply_stylesheet':<20}{legacy_avg:>10.2f}")
+        print(f"   {'首次编译':<20}{compile_ms:>10.2f}")
+        print(f"   {'启动读取缓存':<20}{startup_ms:>10.2f}")
+        print(f"   {'切换主题':<20}{switch_avg:>10.2f}\n")
+        results.append(check(f"切换主题比 apply_stylesheet 快 {legacy_avg / switch_avg:.1f} 倍",
+                             switch_avg < legacy_avg))
+
+        # 4) 版本变化
+        old_dir = os.path.join(folder, restarted.cache_key())
+        upgraded = ThemeManager(cache_dir=folder)
+        upgraded.set_app(app)
+        upgraded._cache_key = restarted.cache_key() + "-next"
+        recompiled = upgraded.load_compiled(THEMES[0]) is None and upgraded.apply_theme(THEMES[0])
+        results.append(check("版本变化后重新编译并删除旧缓存",
+                             recompiled and not os.path.exists(old_dir)
+                             and os.path.isdir(upgraded.theme_cache_dir(THEMES[0]))))
+    finally:
+        app.setStyleSheet("")
+        window.close()
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print("\n" + ("✅ 全部通过" if all(results) else "❌ 存在失败项"))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
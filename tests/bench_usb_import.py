@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+U 盘导入基准测试
+
+生成模拟的 TeslaCam 目录（RecentClips 与 SavedClips 中包含相同的片段），检查：
+1. 导入后文件内容一致，重复片段只保存一份（硬链接）；
+2. 中途取消后再次导入能从清单继续，且不重复复制；
+3. 导入吞吐量与 shutil.copyfile（不计算哈希）的对比；
+4. 单个文件写入失败时计入失败数并清理临时文件，其余文件继续导入。
+
+用法:
+    python tests/bench_usb_import.py [片段数量] [片段大小MB]
+"""
+
+import sys
+import os
+import time
+import shutil
+import hashlib
+import tempfile
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from UsbImporter import UsbImporter  # noqa: E402
+
+VIEWS = ('front', 'back', 'left_repeater', 'right_repeater')
+
+
+def make_source(folder, clips, size_mb):
+    """RecentClips 中生成 clips 个片段，SavedClips 的事件复制其中一半"""
+    recent = os.path.join(folder, "TeslaCam", "RecentClips")
+    saved = os.path.join(folder, "TeslaCam", "SavedClips", "2025-01-01_00-10-00")
+    os.makedirs(recent)
+    os.makedirs(saved)
+    block = os.urandom(1024 * 1024)
+    for i in range(clips):
+        name = f"2025-01-01_00-{i // 4:02d}-00-{VIEWS[i % 4]}.mp4"
+        path = os.path.join(recent, name)
+        with open(path, "wb") as f:
+            # 每个片段开头写入序号，保证内容互不相同
+            f.write(i.to_bytes(8, "little"))
+            for _ in range(size_mb):
+                f.write(block)
+        if i % 2 == 0:
+            shutil.copy2(path, os.path.join(saved, name))
+    with open(os.path.join(saved, "event.json"), "w") as f:
+        f.write('{"city": "test"}')
+
+
+def file_hash(path):
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def check(name, ok):
+    print(f"   {'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def main():
+    clips = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    size_mb = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    print("🔍 U 盘导入基准测试")
+    print("=" * 50)
+
+    folder = tempfile.mkdtemp(prefix="usb-import-")
+    source = os.path.join(folder, "usb")
+    make_source(source, clips, size_mb)
+    total_files = sum(len(files) for _, _, files in os.walk(source))
+    total_mb = sum(os.path.getsize(os.path.join(d, f))
+                   for d, _, files in os.walk(source) for f in files) / 1024 / 1024
+
+    results = []
+
+    # 基准：直接复制
+    baseline = os.path.join(folder, "baseline")
+    started = time.perf_counter()
+    shutil.copytree(source, baseline, copy_function=shutil.copyfile)
+    base_elapsed = time.perf_counter() - started
+    print(f"   shutil.copyfile: {total_mb / base_elapsed:.0f} MB/s")
+
+    # 导入到一半时取消
+    target = os.path.join(folder, "library")
+    stop_after = total_files // 3
+    imported = []
+    importer = UsbImporter(source, target, should_stop=lambda: len(imported) >= stop_after,
+                           progress=lambda done, total, read: imported.append(done))
+    first = importer.run()
+    print(f"   取消前导入: {first}")
+
+    started = time.perf_counter()
+    importer = UsbImporter(source, target)
+    second = importer.run()
+    elapsed = time.perf_counter() - started
+    print(f"   继续导入: {second}")
+    results.append(check("继续导入跳过已完成的文件",
+                         second["skipped"] >= first["copied"] + first["duplicates"]
+                         and second["failed"] == 0))
+
+    same = all(
+        file_hash(os.path.join(d, f)) ==
+        file_hash(os.path.join(target, os.path.relpath(os.path.join(d, f), source)))
+        for d, _, files in os.walk(source) for f in files)
+    results.append(check("导入后内容一致", same))
+
+    saved = os.path.join(target, "TeslaCam", "SavedClips", "2025-01-01_00-10-00")
+    linked = [f for f in os.listdir(saved) if f.endswith(".mp4")
+              and os.stat(os.path.join(saved, f)).st_nlink > 1]
+    duplicates = first["duplicates"] + second["duplicates"]
+    results.append(check(f"重复片段只保存一份 ({duplicates} 个)",
+                         duplicates == (clips + 1) // 2 and len(linked) == duplicates))
+
+    third = UsbImporter(source, target).run()
+    results.append(check("再次导入不复制任何文件",
+                         third["copied"] == 0 and third["skipped"] == total_files))
+
+    # 吞吐量（全新目标目录，不取消）
+    fresh = os.path.join(folder, "fresh")
+    started = time.perf_counter()
+    UsbImporter(source, fresh).run()
+    elapsed = time.perf_counter() - started
+    print(f"   导入（含哈希与去重）: {total_mb / elapsed:.0f} MB/s")
+
+    # 单个文件无法写入目标位置时，其余文件照常导入
+    broken = os.path.join(folder, "broken")
+    blocked = os.path.relpath(next(os.path.join(d, f) for d, _, files in os.walk(source)
+                                   for f in sorted(files)), source)
+    os.makedirs(os.path.join(broken, blocked))
+    fourth = UsbImporter(source, broken).run()
+    leftovers = [f for _, _, files in os.walk(broken) for f in files if f.endswith(".part")]
+    results.append(check(f"单个文件失败不中断导入: {fourth}",
+                         fourth["failed"] == 1 and not leftovers
+                         and fourth["copied"] + fourth["duplicates"] == total_files - 1))
+
+    shutil.rmtree(folder, ignore_errors=True)
+    print("\n" + ("✅ 全部通过" if all(results) else "❌ 存在失败项"))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
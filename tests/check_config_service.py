@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+配置服务检查脚本
+
+在临时目录中使用独立的配置文件，检查：
+1. 含 % 的值（URL 编码的代理密码等）可以写入、读回并落盘；
+2. 一次修改多项时，任一项无效则不修改任何项；
+3. 修改只在值变化时通知订阅者，延迟写入后磁盘内容与内存一致；
+4. 写盘（fsync）期间其他线程的修改不会被阻塞；
+5. 写入失败时保留未写入状态，之后可以重新写入。
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+import threading
+import configparser
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import ConfigService  # noqa: E402
+from ConfigService import ConfigService as Service  # noqa: E402
+
+
+def check(name, ok):
+    print(f"   {'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def read_disk(path):
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.read(path, encoding="utf-8")
+    return parser
+
+
+def main():
+    print("🔍 配置服务检查")
+    print("=" * 50)
+
+    folder = tempfile.mkdtemp(prefix="config-service-")
+    path = os.path.join(folder, "config.ini")
+    results = []
+    try:
+        config = Service(path, flush_delay=0.05)
+
+        # 1) 含 % 的值
+        url = "http://u:p%40ss@h:8080"
+        try:
+            config.update("Proxy", {"enabled": True, "url": url})
+            ok = config.section("Proxy").get("url") == url and config.flush()
+        except Exception as ex:
+            print(f"   写入失败: {ex}")
+            ok = False
+        results.append(check("含 % 的值可以写入并落盘",
+                             ok and read_disk(path).get("Proxy", "url") == url
+                             and Service(path).section("Proxy").get("url") == url))
+
+        # 2) 无效项不修改任何项
+        try:
+            config.update("Proxy", {"url": "http://other", "bad\nkey": "x"})
+            raised = False
+        except ValueError:
+            raised = True
+        results.append(check("含无效项时抛出 ValueError 且不修改其他项",
+                             raised and config.section("Proxy").get("url") == url
+                             and not config._dirty))
+
+        # 3) 变化通知与延迟写入
+        events = []
+        config.subscribe(lambda section, key, value: events.append((section, key, value)))
+        config.update("Settings", {"speed": 1.5, "view": "front"})
+        config.update("Settings", {"speed": 1.5})
+        time.sleep(0.3)
+        disk = read_disk(path)
+        results.append(check(f"只在值变化时通知 {events}，延迟写入后磁盘一致",
+                             events == [("Settings", "speed", "1.5"), ("Settings", "view", "front")]
+                             and disk.get("Settings", "speed") == "1.5"
+                             and not config._dirty))
+
+        # 4) 写盘期间修改不阻塞
+        real_fsync = os.fsync
+        writing = threading.Event()
+
+        def slow_fsync(fd):
+            writing.set()
+            time.sleep(0.5)
+            real_fsync(fd)
+
+        os.fsync = slow_fsync
+        try:
+            config.update("Settings", {"speed": 2})
+            writer = threading.Thread(target=config.flush)
+            writer.start()
+            writing.wait(2)
+            started = time.perf_counter()
+            config.update("Settings", {"speed": 3})
+            blocked_ms = (time.perf_counter() - started) * 1000
+            writer.join()
+        finally:
+            os.fsync = real_fsync
+        config.flush()
+        results.append(check(f"写盘期间修改耗时 {blocked_ms:.1f}ms，最终写入最新值",
+                             blocked_ms < 100 and read_disk(path).get("Settings", "speed") == "3"))
+
+        # 5) 写入失败后可重试
+        # 上级"目录"是一个普通文件，无法创建
+        blocker = os.path.join(folder, "blocker")
+        open(blocker, "w").close()
+        config.path = os.path.join(blocker, "config.ini")
+        config.update("Settings", {"speed": 4})
+        failed = config.flush()
+        config.path = path
+        retried = config.flush()
+        results.append(check("写入失败时保留修改，之后重新写入成功",
+                             not failed and retried
+                             and read_disk(path).get("Settings", "speed") == "4"))
+        ConfigService.flush_all()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print("\n" + ("✅ 全部通过" if all(results) else "❌ 存在失败项"))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
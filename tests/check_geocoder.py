@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+逆地理编码缓存检查脚本
+
+在本机启动一个模拟高德逆地理编码接口的 HTTP 服务，检查：
+1. 同一位置（含四舍五入后相同的坐标）只请求一次服务；
+2. 缓存写入磁盘后，新的 Geocoder 实例不再请求服务；
+3. 服务超时/出错时不会卡住，读取超时不重试，且失败结果被短暂缓存。
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Geocoder import Geocoder, GeocodeCache, AmapProvider  # noqa: E402
+
+
+class MockAmapHandler(BaseHTTPRequestHandler):
+    """模拟 /v3/geocode/regeo；location 经度为 0 时返回空地址，/slow 路径不响应"""
+
+    hits = 0
+
+    def do_GET(self):
+        MockAmapHandler.hits += 1
+        url = urlparse(self.path)
+        if url.path.startswith("/slow"):
+            time.sleep(3)
+            return
+        if url.path.startswith("/error"):
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        lon, lat = parse_qs(url.query)["location"][0].split(",")
+        address = [] if float(lon) == 0 else f"模拟地址 {float(lat):.4f},{float(lon):.4f}"
+        body = json.dumps({"status": "1", "info": "OK",
+                           "regeocode": {"formatted_address": address}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def check(name, ok):
+    print(f"   {'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def main():
+    print("🔍 逆地理编码缓存检查")
+    print("=" * 50)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockAmapHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    cache_path = os.path.join(tempfile.mkdtemp(), "geocode-cache.json")
+
+    results = []
+
+    geocoder = Geocoder(AmapProvider("test", base_url=f"{base}/v3/geocode/regeo"),
+                        GeocodeCache(cache_path))
+    first = geocoder.reverse(121.473701, 31.230416)
+    again = geocoder.reverse(121.4737012, 31.2304158)
+    results.append(check("同一位置只请求一次", first == again and MockAmapHandler.hits == 1))
+
+    empty = geocoder.reverse(0, 0)
+    geocoder.reverse(0, 0)
+    results.append(check("无地址结果被缓存", empty is None and MockAmapHandler.hits == 2))
+    geocoder.close()
+
+    geocoder = Geocoder(AmapProvider("test", base_url=f"{base}/v3/geocode/regeo"),
+                        GeocodeCache(cache_path))
+    geocoder.reverse(121.473701, 31.230416)
+    results.append(check("重启后命中磁盘缓存", MockAmapHandler.hits == 2))
+
+    slow = Geocoder(AmapProvider("test", base_url=f"{base}/slow", timeout=(1, 0.5)),
+                    GeocodeCache(cache_path))
+    slow.provider.name = "slow"
+    started = time.monotonic()
+    address = slow.reverse(120.0, 30.0)
+    elapsed = time.monotonic() - started
+    results.append(check(f"超时不阻塞 ({elapsed:.1f}s)", address is None and elapsed < 5))
+    hits = MockAmapHandler.hits
+    slow.reverse(120.0, 30.0)
+    results.append(check("失败结果被短暂缓存", MockAmapHandler.hits == hits))
+
+    # 读取超时不重试，单次查询的耗时不超过 连接超时 × 2 + 读取超时
+    slow.cache = GeocodeCache(os.path.join(os.path.dirname(cache_path), "slow-cache.json"))
+    started = time.monotonic()
+    slow.reverse(121.0, 31.0)
+    elapsed = time.monotonic() - started
+    results.append(check(f"读取超时只请求一次 ({elapsed:.1f}s)",
+                         MockAmapHandler.hits == hits + 1 and elapsed < 1.5))
+
+    server.shutdown()
+    print("\n" + ("✅ 全部通过" if all(results) else "❌ 存在失败项"))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+通知分发检查脚本
+
+在本机启动模拟的 SMTP 服务和企业微信 webhook 服务，检查：
+1. 短时间内的多条通知合并为一条摘要，SMTP 只连接、登录一次；
+2. 之后的通知复用同一个 SMTP 连接；服务端断开连接后自动重连；
+3. SMTP 临时错误、webhook 返回 500 时按指数退避重试，最终送达；
+4. 队列已满时丢弃最旧的通知，notify 不阻塞；
+5. 配置相同时共用同一个应用级通知器，配置变化时替换并关闭旧的通知器。
+
+用法:
+    python tests/check_notifier.py          # 运行检查
+    python tests/check_notifier.py --serve  # 只启动模拟服务，供手动测试
+"""
+
+import sys
+import os
+import json
+import time
+import base64
+import threading
+import socketserver
+from email import message_from_string
+from email.header import decode_header, make_header
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from notifier import Notifier, shared_notifier  # noqa: E402
+
+
+class StandInSmtp(socketserver.ThreadingTCPServer):
+    """最简 SMTP 服务：EHLO/AUTH PLAIN/MAIL/RCPT/DATA/NOOP/QUIT"""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address):
+        super().__init__(address, StandInSmtpHandler)
+        self.connections = 0
+        self.logins = 0
+        self.messages = []
+        # 接下来 N 次 DATA 返回 451 临时错误
+        self.fail_next = 0
+        # 为 True 时下一条消息送达后断开连接
+        self.drop_after_message = False
+
+
+class StandInSmtpHandler(socketserver.StreamRequestHandler):
+
+    def reply(self, line):
+        self.wfile.write((line + "\r\n").encode())
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.reply("220 stand-in ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors="replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                self.reply("250-stand-in")
+                self.reply("250 AUTH PLAIN LOGIN")
+            elif verb == "AUTH":
+                parts = command.split()
+                if len(parts) < 3:
+                    self.reply("334 ")
+                    base64.b64decode(self.rfile.readline().strip())
+                server.logins += 1
+                self.reply("235 2.7.0 Authentication successful")
+            elif verb in ("MAIL", "RCPT", "RSET"):
+                self.reply("250 OK")
+            elif verb == "NOOP":
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    chunk = self.rfile.readline()
+                    if not chunk or chunk in (b".\r\n", b".\n"):
+                        break
+                    data.append(chunk)
+                if server.fail_next:
+                    server.fail_next -= 1
+                    self.reply("451 4.3.0 Try again later")
+                    continue
+                server.messages.append(b"".join(data).decode(errors="replace"))
+                self.reply("250 OK queued")
+                if server.drop_after_message:
+                    server.drop_after_message = False
+                    return
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class StandInWebhook(BaseHTTPRequestHandler):
+    """模拟企业微信机器人 webhook；fail_next 次请求返回 500"""
+
+    fail_next = 0
+    payloads = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if StandInWebhook.fail_next:
+            StandInWebhook.fail_next -= 1
+            self.send_response(500)
+            self.end_headers()
+            return
+        StandInWebhook.payloads.append(json.loads(body))
+        data = json.dumps({"errcode": 0, "errmsg": "ok"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def mail_text(raw):
+    """解码邮件主题和正文"""
+    message = message_from_string(raw)
+    subject = str(make_header(decode_header(message["Subject"])))
+    body = "".join(part.get_payload(decode=True).decode("utf-8")
+                   for part in message.walk() if not part.is_multipart())
+    return subject + "\n" + body
+
+
+def start_servers(smtp_port=0, http_port=0):
+    smtp = StandInSmtp(("127.0.0.1", smtp_port))
+    http = ThreadingHTTPServer(("127.0.0.1", http_port), StandInWebhook)
+    for server in (smtp, http):
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return smtp, http
+
+
+def check(name, ok):
+    print(f"   {'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def main():
+    if "--serve" in sys.argv:
+        smtp, http = start_servers(2525, 8025)
+        print("SMTP: 127.0.0.1:2525（任意账号密码）, webhook: http://127.0.0.1:8025/")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            return 0
+
+    print("🔍 通知分发检查")
+    print("=" * 50)
+
+    smtp, http = start_servers()
+    notifier = Notifier(
+        enable_system=False, enable_email=True, enable_wechat=True,
+        smtp_host="127.0.0.1", smtp_port=smtp.server_address[1],
+        smtp_user="user", smtp_pass="pass", smtp_from="cam@example.com",
+        smtp_to=["me@example.com"], use_ssl=False, use_tls=False,
+        wechat_webhook=f"http://127.0.0.1:{http.server_address[1]}/send",
+        digest_window=0.3, backoff_base=0.05)
+    results = []
+
+    # 1) 批量通知合并为摘要
+    started = time.perf_counter()
+    for i in range(12):
+        notifier.notify("导出完成", f"文件夹 {i} 已导出")
+    enqueue_ms = (time.perf_counter() - started) * 1000
+    notifier.flush(10)
+    results.append(check(f"12 条通知合并为 1 封邮件（入队 {enqueue_ms:.1f}ms）",
+                         len(smtp.messages) == 1 and "(x12)" in mail_text(smtp.messages[0])
+                         and len(StandInWebhook.payloads) == 1))
+
+    # 2) 连接复用与断线重连
+    notifier.notify("导出完成", "第二批")
+    notifier.flush(10)
+    results.append(check("第二封邮件复用连接",
+                         len(smtp.messages) == 2 and smtp.connections == 1 and smtp.logins == 1))
+    smtp.drop_after_message = True
+    notifier.notify("导出完成", "第三批")
+    notifier.flush(10)
+    notifier.notify("导出完成", "第四批")
+    notifier.flush(10)
+    results.append(check("服务端断开后自动重连",
+                         len(smtp.messages) == 4 and smtp.connections == 2))
+
+    # 3) 临时错误重试
+    smtp.fail_next = 2
+    StandInWebhook.fail_next = 2
+    notifier.notify("导出失败", "重试测试")
+    notifier.flush(10)
+    results.append(check("SMTP 451 与 webhook 500 重试后送达",
+                         len(smtp.messages) == 5 and "重试测试" in mail_text(smtp.messages[-1])
+                         and len(StandInWebhook.payloads) == 5))
+
+    # 4) 队列已满时丢弃最旧的通知
+    small = Notifier(enable_system=False, enable_email=False, enable_wechat=False,
+                     digest_window=0.2, queue_size=5)
+    started = time.perf_counter()
+    for i in range(20):
+        small.notify("t", str(i))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    small.flush(5)
+    results.append(check(f"队列满时不阻塞（{elapsed_ms:.1f}ms），丢弃 {small.dropped} 条",
+                         small.dropped > 0 and elapsed_ms < 100))
+
+    # 5) 应用级共享通知器
+    settings = dict(enable_system=False, enable_email=False, enable_wechat=False,
+                    smtp_to=["me@example.com"], digest_window=0.1)
+    first = shared_notifier(**settings)
+    first.notify("t", "共享")
+    same = shared_notifier(**dict(settings, smtp_to=["me@example.com"]))
+    changed = shared_notifier(**dict(settings, enable_system=True))
+    deadline = time.monotonic() + 5
+    while first._worker is not None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    results.append(check("配置相同时复用通知器，配置变化后旧通知器已关闭",
+                         same is first and changed is not first
+                         and first._worker is None and not first._exit_registered))
+
+    notifier.close()
+    small.close()
+    changed.close()
+    smtp.shutdown()
+    http.shutdown()
+    print("\n" + ("✅ 全部通过" if all(results) else "❌ 存在失败项"))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
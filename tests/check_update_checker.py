@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+更新检查脚本
+
+在本机启动模拟的 GitHub Releases API，检查：
+1. 首次检查下载完整的 Release 信息并写入缓存；
+2. 再次检查发送 If-None-Match，服务器返回 304 时使用缓存内容；
+3. 只有 Last-Modified 时发送 If-Modified-Since；
+4. 发布新版本后取得新内容，缓存期内不发送请求；
+5. 服务器无响应时按超时报错，缓存保持不变；
+6. 启动检查按间隔节流。
+
+用法:
+    python tests/check_update_checker.py
+    python tests/check_update_checker.py --serve  # 只启动模拟 API，供手动测试
+"""
+
+import sys
+import os
+import json
+import time
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from UpdateChecker import ReleaseCache, fetch_latest_release, startup_check_due  # noqa: E402
+
+LAST_MODIFIED = "Mon, 01 Sep 2025 00:00:00 GMT"
+
+
+def make_release(tag):
+    return {
+        "tag_name": tag,
+        "name": f"TeslaCam Player {tag}",
+        "assets": [{"name": f"TeslaCamPlayer_{tag}_Setup.exe",
+                    "browser_download_url": f"http://127.0.0.1/{tag}_Setup.exe",
+                    "digest": "sha256:" + "0" * 64}],
+    }
+
+
+class StandInApi(BaseHTTPRequestHandler):
+    """模拟 /repos/<owner>/<repo>/releases/latest；use_etag 为 False 时只返回 Last-Modified"""
+
+    release = make_release("v1.0.15")
+    version = 1
+    use_etag = True
+    delay = 0.0
+    # (If-None-Match, If-Modified-Since, 状态码)
+    log = []
+
+    def do_GET(self):
+        cls = StandInApi
+        if cls.delay:
+            time.sleep(cls.delay)
+        etag = f'W/"release-{cls.version}"'
+        modified = LAST_MODIFIED if cls.version == 1 else "Tue, 02 Sep 2025 00:00:00 GMT"
+        inm = self.headers.get("If-None-Match")
+        ims = self.headers.get("If-Modified-Since")
+        if (cls.use_etag and inm == etag) or (not cls.use_etag and ims == modified):
+            status, body = 304, b""
+        else:
+            status, body = 200, json.dumps(cls.release).encode()
+        cls.log.append((inm, ims, status))
+        try:
+            self.send_response(status)
+            if cls.use_etag:
+                self.send_header("ETag", etag)
+            self.send_header("Last-Modified", modified)
+            if body:
+                self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(port=0):
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandInApi)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def check(name, ok):
+    print(f"   {'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def main():
+    if "--serve" in sys.argv:
+        start_server(8046)
+        print("API: http://127.0.0.1:8046/repos/JerryYu2014/TeslaCamPlayer/releases/latest")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            return 0
+
+    print("🔍 更新检查")
+    print("=" * 50)
+
+    server = start_server()
+    api = f"http://127.0.0.1:{server.server_address[1]}/repos/JerryYu2014/TeslaCamPlayer/releases/latest"
+    folder = tempfile.mkdtemp(prefix="update-check-")
+    cache_path = os.path.join(folder, "release-cache.json")
+    results = []
+    try:
+        # 1) 首次检查
+        data, source = fetch_latest_release(api, ReleaseCache(cache_path))
+        results.append(check("首次检查下载完整内容并写入缓存",
+                             source == "network" and data["tag_name"] == "v1.0.15"
+                             and ReleaseCache(cache_path).etag == 'W/"release-1"'))
+
+        # 2) 条件请求
+        data, source = fetch_latest_release(api, ReleaseCache(cache_path))
+        results.append(check("再次检查返回 304，使用缓存内容",
+                             source == "not_modified" and data["tag_name"] == "v1.0.15"
+                             and StandInApi.log[-1] == ('W/"release-1"', LAST_MODIFIED, 304)))
+
+        # 3) 只有 Last-Modified
+        StandInApi.use_etag = False
+        os.remove(cache_path)
+        fetch_latest_release(api, ReleaseCache(cache_path))
+        data, source = fetch_latest_release(api, ReleaseCache(cache_path))
+        results.append(check("只有 Last-Modified 时发送 If-Modified-Since",
+                             source == "not_modified" and StandInApi.log[-1] == (None, LAST_MODIFIED, 304)))
+        StandInApi.use_etag = True
+
+        # 4) 新版本与缓存期
+        StandInApi.release = make_release("v1.1.0")
+        StandInApi.version = 2
+        data, source = fetch_latest_release(api, ReleaseCache(cache_path))
+        requests_before = len(StandInApi.log)
+        cached, cached_source = fetch_latest_release(api, ReleaseCache(cache_path), max_age=3600)
+        results.append(check("发布新版本后取得新内容，缓存期内不发送请求",
+                             source == "network" and data["tag_name"] == "v1.1.0"
+                             and cached_source == "cache" and cached["tag_name"] == "v1.1.0"
+                             and len(StandInApi.log) == requests_before))
+
+        # 5) 超时
+        StandInApi.delay = 2.0
+        started = time.perf_counter()
+        try:
+            fetch_latest_release(api, ReleaseCache(cache_path), timeout=(1, 0.5))
+            failed = False
+        except Exception:
+            failed = True
+        elapsed = time.perf_counter() - started
+        StandInApi.delay = 0.0
+        results.append(check(f"服务器无响应时 {elapsed:.1f}s 超时，缓存不变",
+                             failed and elapsed < 1.5
+                             and ReleaseCache(cache_path).data["tag_name"] == "v1.1.0"))
+
+        # 6) 启动检查节流
+        now = time.time()
+        results.append(check("启动检查按间隔节流",
+                             startup_check_due(0, 24, now) and not startup_check_due(now - 3600, 24, now)
+                             and startup_check_due(now - 25 * 3600, 24, now)))
+    finally:
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print("\n" + ("✅ 全部通过" if all(results) else "❌ 存在失败项"))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+更新下载检查脚本
+
+在本机启动模拟的下载服务（支持 Range/ETag，可按比例在传输中途断开连接），检查：
+1. 多段并行下载在频繁断线时自动续传，SHA-256 校验通过；
+2. 中途取消后保留临时文件，再次下载只传输剩余部分；
+3. 校验值不一致时报错并删除临时文件；
+4. 进度按固定间隔上报，次数远少于数据块数；
+5. 服务器不支持 Range 时退化为单连接下载。
+
+用法:
+    python tests/check_update_download.py [大小MB]
+    python tests/check_update_download.py --serve  # 只启动模拟服务，供手动测试
+"""
+
+import sys
+import os
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from UpdateDownloader import ChecksumError, UpdateDownloader  # noqa: E402
+
+CHUNK = 256 * 1024
+
+
+class StandInRelease(BaseHTTPRequestHandler):
+    """模拟 Release 附件下载；每 drop_every 个请求在传输一半时断开"""
+
+    payload = b""
+    etag = '"v1"'
+    ranges = True
+    drop_every = 0
+    # 每写 64KB 暂停的秒数，用于取消测试
+    delay = 0.0
+    requests = []
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = StandInRelease
+        with cls.lock:
+            cls.requests.append(self.headers.get("Range"))
+            number = len(cls.requests)
+        size = len(cls.payload)
+        start, end = 0, size - 1
+        status = 200
+        spec = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if cls.ranges and spec and (if_range is None or if_range == cls.etag):
+            first, _, last = spec.replace("bytes=", "").partition("-")
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            status = 206
+        self.send_response(status)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("ETag", cls.etag)
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        if cls.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+        limit = end + 1
+        if cls.drop_every and number % cls.drop_every == 0 and end - start > 1:
+            limit = start + (end - start) // 2
+        pos = start
+        try:
+            while pos < limit:
+                n = min(64 * 1024, limit - pos)
+                self.wfile.write(cls.payload[pos:pos + n])
+                pos += n
+                if cls.delay:
+                    time.sleep(cls.delay)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(port=0):
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandInRelease)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def reset(**kwargs):
+    StandInRelease.requests = []
+    StandInRelease.ranges = True
+    StandInRelease.drop_every = 0
+    StandInRelease.delay = 0.0
+    for key, value in kwargs.items():
+        setattr(StandInRelease, key, value)
+
+
+def check(name, ok):
+    print(f"   {'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def main():
+    size_mb = 24
+    if len(sys.argv) > 1 and sys.argv[1] != "--serve":
+        size_mb = int(sys.argv[1])
+    StandInRelease.payload = os.urandom(size_mb * 1024 * 1024)
+    sha256 = hashlib.sha256(StandInRelease.payload).hexdigest()
+
+    if "--serve" in sys.argv:
+        start_server(8045)
+        print(f"下载地址: http://127.0.0.1:8045/installer.bin（{size_mb}MB, sha256 {sha256}）")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            return 0
+
+    print("🔍 更新下载检查")
+    print("=" * 50)
+
+    server = start_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}/installer.bin"
+    folder = tempfile.mkdtemp(prefix="update-")
+    target = os.path.join(folder, "installer.bin")
+    results = []
+    try:
+        # 1) 并行分段 + 断线续传
+        reset(drop_every=2)
+        reports = []
+        started = time.perf_counter()
+        downloader = UpdateDownloader(url, target, sha256=sha256, segments=4,
+                                      chunk_size=CHUNK, max_retries=20,
+                                      progress=lambda done, total: reports.append(done))
+        downloader.run()
+        elapsed = time.perf_counter() - started
+        with open(target, "rb") as f:
+            same = f.read() == StandInRelease.payload
+        results.append(check(f"4 段并行、每 2 个请求断线一次: {len(StandInRelease.requests)} 个请求, "
+                             f"{elapsed:.2f}s, 内容与校验值一致",
+                             same and len(StandInRelease.requests) > 5
+                             and not os.path.exists(downloader.part_path)
+                             and not os.path.exists(downloader.state_path)))
+
+        # 4) 进度节流
+        chunks = len(StandInRelease.payload) // CHUNK
+        results.append(check(f"进度上报 {len(reports)} 次（{chunks} 个数据块）",
+                             len(reports) <= elapsed / downloader.progress_interval + 8
+                             and reports[-1] == len(StandInRelease.payload)))
+
+        # 2) 取消后续传
+        os.remove(target)
+        reset(delay=0.002)
+        stop_at = len(StandInRelease.payload) * 0.4
+        progress = {"done": 0}
+        first = UpdateDownloader(url, target, sha256=sha256, segments=4, chunk_size=CHUNK,
+                                 progress_interval=0.05,
+                                 progress=lambda done, total: progress.update(done=done),
+                                 should_stop=lambda: progress["done"] >= stop_at)
+        stopped = first.run() is None and os.path.exists(first.part_path)
+        reset()
+        second = UpdateDownloader(url, target, sha256=sha256, segments=4, chunk_size=CHUNK)
+        second.run()
+        resumed = [r for r in StandInRelease.requests if r and not r.startswith("bytes=0-")]
+        results.append(check(f"取消后续传: 第一次 {first.transferred} 字节, 第二次 {second.transferred} 字节",
+                             stopped and first.transferred + second.transferred == len(StandInRelease.payload)
+                             and len(resumed) == 4 and second.transferred < len(StandInRelease.payload)))
+
+        # 已下载且校验通过的文件直接复用
+        reset()
+        UpdateDownloader(url, target, sha256=sha256).run()
+        results.append(check("已存在的安装包校验通过后不再下载", not StandInRelease.requests))
+
+        # 3) 校验失败
+        os.remove(target)
+        reset()
+        bad = UpdateDownloader(url, target, sha256="0" * 64, chunk_size=CHUNK)
+        try:
+            bad.run()
+            raised = False
+        except ChecksumError:
+            raised = True
+        results.append(check("校验值不一致时报错并删除临时文件",
+                             raised and not os.path.exists(target)
+                             and not os.path.exists(bad.part_path)))
+
+        # 5) 不支持 Range
+        reset(ranges=False)
+        single = UpdateDownloader(url, target, sha256=sha256, chunk_size=CHUNK)
+        single.run()
+        results.append(check("不支持 Range 时单连接下载",
+                             os.path.exists(target) and single.transferred == len(StandInRelease.payload)))
+    finally:
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print("\n" + ("✅ 全部通过" if all(results) else "❌ 存在失败项"))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+可见性调度器检查脚本（不需要 VLC）
+
+用模拟的播放器、媒体和视角控件检查主时钟与恢复同步逻辑：
+1. 全部视角挂起时主时钟按墙钟和倍速推算；
+2. 恢复可见时偏差超过阈值才 seek；
+3. 挂起期间换了媒体的视角恢复时以主时钟时间重新打开，而不是对未打开的输入 seek；
+4. 时长未知时只请求一次异步解析，不调用阻塞的 parse()。
+"""
+
+import sys
+import os
+import time
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from VisibilityScheduler import VisibilityScheduler  # noqa: E402
+
+VIEWS = ('front', 'back', 'left', 'right')
+
+
+class FakePlayer:
+    """模拟 vlc.MediaPlayer：输入打开后 seek 才生效"""
+
+    def __init__(self):
+        self.time = 0
+        self.playing = False
+        self.opened = True
+        self.seeks = []
+
+    def play(self):
+        self.playing = True
+        self.opened = True
+
+    def set_pause(self, paused):
+        self.playing = not paused
+
+    def is_playing(self):
+        return int(self.playing)
+
+    def get_time(self):
+        return self.time if self.opened else -1
+
+    def set_time(self, ms):
+        self.seeks.append(ms)
+        if self.opened:
+            self.time = ms
+
+    def get_length(self):
+        return 60000 if self.opened else 0
+
+    def get_position(self):
+        return self.time / 60000
+
+
+class FakeMedia:
+    def __init__(self):
+        self.parses = 0
+        self.async_parses = 0
+
+    def get_duration(self):
+        return -1
+
+    def parse(self):
+        self.parses += 1
+
+    def parse_with_options(self, flags, timeout):
+        self.async_parses += 1
+
+
+class FakeRegion:
+    def isEmpty(self):
+        return False
+
+
+class FakeWidget:
+    """始终可见的视角控件"""
+
+    def window(self):
+        return self
+
+    def isMinimized(self):
+        return False
+
+    def isVisible(self):
+        return True
+
+    def visibleRegion(self):
+        return FakeRegion()
+
+
+def check(name, ok):
+    print(f"   {'✅' if ok else '❌'} {name}")
+    return ok
+
+
+def main():
+    print("🔍 可见性调度器检查")
+    print("=" * 50)
+
+    players = {view: FakePlayer() for view in VIEWS}
+    media = {view: FakeMedia() for view in VIEWS}
+    reopened = []
+
+    def reopen(view, start_ms, paused):
+        reopened.append((view, start_ms, paused))
+        players[view].opened = False
+        players[view].time = start_ms
+
+    scheduler = VisibilityScheduler(players, {view: FakeWidget() for view in VIEWS},
+                                    lambda: 'front', media.get, reopen=reopen)
+    results = []
+
+    # 1) 全部挂起后按墙钟推算
+    for player in players.values():
+        player.play()
+        player.time = 10000
+    scheduler.on_play()
+    scheduler.on_rate(2.0)
+    for view in VIEWS:
+        scheduler.set_view_enabled(view, False)
+    time.sleep(0.2)
+    clock = scheduler.master_time()
+    results.append(check(f"全部挂起时主时钟按 2 倍速推算: {clock:.0f}ms",
+                         10300 <= clock <= 10600 and not any(p.playing for p in players.values())))
+
+    # 2) 偏差超过阈值才 seek
+    players['back'].time = int(scheduler.master_time()) - 50
+    scheduler.set_view_enabled('back', True)
+    players['left'].time = 1000
+    scheduler.set_view_enabled('left', True)
+    results.append(check("恢复时偏差小于阈值不 seek，超过阈值 seek 到主时钟",
+                         players['back'].seeks == []
+                         and len(players['left'].seeks) == 1
+                         and abs(players['left'].seeks[0] - players['back'].time) < 200))
+
+    # 3) 挂起期间换了媒体
+    scheduler.on_media_changed()
+    for view in VIEWS:
+        players[view].opened = view in scheduler.active_players()
+        players[view].time = 0 if players[view].opened else -1
+        scheduler.on_view_media_changed(view)
+    players['back'].time = players['left'].time = 5000
+    scheduler.set_view_enabled('front', True)
+    results.append(check(f"挂起期间换了媒体的视角从主时钟时间重新打开: {reopened}",
+                         reopened == [('front', 5000, False)] and players['front'].seeks == []
+                         and players['front'].playing and not scheduler.unopened - {'right'}))
+
+    # 4) 异步解析时长
+    for view in VIEWS:
+        scheduler.set_view_enabled(view, False)
+    scheduler.on_media_changed()
+    for _ in range(5):
+        scheduler.length_ms()
+    results.append(check("时长未知时只请求一次异步解析",
+                         media['front'].async_parses == 1 and media['front'].parses == 0))
+
+    print("\n" + ("✅ 全部通过" if all(results) else "❌ 存在失败项"))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
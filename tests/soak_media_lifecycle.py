@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+播放器长时间运行（soak）测试
+
+用 ffmpeg 生成若干组合成的特斯拉命名片段，在无界面环境下反复切换片段组、
+播放、倍速、seek 数千次，定期采样进程常驻内存和打开的文件句柄数，
+预热之后两者的增长超过阈值即判定为泄漏并以非零状态退出。
+
+用法:
+    python tests/soak_media_lifecycle.py [循环次数] [片段组数]
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+import subprocess
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+from TeslaCamPlayerWidget import TeslaCamPlayerWidget  # noqa: E402
+
+# 预热之后允许的增长
+MAX_RSS_GROWTH_MB = 32
+MAX_FD_GROWTH = 16
+WARMUP_CYCLES = 200
+SAMPLE_EVERY = 100
+
+VIEWS = ('front', 'back', 'left_repeater', 'right_repeater')
+
+
+def make_clips(folder, groups, seconds=3):
+    """生成 groups 组、每组四个视角的测试片段"""
+    for i in range(groups):
+        stamp = f"2025-01-01_00-{i // 60:02d}-{i % 60:02d}"
+        for view in VIEWS:
+            path = os.path.join(folder, f"{stamp}-{view}.mp4")
+            subprocess.run(
+                ["ffmpeg", "-loglevel", "quiet", "-y", "-f", "lavfi",
+                 "-i", f"testsrc=size=320x240:rate=30:duration={seconds}",
+                 "-c:v", "libx264", "-preset", "ultrafast", "-g", "30",
+                 "-pix_fmt", "yuv420p", path],
+                check=True)
+
+
+def rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+
+def open_fds():
+    try:
+        import psutil
+        proc = psutil.Process()
+        return proc.num_handles() if sys.platform == "win32" else proc.num_fds()
+    except ImportError:
+        return len(os.listdir("/proc/self/fd"))
+
+
+def main():
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    group_count = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    if shutil.which("ffmpeg") is None:
+        print("❌ 未找到 ffmpeg，无法生成测试片段")
+        return 2
+
+    print("🔍 播放器长时间运行测试")
+    print("=" * 50)
+
+    folder = tempfile.mkdtemp(prefix="teslacam-soak-")
+    try:
+        make_clips(folder, group_count)
+
+        app = QApplication(sys.argv)
+        widget = TeslaCamPlayerWidget(
+            folder, enable_dialogs=False, enable_file_dialog=False,
+            vlc_args=("--vout=dummy", "--aout=dummy", "--no-xlib"))
+        widget.show()
+        groups = widget.video_groups
+        print(f"   片段组: {len(groups)}, 循环次数: {cycles}")
+
+        baseline = None
+        samples = []
+        started = time.monotonic()
+        for i in range(cycles):
+            widget.current_index = i % len(groups)
+            widget.load_video_group(groups[widget.current_index])
+            if i % 3 == 0:
+                widget.play_all()
+            if i % 7 == 0:
+                widget.set_rate_all(2.0 if i % 2 else 1.0)
+            if i % 11 == 0:
+                widget.seek_all(0.5)
+            if i % 13 == 0:
+                widget.stop_all()
+            app.processEvents()
+
+            if i + 1 == WARMUP_CYCLES:
+                baseline = (rss_mb(), open_fds())
+            if baseline and (i + 1) % SAMPLE_EVERY == 0:
+                samples.append((i + 1, rss_mb(), open_fds()))
+                _, rss, fds = samples[-1]
+                print(f"   #{i + 1:>6}  RSS {rss:8.1f} MB  fds {fds:>5}")
+
+        widget.stop_all()
+        elapsed = time.monotonic() - started
+
+        if not samples:
+            print("❌ 循环次数过少，没有预热后的采样")
+            return 2
+
+        _, rss, fds = samples[-1]
+        rss_growth = rss - baseline[0]
+        fd_growth = fds - baseline[1]
+        pool = widget.media_pool
+        print(f"\n   耗时: {elapsed:.1f}s")
+        print(f"   Media 新建/命中/释放: {pool.created}/{pool.hits}/{pool.released}")
+        print(f"   RSS 增长: {rss_growth:.1f} MB (上限 {MAX_RSS_GROWTH_MB})")
+        print(f"   文件句柄增长: {fd_growth} (上限 {MAX_FD_GROWTH})")
+
+        widget.close()
+
+        ok = rss_growth <= MAX_RSS_GROWTH_MB and fd_growth <= MAX_FD_GROWTH
+        print("✅ 未发现资源泄漏" if ok else "❌ 资源持续增长，可能存在泄漏")
+        return 0 if ok else 1
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())